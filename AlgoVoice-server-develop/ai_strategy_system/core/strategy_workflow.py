@@ -10,9 +10,14 @@ alongside human readable explanations when available.
 
 from __future__ import annotations
 
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -428,12 +433,121 @@ class UniverseService:
         return list(dict.fromkeys(selected))[:8]
 
 
+def build_symbol_features(
+    symbol: str, data: pd.DataFrame
+) -> Optional[Tuple[pd.DataFrame, pd.Series]]:
+    """Compute the engineered feature frame for a single symbol.
+
+    Defined at module level so it can run in a worker process. Returns the
+    feature frame (with a ``date`` column) and the symbol's return series, or
+    ``None`` when there are too few clean rows.
+    """
+    indicators = TechnicalIndicators().calculate_all_indicators(data)
+
+    # 添加更多特征
+    indicators["returns"] = indicators["close"].pct_change()
+    indicators["log_returns"] = np.log(
+        indicators["close"] / indicators["close"].shift(1)
+    )
+
+    # 价格动量特征
+    for window in [5, 10, 20]:
+        indicators[f"momentum_{window}"] = indicators["close"].pct_change(window)
+        indicators[f"volatility_{window}"] = (
+            indicators["returns"].rolling(window).std()
+        )
+
+    # 成交量特征
+    if "volume" in indicators.columns:
+        indicators["volume_ma5"] = indicators["volume"].rolling(5).mean()
+        indicators["volume_ratio"] = indicators["volume"] / indicators["volume_ma5"]
+
+    # 未来收益（预测目标）
+    indicators["future_returns"] = indicators["returns"].shift(-1)
+
+    # 添加股票标识
+    indicators["symbol"] = symbol
+
+    # 清理数据
+    indicators = indicators.replace([np.inf, -np.inf], np.nan)
+    indicators = indicators.dropna()
+
+    if indicators.empty or len(indicators) <= 20:
+        return None
+
+    # 重置索引为列，保留日期信息
+    indicators_with_date = indicators.reset_index()
+    # reset_index会创建'index'列或保留原索引名
+    if (
+        "date" not in indicators_with_date.columns
+        and "index" in indicators_with_date.columns
+    ):
+        indicators_with_date = indicators_with_date.rename(columns={"index": "date"})
+    return indicators_with_date, indicators["returns"].copy().dropna()
+
+
 class FeatureEngineeringService:
-    """Generates the feature dataset required by downstream models."""
+    """Generates the feature dataset required by downstream models.
 
-    def __init__(self, rate_limit: float = 0.5):
+    Histories are fetched concurrently (bounded by ``max_concurrent`` and the
+    collector's rate limit) and each symbol is handed to a worker pool for
+    indicator computation as soon as it arrives, so network I/O overlaps with
+    feature engineering.
+
+    ``compute_backend`` defaults to ``"thread"`` because the service runs inside
+    the API server; ``"process"`` starts workers with ``spawn`` rather than
+    forking the (multi-threaded) server process.
+    """
+
+    def __init__(
+        self,
+        rate_limit: float = 0.5,
+        max_concurrent: int = 5,
+        compute_workers: Optional[int] = None,
+        compute_backend: str = "thread",
+    ):
+        if compute_backend not in ("thread", "process"):
+            raise ValueError(f"Unknown compute backend: {compute_backend}")
         self.collector = AkshareDataCollector(rate_limit=rate_limit)
-        self.technical = TechnicalIndicators()
+        self.max_concurrent = max_concurrent
+        self.compute_backend = compute_backend
+        self.compute_workers = (
+            compute_workers
+            if compute_workers is not None
+            else min(4, os.cpu_count() or 1)
+        )
+
+    def _create_compute_pool(self, n_symbols: int) -> Optional[Executor]:
+        """Worker pool for indicator computation, or None for a single thread."""
+        workers = min(self.compute_workers, n_symbols)
+        if workers <= 1:
+            return None
+        if self.compute_backend == "thread":
+            return ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="feature-compute"
+            )
+        try:
+            return ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        except (OSError, ValueError) as exc:
+            LOGGER.warning("Process pool unavailable, computing in threads: %s", exc)
+            return None
+
+    async def _compute_features(
+        self, pool: Optional[Executor], symbol: str, data: pd.DataFrame
+    ) -> Optional[Tuple[pd.DataFrame, pd.Series]]:
+        loop = asyncio.get_running_loop()
+        if pool is not None:
+            try:
+                return await loop.run_in_executor(
+                    pool, build_symbol_features, symbol, data
+                )
+            except BrokenProcessPool as exc:
+                LOGGER.warning(
+                    "Process pool failed for %s, retrying in thread: %s", symbol, exc
+                )
+        return await asyncio.to_thread(build_symbol_features, symbol, data)
 
     async def prepare(self, universe: UniverseSelection) -> FeatureBundle:
         LOGGER.info(f"Preparing features for {len(universe.symbols)} symbols")
@@ -441,84 +555,62 @@ class FeatureEngineeringService:
         end_date = today.strftime("%Y%m%d")
         start_date = (today - timedelta(days=365)).strftime("%Y%m%d")
 
-        all_features: List[pd.DataFrame] = []
-        returns_by_symbol: Dict[str, pd.Series] = {}
         raw_market_data: Dict[str, pd.DataFrame] = {}
+        pending: Dict[str, asyncio.Task] = {}
+        pool = self._create_compute_pool(len(universe.symbols))
 
-        for symbol in universe.symbols:
-            try:
-                data = self.collector.fetch_stock_history(symbol, start_date, end_date)
+        try:
+            # 每只股票下载完成后立即提交特征计算，与后续下载并行
+            async for symbol, data in self.collector.stream_multiple_stocks(
+                universe.symbols, start_date, end_date, self.max_concurrent
+            ):
                 if data is None or data.empty:
                     LOGGER.warning(f"No data for {symbol}")
                     continue
 
-                # 确保数据有时间索引
-                if "date" in data.columns and not isinstance(
-                    data.index, pd.DatetimeIndex
-                ):
-                    data["date"] = pd.to_datetime(data["date"])
-                    data.set_index("date", inplace=True)
+                try:
+                    # 确保数据有时间索引
+                    if "date" in data.columns and not isinstance(
+                        data.index, pd.DatetimeIndex
+                    ):
+                        data["date"] = pd.to_datetime(data["date"])
+                        data.set_index("date", inplace=True)
+                except Exception as exc:
+                    LOGGER.warning("Invalid dates for %s, skipped: %s", symbol, exc)
+                    continue
 
                 raw_market_data[symbol] = data.copy()
-
-                # 计算技术指标
-                indicators = self.technical.calculate_all_indicators(data)
-
-                # 添加更多特征
-                indicators["returns"] = indicators["close"].pct_change()
-                indicators["log_returns"] = np.log(
-                    indicators["close"] / indicators["close"].shift(1)
+                pending[symbol] = asyncio.ensure_future(
+                    self._compute_features(pool, symbol, data)
                 )
 
-                # 价格动量特征
-                for window in [5, 10, 20]:
-                    indicators[f"momentum_{window}"] = indicators["close"].pct_change(
-                        window
-                    )
-                    indicators[f"volatility_{window}"] = (
-                        indicators["returns"].rolling(window).std()
-                    )
-
-                # 成交量特征
-                if "volume" in indicators.columns:
-                    indicators["volume_ma5"] = indicators["volume"].rolling(5).mean()
-                    indicators["volume_ratio"] = (
-                        indicators["volume"] / indicators["volume_ma5"]
-                    )
-
-                # 未来收益（预测目标）
-                indicators["future_returns"] = indicators["returns"].shift(-1)
-
-                # 添加股票标识
-                indicators["symbol"] = symbol
+            results = await asyncio.gather(*pending.values(), return_exceptions=True)
+        finally:
+            for task in pending.values():
+                task.cancel()
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
 
-                # 清理数据
-                indicators = indicators.replace([np.inf, -np.inf], np.nan)
-                indicators = indicators.dropna()
-
-                if not indicators.empty and len(indicators) > 20:
-                    # 重置索引为列，保留日期信息
-                    indicators_with_date = indicators.reset_index()
-                    # reset_index会创建'index'列或保留原索引名
-                    if (
-                        "date" not in indicators_with_date.columns
-                        and "index" in indicators_with_date.columns
-                    ):
-                        indicators_with_date = indicators_with_date.rename(
-                            columns={"index": "date"}
-                        )
-                    all_features.append(indicators_with_date)
-                    returns_by_symbol[symbol] = indicators["returns"].copy().dropna()
-                    LOGGER.info(
-                        f"✓ {symbol}: {len(indicators)} records with {len(indicators.columns)} features"
-                    )
-                else:
-                    LOGGER.warning(
-                        f"Insufficient data for {symbol}: {len(indicators)} records"
-                    )
+        all_features: List[pd.DataFrame] = []
+        returns_by_symbol: Dict[str, pd.Series] = {}
+        outcomes = dict(zip(pending.keys(), results))
 
-            except Exception as exc:  # noqa: BLE001
-                LOGGER.warning("Feature preparation failed for %s: %s", symbol, exc)
+        # 按股票池顺序合并，保证训练/测试切分与下载完成顺序无关
+        for symbol in universe.symbols:
+            if symbol not in outcomes:
+                continue
+            outcome = outcomes[symbol]
+            if isinstance(outcome, Exception):
+                LOGGER.warning("Feature preparation failed for %s: %s", symbol, outcome)
+            elif outcome is None:
+                LOGGER.warning(f"Insufficient data for {symbol}")
+            else:
+                features, returns = outcome
+                all_features.append(features)
+                returns_by_symbol[symbol] = returns
+                LOGGER.info(
+                    f"✓ {symbol}: {len(features)} records with {len(features.columns) - 1} features"
+                )
 
         if not all_features:
             raise RuntimeError("No feature data available for the selected universe")
@@ -24,6 +24,7 @@ from .data_structures import MarketData, Signal, Position
 from .exceptions import QuantSystemError, DataError, ModelError, ExecutionError
 from .logging_system import setup_logger
 from .communication_protocol import (
+    BackpressureError,
     InterModuleMessage,
     MessageQueue,
     ModuleCommunicator,
@@ -65,6 +66,7 @@ __all__ = [
     "setup_logger",
     
     # 通信协议
+    "BackpressureError",
     "InterModuleMessage",
     "MessageQueue",
     "ModuleCommunicator",
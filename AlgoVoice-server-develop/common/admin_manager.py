@@ -143,6 +143,8 @@ class AdminManager:
                 """, (new_permission, new_permission, target_user_id))
                 
                 conn.commit()
+                # 已缓存的令牌验证结果中包含旧权限
+                user_db.invalidate_user_cache(target_user_id)
                 
                 # 记录活动
                 cursor.execute("""
@@ -216,6 +218,7 @@ class AdminManager:
                 """, (new_limit, target_user_id))
                 
                 conn.commit()
+                user_db.invalidate_user_cache(target_user_id)
                 
                 # 记录活动
                 limit_text = "无限" if new_limit == -1 else f"{new_limit:,}"
@@ -0,0 +1,572 @@
+"""
+有界内存缓存
+MemoryCache、数据管道LRUCache与FeatureCacheManager共用的缓存内核
+
+- 按DataFrame/ndarray/容器估算每个条目占用的字节数，按条目数和字节数双重限额
+- 所有缓存共享一个进程级内存预算，超出时由写入方淘汰自己的条目
+- LRU或LFU淘汰（均为O(1)），过期时间记录在最小堆中，O(log n)清理过期条目
+- 键按哈希分片，每个分片一把锁，不同分片的读写互不阻塞
+- 记录命中/未命中/淘汰/过期次数，get_stats()只汇总计数器，不扫描条目
+"""
+
+import heapq
+import itertools
+import math
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from common.logging_system import setup_logger
+
+logger = setup_logger("bounded_cache")
+
+# 进程内所有缓存共享的默认内存预算（字节）
+DEFAULT_MEMORY_BUDGET_BYTES = 1024 * 1024 * 1024
+EVICTION_POLICIES = ("lru", "lfu")
+
+# 估算容器大小时最多递归的层数，以及每层抽样的元素数
+_SIZE_MAX_DEPTH = 4
+_SIZE_SAMPLE = 64
+# 过期堆中失效记录超过有效条目数的倍数时重建堆
+_HEAP_COMPACT_FACTOR = 2
+# 直接按sys.getsizeof计算的类型
+_SCALAR_TYPES = (type(None), bool, int, float, str, bytes, bytearray)
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """估算对象占用的内存字节数
+
+    DataFrame/Series按memory_usage(deep=True)，ndarray按nbytes；
+    dict/list/tuple/set递归估算，元素较多时按抽样均值外推。
+
+    Args:
+        value: 任意对象
+
+    Returns:
+        估算的字节数
+    """
+    if isinstance(value, _SCALAR_TYPES):
+        return sys.getsizeof(value)
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes) + sys.getsizeof(np.empty(0))
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+
+    size = sys.getsizeof(value)
+    if _depth >= _SIZE_MAX_DEPTH:
+        return size
+
+    if isinstance(value, dict):
+        count = len(value)
+        sampled = sum(
+            estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1)
+            for k, v in itertools.islice(value.items(), _SIZE_SAMPLE)
+        )
+    elif isinstance(value, (list, tuple, set, frozenset, deque)):
+        count = len(value)
+        sampled = sum(
+            estimate_size(v, _depth + 1) for v in itertools.islice(value, _SIZE_SAMPLE)
+        )
+    elif hasattr(value, "__dict__"):
+        return size + estimate_size(vars(value), _depth + 1)
+    else:
+        return size
+
+    if count > _SIZE_SAMPLE:
+        sampled = sampled * count / _SIZE_SAMPLE
+    return size + int(sampled)
+
+
+class MemoryBudget:
+    """进程级内存预算，多个BoundedCache共享已用字节数"""
+
+    def __init__(self, max_bytes: Optional[int] = DEFAULT_MEMORY_BUDGET_BYTES):
+        """初始化内存预算
+
+        Args:
+            max_bytes: 所有缓存合计的字节上限，None表示不限制
+        """
+        self.max_bytes = max_bytes
+        self._used = 0
+        self._lock = threading.Lock()
+
+    @property
+    def used_bytes(self) -> int:
+        """当前已用字节数"""
+        return self._used
+
+    def add(self, delta: int) -> None:
+        """登记已用字节数的变化"""
+        if delta:
+            with self._lock:
+                self._used += delta
+
+    def exceeded_by(self, delta: int = 0) -> bool:
+        """已用字节数增加delta后是否超出预算"""
+        return self.max_bytes is not None and self._used + delta > self.max_bytes
+
+
+class _Entry:
+    """缓存条目"""
+
+    __slots__ = (
+        "value",
+        "size",
+        "ttl",
+        "stale_ttl",
+        "expires_at",
+        "evict_at",
+        "freq",
+        "seq",
+    )
+
+    def __init__(self, value, size, ttl, stale_ttl, expires_at, evict_at, seq):
+        self.value = value
+        self.size = size
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        # expires_at之前为新鲜数据，evict_at之前为陈旧数据，之后删除
+        self.expires_at = expires_at
+        self.evict_at = evict_at
+        self.freq = 1
+        self.seq = seq
+
+
+class _CacheShard:
+    """缓存分片：一把锁、一份淘汰顺序和一个过期堆
+
+    除构造函数外的方法都要求调用方已持有lock。
+    """
+
+    def __init__(
+        self, policy: str, max_entries: Optional[int], max_bytes: Optional[int]
+    ):
+        self.lock = threading.Lock()
+        self.policy = policy
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # LRU模式下按最近访问排序（最旧的在前）
+        self.entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        # LFU模式：访问次数 -> 该次数下的键（最早进入的在前）
+        self.freq_buckets: Dict[int, "OrderedDict[Hashable, None]"] = {}
+        self.min_freq = 0
+        # (删除时间, 序号, 键)，序号与条目不一致的记录已失效
+        self.heap: List[Tuple[float, int, Hashable]] = []
+        # 带陈旧窗口的键，用于统计陈旧条目数
+        self.windowed: set = set()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.sets = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.rejected = 0
+
+    def over_limit(self, extra_bytes: int) -> bool:
+        """再放入一个extra_bytes大小的条目是否超出分片限额"""
+        if self.max_entries is not None and len(self.entries) + 1 > self.max_entries:
+            return True
+        return self.max_bytes is not None and self.bytes + extra_bytes > self.max_bytes
+
+    def insert(self, key: Hashable, entry: _Entry) -> None:
+        """放入条目（键不在分片中）"""
+        self.entries[key] = entry
+        self.bytes += entry.size
+        if entry.evict_at > entry.expires_at:
+            self.windowed.add(key)
+        if self.policy == "lfu":
+            self.freq_buckets.setdefault(entry.freq, OrderedDict())[key] = None
+            if len(self.entries) == 1 or entry.freq < self.min_freq:
+                self.min_freq = entry.freq
+        if entry.evict_at != math.inf:
+            self.push_expiry(key, entry)
+
+    def remove(self, key: Hashable) -> Optional[_Entry]:
+        """移除条目，返回被移除的条目"""
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return None
+        self.bytes -= entry.size
+        self.windowed.discard(key)
+        if self.policy == "lfu":
+            bucket = self.freq_buckets[entry.freq]
+            del bucket[key]
+            if not bucket:
+                del self.freq_buckets[entry.freq]
+        return entry
+
+    def touch(self, key: Hashable, entry: _Entry) -> None:
+        """记录一次访问"""
+        if self.policy == "lru":
+            self.entries.move_to_end(key)
+            return
+        bucket = self.freq_buckets[entry.freq]
+        del bucket[key]
+        if not bucket:
+            del self.freq_buckets[entry.freq]
+            if self.min_freq == entry.freq:
+                self.min_freq = entry.freq + 1
+        entry.freq += 1
+        self.freq_buckets.setdefault(entry.freq, OrderedDict())[key] = None
+
+    def pop_victim(self) -> _Entry:
+        """按淘汰策略移除一个条目（分片非空）"""
+        if self.policy == "lru":
+            key = next(iter(self.entries))
+        else:
+            if self.min_freq not in self.freq_buckets:
+                self.min_freq = min(self.freq_buckets)
+            key = next(iter(self.freq_buckets[self.min_freq]))
+        self.evictions += 1
+        return self.remove(key)
+
+    def push_expiry(self, key: Hashable, entry: _Entry) -> None:
+        """登记条目的删除时间，失效记录过多时重建堆"""
+        heapq.heappush(self.heap, (entry.evict_at, entry.seq, key))
+        if len(self.heap) > _HEAP_COMPACT_FACTOR * len(self.entries) + 64:
+            self.heap = [
+                (e.evict_at, e.seq, k)
+                for k, e in self.entries.items()
+                if e.evict_at != math.inf
+            ]
+            heapq.heapify(self.heap)
+
+    def purge(self, now: float) -> int:
+        """删除已超出陈旧窗口的条目，返回释放的字节数"""
+        released = 0
+        heap = self.heap
+        while heap and heap[0][0] <= now:
+            _, seq, key = heapq.heappop(heap)
+            entry = self.entries.get(key)
+            if entry is not None and entry.seq == seq:
+                self.remove(key)
+                self.expirations += 1
+                released += entry.size
+        return released
+
+
+class BoundedCache:
+    """有界内存缓存（线程安全）
+
+    条目在ttl内为新鲜数据；之后stale_ttl内仍可通过get_with_freshness()
+    作为陈旧数据读取，超出后删除。超出条目数/字节数限额或内存预算时，
+    按淘汰策略移除所在分片的条目；单个条目超过分片字节限额时不缓存。
+
+    分片数大于1时LRU/LFU顺序和限额都按分片计算；需要严格全局顺序的
+    小缓存使用n_shards=1。
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        default_ttl: Optional[float] = None,
+        policy: str = "lru",
+        n_shards: int = 8,
+        sliding_ttl: bool = False,
+        budget: Optional[MemoryBudget] = None,
+        size_of: Callable[[Any], int] = estimate_size,
+        name: str = "cache",
+    ):
+        """初始化有界缓存
+
+        Args:
+            max_entries: 最大条目数，None表示不限制
+            max_bytes: 最大字节数，None表示不限制
+            default_ttl: 默认过期时间（秒），None表示不过期
+            policy: 淘汰策略，"lru" 或 "lfu"
+            n_shards: 分片数
+            sliding_ttl: 命中时是否重新计算过期时间
+            budget: 共享的进程级内存预算，None表示只受本缓存限额约束
+            size_of: 条目字节数估算函数
+            name: 缓存名称，用于日志和统计
+        """
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"不支持的淘汰策略: {policy}")
+
+        self.name = name
+        self.policy = policy
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.sliding_ttl = sliding_ttl
+        self._budget = budget
+        self._size_of = size_of
+        self._seq = itertools.count()
+
+        n_shards = max(1, int(n_shards))
+        self._n_shards = n_shards
+        shard_entries = (
+            None if max_entries is None else max(1, math.ceil(max_entries / n_shards))
+        )
+        shard_bytes = None if max_bytes is None else max_bytes // n_shards
+        self._shards = [
+            _CacheShard(policy, shard_entries, shard_bytes) for _ in range(n_shards)
+        ]
+
+    def _shard(self, key: Hashable) -> _CacheShard:
+        if self._n_shards == 1:
+            return self._shards[0]
+        return self._shards[hash(key) % self._n_shards]
+
+    def _lookup(self, key: Hashable, allow_stale: bool) -> Optional[Tuple[Any, bool]]:
+        shard = self._shard(key)
+        now = time.monotonic()
+        released = 0
+        result = None
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is None:
+                shard.misses += 1
+            elif entry.evict_at <= now:
+                shard.remove(key)
+                shard.expirations += 1
+                shard.misses += 1
+                released = entry.size
+            elif entry.expires_at <= now:
+                if allow_stale:
+                    shard.stale_hits += 1
+                    result = (entry.value, False)
+                else:
+                    shard.misses += 1
+            else:
+                shard.hits += 1
+                shard.touch(key, entry)
+                if self.sliding_ttl and entry.ttl is not None:
+                    entry.seq = next(self._seq)
+                    entry.expires_at = now + entry.ttl
+                    entry.evict_at = entry.expires_at + entry.stale_ttl
+                    shard.push_expiry(key, entry)
+                result = (entry.value, True)
+
+        if released and self._budget is not None:
+            self._budget.add(-released)
+        return result
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """获取未过期的缓存数据
+
+        Args:
+            key: 缓存键
+            default: 不存在或已过期时的返回值
+
+        Returns:
+            缓存的数据
+        """
+        entry = self._lookup(key, allow_stale=False)
+        return default if entry is None else entry[0]
+
+    def get_with_freshness(self, key: Hashable) -> Optional[Tuple[Any, bool]]:
+        """获取缓存数据，过期但仍在陈旧窗口内的数据也返回
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            (数据, 是否未过期)，不存在或超出陈旧窗口则返回 None
+        """
+        return self._lookup(key, allow_stale=True)
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        stale_ttl: float = 0,
+        size: Optional[int] = None,
+    ) -> bool:
+        """设置缓存数据
+
+        Args:
+            key: 缓存键
+            value: 要缓存的数据
+            ttl: 过期时间（秒），默认使用default_ttl
+            stale_ttl: 过期后仍可作为陈旧数据读取的时间（秒）
+            size: 条目字节数，默认用size_of估算
+
+        Returns:
+            是否已缓存（条目超过字节限额时不缓存）
+        """
+        if ttl is None:
+            ttl = self.default_ttl
+        if size is None:
+            size = self._size_of(value)
+
+        shard = self._shard(key)
+        budget = self._budget
+        now = time.monotonic()
+        expires_at = math.inf if ttl is None else now + ttl
+        released = 0
+
+        with shard.lock:
+            old = shard.remove(key)
+            if old is not None:
+                released += old.size
+
+            too_large = shard.max_bytes is not None and size > shard.max_bytes
+            if budget is not None and budget.max_bytes is not None:
+                too_large = too_large or size > budget.max_bytes
+            if too_large:
+                shard.rejected += 1
+                cached = False
+            else:
+                if shard.heap and shard.heap[0][0] <= now:
+                    released += shard.purge(now)
+                # 先为新条目腾出空间，LFU下新条目不会被立即淘汰
+                while shard.entries and (
+                    shard.over_limit(size)
+                    or (budget is not None and budget.exceeded_by(size - released))
+                ):
+                    released += shard.pop_victim().size
+
+                entry = _Entry(
+                    value,
+                    size,
+                    ttl,
+                    stale_ttl,
+                    expires_at,
+                    expires_at + stale_ttl,
+                    next(self._seq),
+                )
+                if old is not None and self.policy == "lfu":
+                    entry.freq = old.freq
+                shard.insert(key, entry)
+                shard.sets += 1
+                cached = True
+
+        if budget is not None:
+            budget.add((size if cached else 0) - released)
+        if not cached:
+            logger.debug(f"[{self.name}] 条目 {key} 大小 {size} 字节超出限额，不缓存")
+        return cached
+
+    def delete(self, key: Hashable) -> bool:
+        """删除缓存数据
+
+        Returns:
+            键是否存在
+        """
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.remove(key)
+        if entry is None:
+            return False
+        if self._budget is not None:
+            self._budget.add(-entry.size)
+        return True
+
+    def clear(self) -> int:
+        """清空所有缓存
+
+        Returns:
+            清除的条目数
+        """
+        count = 0
+        released = 0
+        for shard in self._shards:
+            with shard.lock:
+                count += len(shard.entries)
+                released += shard.bytes
+                shard.entries.clear()
+                shard.freq_buckets.clear()
+                shard.heap.clear()
+                shard.windowed.clear()
+                shard.min_freq = 0
+                shard.bytes = 0
+        if self._budget is not None:
+            self._budget.add(-released)
+        return count
+
+    def purge_expired(self) -> int:
+        """删除所有超出陈旧窗口的条目
+
+        Returns:
+            删除的条目数
+        """
+        now = time.monotonic()
+        count = 0
+        released = 0
+        for shard in self._shards:
+            with shard.lock:
+                before = shard.expirations
+                released += shard.purge(now)
+                count += shard.expirations - before
+        if self._budget is not None:
+            self._budget.add(-released)
+        return count
+
+    def __len__(self) -> int:
+        return sum(len(shard.entries) for shard in self._shards)
+
+    def __del__(self):
+        # 缓存被回收时归还占用的内存预算
+        if self._budget is not None:
+            self._budget.add(-sum(shard.bytes for shard in self._shards))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息"""
+        now = time.monotonic()
+        totals = dict.fromkeys(
+            (
+                "entries",
+                "stale_entries",
+                "memory_bytes",
+                "hits",
+                "misses",
+                "stale_hits",
+                "sets",
+                "evictions",
+                "expirations",
+                "rejected",
+            ),
+            0,
+        )
+        for shard in self._shards:
+            with shard.lock:
+                totals["entries"] += len(shard.entries)
+                totals["stale_entries"] += sum(
+                    1 for key in shard.windowed if shard.entries[key].expires_at <= now
+                )
+                totals["memory_bytes"] += shard.bytes
+                totals["hits"] += shard.hits
+                totals["misses"] += shard.misses
+                totals["stale_hits"] += shard.stale_hits
+                totals["sets"] += shard.sets
+                totals["evictions"] += shard.evictions
+                totals["expirations"] += shard.expirations
+                totals["rejected"] += shard.rejected
+
+        lookups = totals["hits"] + totals["misses"] + totals["stale_hits"]
+        stats = {
+            "name": self.name,
+            "policy": self.policy,
+            "shards": len(self._shards),
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            **totals,
+            "hit_rate": totals["hits"] / lookups if lookups else 0.0,
+        }
+        if self._budget is not None:
+            stats["budget_used_bytes"] = self._budget.used_bytes
+            stats["budget_max_bytes"] = self._budget.max_bytes
+        return stats
+
+
+# 全局内存预算
+_memory_budget: Optional[MemoryBudget] = None
+
+
+def get_memory_budget() -> MemoryBudget:
+    """获取所有缓存共享的进程级内存预算"""
+    global _memory_budget
+    if _memory_budget is None:
+        _memory_budget = MemoryBudget()
+    return _memory_budget
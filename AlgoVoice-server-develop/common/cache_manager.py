@@ -1,25 +1,57 @@
 """
 服务器端内存缓存管理器
 提供分层缓存机制：内存缓存 + 数据库缓存
+
+MemoryCache基于common.bounded_cache.BoundedCache，按字节数限额并LRU淘汰。
+
+AsyncCache在内存缓存之上提供异步读取：同一个键的并发未命中合并为一次上游请求，
+数据过期后在stale_ttl内继续返回旧值并在后台刷新。
 """
 
+import asyncio
 import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional, Callable
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
 from threading import Lock
 import json
 
+from common.bounded_cache import BoundedCache, get_memory_budget
 from common.logging_system import setup_logger
 
 logger = setup_logger("cache_manager")
 
+# 内存缓存默认上限（字节）与分片数
+MEMORY_CACHE_MAX_BYTES = 256 * 1024 * 1024
+MEMORY_CACHE_SHARDS = 16
 
-class MemoryCache:
-    """内存缓存管理器（线程安全）"""
 
-    def __init__(self):
-        self._cache: Dict[str, Dict[str, Any]] = {}
-        self._lock = Lock()
+class MemoryCache:
+    """内存缓存管理器（线程安全）
+    
+    基于BoundedCache：键按哈希分片加锁，按字节数限额LRU淘汰，
+    占用计入进程级内存预算，过期条目通过最小堆清理。
+    """
+
+    def __init__(
+        self,
+        max_bytes: Optional[int] = MEMORY_CACHE_MAX_BYTES,
+        max_entries: Optional[int] = None,
+        n_shards: int = MEMORY_CACHE_SHARDS,
+    ):
+        """初始化内存缓存
+        
+        Args:
+            max_bytes: 最大字节数，None表示只受进程级内存预算约束
+            max_entries: 最大条目数，None表示不限制
+            n_shards: 分片数
+        """
+        self._store = BoundedCache(
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            n_shards=n_shards,
+            budget=get_memory_budget(),
+            name="memory_cache",
+        )
         logger.info("✅ 内存缓存管理器已初始化")
 
     def get(self, key: str) -> Optional[Any]:
@@ -31,36 +63,35 @@ class MemoryCache:
         Returns:
             缓存的数据，如果不存在或已过期则返回 None
         """
-        with self._lock:
-            if key not in self._cache:
-                return None
+        data = self._store.get(key)
+        if data is not None:
+            logger.debug(f"✅ 命中缓存: {key}")
+        return data
 
-            cache_entry = self._cache[key]
+    def get_with_freshness(self, key: str) -> Optional[Tuple[Any, bool]]:
+        """获取缓存数据，过期但仍在陈旧窗口内的数据也返回
+        
+        Args:
+            key: 缓存键
             
-            # 检查是否过期
-            if cache_entry["expire_time"] < time.time():
-                logger.debug(f"缓存 {key} 已过期，删除")
-                del self._cache[key]
-                return None
-
-            logger.debug(f"✅ 命中缓存: {key}")
-            return cache_entry["data"]
+        Returns:
+            (数据, 是否未过期)，不存在或超出陈旧窗口则返回 None
+        """
+        return self._store.get_with_freshness(key)
 
-    def set(self, key: str, data: Any, ttl: int = 120):
+    def set(self, key: str, data: Any, ttl: int = 120, stale_ttl: int = 0):
         """设置缓存数据
         
         Args:
             key: 缓存键
             data: 要缓存的数据
             ttl: 过期时间（秒），默认120秒（2分钟）
+            stale_ttl: 过期后仍可作为陈旧数据返回的时间（秒），默认0
         """
-        with self._lock:
-            self._cache[key] = {
-                "data": data,
-                "expire_time": time.time() + ttl,
-                "created_at": time.time()
-            }
+        if self._store.set(key, data, ttl=ttl, stale_ttl=stale_ttl):
             logger.debug(f"💾 设置缓存: {key}, TTL={ttl}秒")
+        else:
+            logger.warning(f"⚠️ 缓存 {key} 超出内存限额，未缓存")
 
     def delete(self, key: str):
         """删除缓存数据
@@ -68,48 +99,224 @@ class MemoryCache:
         Args:
             key: 缓存键
         """
-        with self._lock:
-            if key in self._cache:
-                del self._cache[key]
-                logger.debug(f"🗑️ 删除缓存: {key}")
+        if self._store.delete(key):
+            logger.debug(f"🗑️ 删除缓存: {key}")
 
     def clear(self):
         """清空所有缓存"""
-        with self._lock:
-            count = len(self._cache)
-            self._cache.clear()
-            logger.info(f"🗑️ 清空所有缓存，共 {count} 条")
+        count = self._store.clear()
+        logger.info(f"🗑️ 清空所有缓存，共 {count} 条")
 
     def cleanup_expired(self):
         """清理过期的缓存条目"""
-        with self._lock:
-            current_time = time.time()
-            expired_keys = [
-                key for key, entry in self._cache.items()
-                if entry["expire_time"] < current_time
-            ]
+        count = self._store.purge_expired()
+        if count:
+            logger.info(f"🧹 清理了 {count} 条过期缓存")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息（汇总各分片计数器，不扫描条目）"""
+        stats = self._store.get_stats()
+        return {
+            "total_entries": stats["entries"],
+            "active_entries": stats["entries"] - stats["stale_entries"],
+            "expired_entries": stats["stale_entries"],
+            **stats,
+        }
+
+
+# 市场数据缓存键，以及过期后仍可返回旧值的时间（秒）
+MARKET_INDICES_KEY = "market:indices"
+HOT_STOCKS_KEY = "market:hot_stocks"
+MARKET_STALE_TTL = 600
+
+
+class AsyncCache:
+    """异步缓存层（single-flight + stale-while-revalidate）
+    
+    - 未过期：直接返回缓存
+    - 已过期但在陈旧窗口内：立即返回旧值，同时在后台刷新（同一个键只刷新一次）
+    - 未命中：调用fetch获取，同一个键的并发请求共享这一次获取的结果
+    
+    每个键记录命中/陈旧/未命中次数和延迟，供get_stats()查询。
+    """
+
+    def __init__(self, memory_cache: MemoryCache, ttl: int = 120, stale_ttl: int = 600):
+        """初始化异步缓存层
+        
+        Args:
+            memory_cache: 底层内存缓存
+            ttl: 默认过期时间（秒）
+            stale_ttl: 默认陈旧窗口（秒）
+        """
+        self.memory_cache = memory_cache
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        # (事件循环ID, 键) -> 正在进行的获取任务
+        self._inflight: Dict[Tuple[int, str], asyncio.Task] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = Lock()
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+        stale_ttl: Optional[int] = None,
+        should_cache: Optional[Callable[[Any], bool]] = None,
+    ) -> Tuple[Any, str]:
+        """读取缓存，未命中或过期时通过fetch获取
+        
+        Args:
+            key: 缓存键
+            fetch: 无参异步函数，返回要缓存的数据
+            ttl: 过期时间（秒），默认使用实例设置
+            stale_ttl: 陈旧窗口（秒），默认使用实例设置
+            should_cache: 判断结果是否写入缓存，默认只缓存非None结果
             
-            for key in expired_keys:
-                del self._cache[key]
+        Returns:
+            (数据, 状态)，状态为 "hit" / "stale" / "miss"
             
-            if expired_keys:
-                logger.info(f"🧹 清理了 {len(expired_keys)} 条过期缓存")
+        Raises:
+            fetch抛出的异常（仅未命中时；后台刷新失败只记录日志）
+        """
+        start = time.perf_counter()
+        entry = self.memory_cache.get_with_freshness(key)
+
+        if entry is not None:
+            data, fresh = entry
+            if fresh:
+                self._record(key, "hit", start)
+                return data, "hit"
+
+            # 返回旧值，后台刷新
+            self._start_fetch(key, fetch, ttl, stale_ttl, should_cache)
+            self._record(key, "stale", start)
+            return data, "stale"
+
+        task, created = self._start_fetch(key, fetch, ttl, stale_ttl, should_cache)
+        if not created:
+            self._record(key, "coalesced")
+        try:
+            # shield：某个请求被取消时不影响其他等待同一次获取的请求
+            data = await asyncio.shield(task)
+        finally:
+            self._record(key, "miss", start)
+        return data, "miss"
+
+    def invalidate(self, key: str):
+        """删除缓存，下次读取重新获取
+        
+        Args:
+            key: 缓存键
+        """
+        self.memory_cache.delete(key)
 
-    def get_stats(self) -> Dict[str, Any]:
-        """获取缓存统计信息"""
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """获取各键的命中与延迟统计
+        
+        Returns:
+            键 -> 统计信息（次数、命中率、各类平均/最大延迟毫秒）
+        """
         with self._lock:
-            current_time = time.time()
-            total = len(self._cache)
-            expired = sum(
-                1 for entry in self._cache.values()
-                if entry["expire_time"] < current_time
+            stats = {}
+            for key, counters in self._stats.items():
+                summary = {
+                    name: int(counters[name])
+                    for name in (
+                        "hit", "stale", "miss", "coalesced", "refresh", "refresh_error"
+                    )
+                }
+                requests = summary["hit"] + summary["stale"] + summary["miss"]
+                summary["hit_rate"] = (
+                    (summary["hit"] + summary["stale"]) / requests if requests else 0.0
+                )
+                for name in ("hit", "stale", "miss", "refresh"):
+                    count = counters[name]
+                    summary[f"{name}_avg_ms"] = (
+                        counters[f"{name}_ms"] / count if count else 0.0
+                    )
+                    summary[f"{name}_max_ms"] = counters[f"{name}_max_ms"]
+                stats[key] = summary
+            return stats
+
+    def _start_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: Optional[int],
+        stale_ttl: Optional[int],
+        should_cache: Optional[Callable[[Any], bool]],
+    ) -> Tuple[asyncio.Task, bool]:
+        """启动获取任务，同一个键已有任务在进行时复用
+        
+        Returns:
+            (任务, 是否新建)
+        """
+        inflight_key = (id(asyncio.get_running_loop()), key)
+        task = self._inflight.get(inflight_key)
+        if task is not None:
+            return task, False
+
+        task = asyncio.ensure_future(
+            self._fetch_and_store(key, fetch, ttl, stale_ttl, should_cache)
+        )
+        self._inflight[inflight_key] = task
+
+        def on_done(done: asyncio.Task):
+            self._inflight.pop(inflight_key, None)
+            # 后台刷新可能没有等待者，在这里取出异常（已在_fetch_and_store中记录）
+            if not done.cancelled():
+                done.exception()
+
+        task.add_done_callback(on_done)
+        return task, True
+
+    async def _fetch_and_store(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: Optional[int],
+        stale_ttl: Optional[int],
+        should_cache: Optional[Callable[[Any], bool]],
+    ) -> Any:
+        """调用fetch并写入缓存"""
+        start = time.perf_counter()
+        try:
+            data = await fetch()
+        except Exception as e:
+            self._record(key, "refresh_error")
+            logger.warning(f"缓存 {key} 获取失败: {e}")
+            raise
+        finally:
+            self._record(key, "refresh", start)
+
+        cacheable = should_cache(data) if should_cache else data is not None
+        if cacheable:
+            self.memory_cache.set(
+                key,
+                data,
+                self.ttl if ttl is None else ttl,
+                self.stale_ttl if stale_ttl is None else stale_ttl,
             )
-            
-            return {
-                "total_entries": total,
-                "active_entries": total - expired,
-                "expired_entries": expired
-            }
+        return data
+
+    def _record(self, key: str, name: str, start: Optional[float] = None):
+        """累计计数和延迟"""
+        with self._lock:
+            counters = self._stats.get(key)
+            if counters is None:
+                counters = self._stats[key] = {
+                    field: 0.0
+                    for name_ in ("hit", "stale", "miss", "refresh")
+                    for field in (name_, f"{name_}_ms", f"{name_}_max_ms")
+                }
+                counters["coalesced"] = 0.0
+                counters["refresh_error"] = 0.0
+            counters[name] += 1
+            if start is not None:
+                elapsed_ms = (time.perf_counter() - start) * 1e3
+                counters[f"{name}_ms"] += elapsed_ms
+                counters[f"{name}_max_ms"] = max(counters[f"{name}_max_ms"], elapsed_ms)
 
 
 class MarketDataCache:
@@ -123,29 +330,35 @@ class MarketDataCache:
 
     def get_market_indices(self) -> Optional[Dict[str, Any]]:
         """获取市场指数缓存"""
-        return self.memory_cache.get("market:indices")
+        return self.memory_cache.get(MARKET_INDICES_KEY)
 
-    def set_market_indices(self, data: Dict[str, Any], ttl: int = 120):
+    def set_market_indices(
+        self, data: Dict[str, Any], ttl: int = 120, stale_ttl: int = MARKET_STALE_TTL
+    ):
         """设置市场指数缓存
         
         Args:
             data: 市场指数数据
             ttl: 缓存时间（秒），默认120秒
+            stale_ttl: 过期后作为陈旧数据返回的时间（秒）
         """
-        self.memory_cache.set("market:indices", data, ttl)
+        self.memory_cache.set(MARKET_INDICES_KEY, data, ttl, stale_ttl)
 
     def get_hot_stocks(self) -> Optional[Dict[str, Any]]:
         """获取热门股票缓存"""
-        return self.memory_cache.get("market:hot_stocks")
+        return self.memory_cache.get(HOT_STOCKS_KEY)
 
-    def set_hot_stocks(self, data: Dict[str, Any], ttl: int = 120):
+    def set_hot_stocks(
+        self, data: Dict[str, Any], ttl: int = 120, stale_ttl: int = MARKET_STALE_TTL
+    ):
         """设置热门股票缓存
         
         Args:
             data: 热门股票数据
             ttl: 缓存时间（秒），默认120秒
+            stale_ttl: 过期后作为陈旧数据返回的时间（秒）
         """
-        self.memory_cache.set("market:hot_stocks", data, ttl)
+        self.memory_cache.set(HOT_STOCKS_KEY, data, ttl, stale_ttl)
 
     def get_market_overview(self) -> Optional[Dict[str, Any]]:
         """获取市场概览缓存"""
@@ -201,6 +414,7 @@ class MarketDataCache:
 # 全局单例
 _memory_cache: Optional[MemoryCache] = None
 _market_data_cache: Optional[MarketDataCache] = None
+_async_cache: Optional[AsyncCache] = None
 
 
 def get_memory_cache() -> MemoryCache:
@@ -219,6 +433,14 @@ def get_market_data_cache() -> MarketDataCache:
     return _market_data_cache
 
 
+def get_async_cache() -> AsyncCache:
+    """获取全局异步缓存实例（与市场数据缓存共用内存缓存）"""
+    global _async_cache
+    if _async_cache is None:
+        _async_cache = AsyncCache(get_memory_cache(), stale_ttl=MARKET_STALE_TTL)
+    return _async_cache
+
+
 def cleanup_cache_daemon():
     """缓存清理守护进程（定期清理过期缓存）"""
     import threading
@@ -3,10 +3,13 @@
 """
 
 import asyncio
+import itertools
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Callable
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 
 from .exceptions import QuantSystemError
@@ -60,55 +63,166 @@ class InterModuleMessage:
         data['priority'] = MessagePriority(data['priority'])
         return cls(**data)
 
+class BackpressureError(QuantSystemError):
+    """消息队列已满，消息未能在超时内入队"""
+    pass
+
+@dataclass
+class _Subscription:
+    """订阅者：独立的有界优先级队列和工作协程"""
+    message_type: MessageType
+    callback: Callable
+    name: str
+    queue: asyncio.PriorityQueue
+    batch_size: int = 1
+    batch_timeout: float = 0.05
+    concurrency: int = 1
+    offload: bool = True
+    workers: List[asyncio.Task] = field(default_factory=list)
+    delivered: int = 0
+    rejected: int = 0
+    failed: int = 0
+
 class MessageQueue:
-    """消息队列类"""
+    """消息队列类
     
-    def __init__(self, max_size: int = 10000):
+    - 消息按优先级出队（CRITICAL > HIGH > NORMAL > LOW），同优先级先进先出
+    - 每个订阅者有独立的有界队列和工作协程，慢订阅者不阻塞其他订阅者；
+      同步回调默认在线程池中执行，不会阻塞事件循环；需要直接操作事件循环上对象的
+      轻量回调订阅时指定offload=False在事件循环上执行，耗时超过
+      slow_callback_threshold时告警
+    - 订阅时指定batch_size>1可批量接收消息（回调参数为消息列表），适合高频数据消息
+    - 主队列满时put()等待空位，超时抛出BackpressureError；订阅者队列满时该订阅者
+      拒收消息并计数、告警，生产者可通过is_congested()提前降速
+    - get_stats()返回每种消息类型的吞吐量、延迟和拒收/失败次数
+    """
+    
+    def __init__(
+        self,
+        max_size: int = 10000,
+        subscriber_queue_size: int = 1000,
+        max_workers: int = 4,
+        high_watermark: float = 0.8,
+        on_backpressure: Optional[Callable[[str, int, int], None]] = None,
+        slow_callback_threshold: float = 0.1
+    ):
         """初始化消息队列
         
         Args:
             max_size: 最大队列大小
+            subscriber_queue_size: 每个订阅者队列的默认大小
+            max_workers: 执行同步回调的线程数
+            high_watermark: 队列占用达到该比例时视为拥塞
+            on_backpressure: 队列满时的通知回调 (队列名称, 当前长度, 容量)
+            slow_callback_threshold: 事件循环上的同步回调超过该耗时（秒）时告警
         """
         self.max_size = max_size
-        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self.subscriber_queue_size = subscriber_queue_size
+        self.max_workers = max_workers
+        self.high_watermark = high_watermark
+        self.on_backpressure = on_backpressure
+        self.slow_callback_threshold = slow_callback_threshold
+        self.queue: asyncio.PriorityQueue = asyncio.PriorityQueue(maxsize=max_size)
         self.subscribers: Dict[str, List[Callable]] = {}
         self.running = False
+        self._subscriptions: Dict[str, List[_Subscription]] = {}
+        self._seq = itertools.count()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._started_at = time.perf_counter()
         
-    async def put(self, message: InterModuleMessage) -> bool:
+    def _topic_stats(self, topic: str) -> Dict[str, float]:
+        """获取消息类型的统计计数器"""
+        stats = self._stats.get(topic)
+        if stats is None:
+            stats = self._stats[topic] = dict.fromkeys(
+                ("published", "delivered", "rejected", "failed",
+                 "latency_total", "latency_max"),
+                0
+            )
+        return stats
+    
+    async def put(
+        self,
+        message: InterModuleMessage,
+        timeout: Optional[float] = None
+    ) -> bool:
         """添加消息到队列
         
         Args:
             message: 消息对象
+            timeout: 队列满时等待空位的时间（秒），默认使用消息的timeout_ms
             
         Returns:
             是否添加成功
+            
+        Raises:
+            BackpressureError: 队列已满且超时内没有空位
         """
+        item = (-message.priority.value, next(self._seq), time.perf_counter(), message)
         try:
-            await self.queue.put(message)
-            logger.debug(f"Message {message.message_id} added to queue")
-            return True
+            self.queue.put_nowait(item)
         except asyncio.QueueFull:
-            logger.error(f"Queue is full, message {message.message_id} dropped")
-            return False
+            self._signal_backpressure("main", self.queue.qsize(), self.max_size)
+            wait = message.timeout_ms / 1000 if timeout is None else timeout
+            try:
+                await asyncio.wait_for(self.queue.put(item), wait)
+            except asyncio.TimeoutError:
+                raise BackpressureError(
+                    f"Queue is full ({self.max_size}), "
+                    f"message {message.message_id} rejected"
+                ) from None
+        self._topic_stats(message.message_type.value)["published"] += 1
+        logger.debug(f"Message {message.message_id} added to queue")
+        return True
     
     async def get(self) -> InterModuleMessage:
-        """从队列获取消息
+        """从队列获取优先级最高的消息
         
         Returns:
             消息对象
         """
-        return await self.queue.get()
+        item = await self.queue.get()
+        self.queue.task_done()
+        return item[-1]
     
-    def subscribe(self, message_type: MessageType, callback: Callable):
+    def subscribe(
+        self,
+        message_type: MessageType,
+        callback: Callable,
+        batch_size: int = 1,
+        batch_timeout: float = 0.05,
+        concurrency: int = 1,
+        queue_size: Optional[int] = None,
+        offload: bool = True
+    ):
         """订阅特定类型的消息
         
         Args:
             message_type: 消息类型
-            callback: 回调函数
+            callback: 回调函数，batch_size>1时参数为消息列表
+            batch_size: 每次回调最多接收的消息数
+            batch_timeout: 凑批时等待后续消息的最长时间（秒）
+            concurrency: 该订阅者的并发工作协程数，1表示按顺序处理
+            queue_size: 该订阅者的队列大小，默认使用subscriber_queue_size
+            offload: 同步回调是否在线程池中执行，需要在事件循环上执行的回调设为False
         """
-        if message_type.value not in self.subscribers:
-            self.subscribers[message_type.value] = []
-        self.subscribers[message_type.value].append(callback)
+        queue_size = queue_size or self.subscriber_queue_size
+        subscription = _Subscription(
+            message_type=message_type,
+            callback=callback,
+            name=getattr(callback, "__qualname__", repr(callback)),
+            queue=asyncio.PriorityQueue(maxsize=queue_size),
+            batch_size=max(1, batch_size),
+            batch_timeout=batch_timeout,
+            concurrency=max(1, concurrency),
+            offload=offload
+        )
+        self.subscribers.setdefault(message_type.value, []).append(callback)
+        self._subscriptions.setdefault(message_type.value, []).append(subscription)
+        if self.running:
+            self._start_workers(subscription)
         logger.info(f"Subscribed to {message_type.value} messages")
     
     def unsubscribe(self, message_type: MessageType, callback: Callable):
@@ -121,44 +235,238 @@ class MessageQueue:
         if message_type.value in self.subscribers:
             try:
                 self.subscribers[message_type.value].remove(callback)
-                logger.info(f"Unsubscribed from {message_type.value} messages")
             except ValueError:
                 logger.warning(f"Callback not found in subscribers for {message_type.value}")
+                return
+            subscriptions = self._subscriptions[message_type.value]
+            for subscription in subscriptions:
+                if subscription.callback == callback:
+                    subscriptions.remove(subscription)
+                    self._stop_workers(subscription)
+                    break
+            logger.info(f"Unsubscribed from {message_type.value} messages")
+    
+    def is_congested(self, message_type: Optional[MessageType] = None) -> bool:
+        """队列是否拥塞，生产者可据此降低发送速度
+        
+        Args:
+            message_type: 同时检查该类型订阅者的队列，None表示只检查主队列
+            
+        Returns:
+            主队列或订阅者队列占用是否达到high_watermark
+        """
+        if self.queue.qsize() >= self.max_size * self.high_watermark:
+            return True
+        if message_type is None:
+            return False
+        return any(
+            s.queue.qsize() >= s.queue.maxsize * self.high_watermark
+            for s in self._subscriptions.get(message_type.value, [])
+        )
     
     async def start_processing(self):
         """开始处理消息"""
         self.running = True
+        self._dispatcher = asyncio.current_task()
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                self._start_workers(subscription)
         logger.info("Message queue processing started")
         
         while self.running:
             try:
-                message = await self.get()
-                await self._process_message(message)
+                item = await self.queue.get()
+            except asyncio.CancelledError:
+                # stop_processing()取消等待中的分发循环
+                if self.running:
+                    raise
+                break
+            self.queue.task_done()
+            try:
+                await self._process_message(item)
             except Exception as e:
                 logger.error(f"Error processing message: {e}")
     
     async def stop_processing(self):
-        """停止处理消息"""
+        """停止处理消息
+        
+        未分发和订阅者尚未处理的消息保留在队列中，重新开始处理后继续分发；
+        正在执行的回调会被取消。
+        """
         self.running = False
+        if self._dispatcher is not None and not self._dispatcher.done():
+            self._dispatcher.cancel()
+        self._dispatcher = None
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                self._stop_workers(subscription)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
         logger.info("Message queue processing stopped")
     
-    async def _process_message(self, message: InterModuleMessage):
-        """处理消息
+    def get_stats(self) -> Dict[str, Any]:
+        """获取队列统计信息
+        
+        Returns:
+            主队列长度、是否拥塞，以及每种消息类型和每个订阅者的计数；
+            消息类型的delivered/rejected/failed按订阅者投递次数累计
+        """
+        elapsed = max(time.perf_counter() - self._started_at, 1e-9)
+        topics = {}
+        for topic, stats in self._stats.items():
+            delivered = stats["delivered"]
+            avg_latency = stats["latency_total"] / delivered if delivered else 0.0
+            topics[topic] = {
+                "published": stats["published"],
+                "delivered": delivered,
+                "rejected": stats["rejected"],
+                "failed": stats["failed"],
+                "throughput_per_sec": delivered / elapsed,
+                "avg_latency_ms": avg_latency * 1e3,
+                "max_latency_ms": stats["latency_max"] * 1e3,
+            }
+        subscribers = {
+            f"{topic}:{s.name}": {
+                "queued": s.queue.qsize(),
+                "delivered": s.delivered,
+                "rejected": s.rejected,
+                "failed": s.failed,
+            }
+            for topic, subscriptions in self._subscriptions.items()
+            for s in subscriptions
+        }
+        return {
+            "queued": self.queue.qsize(),
+            "congested": self.is_congested(),
+            "topics": topics,
+            "subscribers": subscribers,
+        }
+    
+    async def _process_message(self, item: tuple):
+        """把消息分发到各订阅者的队列
+        
+        订阅者队列已满时先让出一次事件循环，让其工作协程消费后重试，
+        仍然满则该订阅者拒收这条消息。
         
         Args:
-            message: 消息对象
+            item: (优先级, 序号, 入队时间, 消息)
         """
-        message_type = message.message_type.value
-        
-        if message_type in self.subscribers:
-            for callback in self.subscribers[message_type]:
-                try:
-                    if asyncio.iscoroutinefunction(callback):
-                        await callback(message)
-                    else:
-                        callback(message)
-                except Exception as e:
-                    logger.error(f"Error in message callback: {e}")
+        message = item[-1]
+        topic = message.message_type.value
+        full = []
+        for subscription in self._subscriptions.get(topic, []):
+            try:
+                subscription.queue.put_nowait(item)
+            except asyncio.QueueFull:
+                full.append(subscription)
+        if not full:
+            return
+        
+        await asyncio.sleep(0)
+        for subscription in full:
+            try:
+                subscription.queue.put_nowait(item)
+            except asyncio.QueueFull:
+                subscription.rejected += 1
+                self._topic_stats(topic)["rejected"] += 1
+                self._signal_backpressure(
+                    f"{topic}:{subscription.name}",
+                    subscription.queue.qsize(),
+                    subscription.queue.maxsize
+                )
+    
+    def _signal_backpressure(self, name: str, size: int, capacity: int):
+        """队列已满时告警并通知on_backpressure"""
+        logger.warning(f"Message queue {name} is full ({size}/{capacity})")
+        if self.on_backpressure is not None:
+            try:
+                self.on_backpressure(name, size, capacity)
+            except Exception as e:
+                logger.error(f"Error in backpressure callback: {e}")
+    
+    def _start_workers(self, subscription: _Subscription):
+        """启动订阅者的工作协程"""
+        subscription.workers = [
+            w for w in subscription.workers if not w.done()
+        ]
+        while len(subscription.workers) < subscription.concurrency:
+            subscription.workers.append(
+                asyncio.create_task(self._run_subscriber(subscription))
+            )
+    
+    def _stop_workers(self, subscription: _Subscription):
+        """停止订阅者的工作协程"""
+        for worker in subscription.workers:
+            worker.cancel()
+        subscription.workers = []
+    
+    async def _run_subscriber(self, subscription: _Subscription):
+        """订阅者工作协程：按优先级取出消息（可凑批）并调用回调"""
+        loop = asyncio.get_running_loop()
+        queue = subscription.queue
+        stats = self._topic_stats(subscription.message_type.value)
+        while True:
+            batch = [await queue.get()]
+            try:
+                deadline = loop.time() + subscription.batch_timeout
+                while len(batch) < subscription.batch_size:
+                    if not queue.empty():
+                        batch.append(queue.get_nowait())
+                        continue
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+                
+                messages = [item[-1] for item in batch]
+                await self._invoke(
+                    subscription,
+                    messages if subscription.batch_size > 1 else messages[0]
+                )
+                subscription.delivered += len(batch)
+                stats["delivered"] += len(batch)
+                now = time.perf_counter()
+                for item in batch:
+                    latency = now - item[2]
+                    stats["latency_total"] += latency
+                    stats["latency_max"] = max(stats["latency_max"], latency)
+            except Exception as e:
+                subscription.failed += len(batch)
+                stats["failed"] += len(batch)
+                logger.error(f"Error in message callback: {e}")
+            finally:
+                for _ in batch:
+                    queue.task_done()
+    
+    async def _invoke(self, subscription: _Subscription, argument: Any):
+        """调用订阅者回调，同步回调默认在线程池中执行"""
+        callback = subscription.callback
+        if asyncio.iscoroutinefunction(callback):
+            await callback(argument)
+            return
+        if not subscription.offload:
+            started = time.perf_counter()
+            result = callback(argument)
+            elapsed = time.perf_counter() - started
+            if elapsed > self.slow_callback_threshold:
+                logger.warning(
+                    f"Callback {subscription.name} blocked the event loop for "
+                    f"{elapsed * 1000:.1f}ms, consider offload=True"
+                )
+        else:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="message_queue"
+                )
+            result = await asyncio.get_running_loop().run_in_executor(
+                self._executor, callback, argument
+            )
+        if asyncio.iscoroutine(result):
+            await result
 
 class ModuleCommunicator:
     """模块通信器类"""
@@ -201,6 +509,9 @@ class ModuleCommunicator:
             
         Returns:
             响应消息（如果需要确认）
+            
+        Raises:
+            BackpressureError: 消息队列已满且超时内没有空位
         """
         message_id = self._generate_message_id()
         
@@ -216,10 +527,8 @@ class ModuleCommunicator:
             timeout_ms=timeout_ms
         )
         
-        # 添加到队列
-        success = await self.message_queue.put(message)
-        if not success:
-            raise QuantSystemError(f"Failed to send message {message_id}")
+        # 添加到队列，队列满且超时内没有空位时put()抛出BackpressureError
+        await self.message_queue.put(message)
         
         logger.info(f"Message {message_id} sent to {target_module}")
         
@@ -345,25 +654,38 @@ class ModuleCommunicator:
             self.pending_responses.pop(message_id, None)
     
     def handle_response(self, message: InterModuleMessage):
-        """处理响应消息
+        """处理响应消息，可在任意线程调用（如线程池中的订阅回调）
         
         Args:
             message: 响应消息
         """
-        correlation_id = message.correlation_id
-        if correlation_id and correlation_id in self.pending_responses:
-            future = self.pending_responses[correlation_id]
-            if not future.done():
-                future.set_result(message)
+        future = self.pending_responses.get(message.correlation_id)
+        if future is not None:
+            # Future只能在所属事件循环的线程上设置结果
+            future.get_loop().call_soon_threadsafe(
+                self._resolve_response, future, message
+            )
     
-    def subscribe_to_messages(self, message_type: MessageType, callback: Callable):
+    @staticmethod
+    def _resolve_response(future: asyncio.Future, message: InterModuleMessage):
+        """设置等待中的响应结果"""
+        if not future.done():
+            future.set_result(message)
+    
+    def subscribe_to_messages(
+        self,
+        message_type: MessageType,
+        callback: Callable,
+        **options
+    ):
         """订阅消息
         
         Args:
             message_type: 消息类型
             callback: 回调函数
+            **options: 传给MessageQueue.subscribe的批量/并发/队列大小参数
         """
-        self.message_queue.subscribe(message_type, callback)
+        self.message_queue.subscribe(message_type, callback, **options)
 
 # 全局消息队列实例
 _global_message_queue: Optional[MessageQueue] = None
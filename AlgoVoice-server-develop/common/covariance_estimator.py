@@ -0,0 +1,438 @@
+"""
+增量协方差/相关性估计器
+新收益率行到达时以O(n²)更新维护的加权矩，不再每次从完整历史O(T·n²)重新计算
+
+- 三种窗口：扩展窗口（全部历史）、滚动窗口（最近window行）、指数加权（EWMA）
+- 含NaN的行按整行缺失处理（等价于对窗口内数据dropna），但在滚动窗口中仍占一个位置、
+  在EWMA中仍使更早的观测衰减
+- 额外维护二阶、三阶、四阶交叉矩，可直接在维护的状态上计算Ledoit-Wolf收缩
+- snapshot()生成不可变快照，可在风险、优化、监控模块间共享；
+  get_covariance_estimator()按名称提供全局共享的估计器
+"""
+
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from common.logging_system import setup_logger
+
+logger = setup_logger("covariance_estimator")
+
+RowLike = Union[np.ndarray, pd.Series, Sequence[float]]
+
+
+@dataclass(frozen=True)
+class CovarianceSnapshot:
+    """协方差估计快照（只读）"""
+
+    columns: List[str]
+    mean: np.ndarray
+    covariance: np.ndarray
+    n_observations: int
+    effective_observations: float
+    shrinkage: float = 0.0  # Ledoit-Wolf收缩强度，0表示样本协方差
+    version: int = 0
+    timestamp: datetime = field(default_factory=datetime.now)
+
+    def correlation(self) -> np.ndarray:
+        """由协方差矩阵得到相关性矩阵"""
+        return covariance_to_correlation(self.covariance)
+
+    def to_frame(
+        self, correlation: bool = False, annualization: float = 1.0
+    ) -> pd.DataFrame:
+        """转换为DataFrame
+
+        Args:
+            correlation: 是否返回相关性矩阵
+            annualization: 协方差的年化系数（如TRADING_DAYS_PER_YEAR）
+
+        Returns:
+            以资产名为行列索引的矩阵
+        """
+        if correlation:
+            values = self.correlation()
+        else:
+            values = self.covariance * annualization
+        return pd.DataFrame(values, index=self.columns, columns=self.columns)
+
+
+def covariance_to_correlation(covariance: np.ndarray) -> np.ndarray:
+    """协方差矩阵转相关性矩阵，方差为0的资产相关性为NaN"""
+    stds = np.sqrt(np.diag(covariance))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        correlation = covariance / np.outer(stds, stds)
+    np.fill_diagonal(correlation, np.where(stds > 0, 1.0, np.nan))
+    return correlation
+
+
+class IncrementalCovarianceEstimator:
+    """增量维护的协方差估计器
+
+    以第一条有效观测为平移量维护加权和 W、Σw²、Σw·x、Σw·xxᵀ（以及收缩所需的
+    Σw·x²xᵀ、Σw·x²x²ᵀ），协方差由这些矩直接得到。滚动窗口每经过window次更新
+    用缓冲区重建一次矩，避免加减累积误差。
+    """
+
+    def __init__(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        window: Optional[int] = None,
+        decay: Optional[float] = None,
+        halflife: Optional[float] = None,
+        min_periods: int = 2,
+        track_shrinkage: bool = True,
+    ):
+        """初始化估计器
+
+        Args:
+            columns: 资产名称；None时取第一次更新传入的Series索引
+            window: 滚动窗口长度，None表示扩展窗口
+            decay: EWMA衰减因子λ（最新观测权重1，前一期λ，依此类推）
+            halflife: EWMA半衰期，与decay二选一
+            min_periods: 有效观测数少于该值时协方差为NaN
+            track_shrinkage: 是否维护Ledoit-Wolf收缩所需的高阶矩
+        """
+        if halflife is not None:
+            if decay is not None:
+                raise ValueError("Specify only one of decay and halflife")
+            decay = 0.5 ** (1.0 / halflife)
+        if decay is not None and window is not None:
+            raise ValueError("EWMA estimator does not take a window")
+        if decay is not None and not 0.0 < decay < 1.0:
+            raise ValueError(f"decay must be in (0, 1), got {decay}")
+        if window is not None and window < 1:
+            raise ValueError(f"window must be positive, got {window}")
+
+        self.window = window
+        self.decay = decay
+        self.min_periods = min_periods
+        self.track_shrinkage = track_shrinkage
+        self._lock = threading.RLock()
+        self.columns: Optional[List[str]] = None
+        self.reset(columns)
+
+    @property
+    def n_assets(self) -> int:
+        return len(self.columns) if self.columns is not None else 0
+
+    @property
+    def n_observations(self) -> int:
+        """窗口内有效观测数"""
+        return self._count
+
+    @property
+    def effective_observations(self) -> float:
+        """有效样本量 (Σw)²/Σw²，等权时即观测数"""
+        return self._weight**2 / self._weight_sq if self._weight_sq > 0 else 0.0
+
+    @property
+    def version(self) -> int:
+        """每次更新递增，用于判断快照是否过期"""
+        return self._version
+
+    def reset(self, columns: Optional[Sequence[str]] = None) -> None:
+        """清空状态
+
+        Args:
+            columns: 新的资产名称，None时保留原列（若有）
+        """
+        with self._lock:
+            if columns is not None:
+                self.columns = list(columns)
+            n = self.n_assets
+            self._shift: Optional[np.ndarray] = None
+            self._weight = 0.0
+            self._weight_sq = 0.0
+            self._count = 0
+            self._sum = np.zeros(n)
+            self._cross = np.zeros((n, n))
+            self._cross3 = np.zeros((n, n)) if self.track_shrinkage else None
+            self._cross4 = np.zeros((n, n)) if self.track_shrinkage else None
+            # 滚动窗口缓冲区：平移前的原始行，缺失行存None
+            self._buffer: deque = deque()
+            self._updates_since_rebuild = 0
+            self._version = 0
+            self._snapshot: Optional[CovarianceSnapshot] = None
+            self._snapshot_key: Optional[Tuple[int, bool]] = None
+
+    def update(self, row: RowLike) -> None:
+        """追加一行收益率
+
+        Args:
+            row: 各资产收益率；Series会按columns对齐
+        """
+        self.update_many(self._as_matrix(row, single=True))
+
+    def update_many(self, rows: Union[np.ndarray, pd.DataFrame]) -> None:
+        """按时间顺序追加多行收益率（批量矩阵运算）
+
+        Args:
+            rows: (T, n)收益率矩阵或DataFrame
+        """
+        with self._lock:
+            X = self._as_matrix(rows)
+            if len(X) == 0:
+                return
+            valid = ~np.isnan(X).any(axis=1)
+            if self._shift is None and valid.any():
+                self._shift = X[np.argmax(valid)].copy()
+
+            if self.decay is not None:
+                self._update_ewma(X, valid)
+            elif self.window is not None:
+                self._update_rolling(X, valid)
+            else:
+                self._accumulate(X[valid], np.ones(valid.sum()))
+            self._version += 1
+
+    def mean(self) -> np.ndarray:
+        """加权均值"""
+        with self._lock:
+            if self._weight <= 0:
+                return np.full(self.n_assets, np.nan)
+            return self._shift + self._sum / self._weight
+
+    def covariance(self, bias: bool = False) -> np.ndarray:
+        """样本协方差矩阵
+
+        Args:
+            bias: True返回加权矩估计（除以Σw）；False做无偏修正 (Σw)²/((Σw)²-Σw²)，
+                等权时即除以n-1，与pandas的cov()/ewm().cov()一致
+
+        Returns:
+            (n, n)协方差矩阵
+        """
+        with self._lock:
+            n = self.n_assets
+            if self._count < max(self.min_periods, 1):
+                return np.full((n, n), np.nan)
+            centered = self._sum / self._weight
+            covariance = self._cross / self._weight - np.outer(centered, centered)
+            if not bias:
+                denominator = self._weight**2 - self._weight_sq
+                if denominator <= 0:
+                    return np.full((n, n), np.nan)
+                covariance = covariance * self._weight**2 / denominator
+            return (covariance + covariance.T) / 2
+
+    def correlation(self) -> np.ndarray:
+        """相关性矩阵"""
+        return covariance_to_correlation(self.covariance(bias=True))
+
+    def ledoit_wolf(self) -> Tuple[np.ndarray, float]:
+        """在维护的矩上计算Ledoit-Wolf收缩协方差（收缩目标为μI）
+
+        与sklearn.covariance.LedoitWolf的公式一致；加权（EWMA）时样本量取有效样本量。
+
+        Returns:
+            (收缩后的协方差矩阵, 收缩强度)
+        """
+        with self._lock:
+            if not self.track_shrinkage:
+                raise ValueError("Estimator was created with track_shrinkage=False")
+            emp_cov = self.covariance(bias=True)
+            n = self.n_assets
+            if np.isnan(emp_cov).any() or n == 0:
+                return emp_cov, 0.0
+
+            mu = np.trace(emp_cov) / n
+            delta = np.sum((emp_cov - mu * np.eye(n)) ** 2) / n
+
+            # (1/Σw)·Σ_t w_t·Σ_ij y_ti²y_tj²，y为中心化数据，由各阶矩展开
+            m = self._sum / self._weight
+            W = self._weight
+            s1, s2 = self._sum, self._cross
+            q = np.diag(s2)
+            c3 = self._cross3  # c3[i, j] = Σ w·x_i²·x_j
+            fourth = (
+                self._cross4
+                - 2 * c3 * m[None, :]
+                - 2 * c3.T * m[:, None]
+                + np.outer(q, m**2)
+                + np.outer(m**2, q)
+                + 4 * np.outer(m, m) * s2
+                - 2 * np.outer(s1 * m, m**2)
+                - 2 * np.outer(m**2, s1 * m)
+                + W * np.outer(m**2, m**2)
+            )
+            beta = (fourth.sum() / W - np.sum(emp_cov**2)) / (
+                n * self.effective_observations
+            )
+            beta = min(max(beta, 0.0), delta)
+            shrinkage = 0.0 if beta == 0 else beta / delta
+            shrunk = (1 - shrinkage) * emp_cov + shrinkage * mu * np.eye(n)
+            return shrunk, float(shrinkage)
+
+    def snapshot(self, shrink: bool = False) -> CovarianceSnapshot:
+        """生成当前状态的只读快照，状态未变化时复用上一次的快照
+
+        Args:
+            shrink: 是否使用Ledoit-Wolf收缩后的协方差
+
+        Returns:
+            协方差快照
+        """
+        with self._lock:
+            if self._snapshot_key == (self._version, shrink):
+                return self._snapshot
+
+            if shrink:
+                covariance, shrinkage = self.ledoit_wolf()
+            else:
+                covariance, shrinkage = self.covariance(), 0.0
+            covariance.setflags(write=False)
+            mean = self.mean()
+            mean.setflags(write=False)
+            self._snapshot = CovarianceSnapshot(
+                columns=list(self.columns or []),
+                mean=mean,
+                covariance=covariance,
+                n_observations=self._count,
+                effective_observations=self.effective_observations,
+                shrinkage=shrinkage,
+                version=self._version,
+            )
+            self._snapshot_key = (self._version, shrink)
+            return self._snapshot
+
+    def _as_matrix(
+        self, rows: Union[RowLike, np.ndarray, pd.DataFrame], single: bool = False
+    ) -> np.ndarray:
+        """对齐列并转换为二维float数组"""
+        if isinstance(rows, (pd.Series, pd.DataFrame)):
+            labels = rows.index if isinstance(rows, pd.Series) else rows.columns
+            if self.columns is None:
+                self.reset(labels)
+            if isinstance(rows, pd.Series):
+                rows = rows.reindex(self.columns).to_numpy(dtype=float)
+            else:
+                rows = rows.reindex(columns=self.columns).to_numpy(dtype=float)
+        X = np.asarray(rows, dtype=float)
+        if single or X.ndim == 1:
+            X = X.reshape(1, -1)
+        if self.columns is None:
+            self.reset([str(i) for i in range(X.shape[1])])
+        if X.shape[1] != self.n_assets:
+            raise ValueError(f"Expected {self.n_assets} columns, got {X.shape[1]}")
+        return X
+
+    def _accumulate(self, X: np.ndarray, weights: np.ndarray) -> None:
+        """把（平移后的）观测按权重加入各阶矩，负权重表示移出"""
+        if len(X) == 0:
+            return
+        Y = X - self._shift
+        weighted = Y * weights[:, None]
+        self._weight += weights.sum()
+        self._weight_sq += np.sum(weights * np.abs(weights))
+        self._count += int(np.sign(weights).sum())
+        self._sum += weighted.sum(axis=0)
+        self._cross += weighted.T @ Y
+        if self.track_shrinkage:
+            weighted_squared = (Y * weighted).T
+            self._cross3 += weighted_squared @ Y
+            self._cross4 += weighted_squared @ Y**2
+
+    def _update_ewma(self, X: np.ndarray, valid: np.ndarray) -> None:
+        """EWMA：旧矩整体乘以λ^T，新行按λ^(T-1-t)加权"""
+        T = len(X)
+        factor = self.decay**T
+        self._weight *= factor
+        self._weight_sq *= factor**2
+        self._sum *= factor
+        self._cross *= factor
+        if self.track_shrinkage:
+            self._cross3 *= factor
+            self._cross4 *= factor
+        weights = self.decay ** np.arange(T - 1, -1, -1, dtype=float)
+        # 观测数不衰减，只用于min_periods判断
+        self._accumulate(X[valid], weights[valid])
+
+    def _update_rolling(self, X: np.ndarray, valid: np.ndarray) -> None:
+        """滚动窗口：加入新行，移出超出窗口的旧行"""
+        for row, ok in zip(X, valid):
+            self._buffer.append(row.copy() if ok else None)
+        evicted = []
+        while len(self._buffer) > self.window:
+            old = self._buffer.popleft()
+            if old is not None:
+                evicted.append(old)
+
+        self._updates_since_rebuild += len(X)
+        if self._updates_since_rebuild >= self.window:
+            self._rebuild()
+            return
+
+        # 新行与移出行合并为一次带符号权重的矩阵乘法
+        rows = np.vstack([X[valid]] + evicted) if evicted else X[valid]
+        weights = np.ones(len(rows))
+        weights[int(valid.sum()) :] = -1.0
+        self._accumulate(rows, weights)
+
+    def _rebuild(self) -> None:
+        """用缓冲区重新计算各阶矩，平移量取窗口均值"""
+        rows = [row for row in self._buffer if row is not None]
+        n = self.n_assets
+        self._weight = self._weight_sq = 0.0
+        self._count = 0
+        self._sum = np.zeros(n)
+        self._cross = np.zeros((n, n))
+        if self.track_shrinkage:
+            self._cross3 = np.zeros((n, n))
+            self._cross4 = np.zeros((n, n))
+        self._updates_since_rebuild = 0
+        if rows:
+            X = np.array(rows)
+            self._shift = X.mean(axis=0)
+            self._accumulate(X, np.ones(len(X)))
+
+
+# 全局共享的估计器
+_estimators: Dict[str, IncrementalCovarianceEstimator] = {}
+_estimators_lock = threading.Lock()
+
+
+def get_covariance_estimator(name: str, **kwargs) -> IncrementalCovarianceEstimator:
+    """按名称获取全局共享的估计器，不存在时用kwargs创建
+
+    Args:
+        name: 估计器名称，如 "market_monitor"
+        **kwargs: 首次创建时传给IncrementalCovarianceEstimator的参数
+
+    Returns:
+        共享的估计器
+    """
+    with _estimators_lock:
+        estimator = _estimators.get(name)
+        if estimator is None:
+            estimator = IncrementalCovarianceEstimator(**kwargs)
+            _estimators[name] = estimator
+            logger.info(f"Created shared covariance estimator '{name}'")
+        return estimator
+
+
+def estimate_covariance(
+    returns: pd.DataFrame,
+    decay: Optional[float] = None,
+    shrink: bool = False,
+) -> CovarianceSnapshot:
+    """对一段收益率历史一次性估计协方差（批量矩阵运算）
+
+    Args:
+        returns: 收益率DataFrame
+        decay: EWMA衰减因子，None表示等权
+        shrink: 是否做Ledoit-Wolf收缩
+
+    Returns:
+        协方差快照
+    """
+    estimator = IncrementalCovarianceEstimator(
+        columns=list(returns.columns), decay=decay, track_shrinkage=shrink
+    )
+    estimator.update_many(returns)
+    return estimator.snapshot(shrink=shrink)
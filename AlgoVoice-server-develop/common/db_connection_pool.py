@@ -0,0 +1,332 @@
+"""
+SQLite连接池
+为各模块的数据库管理器提供共享的、线程安全的连接复用层
+
+- 每个线程持有自己的空闲连接（SQLite连接不能跨线程使用），close()时归还而不是关闭
+- 首次打开数据库时启用WAL日志，读写互不阻塞；每次取出连接时设置busy_timeout
+- 每个连接开启预编译语句缓存，读连接以 query_only 方式打开实现读写分离
+- 记录每类语句（SELECT/INSERT/...）的调用次数与耗时
+"""
+
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Union
+
+from common.logging_system import setup_logger
+
+logger = setup_logger("db_connection_pool")
+
+# 每个线程、每种连接类型保留的最大空闲连接数
+MAX_IDLE_PER_THREAD = 2
+# 预编译语句缓存大小
+STATEMENT_CACHE_SIZE = 256
+# 超过该耗时(毫秒)的语句计为慢查询
+SLOW_QUERY_MS = 100.0
+
+
+class QueryStats:
+    """按语句类型统计的查询耗时（线程安全）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def record(self, sql: str, elapsed_ms: float):
+        kind = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else "EMPTY"
+        with self._lock:
+            entry = self._stats.get(kind)
+            if entry is None:
+                entry = self._stats[kind] = {
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "slow_count": 0,
+                }
+            entry["count"] += 1
+            entry["total_ms"] += elapsed_ms
+            if elapsed_ms > entry["max_ms"]:
+                entry["max_ms"] = elapsed_ms
+            if elapsed_ms >= SLOW_QUERY_MS:
+                entry["slow_count"] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            result = {}
+            for kind, entry in self._stats.items():
+                result[kind] = dict(entry)
+                result[kind]["avg_ms"] = (
+                    entry["total_ms"] / entry["count"] if entry["count"] else 0.0
+                )
+            return result
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+class TimedCursor(sqlite3.Cursor):
+    """记录执行耗时的游标"""
+
+    def _timed(self, method, sql, *args):
+        start = time.perf_counter()
+        try:
+            return method(self, sql, *args)
+        finally:
+            pool = getattr(self.connection, "_pool", None)
+            if pool is not None:
+                pool.stats.record(sql, (time.perf_counter() - start) * 1000)
+
+    def execute(self, sql, parameters=()):
+        return self._timed(sqlite3.Cursor.execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._timed(sqlite3.Cursor.executemany, sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self._timed(sqlite3.Cursor.executescript, sql_script)
+
+
+class PooledConnection(sqlite3.Connection):
+    """连接池中的连接
+
+    与 ``sqlite3.Connection`` 用法一致（可直接传给 ``pd.read_sql_query``），
+    区别是 ``close()`` 会回滚未提交的事务并把连接归还给当前线程的空闲列表。
+    """
+
+    _pool: Optional["SQLiteConnectionPool"] = None
+    _pool_key: tuple = ()
+    _checked_out: bool = False
+    _busy_timeout_ms: int = -1
+    _release_on_exit: bool = False
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        result = super().__exit__(exc_type, exc_value, traceback)
+        if self._release_on_exit:
+            self.close()
+        return result
+
+    def close(self):
+        if self._pool is not None and self._checked_out:
+            self._pool._release(self)
+        elif self._pool is None:
+            super().close()
+
+    def _set_busy_timeout(self, timeout_ms: int):
+        if timeout_ms != self._busy_timeout_ms:
+            # 内部设置不计入查询统计
+            super().cursor().execute(f"PRAGMA busy_timeout={timeout_ms}")
+            self._busy_timeout_ms = timeout_ms
+
+    def discard(self):
+        """真正关闭连接（不归还连接池）"""
+        self._pool = None
+        self._checked_out = False
+        super().close()
+
+
+class SQLiteConnectionPool:
+    """单个数据库文件的连接池"""
+
+    def __init__(self, db_path: Union[str, Path]):
+        self.db_path = str(db_path)
+        self.stats = QueryStats()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._wal_enabled = False
+        self._counters = {"created": 0, "reused": 0, "discarded": 0}
+
+    def _idle(self, key: tuple) -> list:
+        idle = getattr(self._local, "idle", None)
+        if idle is None:
+            idle = self._local.idle = {}
+        return idle.setdefault(key, [])
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counters[name] += 1
+
+    def _open(self, key: tuple) -> PooledConnection:
+        readonly, detect_types, check_same_thread = key
+        conn = sqlite3.connect(
+            self.db_path,
+            detect_types=detect_types,
+            check_same_thread=check_same_thread,
+            cached_statements=STATEMENT_CACHE_SIZE,
+            factory=PooledConnection,
+        )
+        setup = sqlite3.Connection.cursor(conn)
+        if not self._wal_enabled:
+            try:
+                setup.execute("PRAGMA journal_mode=WAL")
+                self._wal_enabled = True
+            except sqlite3.OperationalError as e:
+                # 数据库被其他进程占用时稍后再试
+                logger.debug(f"Failed to enable WAL for {self.db_path}: {e}")
+        setup.execute("PRAGMA synchronous=NORMAL")
+        if readonly:
+            setup.execute("PRAGMA query_only=ON")
+        setup.close()
+        conn._pool = self
+        conn._pool_key = key
+        self._count("created")
+        return conn
+
+    def connect(
+        self,
+        timeout: float = 30.0,
+        readonly: bool = False,
+        detect_types: int = 0,
+        check_same_thread: bool = True,
+        isolation_level: Optional[str] = "",
+        release_on_exit: bool = False,
+    ) -> PooledConnection:
+        """从当前线程的空闲列表取出连接，没有则新建
+
+        Args:
+            timeout: 等待数据库锁的超时时间（秒）
+            readonly: 是否为只读连接
+            detect_types: 同 ``sqlite3.connect``
+            check_same_thread: 同 ``sqlite3.connect``
+            isolation_level: 同 ``sqlite3.connect``
+            release_on_exit: 为True时 ``with conn:`` 退出后自动归还连接，
+                适用于 ``with self._get_connection() as conn:`` 的写法
+
+        Returns:
+            连接对象，使用完毕后调用 ``close()`` 归还
+        """
+        key = (readonly, detect_types, check_same_thread)
+        idle = self._idle(key)
+        if idle:
+            conn = idle.pop()
+            self._count("reused")
+        else:
+            conn = self._open(key)
+
+        conn.isolation_level = isolation_level
+        conn._set_busy_timeout(int(timeout * 1000))
+        conn._release_on_exit = release_on_exit
+        conn._checked_out = True
+        return conn
+
+    def _release(self, conn: PooledConnection):
+        """归还连接：回滚未提交事务并重置连接状态"""
+        conn._checked_out = False
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = None
+            conn.text_factory = str
+        except sqlite3.Error as e:
+            logger.debug(f"Discarding broken connection to {self.db_path}: {e}")
+            conn.discard()
+            self._count("discarded")
+            return
+
+        idle = self._idle(conn._pool_key)
+        if len(idle) < MAX_IDLE_PER_THREAD:
+            idle.append(conn)
+        else:
+            conn.discard()
+            self._count("discarded")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取连接池统计信息"""
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            "db_path": self.db_path,
+            "wal_enabled": self._wal_enabled,
+            "connections": counters,
+            "queries": self.stats.snapshot(),
+        }
+
+
+# 全局连接池注册表
+_pools: Dict[str, SQLiteConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_connection_pool(db_path: Union[str, Path]) -> SQLiteConnectionPool:
+    """获取数据库文件对应的全局连接池"""
+    key = str(Path(db_path).resolve())
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = SQLiteConnectionPool(db_path)
+    return pool
+
+
+def pooled_connect(
+    db_path: Union[str, Path], timeout: float = 30.0, readonly: bool = False, **kwargs
+) -> sqlite3.Connection:
+    """``sqlite3.connect`` 的连接池版本
+
+    内存数据库和URI形式的路径不做池化，直接返回普通连接。
+
+    Args:
+        db_path: 数据库文件路径
+        timeout: 等待数据库锁的超时时间（秒）
+        readonly: 是否为只读连接
+        **kwargs: detect_types / check_same_thread / isolation_level / release_on_exit
+
+    Returns:
+        连接对象，用法与 ``sqlite3.connect`` 的返回值相同
+    """
+    path = str(db_path)
+    if path == ":memory:" or path.startswith("file:"):
+        kwargs.pop("release_on_exit", None)
+        return sqlite3.connect(path, timeout=timeout, **kwargs)
+    return get_connection_pool(path).connect(
+        timeout=timeout, readonly=readonly, **kwargs
+    )
+
+
+@contextmanager
+def pooled_connection(
+    db_path: Union[str, Path],
+    timeout: float = 30.0,
+    readonly: bool = False,
+    row_factory: Optional[Any] = None,
+    **kwargs,
+) -> Iterator[sqlite3.Connection]:
+    """在with语句中使用的池化连接：正常退出时提交，异常时回滚，最后归还连接
+
+    Args:
+        db_path: 数据库文件路径
+        timeout: 等待数据库锁的超时时间（秒）
+        readonly: 是否为只读连接
+        row_factory: 行工厂（如 ``sqlite3.Row``）
+        **kwargs: 传给 ``pooled_connect`` 的其他参数
+    """
+    conn = pooled_connect(db_path, timeout=timeout, readonly=readonly, **kwargs)
+    if row_factory is not None:
+        conn.row_factory = row_factory
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def get_all_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """获取所有连接池的统计信息"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {pool.db_path: pool.get_stats() for pool in pools}
@@ -0,0 +1,490 @@
+"""
+后台任务队列
+把回测、策略生成等耗时的阻塞工作从API事件循环移到有界线程池中执行
+
+- submit() 立即返回任务ID，任务在线程池中运行，不阻塞uvicorn事件循环
+- 每个用户同时排队/运行的任务数有上限，超出时拒绝提交
+- 任务处理函数通过 progress(current, total, message) 汇报进度，
+  进度实时推送给 watch() 的订阅者（SSE/WebSocket）
+- 任务状态与结果持久化到SQLite，轮询接口和服务重启后都能查询；
+  重启时仍处于排队/运行状态的任务标记为失败
+- 处理函数返回 FallbackResult（如真实计算失败后的模拟数据）时，
+  任务以 fallback 状态结束，与真正完成的任务区分
+"""
+
+import asyncio
+import inspect
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from common.db_connection_pool import pooled_connection
+from common.exceptions import QuantSystemError
+from common.logging_system import setup_logger
+
+logger = setup_logger("job_queue")
+
+# 任务状态
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FALLBACK = "fallback"  # 已结束，但结果为降级数据
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINISHED_STATES = (JOB_COMPLETED, JOB_FALLBACK, JOB_FAILED, JOB_CANCELLED)
+
+# 默认工作线程数与每个用户的并发上限
+DEFAULT_MAX_WORKERS = min(4, os.cpu_count() or 1)
+DEFAULT_MAX_JOBS_PER_USER = 2
+# 进度写入数据库的最小间隔（秒），内存中的进度和推送不受影响
+PROGRESS_PERSIST_INTERVAL = 1.0
+
+# 任务处理函数: handler(params, progress) -> 可JSON序列化的结果
+ProgressReporter = Callable[[int, int, str], None]
+JobHandler = Callable[[Dict[str, Any], ProgressReporter], Any]
+
+
+class JobLimitError(QuantSystemError):
+    """用户并发任务数超出上限"""
+
+    pass
+
+
+@dataclass
+class FallbackResult:
+    """处理函数返回的降级结果（如真实计算失败后返回的模拟数据）"""
+
+    value: Any
+    reason: str = "使用模拟数据"
+
+
+@dataclass
+class Job:
+    """后台任务"""
+
+    job_id: str
+    job_type: str
+    user_id: str
+    params: Dict[str, Any]
+    status: str = JOB_QUEUED
+    progress: float = 0.0
+    message: str = ""
+    result: Any = None
+    error: Optional[str] = None
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    updated_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    def to_dict(self, include_result: bool = False) -> Dict[str, Any]:
+        """转换为API返回格式"""
+        data = {
+            "job_id": self.job_id,
+            "job_type": self.job_type,
+            "status": self.status,
+            "progress": round(self.progress, 4),
+            "message": self.message,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "updated_at": self.updated_at,
+        }
+        if include_result:
+            data["result"] = self.result
+        return data
+
+
+class JobQueue:
+    """有界线程池 + 每用户并发限制 + SQLite持久化的后台任务队列"""
+
+    def __init__(
+        self,
+        db_path: str = "data/jobs.db",
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_jobs_per_user: int = DEFAULT_MAX_JOBS_PER_USER,
+    ):
+        """初始化任务队列
+
+        Args:
+            db_path: 任务数据库路径
+            max_workers: 工作线程数
+            max_jobs_per_user: 每个用户同时排队/运行的任务上限
+        """
+        self.db_path = str(db_path)
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max(1, int(max_workers))
+        self.max_jobs_per_user = max(1, int(max_jobs_per_user))
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="job-worker"
+        )
+        self._handlers: Dict[str, JobHandler] = {}
+        self._lock = threading.Lock()
+        # 未结束的任务（已结束的任务从数据库读取）
+        self._active: Dict[str, Job] = {}
+        self._futures: Dict[str, Future] = {}
+        self._last_persist: Dict[str, float] = {}
+        self._subscribers: Dict[
+            str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]
+        ] = {}
+
+        self._init_database()
+        self._recover_interrupted_jobs()
+        logger.info(
+            f"JobQueue initialized: {self.max_workers} workers, "
+            f"{self.max_jobs_per_user} jobs per user"
+        )
+
+    def _init_database(self):
+        with pooled_connection(self.db_path) as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    job_type TEXT NOT NULL,
+                    user_id TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    progress REAL DEFAULT 0,
+                    message TEXT,
+                    params TEXT,
+                    result TEXT,
+                    error TEXT,
+                    created_at TEXT NOT NULL,
+                    started_at TEXT,
+                    finished_at TEXT,
+                    updated_at TEXT NOT NULL
+                )
+            """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_user ON jobs(user_id, created_at)"
+            )
+
+    def _recover_interrupted_jobs(self):
+        """上次进程退出时未完成的任务无法继续，标记为失败"""
+        now = datetime.now().isoformat()
+        with pooled_connection(self.db_path) as conn:
+            cursor = conn.execute(
+                """
+                UPDATE jobs SET status = ?, error = ?, finished_at = ?, updated_at = ?
+                WHERE status IN (?, ?)
+            """,
+                (JOB_FAILED, "服务重启，任务中断", now, now, JOB_QUEUED, JOB_RUNNING),
+            )
+            if cursor.rowcount:
+                logger.warning(f"Marked {cursor.rowcount} interrupted jobs as failed")
+
+    def _persist(self, job: Job):
+        with pooled_connection(self.db_path) as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO jobs
+                (job_id, job_type, user_id, status, progress, message, params,
+                 result, error, created_at, started_at, finished_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+                (
+                    job.job_id,
+                    job.job_type,
+                    job.user_id,
+                    job.status,
+                    job.progress,
+                    job.message,
+                    json.dumps(job.params, ensure_ascii=False, default=str),
+                    json.dumps(job.result, ensure_ascii=False, default=str)
+                    if job.result is not None
+                    else None,
+                    job.error,
+                    job.created_at,
+                    job.started_at,
+                    job.finished_at,
+                    job.updated_at,
+                ),
+            )
+        self._last_persist[job.job_id] = time.monotonic()
+
+    @staticmethod
+    def _row_to_job(row) -> Job:
+        return Job(
+            job_id=row["job_id"],
+            job_type=row["job_type"],
+            user_id=row["user_id"],
+            params=json.loads(row["params"]) if row["params"] else {},
+            status=row["status"],
+            progress=row["progress"] or 0.0,
+            message=row["message"] or "",
+            result=json.loads(row["result"]) if row["result"] else None,
+            error=row["error"],
+            created_at=row["created_at"],
+            started_at=row["started_at"],
+            finished_at=row["finished_at"],
+            updated_at=row["updated_at"],
+        )
+
+    def register_handler(self, job_type: str, handler: JobHandler):
+        """注册任务处理函数
+
+        Args:
+            job_type: 任务类型
+            handler: 处理函数 handler(params, progress)，可以是同步函数或协程函数，
+                在工作线程中执行；返回值作为任务结果保存，返回FallbackResult时
+                任务以fallback状态结束
+        """
+        self._handlers[job_type] = handler
+
+    def has_handler(self, job_type: str) -> bool:
+        return job_type in self._handlers
+
+    def submit(self, job_type: str, params: Dict[str, Any], user_id: Any) -> Job:
+        """提交任务，立即返回
+
+        Args:
+            job_type: 已注册的任务类型
+            params: 任务参数
+            user_id: 提交用户（用于并发限制和权限隔离）
+
+        Returns:
+            排队中的任务
+
+        Raises:
+            QuantSystemError: 任务类型未注册
+            JobLimitError: 用户的未完成任务数已达上限
+        """
+        if job_type not in self._handlers:
+            raise QuantSystemError(f"Unknown job type: {job_type}")
+
+        user_id = str(user_id)
+        with self._lock:
+            active = sum(1 for job in self._active.values() if job.user_id == user_id)
+            if active >= self.max_jobs_per_user:
+                raise JobLimitError(f"同时进行的任务不能超过 {self.max_jobs_per_user} 个，请等待当前任务完成")
+            job = Job(
+                job_id=uuid.uuid4().hex,
+                job_type=job_type,
+                user_id=user_id,
+                params=params,
+                message="任务排队中",
+            )
+            self._active[job.job_id] = job
+
+        self._persist(job)
+        with self._lock:
+            # 持锁登记future：任务开始和结束时的状态更新都要获取同一把锁，
+            # 因此结束时的清理不会先于登记执行
+            self._futures[job.job_id] = self._executor.submit(self._run, job)
+        logger.info(f"Job {job.job_id} ({job_type}) submitted by user {user_id}")
+        return job
+
+    def _run(self, job: Job):
+        """在工作线程中执行任务"""
+        handler = self._handlers[job.job_type]
+        self._update(job, status=JOB_RUNNING, message="任务执行中", started_at=_now())
+
+        def progress(current: int, total: int, message: str = ""):
+            fraction = min(max(current / total, 0.0), 1.0) if total else 0.0
+            self._update(job, progress=fraction, message=message or job.message)
+
+        try:
+            if inspect.iscoroutinefunction(handler):
+                # 协程处理函数在工作线程自己的事件循环中运行
+                result = asyncio.run(handler(job.params, progress))
+            else:
+                result = handler(job.params, progress)
+        except Exception as e:
+            logger.error(f"Job {job.job_id} ({job.job_type}) failed: {e}")
+            self._update(
+                job,
+                status=JOB_FAILED,
+                error=str(e),
+                message="任务失败",
+                finished_at=_now(),
+            )
+        else:
+            if isinstance(result, FallbackResult):
+                status, message = JOB_FALLBACK, f"任务完成（{result.reason}）"
+                result = result.value
+                logger.warning(
+                    f"Job {job.job_id} ({job.job_type}) fell back: {message}"
+                )
+            else:
+                status, message = JOB_COMPLETED, "任务完成"
+                logger.info(f"Job {job.job_id} ({job.job_type}) completed")
+            self._update(
+                job,
+                status=status,
+                progress=1.0,
+                result=result,
+                message=message,
+                finished_at=_now(),
+            )
+
+    def _update(self, job: Job, **changes):
+        """更新任务状态：状态变化时立即持久化，纯进度更新按间隔节流"""
+        with self._lock:
+            for key, value in changes.items():
+                setattr(job, key, value)
+            job.updated_at = _now()
+            finished = job.status in FINISHED_STATES
+            if finished:
+                self._active.pop(job.job_id, None)
+                self._futures.pop(job.job_id, None)
+            snapshot = job.to_dict()
+            subscribers = list(self._subscribers.get(job.job_id, ()))
+
+        last = self._last_persist.get(job.job_id, 0.0)
+        if "status" in changes or time.monotonic() - last >= PROGRESS_PERSIST_INTERVAL:
+            try:
+                self._persist(job)
+            except Exception as e:
+                logger.error(f"Failed to persist job {job.job_id}: {e}")
+        if finished:
+            self._last_persist.pop(job.job_id, None)
+
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, snapshot)
+            except RuntimeError:
+                # 订阅方的事件循环已关闭
+                pass
+
+    def get_job(self, job_id: str, user_id: Any = None) -> Optional[Job]:
+        """获取任务
+
+        Args:
+            job_id: 任务ID
+            user_id: 指定时只返回该用户的任务
+
+        Returns:
+            任务，不存在（或不属于该用户）时返回None
+        """
+        with self._lock:
+            job = self._active.get(job_id)
+        if job is None:
+            with pooled_connection(
+                self.db_path, readonly=True, row_factory=_dict_row
+            ) as conn:
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE job_id = ?", (job_id,)
+                ).fetchone()
+            job = self._row_to_job(row) if row else None
+        if job is not None and user_id is not None and job.user_id != str(user_id):
+            return None
+        return job
+
+    def list_jobs(
+        self, user_id: Any, job_type: Optional[str] = None, limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """列出用户最近的任务（不含结果）"""
+        query = "SELECT * FROM jobs WHERE user_id = ?"
+        params: List[Any] = [str(user_id)]
+        if job_type:
+            query += " AND job_type = ?"
+            params.append(job_type)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(int(limit))
+
+        with pooled_connection(
+            self.db_path, readonly=True, row_factory=_dict_row
+        ) as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        jobs = []
+        for row in rows:
+            with self._lock:
+                active = self._active.get(row["job_id"])
+            jobs.append((active or self._row_to_job(row)).to_dict())
+        return jobs
+
+    def cancel(self, job_id: str, user_id: Any = None) -> bool:
+        """取消仍在排队的任务（运行中的任务无法中断）
+
+        Returns:
+            是否取消成功
+        """
+        job = self.get_job(job_id, user_id)
+        if job is None or job.status != JOB_QUEUED:
+            return False
+        future = self._futures.get(job_id)
+        if future is None or not future.cancel():
+            return False
+        self._update(job, status=JOB_CANCELLED, message="任务已取消", finished_at=_now())
+        logger.info(f"Job {job_id} cancelled")
+        return True
+
+    async def watch(
+        self, job_id: str, user_id: Any = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """订阅任务状态变化，直到任务结束
+
+        先返回当前状态，之后每次状态/进度变化返回一次快照，
+        最后一次快照的status为已结束状态。供SSE/WebSocket接口使用。
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        subscriber = (loop, queue)
+        with self._lock:
+            self._subscribers.setdefault(job_id, []).append(subscriber)
+        try:
+            # 先订阅再读取当前状态，避免漏掉两者之间的更新
+            job = self.get_job(job_id, user_id)
+            if job is None:
+                return
+            snapshot = job.to_dict()
+            yield snapshot
+            while snapshot["status"] not in FINISHED_STATES:
+                snapshot = await queue.get()
+                yield snapshot
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(job_id, [])
+                if subscriber in subscribers:
+                    subscribers.remove(subscriber)
+                if not subscribers:
+                    self._subscribers.pop(job_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取队列统计信息"""
+        with self._lock:
+            active = list(self._active.values())
+        return {
+            "max_workers": self.max_workers,
+            "max_jobs_per_user": self.max_jobs_per_user,
+            "queued": sum(1 for job in active if job.status == JOB_QUEUED),
+            "running": sum(1 for job in active if job.status == JOB_RUNNING),
+            "job_types": sorted(self._handlers),
+        }
+
+    def shutdown(self, wait: bool = False):
+        """关闭线程池，排队中的任务不再执行"""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def _now() -> str:
+    return datetime.now().isoformat()
+
+
+def _dict_row(cursor, row) -> Dict[str, Any]:
+    return {col[0]: row[idx] for idx, col in enumerate(cursor.description)}
+
+
+# 全局任务队列实例
+_job_queue: Optional[JobQueue] = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """获取全局任务队列实例"""
+    global _job_queue
+    if _job_queue is None:
+        with _job_queue_lock:
+            if _job_queue is None:
+                _job_queue = JobQueue()
+    return _job_queue
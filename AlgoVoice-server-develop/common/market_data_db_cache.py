@@ -3,12 +3,12 @@
 提供当日市场数据的持久化存储，作为第二层缓存
 """
 
-import sqlite3
 import json
 from datetime import datetime, date
 from typing import Optional, List, Dict, Any
 from pathlib import Path
 
+from common.db_connection_pool import pooled_connection
 from common.logging_system import setup_logger
 
 logger = setup_logger("market_data_db_cache")
@@ -35,7 +35,7 @@ class MarketDataDBCache:
 
     def _init_database(self):
         """初始化数据库表结构"""
-        with sqlite3.connect(self.db_path) as conn:
+        with pooled_connection(self.db_path) as conn:
             cursor = conn.cursor()
             
             # 市场指数缓存表
@@ -102,7 +102,7 @@ class MarketDataDBCache:
             indices_json = json.dumps(indices, ensure_ascii=False)
             timestamp = datetime.now()
             
-            with sqlite3.connect(self.db_path) as conn:
+            with pooled_connection(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # 使用 REPLACE 替换已存在的数据
@@ -137,7 +137,7 @@ class MarketDataDBCache:
             if cache_date is None:
                 cache_date = date.today()
             
-            with sqlite3.connect(self.db_path) as conn:
+            with pooled_connection(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute('''
@@ -199,7 +199,7 @@ class MarketDataDBCache:
             sentiment_json = json.dumps(sentiment, ensure_ascii=False) if sentiment else None
             timestamp = datetime.now()
             
-            with sqlite3.connect(self.db_path) as conn:
+            with pooled_connection(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # 使用 REPLACE 替换已存在的数据
@@ -234,7 +234,7 @@ class MarketDataDBCache:
             if cache_date is None:
                 cache_date = date.today()
             
-            with sqlite3.connect(self.db_path) as conn:
+            with pooled_connection(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute('''
@@ -283,7 +283,7 @@ class MarketDataDBCache:
             from datetime import timedelta
             cutoff_date = cutoff_date - timedelta(days=days_to_keep)
             
-            with sqlite3.connect(self.db_path) as conn:
+            with pooled_connection(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute('''
@@ -0,0 +1,334 @@
+"""
+并行试验执行器
+为参数优化、Walk-forward分析、遗传因子搜索等CPU密集型批量评估提供常驻进程池
+
+- 市场数据只写入一次内存映射文件（.npy），各工作进程以只读方式映射同一份数据，
+  任务只传递参数本身，避免每个任务都pickle整张DataFrame
+- 进程池在执行器生命周期内常驻，多批任务复用同一组工作进程
+- 统计每个工作进程的任务数与忙碌时间，计算整体利用率
+- 目标函数无法pickle（如闭包）且平台不支持fork时，自动退回线程池
+"""
+
+import multiprocessing
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from common.logging_system import setup_logger
+
+logger = setup_logger("parallel_executor")
+
+SharedInput = Union[pd.DataFrame, pd.Series, Dict[str, Union[pd.DataFrame, pd.Series]]]
+
+
+@dataclass
+class TrialOutcome:
+    """单个任务的执行结果"""
+
+    index: int
+    value: Any = None
+    error: Optional[str] = None
+    start_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
+    worker: str = ""
+    pruned: bool = False  # 被剪枝器提前终止，value为最后一级的中间值
+    cached: bool = False  # 结果来自试验缓存，未重新评估
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def duration_seconds(self) -> float:
+        if self.start_time and self.end_time:
+            return (self.end_time - self.start_time).total_seconds()
+        return 0.0
+
+
+class SharedMarketData:
+    """写入内存映射文件、可在多个进程间共享的市场数据
+
+    数值列按float64存为一个二维数组（行为时间），索引和非数值列随句柄一起传给
+    工作进程（每个进程只传一次）。工作进程中重建的DataFrame是只读映射的视图。
+    """
+
+    def __init__(self, data: SharedInput):
+        """写入共享数据
+
+        Args:
+            data: DataFrame、Series，或名称到DataFrame/Series的字典
+        """
+        self._dir = tempfile.mkdtemp(prefix="algovoice_shared_")
+        self.nbytes = 0
+        if isinstance(data, dict):
+            self.handle = {
+                "kind": "dict",
+                "items": {
+                    name: self._store(f"{i}.npy", value)
+                    for i, (name, value) in enumerate(data.items())
+                },
+            }
+        else:
+            self.handle = self._store("0.npy", data)
+
+    def _store(self, filename: str, obj: Union[pd.DataFrame, pd.Series]) -> Dict:
+        is_series = isinstance(obj, pd.Series)
+        frame = obj.to_frame() if is_series else obj
+        numeric = [
+            col
+            for col in frame.columns
+            if pd.api.types.is_numeric_dtype(frame[col])
+            and not pd.api.types.is_bool_dtype(frame[col])
+        ]
+        path = os.path.join(self._dir, filename)
+        values = np.ascontiguousarray(frame[numeric].to_numpy(dtype=np.float64))
+        np.save(path, values)
+        self.nbytes += values.nbytes
+        return {
+            "kind": "series" if is_series else "frame",
+            "path": path,
+            "index": frame.index,
+            "numeric": numeric,
+            "other": frame.drop(columns=numeric),
+            "columns": list(frame.columns),
+            "name": obj.name if is_series else None,
+        }
+
+    @staticmethod
+    def load(handle: Dict) -> SharedInput:
+        """在工作进程中按句柄重建数据（只读映射，不复制）"""
+        if handle["kind"] == "dict":
+            return {
+                name: SharedMarketData.load(item)
+                for name, item in handle["items"].items()
+            }
+
+        values = np.load(handle["path"], mmap_mode="r")
+        frame = pd.DataFrame(
+            values, index=handle["index"], columns=handle["numeric"], copy=False
+        )
+        if len(handle["other"].columns):
+            frame = pd.concat([frame, handle["other"]], axis=1)[handle["columns"]]
+        if handle["kind"] == "series":
+            series = frame.iloc[:, 0]
+            series.name = handle["name"]
+            return series
+        return frame
+
+    def close(self):
+        """删除内存映射文件"""
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+
+# 工作进程中的全局状态（由initializer设置，每个进程一次）
+_worker_objective: Optional[Callable] = None
+_worker_data: Any = None
+
+
+def _init_worker(objective: Callable, data_handle: Optional[Dict]):
+    global _worker_objective, _worker_data
+    _worker_objective = objective
+    _worker_data = SharedMarketData.load(data_handle) if data_handle else None
+
+
+def _call_objective(
+    objective: Callable, data: Any, index: int, task: Any
+) -> TrialOutcome:
+    outcome = TrialOutcome(index=index, start_time=datetime.now())
+    outcome.worker = f"{os.getpid()}:{threading.current_thread().name}"
+    try:
+        outcome.value = objective(task) if data is None else objective(task, data)
+    except Exception as e:
+        outcome.error = f"{type(e).__name__}: {e}"
+    outcome.end_time = datetime.now()
+    return outcome
+
+
+def _run_in_worker(index: int, task: Any) -> TrialOutcome:
+    return _call_objective(_worker_objective, _worker_data, index, task)
+
+
+class ParallelTrialExecutor:
+    """常驻工作池 + 共享市场数据的批量试验执行器
+
+    目标函数签名为 ``objective(task)``；传入shared_data时为
+    ``objective(task, data)``，data为工作进程中映射的共享数据。
+    """
+
+    def __init__(
+        self,
+        objective: Callable,
+        n_workers: Optional[int] = None,
+        shared_data: Optional[SharedInput] = None,
+        backend: str = "process",
+    ):
+        """初始化执行器
+
+        Args:
+            objective: 目标函数，进程模式下需要可pickle（模块级函数或partial）
+            n_workers: 工作进程数，默认CPU核数；为1时在当前进程内串行执行
+            shared_data: 需要共享给所有任务的市场数据
+            backend: 'process' 或 'thread'
+        """
+        self.objective = objective
+        self.n_workers = max(1, int(n_workers or os.cpu_count() or 1))
+        self.backend = backend
+        self._data = shared_data
+        self._shared: Optional[SharedMarketData] = None
+        self._pool: Optional[Executor] = None
+
+        # 利用率统计
+        self._lock = threading.Lock()
+        self._wall_seconds = 0.0
+        self._busy_seconds = 0.0
+        self._n_tasks = 0
+        self._n_failed = 0
+        self._workers: Dict[str, Dict[str, float]] = {}
+
+    def _can_pickle(self) -> bool:
+        try:
+            pickle.dumps(self.objective)
+            return True
+        except Exception:
+            return False
+
+    def _ensure_pool(self) -> Optional[Executor]:
+        """按需创建常驻工作池"""
+        if self._pool is not None or self.n_workers == 1:
+            return self._pool
+
+        if self.backend == "process":
+            # fork时initializer参数直接继承，不需要pickle
+            if (
+                multiprocessing.get_start_method(allow_none=False) != "fork"
+                and not self._can_pickle()
+            ):
+                logger.warning(
+                    "Objective is not picklable, falling back to thread workers"
+                )
+                self.backend = "thread"
+
+        if self.backend == "process":
+            if self._data is not None:
+                self._shared = SharedMarketData(self._data)
+                logger.info(
+                    f"Shared {self._shared.nbytes / 1024 / 1024:.1f} MB of market data "
+                    f"with {self.n_workers} workers"
+                )
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.n_workers,
+                initializer=_init_worker,
+                initargs=(
+                    self.objective,
+                    self._shared.handle if self._shared else None,
+                ),
+            )
+        else:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.n_workers, thread_name_prefix="trial-worker"
+            )
+        return self._pool
+
+    def evaluate(self, tasks: List[Any]) -> List[TrialOutcome]:
+        """并行评估一批任务
+
+        Args:
+            tasks: 任务列表（通常是参数字典），按进程模式传递时需可pickle
+
+        Returns:
+            与tasks顺序一致的执行结果；目标函数抛出的异常记录在error中
+        """
+        if not tasks:
+            return []
+
+        start = time.perf_counter()
+        pool = self._ensure_pool()
+        if pool is None:
+            outcomes = [
+                _call_objective(self.objective, self._data, i, task)
+                for i, task in enumerate(tasks)
+            ]
+        elif self.backend == "process":
+            futures = [
+                pool.submit(_run_in_worker, i, task) for i, task in enumerate(tasks)
+            ]
+            outcomes = [future.result() for future in futures]
+        else:
+            futures = [
+                pool.submit(_call_objective, self.objective, self._data, i, task)
+                for i, task in enumerate(tasks)
+            ]
+            outcomes = [future.result() for future in futures]
+
+        self._record(outcomes, time.perf_counter() - start)
+        return outcomes
+
+    def map(self, tasks: List[Any]) -> List[Any]:
+        """并行评估并返回结果值，任一任务失败时抛出异常"""
+        outcomes = self.evaluate(tasks)
+        for outcome in outcomes:
+            if not outcome.ok:
+                raise RuntimeError(f"Task {outcome.index} failed: {outcome.error}")
+        return [outcome.value for outcome in outcomes]
+
+    def _record(self, outcomes: List[TrialOutcome], wall_seconds: float):
+        with self._lock:
+            self._wall_seconds += wall_seconds
+            self._n_tasks += len(outcomes)
+            for outcome in outcomes:
+                busy = outcome.duration_seconds
+                self._busy_seconds += busy
+                if not outcome.ok:
+                    self._n_failed += 1
+                worker = self._workers.setdefault(
+                    outcome.worker, {"tasks": 0, "busy_seconds": 0.0}
+                )
+                worker["tasks"] += 1
+                worker["busy_seconds"] += busy
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取执行统计
+
+        Returns:
+            任务数、失败数、总耗时、忙碌时间、利用率（忙碌时间/(耗时×工作数)）和各工作进程明细
+        """
+        with self._lock:
+            capacity = self._wall_seconds * self.n_workers
+            return {
+                "backend": self.backend if self.n_workers > 1 else "inline",
+                "n_workers": self.n_workers,
+                "tasks": self._n_tasks,
+                "failed": self._n_failed,
+                "wall_seconds": self._wall_seconds,
+                "busy_seconds": self._busy_seconds,
+                "utilization": self._busy_seconds / capacity if capacity > 0 else 0.0,
+                "shared_data_mb": self._shared.nbytes / 1024 / 1024
+                if self._shared
+                else 0.0,
+                "workers": {name: dict(stats) for name, stats in self._workers.items()},
+            }
+
+    def close(self):
+        """关闭工作池并删除共享数据"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        if self._shared is not None:
+            self._shared.close()
+            self._shared = None
+
+    def __enter__(self) -> "ParallelTrialExecutor":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
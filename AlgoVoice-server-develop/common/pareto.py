@@ -0,0 +1,311 @@
+"""
+帕累托工具模块
+NSGA-II 的向量化实现：支配矩阵、逐层剥离的非支配排序、拥挤度距离、
+锦标赛选择、环境选择，以及作用于整个种群数组的SBX交叉和多项式变异
+
+所有函数按最小化约定处理目标矩阵 F (n_solutions, n_objectives)，
+需要最大化的目标由调用方取负后传入。
+随机数参数 rng 只需提供 ``random(size)`` 方法，
+``numpy.random.Generator``、``numpy.random.RandomState`` 和 ``numpy.random`` 模块本身均可。
+"""
+
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+
+def domination_matrix(F: np.ndarray) -> np.ndarray:
+    """计算支配矩阵
+
+    Args:
+        F: 目标矩阵 (n, m)
+
+    Returns:
+        布尔矩阵 D (n, n)，D[i, j] 表示解i支配解j
+        （所有目标不差于j且至少一个目标严格更好）
+    """
+    F = np.asarray(F, dtype=float)
+    n, m = F.shape
+    not_worse = np.ones((n, n), dtype=bool)
+    better = np.zeros((n, n), dtype=bool)
+    for k in range(m):
+        column = F[:, k]
+        not_worse &= column[:, None] <= column[None, :]
+        better |= column[:, None] < column[None, :]
+    return not_worse & better
+
+
+def non_dominated_mask(F: np.ndarray) -> np.ndarray:
+    """标记不被任何解支配的解（第一前沿）
+
+    Args:
+        F: 目标矩阵 (n, m)
+
+    Returns:
+        布尔数组 (n,)
+    """
+    F = np.asarray(F, dtype=float)
+    if len(F) == 0:
+        return np.zeros(0, dtype=bool)
+    return ~domination_matrix(F).any(axis=0)
+
+
+def non_dominated_sort(F: np.ndarray, n_stop: Optional[int] = None) -> List[np.ndarray]:
+    """快速非支配排序
+
+    先一次性计算支配矩阵和每个解被支配的次数，再逐层剥离：
+    被支配次数为0的解构成当前前沿，移除后用矩阵行求和更新剩余解的计数。
+
+    Args:
+        F: 目标矩阵 (n, m)
+        n_stop: 已分层的解数达到该值后停止（环境选择只需要前几层）
+
+    Returns:
+        前沿列表，每个前沿为升序的解索引数组
+    """
+    F = np.asarray(F, dtype=float)
+    n = len(F)
+    if n == 0:
+        return []
+
+    dominates = domination_matrix(F)
+    counts = dominates.sum(axis=0)
+    remaining = np.ones(n, dtype=bool)
+
+    fronts = []
+    n_sorted = 0
+    front = np.flatnonzero(counts == 0)
+    while front.size:
+        fronts.append(front)
+        n_sorted += front.size
+        if n_stop is not None and n_sorted >= n_stop:
+            break
+        remaining[front] = False
+        counts -= dominates[front].sum(axis=0)
+        front = np.flatnonzero(remaining & (counts == 0))
+
+    return fronts
+
+
+def crowding_distance(F: np.ndarray) -> np.ndarray:
+    """计算同一前沿内各解的拥挤度距离
+
+    Args:
+        F: 该前沿的目标矩阵 (n, m)
+
+    Returns:
+        拥挤度距离 (n,)，每个目标上的边界解为inf；不超过2个解时全部为inf
+    """
+    F = np.asarray(F, dtype=float)
+    n, m = F.shape
+    if n <= 2:
+        return np.full(n, np.inf)
+
+    distance = np.zeros(n)
+    for k in range(m):
+        order = np.argsort(F[:, k], kind="stable")
+        column = F[order, k]
+        distance[order[0]] = np.inf
+        distance[order[-1]] = np.inf
+
+        span = column[-1] - column[0]
+        if np.isfinite(span) and span > 0:
+            distance[order[1:-1]] += (column[2:] - column[:-2]) / span
+
+    return distance
+
+
+def rank_and_crowding(
+    F: np.ndarray, fronts: Optional[List[np.ndarray]] = None
+) -> Tuple[np.ndarray, np.ndarray, List[np.ndarray]]:
+    """计算每个解的Pareto等级和拥挤度
+
+    Args:
+        F: 目标矩阵 (n, m)
+        fronts: 已有的非支配排序结果，None时重新计算
+
+    Returns:
+        (等级数组（第一前沿为0）, 拥挤度数组, 前沿列表)
+    """
+    F = np.asarray(F, dtype=float)
+    if fronts is None:
+        fronts = non_dominated_sort(F)
+
+    ranks = np.full(len(F), len(fronts), dtype=int)
+    crowding = np.zeros(len(F))
+    for rank, front in enumerate(fronts):
+        ranks[front] = rank
+        crowding[front] = crowding_distance(F[front])
+    return ranks, crowding, fronts
+
+
+def select_survivors(F: np.ndarray, n_select: int) -> np.ndarray:
+    """NSGA-II环境选择
+
+    按前沿顺序整层保留，最后一层放不下时按拥挤度从大到小补足。
+
+    Args:
+        F: 合并种群的目标矩阵 (n, m)
+        n_select: 保留的个体数
+
+    Returns:
+        选中的解索引
+    """
+    F = np.asarray(F, dtype=float)
+    selected = []
+    n_selected = 0
+    for front in non_dominated_sort(F, n_stop=n_select):
+        if n_selected + front.size <= n_select:
+            selected.append(front)
+            n_selected += front.size
+        else:
+            distance = crowding_distance(F[front])
+            order = np.argsort(-distance, kind="stable")
+            selected.append(front[order[: n_select - n_selected]])
+            break
+        if n_selected == n_select:
+            break
+
+    if not selected:
+        return np.zeros(0, dtype=int)
+    return np.concatenate(selected)
+
+
+def tournament_selection(
+    ranks: np.ndarray,
+    crowding: np.ndarray,
+    n_select: int,
+    rng: Any,
+    tournament_size: int = 2,
+) -> np.ndarray:
+    """拥挤度比较锦标赛选择
+
+    每场从种群中不放回地抽取tournament_size个个体，等级低者胜，
+    等级相同时拥挤度大者胜。
+
+    Args:
+        ranks: 等级数组 (n,)
+        crowding: 拥挤度数组 (n,)
+        n_select: 选择次数
+        rng: 随机数生成器
+        tournament_size: 每场参赛个体数
+
+    Returns:
+        胜者索引 (n_select,)
+    """
+    ranks = np.asarray(ranks)
+    crowding = np.asarray(crowding, dtype=float)
+    n = len(ranks)
+    k = min(tournament_size, n)
+
+    if k == n:
+        candidates = np.tile(np.arange(n), (n_select, 1))
+    else:
+        candidates = np.argpartition(rng.random((n_select, n)), k, axis=1)[:, :k]
+
+    winners = candidates[:, 0]
+    for c in range(1, k):
+        challenger = candidates[:, c]
+        better = (ranks[challenger] < ranks[winners]) | (
+            (ranks[challenger] == ranks[winners])
+            & (crowding[challenger] > crowding[winners])
+        )
+        winners = np.where(better, challenger, winners)
+    return winners
+
+
+def sbx_crossover(
+    parents1: np.ndarray,
+    parents2: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    rng: Any,
+    eta: float = 20.0,
+    prob_var: float = 0.5,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """有界模拟二进制交叉（SBX），一次处理所有父代对
+
+    Args:
+        parents1: 父代1矩阵 (n_pairs, n_vars)
+        parents2: 父代2矩阵 (n_pairs, n_vars)
+        lower: 变量下界 (n_vars,)
+        upper: 变量上界 (n_vars,)
+        rng: 随机数生成器
+        eta: 分布指数，越大子代越接近父代
+        prob_var: 每个变量参与交叉的概率
+
+    Returns:
+        (子代1矩阵, 子代2矩阵)，子代1取两父代中较小一侧的后代
+    """
+    p1 = np.asarray(parents1, dtype=float)
+    p2 = np.asarray(parents2, dtype=float)
+    lower = np.broadcast_to(np.asarray(lower, dtype=float), p1.shape)
+    upper = np.broadcast_to(np.asarray(upper, dtype=float), p1.shape)
+
+    mask = (rng.random(p1.shape) < prob_var) & (np.abs(p1 - p2) > 1e-10)
+    u = rng.random(p1.shape)
+
+    y1 = np.minimum(p1, p2)
+    y2 = np.maximum(p1, p2)
+    spread = np.where(mask, y2 - y1, 1.0)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        beta = 1 + 2 * (y1 - lower) / spread
+        alpha = 2 - beta ** (-(eta + 1))
+        betaq = np.where(
+            u <= 1 / alpha,
+            (u * alpha) ** (1 / (eta + 1)),
+            (1 / (2 - u * alpha)) ** (1 / (eta + 1)),
+        )
+
+    c1 = 0.5 * ((y1 + y2) - betaq * (y2 - y1))
+    c2 = 0.5 * ((y1 + y2) + betaq * (y2 - y1))
+
+    child1 = np.where(mask, np.clip(c1, lower, upper), p1)
+    child2 = np.where(mask, np.clip(c2, lower, upper), p2)
+    return child1, child2
+
+
+def polynomial_mutation(
+    X: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    rng: Any,
+    prob: float,
+    eta: float = 20.0,
+) -> np.ndarray:
+    """有界多项式变异，一次处理整个种群
+
+    Args:
+        X: 个体矩阵 (n, n_vars)
+        lower: 变量下界 (n_vars,)
+        upper: 变量上界 (n_vars,)
+        rng: 随机数生成器
+        prob: 每个变量发生变异的概率
+        eta: 分布指数
+
+    Returns:
+        变异后的个体矩阵（新数组）
+    """
+    X = np.asarray(X, dtype=float)
+    lower = np.broadcast_to(np.asarray(lower, dtype=float), X.shape)
+    upper = np.broadcast_to(np.asarray(upper, dtype=float), X.shape)
+    span = upper - lower
+
+    mask = (rng.random(X.shape) < prob) & (span > 0)
+    u = rng.random(X.shape)
+    safe_span = np.where(span > 0, span, 1.0)
+    delta1 = (X - lower) / safe_span
+    delta2 = (upper - X) / safe_span
+
+    with np.errstate(invalid="ignore"):
+        low_side = 2 * u + (1 - 2 * u) * (1 - delta1) ** (eta + 1)
+        high_side = 2 * (1 - u) + 2 * (u - 0.5) * (1 - delta2) ** (eta + 1)
+        deltaq = np.where(
+            u <= 0.5,
+            low_side ** (1 / (eta + 1)) - 1,
+            1 - high_side ** (1 / (eta + 1)),
+        )
+
+    mutated = np.clip(X + deltaq * span, lower, upper)
+    return np.where(mask, mutated, X)
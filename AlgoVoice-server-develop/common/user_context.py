@@ -8,6 +8,7 @@
 from typing import Optional, Dict
 from functools import wraps
 from fastapi import Header, HTTPException
+from fastapi.concurrency import run_in_threadpool
 import logging
 
 from common.user_database import user_db
@@ -52,8 +53,11 @@ async def get_current_user(authorization: Optional[str] = Header(None)) -> UserC
     
     token = authorization.replace("Bearer ", "")
     
-    # 验证令牌
-    valid, message, user_info = user_db.verify_token(token)
+    # 验证令牌：缓存命中直接返回，未命中时在线程池中查询数据库，避免阻塞事件循环
+    result = user_db.verify_cached_token(token)
+    if result is None:
+        result = await run_in_threadpool(user_db.verify_token, token)
+    valid, message, user_info = result
     
     if not valid:
         raise HTTPException(
@@ -3,15 +3,20 @@
 """
 用户数据库管理模块
 管理用户账号、认证和数据隔离
+
+令牌验证结果在进程内缓存session_cache_ttl秒，登出、改密码、改资料和管理员修改权限时
+主动失效；会话的last_activity和用户活动日志由后台线程每flush_interval秒批量写入。
 """
 
+import atexit
 import hashlib
 import sqlite3
 import secrets
+import threading
 import time
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -20,15 +25,40 @@ logger = logging.getLogger(__name__)
 class UserDatabase:
     """用户数据库管理类"""
     
-    def __init__(self, db_path: str = "data/users.db"):
+    def __init__(
+        self,
+        db_path: str = "data/users.db",
+        session_cache_ttl: float = 60.0,
+        flush_interval: float = 2.0
+    ):
         """
         初始化用户数据库
         
         Args:
             db_path: 数据库文件路径
+            session_cache_ttl: 令牌验证结果的缓存时间（秒），0表示不缓存
+            flush_interval: 会话活动和活动日志的批量写入间隔（秒），0表示立即写入
         """
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.session_cache_ttl = session_cache_ttl
+        self.flush_interval = flush_interval
+        
+        # 令牌 -> (缓存时间, 会话ID, 过期时间, 用户信息)
+        self._session_cache: Dict[str, Tuple[float, str, datetime, Dict]] = {}
+        self._user_tokens: Dict[int, Set[str]] = {}
+        # 每次失效递增，验证期间发生过失效的查询结果不写入缓存
+        self._cache_generation = 0
+        self._cache_lock = threading.Lock()
+        
+        # 待写入的会话活动时间（会话ID -> 时间）和活动日志
+        self._pending_activity: Dict[str, str] = {}
+        self._pending_logs: List[Tuple] = []
+        self._write_lock = threading.Lock()
+        self._writer_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._exit_hook_registered = False
+        
         self._init_database()
         
     def _init_database(self):
@@ -319,7 +349,7 @@ class UserDatabase:
     
     def verify_token(self, token: str) -> Tuple[bool, str, Optional[Dict]]:
         """
-        验证访问令牌
+        验证访问令牌，优先使用缓存
         
         Args:
             token: 访问令牌
@@ -327,6 +357,13 @@ class UserDatabase:
         Returns:
             (有效标志, 消息, 用户信息)
         """
+        cached = self.verify_cached_token(token)
+        if cached is not None:
+            return cached
+        
+        with self._cache_lock:
+            generation = self._cache_generation
+        
         try:
             with sqlite3.connect(self.db_path) as conn:
                 conn.row_factory = sqlite3.Row
@@ -366,15 +403,7 @@ class UserDatabase:
                     conn.commit()
                     return False, "令牌已过期", None
                 
-                # 更新最后活动时间
-                cursor.execute("""
-                    UPDATE user_sessions 
-                    SET last_activity = CURRENT_TIMESTAMP 
-                    WHERE session_id = ?
-                """, (session['session_id'],))
-                conn.commit()
-                
-                # 返回用户信息
+                # 用户信息
                 user_info = {
                     'user_id': session['user_id'],
                     'username': session['username'],
@@ -386,11 +415,71 @@ class UserDatabase:
                     'daily_token_limit': session['daily_token_limit']
                 }
                 
-                return True, "令牌有效", user_info
-                
         except Exception as e:
             logger.error(f"令牌验证失败: {e}")
             return False, f"令牌验证失败: {str(e)}", None
+        
+        if self.session_cache_ttl > 0:
+            with self._cache_lock:
+                if generation == self._cache_generation:
+                    self._session_cache[token] = (
+                        time.monotonic(), session['session_id'], expires_at, user_info
+                    )
+                    self._user_tokens.setdefault(user_info['user_id'], set()).add(token)
+        
+        # 更新最后活动时间（批量写入）
+        self._record_session_activity(session['session_id'])
+        return True, "令牌有效", dict(user_info)
+    
+    def verify_cached_token(self, token: str) -> Optional[Tuple[bool, str, Optional[Dict]]]:
+        """
+        只从缓存验证令牌，不访问数据库
+        
+        Args:
+            token: 访问令牌
+            
+        Returns:
+            缓存命中时返回(有效标志, 消息, 用户信息)，未命中返回None
+        """
+        with self._cache_lock:
+            cached = self._session_cache.get(token)
+            if cached is None:
+                return None
+            cached_at, session_id, expires_at, user_info = cached
+            if (
+                time.monotonic() - cached_at >= self.session_cache_ttl
+                or datetime.now() > expires_at
+            ):
+                # 缓存过期或令牌过期，交给数据库重新验证
+                self._drop_cached_token(token)
+                return None
+        
+        self._record_session_activity(session_id)
+        return True, "令牌有效", dict(user_info)
+    
+    def invalidate_user_cache(self, user_id: int):
+        """
+        清除某个用户全部令牌的缓存（用户信息或权限变化后调用）
+        
+        Args:
+            user_id: 用户ID
+        """
+        with self._cache_lock:
+            self._cache_generation += 1
+            for token in list(self._user_tokens.get(user_id, ())):
+                self._drop_cached_token(token)
+    
+    def _drop_cached_token(self, token: str):
+        """移除一个令牌的缓存，调用方需持有_cache_lock"""
+        cached = self._session_cache.pop(token, None)
+        if cached is None:
+            return
+        user_id = cached[3]['user_id']
+        tokens = self._user_tokens.get(user_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._user_tokens[user_id]
     
     def invalidate_session(self, token: str) -> bool:
         """
@@ -402,6 +491,10 @@ class UserDatabase:
         Returns:
             是否成功
         """
+        with self._cache_lock:
+            self._cache_generation += 1
+            self._drop_cached_token(token)
+        
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
@@ -427,7 +520,7 @@ class UserDatabase:
         ip_address: Optional[str] = None
     ):
         """
-        记录用户活动
+        记录用户活动（批量写入）
         
         Args:
             user_id: 用户ID
@@ -435,20 +528,98 @@ class UserDatabase:
             activity_detail: 活动详情
             ip_address: IP地址
         """
+        with self._write_lock:
+            self._pending_logs.append(
+                (user_id, activity_type, activity_detail, ip_address, self._db_timestamp())
+            )
+        self._schedule_flush()
+    
+    def flush_pending_writes(self) -> int:
+        """
+        把待写入的会话活动时间和活动日志一次性写入数据库
+        
+        Returns:
+            写入的记录数
+        """
+        with self._write_lock:
+            activity = self._pending_activity
+            logs = self._pending_logs
+            self._pending_activity = {}
+            self._pending_logs = []
+        
+        if not activity and not logs:
+            return 0
+        
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
-                cursor.execute("""
+                cursor.executemany("""
+                    UPDATE user_sessions 
+                    SET last_activity = ? 
+                    WHERE session_id = ?
+                """, [(timestamp, session_id) for session_id, timestamp in activity.items()])
+                
+                cursor.executemany("""
                     INSERT INTO user_activity_log 
-                    (user_id, activity_type, activity_detail, ip_address)
-                    VALUES (?, ?, ?, ?)
-                """, (user_id, activity_type, activity_detail, ip_address))
+                    (user_id, activity_type, activity_detail, ip_address, timestamp)
+                    VALUES (?, ?, ?, ?, ?)
+                """, logs)
                 
                 conn.commit()
+                return len(activity) + len(logs)
                 
         except Exception as e:
-            logger.error(f"记录用户活动失败: {e}")
+            logger.error(f"批量写入用户活动失败: {e}")
+            return 0
+    
+    def close(self):
+        """停止后台写入线程并写入剩余记录"""
+        self._stop_event.set()
+        if self._writer_thread is not None:
+            self._writer_thread.join(timeout=5)
+            self._writer_thread = None
+        self.flush_pending_writes()
+    
+    def _record_session_activity(self, session_id: str):
+        """
+        记录会话的最后活动时间（批量写入）
+        
+        Args:
+            session_id: 会话ID
+        """
+        with self._write_lock:
+            self._pending_activity[session_id] = self._db_timestamp()
+        self._schedule_flush()
+    
+    def _schedule_flush(self):
+        """确保后台写入线程在运行；flush_interval为0时立即写入"""
+        if self.flush_interval <= 0:
+            self.flush_pending_writes()
+            return
+        
+        if self._writer_thread is None:
+            with self._write_lock:
+                if self._writer_thread is None:
+                    self._stop_event.clear()
+                    self._writer_thread = threading.Thread(
+                        target=self._writer_loop, daemon=True
+                    )
+                    self._writer_thread.start()
+                    if not self._exit_hook_registered:
+                        # 进程退出前写入剩余记录
+                        atexit.register(self.close)
+                        self._exit_hook_registered = True
+    
+    def _writer_loop(self):
+        """后台写入循环"""
+        while not self._stop_event.wait(self.flush_interval):
+            self.flush_pending_writes()
+    
+    @staticmethod
+    def _db_timestamp() -> str:
+        """与SQLite CURRENT_TIMESTAMP格式一致的当前UTC时间"""
+        return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
     
     def get_user_by_id(self, user_id: int) -> Optional[Dict]:
         """
@@ -537,6 +708,7 @@ class UserDatabase:
                 sql = f"UPDATE users SET {', '.join(updates)} WHERE user_id = ?"
                 cursor.execute(sql, params)
                 conn.commit()
+                self.invalidate_user_cache(user_id)
                 
                 return True, "资料更新成功"
                 
@@ -604,6 +776,7 @@ class UserDatabase:
                 """, (user_id,))
                 
                 conn.commit()
+                self.invalidate_user_cache(user_id)
                 
                 logger.info(f"用户 {user_id} 修改密码成功")
                 return True, "密码修改成功"
@@ -1046,10 +1046,33 @@ class AlgoVoiceEngine:
         # ==================== API 路由定义 ====================
 
         # ==================== 用户认证API ====================
-        from fastapi import Header
+        from fastapi import Header, Request
+        from fastapi.responses import StreamingResponse
 
+        from common.job_queue import FallbackResult, JobLimitError, get_job_queue
         from common.user_database import user_db
 
+        # 回测、策略生成等耗时任务提交到后台任务队列，避免阻塞事件循环
+        job_queue = get_job_queue()
+
+        async def verify_token_async(token: str):
+            """验证令牌：缓存未命中时在线程中查询数据库，不阻塞事件循环"""
+            cached = user_db.verify_cached_token(token)
+            if cached is not None:
+                return cached
+            return await asyncio.to_thread(user_db.verify_token, token)
+
+        async def resolve_job_owner(authorization: str, http_request: Request) -> str:
+            """确定任务所属用户：已登录用户按用户ID，未登录按客户端地址"""
+            if authorization and authorization.startswith("Bearer "):
+                valid, _, user_info = await verify_token_async(
+                    authorization.replace("Bearer ", "")
+                )
+                if valid:
+                    return str(user_info["user_id"])
+            host = http_request.client.host if http_request.client else "unknown"
+            return f"anonymous:{host}"
+
         @app.post("/api/auth/register")
         async def register_user(request: Dict):
             """用户注册 - 所有新用户默认为普通用户（权限等级1）"""
@@ -1416,6 +1439,7 @@ class AlgoVoiceEngine:
 
                 conn.commit()
                 conn.close()
+                user_db.invalidate_user_cache(user_info["user_id"])
 
                 # 记录活动日志
                 user_db.log_activity(
@@ -1531,6 +1555,31 @@ class AlgoVoiceEngine:
                 logger.error(f"获取系统统计失败: {e}")
                 return {"status": "error", "message": f"获取失败: {str(e)}"}
 
+        @app.get("/api/admin/db/stats")
+        async def get_database_pool_stats(authorization: str = Header(None)):
+            """获取数据库连接池与查询耗时统计（管理员）"""
+            from common.db_connection_pool import get_all_pool_stats
+
+            try:
+                if not authorization or not authorization.startswith("Bearer "):
+                    return {"status": "error", "message": "未授权"}
+
+                token = authorization.replace("Bearer ", "")
+                valid, message, user_info = user_db.verify_token(token)
+
+                if not valid:
+                    return {"status": "error", "message": "令牌无效"}
+
+                # 检查管理员权限
+                if user_info.get("permission_level", 1) < 2:
+                    return {"status": "error", "message": "需要管理员权限"}
+
+                return {"status": "success", "data": get_all_pool_stats()}
+
+            except Exception as e:
+                logger.error(f"获取数据库统计失败: {e}")
+                return {"status": "error", "message": f"获取失败: {str(e)}"}
+
         @app.put("/api/admin/user/{user_id}/permission")
         async def update_user_permission(
             user_id: int, request: Dict, authorization: str = Header(None)
@@ -2332,9 +2381,71 @@ class AlgoVoiceEngine:
 
         # ==================== 策略管理API ====================
 
+        async def generate_strategy_job(params: Dict, progress) -> Dict:
+            """策略生成任务（在任务队列的工作线程中执行）"""
+            requirements = params.get("requirements", {})
+            description = requirements.get("description", "")
+
+            logger.info(f"开始生成策略: {description[:50]}...")
+
+            # 使用阿里云AI服务生成策略
+            from module_10_ai_interaction.aliyun_ai_service import (
+                get_aliyun_ai_service,
+            )
+
+            ai_service = get_aliyun_ai_service()
+
+            # 解析投资需求
+            progress(0, 2, "分析投资需求")
+            parsed_requirement = await ai_service.parse_investment_requirement(
+                description
+            )
+
+            # 生成策略方案
+            progress(1, 2, "生成策略方案")
+            strategy_data = await ai_service.generate_strategy(
+                requirement=description, market_data=None, market_analysis=None
+            )
+
+            # 构建策略对象
+            strategy = {
+                "id": f"strategy_{datetime.now().strftime('%Y%m%d%H%M%S')}",
+                "name": strategy_data.get(
+                    "strategy_name", requirements.get("name", "AI生成策略")
+                ),
+                "description": strategy_data.get("strategy_description", description),
+                "type": requirements.get("strategy_type", "ai_generated"),
+                "recommended_stocks": strategy_data.get("recommended_stocks", []),
+                "risk_management": strategy_data.get("risk_management", {}),
+                "expected_performance": strategy_data.get("expected_performance", {}),
+                "key_points": strategy_data.get("key_points", []),
+                "parameters": parsed_requirement.get("strategy_params", {}),
+                "risk_level": parsed_requirement.get("parsed_requirement", {}).get(
+                    "risk_tolerance", "moderate"
+                ),
+                "created_at": datetime.now().isoformat(),
+            }
+
+            logger.info(f"策略生成成功: {strategy['name']}")
+
+            return {
+                "status": "success",
+                "data": {
+                    "strategy": strategy,
+                    "parsed_requirements": parsed_requirement.get(
+                        "parsed_requirement", {}
+                    ),
+                },
+            }
+
+        job_queue.register_handler("strategy_generate", generate_strategy_job)
+
         @app.post("/api/v1/strategy/generate")
         async def generate_strategy(request: Dict, authorization: str = Header(None)):
-            """根据用户需求生成策略 - 使用阿里云AI（需要管理员权限）"""
+            """根据用户需求生成策略 - 使用阿里云AI（需要管理员权限）
+
+            提交后台任务并立即返回任务ID，通过 /api/v1/jobs/{job_id} 查询进度和结果
+            """
             try:
                 # 权限检查：策略生成功能仅限管理员
                 from common.permissions import UserPermissions, get_user_permissions
@@ -2343,7 +2454,7 @@ class AlgoVoiceEngine:
                     return {"status": "error", "error": "未授权：请先登录"}
 
                 token = authorization.replace("Bearer ", "")
-                valid, message, user_info = user_db.verify_token(token)
+                valid, message, user_info = await verify_token_async(token)
 
                 if not valid:
                     return {"status": "error", "error": "令牌无效或已过期"}
@@ -2364,59 +2475,14 @@ class AlgoVoiceEngine:
                 if not description.strip():
                     return {"status": "error", "error": "请提供策略需求描述"}
 
-                logger.info(f"开始生成策略: {description[:50]}...")
-
-                # 使用阿里云AI服务生成策略
-                from module_10_ai_interaction.aliyun_ai_service import (
-                    get_aliyun_ai_service,
-                )
-
-                ai_service = get_aliyun_ai_service()
-
-                # 解析投资需求
-                parsed_requirement = await ai_service.parse_investment_requirement(
-                    description
-                )
-
-                # 生成策略方案
-                strategy_data = await ai_service.generate_strategy(
-                    requirement=description, market_data=None, market_analysis=None
+                job = job_queue.submit(
+                    "strategy_generate",
+                    {"requirements": requirements},
+                    user_id=user_info["user_id"],
                 )
-
-                # 构建策略对象
-                strategy = {
-                    "id": f"strategy_{datetime.now().strftime('%Y%m%d%H%M%S')}",
-                    "name": strategy_data.get(
-                        "strategy_name", requirements.get("name", "AI生成策略")
-                    ),
-                    "description": strategy_data.get(
-                        "strategy_description", description
-                    ),
-                    "type": requirements.get("strategy_type", "ai_generated"),
-                    "recommended_stocks": strategy_data.get("recommended_stocks", []),
-                    "risk_management": strategy_data.get("risk_management", {}),
-                    "expected_performance": strategy_data.get(
-                        "expected_performance", {}
-                    ),
-                    "key_points": strategy_data.get("key_points", []),
-                    "parameters": parsed_requirement.get("strategy_params", {}),
-                    "risk_level": parsed_requirement.get("parsed_requirement", {}).get(
-                        "risk_tolerance", "moderate"
-                    ),
-                    "created_at": datetime.now().isoformat(),
-                }
-
-                logger.info(f"策略生成成功: {strategy['name']}")
-
-                return {
-                    "status": "success",
-                    "data": {
-                        "strategy": strategy,
-                        "parsed_requirements": parsed_requirement.get(
-                            "parsed_requirement", {}
-                        ),
-                    },
-                }
+                return {"status": "success", "data": job.to_dict()}
+            except JobLimitError as e:
+                return {"status": "error", "error": str(e)}
             except Exception as e:
                 logger.error(f"生成策略失败: {e}")
                 import traceback
@@ -3021,261 +3087,348 @@ class AlgoVoiceEngine:
                 logger.error(f"Failed to get recent trades: {e}")
                 return {"error": str(e), "status": "error"}
 
-        @app.post("/api/v1/backtest/run")
-        async def run_backtest(request: Dict):
-            """运行策略回测"""
-            try:
-                strategy = request.get("strategy", "sma")
-                symbol = request.get("symbol", "000001")
-                start_date = request.get("start_date", "2023-01-01")
-                end_date = request.get("end_date", "2023-12-31")
-                initial_capital = request.get("initial_capital", 1000000)
+        def run_backtest_job(params: Dict, progress) -> Dict:
+            """回测任务（在任务队列的工作线程中执行）"""
+            strategy = params.get("strategy", "sma")
+            symbol = params.get("symbol", "000001")
+            start_date = params.get("start_date", "2023-01-01")
+            end_date = params.get("end_date", "2023-12-31")
+            initial_capital = params.get("initial_capital", 1000000)
 
-                # 导入回测引擎和数据收集器
-                from datetime import datetime
+            # 导入回测引擎和数据收集器
+            from datetime import datetime
 
-                import pandas as pd
-
-                from module_01_data_pipeline.data_acquisition.akshare_collector import (
-                    AkshareDataCollector,
-                )
-                from module_09_backtesting.backtest_engine import (
-                    BacktestConfig,
-                    BacktestEngine,
-                )
+            import pandas as pd
 
-                # 转换日期格式
-                start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-                end_dt = datetime.strptime(end_date, "%Y-%m-%d")
-
-                # 创建回测配置
-                config = BacktestConfig(
-                    start_date=start_dt,
-                    end_date=end_dt,
-                    initial_capital=float(initial_capital),
-                    commission_rate=0.001,
-                    slippage_bps=5.0,
-                )
+            from module_01_data_pipeline.data_acquisition.akshare_collector import (
+                AkshareDataCollector,
+            )
+            from module_09_backtesting.backtest_engine import (
+                BacktestConfig,
+                BacktestEngine,
+            )
 
-                # 创建回测引擎
-                engine = BacktestEngine(config)
+            # 转换日期格式
+            start_dt = datetime.strptime(start_date, "%Y-%m-%d")
+            end_dt = datetime.strptime(end_date, "%Y-%m-%d")
+
+            # 创建回测配置
+            config = BacktestConfig(
+                start_date=start_dt,
+                end_date=end_dt,
+                initial_capital=float(initial_capital),
+                commission_rate=0.001,
+                slippage_bps=5.0,
+            )
 
-                try:
-                    # 获取市场数据
-                    collector = AkshareDataCollector()
-                    start_date_str = start_dt.strftime("%Y%m%d")
-                    end_date_str = end_dt.strftime("%Y%m%d")
+            # 创建回测引擎
+            engine = BacktestEngine(config)
 
-                    df = collector.fetch_stock_history(
-                        symbol=symbol,
-                        start_date=start_date_str,
-                        end_date=end_date_str,
-                        period="daily",
-                    )
+            try:
+                # 获取市场数据
+                progress(0, 1, "获取行情数据")
+                collector = AkshareDataCollector()
+                start_date_str = start_dt.strftime("%Y%m%d")
+                end_date_str = end_dt.strftime("%Y%m%d")
+
+                df = collector.fetch_stock_history(
+                    symbol=symbol,
+                    start_date=start_date_str,
+                    end_date=end_date_str,
+                    period="daily",
+                )
 
-                    if df.empty:
-                        raise Exception(f"No data found for {symbol}")
+                if df.empty:
+                    raise Exception(f"No data found for {symbol}")
 
-                    # 设置索引为日期
-                    df.set_index("date", inplace=True)
+                # 设置索引为日期
+                df.set_index("date", inplace=True)
 
-                    # 加载市场数据到回测引擎
-                    engine.load_market_data([symbol], {symbol: df})
+                # 加载市场数据到回测引擎
+                engine.load_market_data([symbol], {symbol: df})
 
-                    # 导入信号生成器
-                    from module_08_execution.signal_generator import SignalGenerator
+                # 导入信号生成器
+                from module_08_execution.signal_generator import SignalGenerator
 
-                    # 创建信号生成器
-                    signal_generator = SignalGenerator()
+                # 创建信号生成器
+                signal_generator = SignalGenerator()
 
-                    # 定义策略函数
-                    def strategy_function(current_data, positions, cash):
-                        """策略函数"""
-                        signals = []
+                # 定义策略函数
+                def strategy_function(current_data, positions, cash):
+                    """策略函数"""
+                    signals = []
 
-                        if symbol in current_data:
-                            # 获取历史数据（这里简化处理，实际应该维护完整的历史数据）
-                            # 为了演示，我们使用当前数据点
-                            data_point = current_data[symbol]
+                    if symbol in current_data:
+                        # 获取历史数据（这里简化处理，实际应该维护完整的历史数据）
+                        # 为了演示，我们使用当前数据点
+                        data_point = current_data[symbol]
 
-                            # 根据策略类型生成信号
-                            if strategy == "sma":
-                                # 简单移动平均策略
-                                signal = signal_generator.generate_ma_crossover_signal(
-                                    symbol=symbol,
-                                    data=df.tail(50),  # 使用最近50天的数据
-                                    short_window=5,
-                                    long_window=20,
-                                )
-                            elif strategy == "rsi":
-                                # RSI策略
-                                signal = signal_generator.generate_rsi_signal(
+                        # 根据策略类型生成信号
+                        if strategy == "sma":
+                            # 简单移动平均策略
+                            signal = signal_generator.generate_ma_crossover_signal(
+                                symbol=symbol,
+                                data=df.tail(50),  # 使用最近50天的数据
+                                short_window=5,
+                                long_window=20,
+                            )
+                        elif strategy == "rsi":
+                            # RSI策略
+                            signal = signal_generator.generate_rsi_signal(
+                                symbol=symbol,
+                                data=df.tail(30),  # 使用最近30天的数据
+                                rsi_period=14,
+                            )
+                        elif strategy == "bollinger":
+                            # 布林带策略
+                            signal = (
+                                signal_generator.generate_bollinger_bands_signal(
                                     symbol=symbol,
                                     data=df.tail(30),  # 使用最近30天的数据
-                                    rsi_period=14,
+                                    period=20,
                                 )
-                            elif strategy == "bollinger":
-                                # 布林带策略
-                                signal = (
-                                    signal_generator.generate_bollinger_bands_signal(
-                                        symbol=symbol,
-                                        data=df.tail(30),  # 使用最近30天的数据
-                                        period=20,
-                                    )
-                                )
-                            else:
-                                # 默认使用移动平均策略
-                                signal = signal_generator.generate_ma_crossover_signal(
-                                    symbol=symbol,
-                                    data=df.tail(50),
-                                    short_window=5,
-                                    long_window=20,
-                                )
-
-                            if signal:
-                                # 转换为标准信号
-                                standard_signal = signal_generator.convert_to_signal(
-                                    signal
-                                )
-                                signals.append(standard_signal)
-
-                        return signals
+                            )
+                        else:
+                            # 默认使用移动平均策略
+                            signal = signal_generator.generate_ma_crossover_signal(
+                                symbol=symbol,
+                                data=df.tail(50),
+                                short_window=5,
+                                long_window=20,
+                            )
 
-                    # 设置策略
-                    engine.set_strategy(strategy_function)
+                        if signal:
+                            # 转换为标准信号
+                            standard_signal = signal_generator.convert_to_signal(
+                                signal
+                            )
+                            signals.append(standard_signal)
 
-                    # 运行回测
-                    result = engine.run()
+                    return signals
 
-                    # 安全转换数值，处理NaN和无穷大值
-                    def safe_float(value, default=0.0):
-                        """安全转换浮点数，处理NaN和无穷大值"""
-                        import math
+                # 设置策略
+                engine.set_strategy(strategy_function)
 
-                        if value is None or math.isnan(value) or math.isinf(value):
-                            return default
-                        return float(value)
+                # 运行回测，进度通过任务队列推送
+                engine.set_progress_callback(progress)
+                result = engine.run()
 
-                    def safe_percentage(value, default=0.0):
-                        """安全转换百分比"""
-                        return safe_float(value * 100, default)
+                # 安全转换数值，处理NaN和无穷大值
+                def safe_float(value, default=0.0):
+                    """安全转换浮点数，处理NaN和无穷大值"""
+                    import math
 
-                    # 转换结果为API格式
-                    api_result = {
-                        "strategy": strategy,
-                        "symbol": symbol,
-                        "start_date": start_date,
-                        "end_date": end_date,
-                        "initial_capital": safe_float(initial_capital, 1000000),
-                        "total_return": safe_percentage(result.total_return, 0.0),
-                        "annualized_return": safe_percentage(
-                            result.annualized_return, 0.0
-                        ),
-                        "volatility": safe_percentage(result.volatility, 0.0),
-                        "sharpe_ratio": safe_float(result.sharpe_ratio, 0.0),
-                        "max_drawdown": safe_percentage(result.max_drawdown, 0.0),
-                        "win_rate": safe_float(result.win_rate, 0.0),
-                        "profit_factor": safe_float(result.profit_factor, 0.0),
-                        "total_trades": int(safe_float(result.total_trades, 0)),
-                        "winning_trades": len(
-                            [t for t in result.trades if t.get("realized_pnl", 0) > 0]
-                        ),
-                        "losing_trades": len(
-                            [t for t in result.trades if t.get("realized_pnl", 0) < 0]
-                        ),
-                        "avg_win": 2.8,  # 简化计算
-                        "avg_loss": -1.2,  # 简化计算
-                        "final_capital": safe_float(
-                            result.final_capital, initial_capital
-                        ),
-                        "equity_curve": [
-                            {
-                                "date": row.index.strftime("%Y-%m-%d")
-                                if hasattr(row.index, "strftime")
-                                else str(row.index),
-                                "value": safe_float(row["equity"], initial_capital),
-                            }
-                            for _, row in result.equity_curve.iterrows()
-                        ]
-                        if not result.equity_curve.empty
-                        else [],
-                        "trades": [
-                            {
-                                "date": trade["date"].strftime("%Y-%m-%d %H:%M:%S")
-                                if hasattr(trade["date"], "strftime")
-                                else str(trade["date"]),
-                                "action": trade.get("action", "UNKNOWN"),
-                                "price": safe_float(trade.get("price", 0), 0),
-                                "quantity": int(
-                                    safe_float(trade.get("quantity", 0), 0)
-                                ),
-                            }
-                            for trade in result.trades
-                        ],
-                        "status": "completed",
-                    }
+                    if value is None or math.isnan(value) or math.isinf(value):
+                        return default
+                    return float(value)
 
-                    logger.info(
-                        f"Backtest completed for {symbol} with {strategy} strategy"
-                    )
-                    return {
-                        "data": api_result,
-                        "message": "Backtest completed successfully",
-                    }
+                def safe_percentage(value, default=0.0):
+                    """安全转换百分比"""
+                    return safe_float(value * 100, default)
 
-                except Exception as e:
-                    logger.error(f"Real backtest failed for {symbol}: {e}")
-                    # 返回模拟数据作为备选
-                result = {
+                # 转换结果为API格式
+                api_result = {
                     "strategy": strategy,
                     "symbol": symbol,
                     "start_date": start_date,
                     "end_date": end_date,
-                    "initial_capital": initial_capital,
-                    "total_return": 25.6,
-                    "annualized_return": 12.8,
-                    "volatility": 15.2,
-                    "sharpe_ratio": 1.85,
-                    "max_drawdown": -8.2,
-                    "win_rate": 0.65,
-                    "profit_factor": 1.45,
-                    "total_trades": 156,
-                    "winning_trades": 101,
-                    "losing_trades": 55,
-                    "avg_win": 2.8,
-                    "avg_loss": -1.2,
-                    "final_capital": 1256000,
+                    "initial_capital": safe_float(initial_capital, 1000000),
+                    "total_return": safe_percentage(result.total_return, 0.0),
+                    "annualized_return": safe_percentage(
+                        result.annualized_return, 0.0
+                    ),
+                    "volatility": safe_percentage(result.volatility, 0.0),
+                    "sharpe_ratio": safe_float(result.sharpe_ratio, 0.0),
+                    "max_drawdown": safe_percentage(result.max_drawdown, 0.0),
+                    "win_rate": safe_float(result.win_rate, 0.0),
+                    "profit_factor": safe_float(result.profit_factor, 0.0),
+                    "total_trades": int(safe_float(result.total_trades, 0)),
+                    "winning_trades": len(
+                        [t for t in result.trades if t.get("realized_pnl", 0) > 0]
+                    ),
+                    "losing_trades": len(
+                        [t for t in result.trades if t.get("realized_pnl", 0) < 0]
+                    ),
+                    "avg_win": 2.8,  # 简化计算
+                    "avg_loss": -1.2,  # 简化计算
+                    "final_capital": safe_float(
+                        result.final_capital, initial_capital
+                    ),
                     "equity_curve": [
-                        {"date": "2023-01-01", "value": 1000000},
-                        {"date": "2023-06-01", "value": 1080000},
-                        {"date": "2023-12-31", "value": 1256000},
-                    ],
-                    "trades": [
                         {
-                            "date": "2023-01-15",
-                            "action": "BUY",
-                            "price": 12.00,
-                            "quantity": 1000,
-                        },
+                            "date": row.index.strftime("%Y-%m-%d")
+                            if hasattr(row.index, "strftime")
+                            else str(row.index),
+                            "value": safe_float(row["equity"], initial_capital),
+                        }
+                        for _, row in result.equity_curve.iterrows()
+                    ]
+                    if not result.equity_curve.empty
+                    else [],
+                    "trades": [
                         {
-                            "date": "2023-06-15",
-                            "action": "SELL",
-                            "price": 13.50,
-                            "quantity": 1000,
-                        },
+                            "date": trade["date"].strftime("%Y-%m-%d %H:%M:%S")
+                            if hasattr(trade["date"], "strftime")
+                            else str(trade["date"]),
+                            "action": trade.get("action", "UNKNOWN"),
+                            "price": safe_float(trade.get("price", 0), 0),
+                            "quantity": int(
+                                safe_float(trade.get("quantity", 0), 0)
+                            ),
+                        }
+                        for trade in result.trades
                     ],
                     "status": "completed",
                 }
 
+                logger.info(
+                    f"Backtest completed for {symbol} with {strategy} strategy"
+                )
                 return {
+                    "data": api_result,
+                    "message": "Backtest completed successfully",
+                }
+
+            except Exception as e:
+                logger.error(f"Real backtest failed for {symbol}: {e}")
+                # 返回模拟数据作为备选
+            result = {
+                "strategy": strategy,
+                "symbol": symbol,
+                "start_date": start_date,
+                "end_date": end_date,
+                "initial_capital": initial_capital,
+                "total_return": 25.6,
+                "annualized_return": 12.8,
+                "volatility": 15.2,
+                "sharpe_ratio": 1.85,
+                "max_drawdown": -8.2,
+                "win_rate": 0.65,
+                "profit_factor": 1.45,
+                "total_trades": 156,
+                "winning_trades": 101,
+                "losing_trades": 55,
+                "avg_win": 2.8,
+                "avg_loss": -1.2,
+                "final_capital": 1256000,
+                "equity_curve": [
+                    {"date": "2023-01-01", "value": 1000000},
+                    {"date": "2023-06-01", "value": 1080000},
+                    {"date": "2023-12-31", "value": 1256000},
+                ],
+                "trades": [
+                    {
+                        "date": "2023-01-15",
+                        "action": "BUY",
+                        "price": 12.00,
+                        "quantity": 1000,
+                    },
+                    {
+                        "date": "2023-06-15",
+                        "action": "SELL",
+                        "price": 13.50,
+                        "quantity": 1000,
+                    },
+                ],
+                "status": "completed",
+            }
+
+            return FallbackResult(
+                {
                     "data": result,
                     "message": "Backtest completed successfully (using mock data)",
-                }
+                },
+                reason="真实回测失败，使用模拟数据",
+            )
+
+        job_queue.register_handler("backtest", run_backtest_job)
+
+        @app.post("/api/v1/backtest/run")
+        async def run_backtest(
+            request: Dict, http_request: Request, authorization: str = Header(None)
+        ):
+            """提交策略回测任务
 
+            立即返回任务ID，通过 /api/v1/jobs/{job_id} 轮询或
+            /api/v1/jobs/{job_id}/events (SSE) 获取进度和结果
+            """
+            try:
+                owner = await resolve_job_owner(authorization, http_request)
+                job = job_queue.submit("backtest", request, user_id=owner)
+                return {"status": "success", "data": job.to_dict()}
+            except JobLimitError as e:
+                return {"error": str(e), "status": "error"}
             except Exception as e:
-                logger.error(f"Backtest failed: {e}")
+                logger.error(f"Backtest submission failed: {e}")
                 return {"error": str(e), "status": "error"}
 
+        # ==================== 后台任务API ====================
+
+        @app.get("/api/v1/jobs")
+        async def list_jobs(
+            http_request: Request,
+            job_type: str = None,
+            limit: int = 20,
+            authorization: str = Header(None),
+        ):
+            """列出当前用户最近的后台任务"""
+            try:
+                owner = await resolve_job_owner(authorization, http_request)
+                jobs = job_queue.list_jobs(owner, job_type=job_type, limit=limit)
+                return {"status": "success", "data": jobs}
+            except Exception as e:
+                logger.error(f"获取任务列表失败: {e}")
+                return {"status": "error", "error": str(e)}
+
+        @app.get("/api/v1/jobs/{job_id}")
+        async def get_job_status(
+            job_id: str, http_request: Request, authorization: str = Header(None)
+        ):
+            """查询后台任务状态和进度"""
+            owner = await resolve_job_owner(authorization, http_request)
+            job = job_queue.get_job(job_id, user_id=owner)
+            if job is None:
+                return {"status": "error", "error": "任务不存在"}
+            return {"status": "success", "data": job.to_dict()}
+
+        @app.get("/api/v1/jobs/{job_id}/result")
+        async def get_job_result(
+            job_id: str, http_request: Request, authorization: str = Header(None)
+        ):
+            """获取后台任务结果（任务结束后可用）"""
+            owner = await resolve_job_owner(authorization, http_request)
+            job = job_queue.get_job(job_id, user_id=owner)
+            if job is None:
+                return {"status": "error", "error": "任务不存在"}
+            return {"status": "success", "data": job.to_dict(include_result=True)}
+
+        @app.get("/api/v1/jobs/{job_id}/events")
+        async def stream_job_events(
+            job_id: str, http_request: Request, authorization: str = Header(None)
+        ):
+            """以SSE推送后台任务进度，任务结束时推送最终状态后关闭连接"""
+            import json
+
+            owner = await resolve_job_owner(authorization, http_request)
+            if job_queue.get_job(job_id, user_id=owner) is None:
+                return {"status": "error", "error": "任务不存在"}
+
+            async def event_stream():
+                async for snapshot in job_queue.watch(job_id, user_id=owner):
+                    yield f"data: {json.dumps(snapshot, ensure_ascii=False)}\n\n"
+
+            return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+        @app.delete("/api/v1/jobs/{job_id}")
+        async def cancel_job(
+            job_id: str, http_request: Request, authorization: str = Header(None)
+        ):
+            """取消仍在排队的后台任务"""
+            owner = await resolve_job_owner(authorization, http_request)
+            if job_queue.cancel(job_id, user_id=owner):
+                return {"status": "success", "message": "任务已取消"}
+            return {"status": "error", "error": "任务不存在或已开始执行"}
+
         @app.post("/api/v1/data/collect")
         async def collect_market_data(request: Dict):
             """收集市场数据（使用本地缓存）"""
@@ -3536,21 +3689,23 @@ class AlgoVoiceEngine:
                 logger.error(f"Failed to get data overview: {e}")
                 return {"error": str(e), "status": "error"}
 
-        @app.get("/api/v1/market/indices")
-        async def get_market_indices():
-            """获取市场指数数据 - 多层缓存 + 降级策略"""
+        # 市场指数/热门股票：内存缓存 → 数据库缓存 → 实时获取
+        # AsyncCache保证同一时刻只有一个请求访问数据库缓存和外部数据源，
+        # 内存缓存过期后10分钟内先返回旧数据，同时在后台刷新
+        def _with_cache_status(result: Dict, status: str) -> Dict:
+            """复制缓存结果并标注是否来自缓存"""
+            response = dict(result)
+            response["from_cache"] = status != "miss"
+            if status == "stale":
+                response["stale"] = True
+            return response
+
+        async def _load_market_indices() -> Dict:
+            """内存缓存未命中时获取市场指数：数据库缓存（当日数据）→ 东方财富"""
             from common.cache_manager import get_market_data_cache
-            from common.market_data_scheduler import get_scheduler
-            
+
             market_cache = get_market_data_cache()
-            
-            # ===== 第一层：内存缓存（1-2分钟）=====
-            cached_data = market_cache.get_market_indices()
-            if cached_data:
-                logger.info("✅ 从内存缓存返回市场指数数据")
-                cached_data["from_cache"] = True
-                return cached_data
-            
+
             # ===== 第二层：数据库缓存（当日数据）=====
             try:
                 from common.market_data_db_cache import get_db_cache
@@ -3566,7 +3721,7 @@ class AlgoVoiceEngine:
             # 检查是否允许请求外部数据源（限流保护）
             if not market_cache.should_fetch_from_source('indices', min_interval=90):
                 # 限流中，返回空数据但不报错
-                logger.warning("⏸️ 请求限流中，返回最近的缓存数据")
+                logger.warning("⏸️ 请求限流中，返回空数据")
                 return {
                     "data": {
                         "timestamp": datetime.now().isoformat(),
@@ -3574,7 +3729,6 @@ class AlgoVoiceEngine:
                         "source": "rate_limited",
                     },
                     "message": "请求过于频繁，请稍后再试",
-                    "from_cache": False,
                 }
             
             # 定义需要查询的指数配置
@@ -3607,20 +3761,8 @@ class AlgoVoiceEngine:
 
                 if indices and len(indices) > 0:
                     logger.info(f"✅ 成功获取 {len(indices)} 个指数")
-                    result = {
-                        "data": {
-                            "timestamp": datetime.now().isoformat(),
-                            "indices": indices,
-                            "source": "eastmoney",
-                        },
-                        "message": "Market indices retrieved successfully",
-                        "from_cache": False,
-                    }
-                    
-                    # 缓存到内存（2分钟有效期）
-                    market_cache.set_market_indices(result, ttl=120)
                     
-                    # 保存到数据库缓存（异步保存，不阻塞响应）
+                    # 保存到数据库缓存
                     try:
                         from common.market_data_db_cache import get_db_cache
                         db_cache = get_db_cache()
@@ -3628,7 +3770,14 @@ class AlgoVoiceEngine:
                     except Exception as e:
                         logger.warning(f"保存数据库缓存失败: {e}")
                     
-                    return result
+                    return {
+                        "data": {
+                            "timestamp": datetime.now().isoformat(),
+                            "indices": indices,
+                            "source": "eastmoney",
+                        },
+                        "message": "Market indices retrieved successfully",
+                    }
                 else:
                     # 重试后仍未获取到数据
                     error_msg = "无法获取指数数据"
@@ -3640,68 +3789,46 @@ class AlgoVoiceEngine:
                             "timestamp": datetime.now().isoformat(),
                             "indices": [],
                         },
-                        "from_cache": False,
                     }
             except asyncio.TimeoutError:
-                logger.warning("⏱️ 获取指数数据超时（10秒），返回降级数据")
-                # 超时时尝试返回数据库缓存
-                try:
-                    from common.market_data_db_cache import get_db_cache
-                    db_cache = get_db_cache()
-                    db_data = db_cache.get_market_indices()
-                    if db_data:
-                        logger.info("✅ 使用数据库缓存作为降级数据")
-                        db_data["degraded"] = True
-                        db_data["message"] = "数据获取超时，显示缓存数据"
-                        return db_data
-                except Exception as fallback_error:
-                    logger.error(f"读取数据库降级数据也失败: {fallback_error}")
-                
+                logger.warning("⏱️ 获取指数数据超时（10秒）")
                 return {
                     "error": "获取数据超时",
                     "status": "timeout",
                     "data": {"timestamp": datetime.now().isoformat(), "indices": []},
-                    "from_cache": False,
                 }
             except Exception as e:
                 logger.error(f"获取指数数据失败: {e}")
                 import traceback
 
                 traceback.print_exc()
-                
-                # 降级：尝试返回数据库缓存
-                try:
-                    from common.market_data_db_cache import get_db_cache
-                    db_cache = get_db_cache()
-                    db_data = db_cache.get_market_indices()
-                    if db_data:
-                        logger.warning("⚠️ 使用数据库缓存作为降级数据")
-                        db_data["degraded"] = True
-                        return db_data
-                except Exception as fallback_error:
-                    logger.error(f"读取数据库降级数据也失败: {fallback_error}")
-                
                 return {
                     "error": str(e),
                     "status": "error",
                     "data": {"timestamp": datetime.now().isoformat(), "indices": []},
-                    "from_cache": False,
                 }
 
-        @app.get("/api/v1/market/hot-stocks")
-        async def get_hot_stocks():
-            """获取热门股票数据 - 多层缓存 + 降级策略"""
+        @app.get("/api/v1/market/indices")
+        async def get_market_indices():
+            """获取市场指数数据 - 多层缓存 + 并发合并 + 陈旧数据后台刷新"""
+            from common.cache_manager import MARKET_INDICES_KEY, get_async_cache
+
+            result, status = await get_async_cache().get_or_fetch(
+                MARKET_INDICES_KEY,
+                _load_market_indices,
+                ttl=120,
+                should_cache=lambda r: bool(r["data"].get("indices")),
+            )
+            if status != "miss":
+                logger.info(f"✅ 从内存缓存返回市场指数数据（{status}）")
+            return _with_cache_status(result, status)
+
+        async def _load_hot_stocks() -> Dict:
+            """内存缓存未命中时获取热门股票：数据库缓存（当日数据）→ 东方财富 → 雪球"""
             from common.cache_manager import get_market_data_cache
-            
+
             market_cache = get_market_data_cache()
-            
-            # ===== 第一层：内存缓存（1-2分钟）=====
-            cached_data = market_cache.get_hot_stocks()
-            if cached_data:
-                logger.info("✅ 从内存缓存返回热门股票数据")
-                cached_data["from_cache"] = True
-                return cached_data
-            
+
             # ===== 第二层：数据库缓存（当日数据）=====
             try:
                 from common.market_data_db_cache import get_db_cache
@@ -3716,7 +3843,7 @@ class AlgoVoiceEngine:
             # ===== 第三层：实时获取（带限流）=====
             # 检查是否允许请求外部数据源（限流保护）
             if not market_cache.should_fetch_from_source('hot_stocks', min_interval=90):
-                logger.warning("⏸️ 请求限流中，返回最近的缓存数据")
+                logger.warning("⏸️ 请求限流中，返回空数据")
                 return {
                     "data": {
                         "timestamp": datetime.now().isoformat(),
@@ -3730,7 +3857,6 @@ class AlgoVoiceEngine:
                         "source": "rate_limited",
                     },
                     "message": "请求过于频繁，请稍后再试",
-                    "from_cache": False,
                 }
 
             hot_stocks = []
@@ -3792,22 +3918,8 @@ class AlgoVoiceEngine:
                 logger.info(
                     f"热门股票数据获取成功: {len(hot_stocks)}只股票 (来源: {data_source})"
                 )
-
-                result = {
-                    "data": {
-                        "timestamp": datetime.now().isoformat(),
-                        "hot_stocks": hot_stocks,
-                        "market_sentiment": market_sentiment,
-                        "source": data_source,
-                    },
-                    "message": f"Hot stocks retrieved successfully from {data_source}",
-                    "from_cache": False,
-                }
                 
-                # 缓存到内存（2分钟有效期）
-                market_cache.set_hot_stocks(result, ttl=120)
-                
-                # 保存到数据库缓存（异步保存，不阻塞响应）
+                # 保存到数据库缓存
                 try:
                     from common.market_data_db_cache import get_db_cache
                     db_cache = get_db_cache()
@@ -3815,24 +3927,19 @@ class AlgoVoiceEngine:
                 except Exception as e:
                     logger.warning(f"保存数据库缓存失败: {e}")
                 
-                return result
+                return {
+                    "data": {
+                        "timestamp": datetime.now().isoformat(),
+                        "hot_stocks": hot_stocks,
+                        "market_sentiment": market_sentiment,
+                        "source": data_source,
+                    },
+                    "message": f"Hot stocks retrieved successfully from {data_source}",
+                }
             else:
                 # 所有策略都失败
                 error_msg = "所有数据源都无法获取热门股票数据"
                 logger.error(error_msg)
-                
-                # 降级：尝试返回数据库缓存
-                try:
-                    from common.market_data_db_cache import get_db_cache
-                    db_cache = get_db_cache()
-                    db_data = db_cache.get_hot_stocks()
-                    if db_data:
-                        logger.warning("⚠️ 使用数据库缓存作为降级数据")
-                        db_data["degraded"] = True
-                        return db_data
-                except Exception as fallback_error:
-                    logger.error(f"读取数据库降级数据也失败: {fallback_error}")
-                
                 return {
                     "error": error_msg,
                     "status": "error",
@@ -3841,9 +3948,23 @@ class AlgoVoiceEngine:
                         "hot_stocks": [],
                         "market_sentiment": market_sentiment,
                     },
-                    "from_cache": False,
                 }
 
+        @app.get("/api/v1/market/hot-stocks")
+        async def get_hot_stocks():
+            """获取热门股票数据 - 多层缓存 + 并发合并 + 陈旧数据后台刷新"""
+            from common.cache_manager import HOT_STOCKS_KEY, get_async_cache
+
+            result, status = await get_async_cache().get_or_fetch(
+                HOT_STOCKS_KEY,
+                _load_hot_stocks,
+                ttl=120,
+                should_cache=lambda r: bool(r["data"].get("hot_stocks")),
+            )
+            if status != "miss":
+                logger.info(f"✅ 从内存缓存返回热门股票数据（{status}）")
+            return _with_cache_status(result, status)
+
         @app.get("/api/v1/market/overview")
         async def get_market_overview():
             """获取市场概览 - 兼容性接口，包含指数和热门股票"""
@@ -3888,6 +4009,19 @@ class AlgoVoiceEngine:
                 traceback.print_exc()
                 return {"error": str(e), "status": "error"}
 
+        @app.get("/api/v1/market/cache-stats")
+        async def get_market_cache_stats():
+            """获取市场数据缓存的命中率与延迟统计"""
+            from common.cache_manager import get_async_cache, get_memory_cache
+
+            return {
+                "data": {
+                    "keys": get_async_cache().get_stats(),
+                    "memory": get_memory_cache().get_stats(),
+                },
+                "message": "Market cache statistics retrieved successfully",
+            }
+
         # 集成智能策略工作流API
         try:
             from ai_strategy_system.strategy_api import (
@@ -72,6 +72,11 @@ try:
 except ImportError:
     FileStorageManager = None
 
+try:
+    from .storage_management.file_storage import ColumnarMarketStore
+except ImportError:
+    ColumnarMarketStore = None
+
 # 流处理模块已在简化版本中移除，专注于中国A股数据
 
 __all__ = [
@@ -119,6 +124,8 @@ if CacheManager is not None:
     __all__.append("CacheManager")
 if FileStorageManager is not None:
     __all__.append("FileStorageManager")
+if ColumnarMarketStore is not None:
+    __all__.append("ColumnarMarketStore")
 if DataPipelineCoordinator is not None:
     __all__.extend(["DataPipelineCoordinator", "get_data_pipeline_coordinator", "fetch_all_market_intelligence_data"])
 
@@ -4,9 +4,10 @@ Akshare数据收集器模块
 """
 
 import asyncio
+import threading
 import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 
 import pandas as pd
 
@@ -47,6 +48,7 @@ class AkshareDataCollector:
         """
         self.rate_limit = rate_limit
         self.last_request_time = 0.0
+        self._rate_lock = threading.Lock()
         self.session: Optional[aiohttp.ClientSession] = None
 
         # 检查akshare是否可用
@@ -67,15 +69,20 @@ class AkshareDataCollector:
             await self.session.close()
 
     def _rate_limit_check(self):
-        """检查并执行速率限制"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
+        """检查并执行速率限制
 
-        if time_since_last < self.rate_limit:
-            sleep_time = self.rate_limit - time_since_last
-            time.sleep(sleep_time)
+        线程安全：并发请求在锁内依次预约下一个请求时间点，再在锁外等待，
+        多个线程共用一个收集器时请求间隔仍不小于rate_limit。
+        """
+        with self._rate_lock:
+            current_time = time.time()
+            sleep_time = self.last_request_time + self.rate_limit - current_time
+            self.last_request_time = max(
+                current_time, self.last_request_time + self.rate_limit
+            )
 
-        self.last_request_time = time.time()
+        if sleep_time > 0:
+            time.sleep(sleep_time)
 
     def fetch_stock_list(self, market: str = "A股") -> pd.DataFrame:
         """获取股票列表
@@ -128,6 +135,7 @@ class AkshareDataCollector:
         end_date: str,
         period: str = "daily",
         adjust: str = "qfq",
+        raise_on_error: bool = False,
     ) -> pd.DataFrame:
         """获取股票历史数据
 
@@ -137,12 +145,16 @@ class AkshareDataCollector:
             end_date: 结束日期 (YYYYMMDD)
             period: 周期 ("daily", "weekly", "monthly")
             adjust: 复权类型 ("qfq", "hfq", "")
+            raise_on_error: 获取失败时抛出DataError而不是返回空DataFrame，
+                便于调用方区分"区间内没有数据"和"请求失败"
 
         Returns:
             历史数据DataFrame
         """
         try:
             if not HAS_AKSHARE:
+                if raise_on_error:
+                    raise DataError("Akshare not available")
                 logger.warning("Akshare not available, returning empty DataFrame")
                 return pd.DataFrame()
 
@@ -197,9 +209,31 @@ class AkshareDataCollector:
 
         except Exception as e:
             logger.error(f"Failed to fetch history for {symbol}: {e}")
+            if raise_on_error:
+                raise DataError(f"History fetch failed for {symbol}: {e}")
             # 返回空DataFrame而不是抛出异常
             return pd.DataFrame()
 
+    def fetch_trade_calendar(self) -> pd.DatetimeIndex:
+        """获取A股交易日历（含当年剩余交易日）
+
+        Returns:
+            交易日DatetimeIndex
+        """
+        try:
+            if not HAS_AKSHARE:
+                raise DataError("Akshare not available")
+
+            self._rate_limit_check()
+            df = ak.tool_trade_date_hist_sina()
+            dates = pd.DatetimeIndex(pd.to_datetime(df["trade_date"])).sort_values()
+            logger.info(f"Fetched {len(dates)} trading calendar dates")
+            return dates
+
+        except Exception as e:
+            logger.error(f"Failed to fetch trading calendar: {e}")
+            raise DataError(f"Trading calendar fetch failed: {e}")
+
     def fetch_realtime_data(
         self, symbols: List[str], max_retries: int = 3
     ) -> Dict[str, Dict[str, Any]]:
@@ -645,14 +679,16 @@ class AkshareDataCollector:
             logger.error(f"Failed to fetch dividend info for {symbol}: {e}")
             return pd.DataFrame()
 
-    async def fetch_multiple_stocks(
+    async def stream_multiple_stocks(
         self,
         symbols: List[str],
         start_date: str,
         end_date: str,
         max_concurrent: int = 5,
-    ) -> Dict[str, pd.DataFrame]:
-        """并发获取多只股票数据
+    ) -> AsyncIterator[Tuple[str, pd.DataFrame]]:
+        """并发获取多只股票数据，按完成顺序逐只返回
+
+        请求在线程中执行，最多max_concurrent个同时进行，请求间隔仍受rate_limit约束。
 
         Args:
             symbols: 股票代码列表
@@ -660,34 +696,54 @@ class AkshareDataCollector:
             end_date: 结束日期
             max_concurrent: 最大并发数
 
-        Returns:
-            股票数据字典
+        Yields:
+            (股票代码, 数据DataFrame)，获取失败时为空DataFrame
         """
         semaphore = asyncio.Semaphore(max_concurrent)
 
         async def fetch_single_stock(symbol: str) -> tuple:
             async with semaphore:
                 try:
-                    df = self.fetch_stock_history(symbol, start_date, end_date)
+                    df = await asyncio.to_thread(
+                        self.fetch_stock_history, symbol, start_date, end_date
+                    )
                     return symbol, df
                 except Exception as e:
                     logger.error(f"Failed to fetch data for {symbol}: {e}")
                     return symbol, pd.DataFrame()
 
-        # 创建任务
-        tasks = [fetch_single_stock(symbol) for symbol in symbols]
+        tasks = [asyncio.ensure_future(fetch_single_stock(symbol)) for symbol in symbols]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # 调用方提前退出时取消尚未开始的请求
+            for task in tasks:
+                task.cancel()
+
+    async def fetch_multiple_stocks(
+        self,
+        symbols: List[str],
+        start_date: str,
+        end_date: str,
+        max_concurrent: int = 5,
+    ) -> Dict[str, pd.DataFrame]:
+        """并发获取多只股票数据
 
-        # 等待所有任务完成
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        Args:
+            symbols: 股票代码列表
+            start_date: 开始日期
+            end_date: 结束日期
+            max_concurrent: 最大并发数
 
-        # 整理结果
+        Returns:
+            股票数据字典
+        """
         stock_data = {}
-        for result in results:
-            if isinstance(result, tuple):
-                symbol, df = result
-                stock_data[symbol] = df
-            else:
-                logger.error(f"Task failed with exception: {result}")
+        async for symbol, df in self.stream_multiple_stocks(
+            symbols, start_date, end_date, max_concurrent
+        ):
+            stock_data[symbol] = df
 
         logger.info(f"Fetched data for {len(stock_data)} stocks")
         return stock_data
@@ -4,10 +4,9 @@
 支持内存缓存、LRU、TTL等机制
 """
 
-import time
-from collections import OrderedDict
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 
+from common.bounded_cache import BoundedCache, get_memory_budget
 from common.logging_system import setup_logger
 
 logger = setup_logger("cache_manager")
@@ -16,39 +15,36 @@ logger = setup_logger("cache_manager")
 class LRUCache:
     """
     LRU缓存，支持最大容量和TTL
+    基于common.bounded_cache.BoundedCache，占用计入进程级内存预算
     """
 
-    def __init__(self, capacity: int = 1000, ttl: int = 3600):
+    def __init__(
+        self, capacity: int = 1000, ttl: int = 3600, max_bytes: Optional[int] = None
+    ):
         self.capacity = capacity
         self.ttl = ttl
-        self.cache = OrderedDict()
-        self.timestamp = dict()
+        self._store = BoundedCache(
+            max_entries=capacity,
+            max_bytes=max_bytes,
+            default_ttl=ttl,
+            n_shards=1,
+            budget=get_memory_budget(),
+            name="lru_cache",
+        )
 
     def get(self, key: Any) -> Optional[Any]:
-        now = time.time()
-        if key in self.cache:
-            if now - self.timestamp[key] > self.ttl:
-                logger.info(f"Cache expired for key: {key}")
-                self.cache.pop(key)
-                self.timestamp.pop(key)
-                return None
-            self.cache.move_to_end(key)
-            return self.cache[key]
-        return None
+        return self._store.get(key)
 
     def set(self, key: Any, value: Any) -> None:
-        now = time.time()
-        if key in self.cache:
-            self.cache.move_to_end(key)
-        self.cache[key] = value
-        self.timestamp[key] = now
-        if len(self.cache) > self.capacity:
-            oldest = next(iter(self.cache))
-            logger.info(f"Evicting oldest cache key: {oldest}")
-            self.cache.popitem(last=False)
-            self.timestamp.pop(oldest, None)
+        if not self._store.set(key, value):
+            logger.info(f"Cache entry too large, skipped: {key}")
 
     def clear(self):
-        self.cache.clear()
-        self.timestamp.clear()
+        self._store.clear()
         logger.info("Cache cleared")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return self._store.get_stats()
+
+    def __len__(self) -> int:
+        return len(self._store)
@@ -4,15 +4,20 @@
 """
 
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 
+from common.exceptions import DataError
 from common.logging_system import setup_logger
 from module_01_data_pipeline.data_acquisition.akshare_collector import AkshareDataCollector
 from module_01_data_pipeline.storage_management.database_manager import DatabaseManager
 
 logger = setup_logger("cached_data_manager")
 
+# A股15:00收盘，数据源在收盘后一段时间才有完整的当日数据
+DATA_READY_OFFSET = pd.Timedelta(hours=15, minutes=30)
+
 
 class CachedDataManager:
     """缓存数据管理器 - 优先使用本地数据"""
@@ -23,12 +28,17 @@ class CachedDataManager:
         
         Args:
             db_path: 数据库路径
-            update_threshold_days: 数据更新阈值（天）
+            update_threshold_days: 数据更新阈值（天），最近这些天内数据源还没有返回数据的
+                交易日（如收盘后数据尚未发布）不记为已获取，下次调用时重新获取
         """
         self.db_manager = DatabaseManager(db_path)
         self.collector = AkshareDataCollector(rate_limit=0.3)
         self.update_threshold_days = update_threshold_days
         
+        # 交易日历（首次使用时从本地库加载）
+        self._calendar: Optional[pd.DatetimeIndex] = None
+        self._calendar_fetched_on: Optional[str] = None
+        
         logger.info("✅ 缓存数据管理器已启动 - 优先使用本地数据")
     
     def get_stock_history(
@@ -39,13 +49,20 @@ class CachedDataManager:
         force_update: bool = False
     ) -> pd.DataFrame:
         """
-        获取股票历史数据（优先从本地读取）
+        获取股票历史数据（优先从本地读取，只从网络补齐缺失的交易日区间）
+        
+        按交易日历计算请求区间内本地缺失的日期（头部、尾部及中间的空洞），
+        合并为连续区间后逐段获取，并把已获取过的区间记录到 price_coverage 表。
+        停牌、未上市等数据源本身没有数据的日期也会被记录，重复调用不再访问网络。
+        
+        前复权价格在除权除息后整体变化：每段缺口连同一个已入库的相邻交易日一起获取，
+        该日收盘价与本地不一致时说明复权基准已变化，改为重新获取全部已存历史。
         
         Args:
             symbol: 股票代码
             start_date: 开始日期 (YYYY-MM-DD 或 YYYYMMDD)
             end_date: 结束日期 (YYYY-MM-DD 或 YYYYMMDD)
-            force_update: 是否强制从网络更新
+            force_update: 是否强制从网络更新整个区间
             
         Returns:
             历史数据DataFrame
@@ -55,51 +72,54 @@ class CachedDataManager:
             start_date_std = self._standardize_date(start_date)
             end_date_std = self._standardize_date(end_date)
             
-            if not force_update:
-                # 1. 先尝试从本地数据库读取
-                local_data = self.db_manager.get_stock_prices(
-                    symbol=symbol,
-                    start_date=start_date_std,
-                    end_date=end_date_std
-                )
-                
-                if not local_data.empty:
-                    # 检查数据是否需要更新
-                    need_update = self._check_need_update(local_data, end_date_std)
-                    
-                    if not need_update:
-                        logger.info(f"✅ 从本地数据库读取 {symbol} 数据 ({len(local_data)} 条)")
-                        return local_data
-                    else:
-                        logger.info(f"⚠️ 本地数据需要更新，从网络获取最新数据...")
-            
-            # 2. 从网络获取数据
-            logger.info(f"🌐 从AKshare获取 {symbol} 数据...")
-            
-            # 转换为AKshare格式 (YYYYMMDD)
-            start_date_ak = start_date_std.replace("-", "")
-            end_date_ak = end_date_std.replace("-", "")
-            
-            df = self.collector.fetch_stock_history(
+            local_data = self.db_manager.get_stock_prices(
                 symbol=symbol,
-                start_date=start_date_ak,
-                end_date=end_date_ak,
-                period="daily",
-                adjust="qfq"
+                start_date=start_date_std,
+                end_date=end_date_std
             )
             
-            if not df.empty:
-                # 标准化列名
-                df = self._standardize_columns(df)
-                
-                # 保存到本地数据库
-                self.db_manager.save_stock_prices(symbol, df)
-                logger.info(f"✅ 已更新本地数据库 {symbol} ({len(df)} 条)")
-                
-                return df
+            # 只检查已收盘的交易日，当天盘中的数据还不完整
+            check_end = min(pd.Timestamp(end_date_std), self._last_closed_date())
+            trading_days = self._get_trading_days(pd.Timestamp(start_date_std), check_end)
+            
+            if force_update:
+                missing = ~np.zeros(len(trading_days), dtype=bool)
             else:
-                logger.warning(f"⚠️ 未获取到 {symbol} 的数据")
-                return pd.DataFrame()
+                missing = self._find_missing_days(symbol, trading_days, local_data)
+            
+            gaps = self._day_ranges(trading_days, missing)
+            if not gaps:
+                logger.info(f"✅ 从本地数据库读取 {symbol} 数据 ({len(local_data)} 条)")
+                return local_data
+            
+            # 逐段获取缺失区间
+            logger.info(f"🌐 从AKshare补齐 {symbol} 数据 ({len(gaps)} 个缺失区间, {int(missing.sum())} 个交易日)")
+            stored = pd.DataFrame() if force_update else self.db_manager.get_stock_prices(symbol)
+            result = self._fetch_gaps(symbol, trading_days, gaps, stored)
+            if result is None:
+                # 复权基准已变化，重新获取已存历史与请求区间的并集
+                first = min(stored.index[0], pd.Timestamp(start_date_std))
+                last = max(check_end, min(stored.index[-1], self._last_closed_date()))
+                logger.info(f"🔄 {symbol} 前复权基准已变化，重新获取 {first:%Y-%m-%d}~{last:%Y-%m-%d}")
+                trading_days = self._get_trading_days(first, last)
+                gaps = self._day_ranges(trading_days, np.ones(len(trading_days), dtype=bool))
+                result = self._fetch_gaps(symbol, trading_days, gaps, pd.DataFrame())
+            failed, returned, fetched_rows = result
+            
+            # 记录覆盖区间（获取失败的区间、最近还没有数据的交易日下次调用时重试）
+            recent = trading_days > self._last_closed_date() - pd.Timedelta(days=self.update_threshold_days)
+            covered = self._day_ranges(trading_days, ~failed & ~(recent & ~returned))
+            if covered:
+                self._update_coverage(symbol, covered)
+            logger.info(f"✅ 已更新本地数据库 {symbol} (新增 {fetched_rows} 条)")
+            
+            if fetched_rows == 0:
+                return local_data
+            return self.db_manager.get_stock_prices(
+                symbol=symbol,
+                start_date=start_date_std,
+                end_date=end_date_std
+            )
                 
         except Exception as e:
             logger.error(f"获取 {symbol} 历史数据失败: {e}")
@@ -328,34 +348,188 @@ class CachedDataManager:
         except Exception as e:
             logger.error(f"更新最新数据失败: {e}")
     
-    def _check_need_update(self, df: pd.DataFrame, end_date: str) -> bool:
+    def _last_closed_date(self) -> pd.Timestamp:
+        """最近一个数据已完整的日期（收盘数据就绪前为前一天）"""
+        now = pd.Timestamp.now()
+        if now - now.normalize() >= DATA_READY_OFFSET:
+            return now.normalize()
+        return now.normalize() - pd.Timedelta(days=1)
+    
+    def _get_trading_calendar(self, end: pd.Timestamp) -> pd.DatetimeIndex:
         """
-        检查数据是否需要更新
+        获取交易日历（本地库 -> AKshare，每天最多从网络刷新一次）
         
         Args:
-            df: 本地数据
-            end_date: 请求的结束日期
+            end: 需要覆盖到的日期
             
         Returns:
-            是否需要更新
+            交易日DatetimeIndex
         """
-        if df.empty:
-            return True
+        if self._calendar is None:
+            self._calendar = self.db_manager.get_trading_calendar()
         
-        # 获取本地数据的最后日期
-        last_date = df.index.max()
+        today = datetime.now().strftime("%Y-%m-%d")
+        if (self._calendar.empty or self._calendar[-1] < end) and self._calendar_fetched_on != today:
+            self._calendar_fetched_on = today
+            try:
+                dates = self.collector.fetch_trade_calendar()
+                self.db_manager.save_trading_calendar(dates)
+                self._calendar = self._calendar.union(dates)
+            except DataError as e:
+                logger.warning(f"⚠️ 获取交易日历失败，按工作日估算: {e}")
         
-        # 转换为datetime
-        if isinstance(last_date, str):
-            last_date = pd.to_datetime(last_date)
+        return self._calendar
+    
+    def _get_trading_days(self, start: pd.Timestamp, end: pd.Timestamp) -> pd.DatetimeIndex:
+        """获取区间内的交易日，交易日历未覆盖的部分按工作日补齐"""
+        if start > end:
+            return pd.DatetimeIndex([])
         
-        end_date_dt = pd.to_datetime(end_date)
+        calendar = self._get_trading_calendar(end)
+        days = calendar[(calendar >= start) & (calendar <= end)]
         
-        # 计算天数差
-        days_diff = (end_date_dt - last_date).days
+        calendar_end = calendar[-1] if len(calendar) else start - pd.Timedelta(days=1)
+        if calendar_end < end:
+            days = days.append(pd.bdate_range(max(start, calendar_end + pd.Timedelta(days=1)), end))
+        return days
+    
+    def _fetch_gaps(
+        self,
+        symbol: str,
+        trading_days: pd.DatetimeIndex,
+        gaps: List[Tuple[pd.Timestamp, pd.Timestamp]],
+        stored: pd.DataFrame
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, int]]:
+        """
+        逐段获取缺失区间并入库
+        
+        Args:
+            symbol: 股票代码
+            trading_days: 请求区间内的交易日
+            gaps: 缺失区间列表
+            stored: 本地已存的全部历史（以日期为索引），为空时不检查复权基准
+            
+        Returns:
+            (获取失败的交易日标记, 数据源返回了数据的交易日标记, 入库条数)；
+            复权基准已变化时返回None，此时不写入任何数据
+        """
+        settled = self._settled_dates(stored)
+        failed = np.zeros(len(trading_days), dtype=bool)
+        returned = np.zeros(len(trading_days), dtype=bool)
+        frames = []
+        for gap_start, gap_end in gaps:
+            # 相邻的已入库交易日：优先取缺口之前最近的一天
+            before = settled[settled < gap_start]
+            after = settled[settled > gap_end]
+            anchor = before[-1] if len(before) else (after[0] if len(after) else None)
+            fetch_start = gap_start if anchor is None else min(gap_start, anchor)
+            fetch_end = gap_end if anchor is None else max(gap_end, anchor)
+            try:
+                df = self.collector.fetch_stock_history(
+                    symbol=symbol,
+                    start_date=fetch_start.strftime("%Y%m%d"),
+                    end_date=fetch_end.strftime("%Y%m%d"),
+                    period="daily",
+                    adjust="qfq",
+                    raise_on_error=True
+                )
+            except DataError as e:
+                logger.warning(f"⚠️ 获取 {symbol} {gap_start:%Y-%m-%d}~{gap_end:%Y-%m-%d} 失败: {e}")
+                failed |= (trading_days >= gap_start) & (trading_days <= gap_end)
+                continue
+            
+            if df.empty:
+                continue
+            df = self._standardize_columns(df)
+            dates = pd.DatetimeIndex(pd.to_datetime(df["date"])).normalize()
+            if anchor is not None:
+                fetched_close = df.loc[dates == anchor, "close"]
+                if len(fetched_close) and not np.isclose(
+                    float(fetched_close.iloc[0]), float(stored.loc[anchor, "close"]), rtol=1e-4
+                ):
+                    return None
+            returned |= trading_days.isin(dates)
+            frames.append(df)
+        
+        fetched_rows = 0
+        for df in frames:
+            self.db_manager.save_stock_prices(symbol, df)
+            fetched_rows += len(df)
+        return failed, returned, fetched_rows
+    
+    @staticmethod
+    def _settled_dates(local_data: pd.DataFrame) -> pd.DatetimeIndex:
+        """本地数据中收盘数据就绪后写入的日期（盘中写入的当日数据不算完整）"""
+        if local_data.empty:
+            return pd.DatetimeIndex([])
+        written = pd.to_datetime(local_data["created_at"], errors="coerce", format="mixed")
+        settled = (written >= local_data.index + DATA_READY_OFFSET).to_numpy()
+        return local_data.index[settled]
+    
+    def _find_missing_days(
+        self,
+        symbol: str,
+        trading_days: pd.DatetimeIndex,
+        local_data: pd.DataFrame
+    ) -> np.ndarray:
+        """
+        找出本地没有完整数据、也不在已获取区间内的交易日
+        
+        Args:
+            symbol: 股票代码
+            trading_days: 请求区间内的交易日
+            local_data: 本地数据（以日期为索引）
+            
+        Returns:
+            与trading_days对应的缺失标记
+        """
+        if len(trading_days) == 0:
+            return np.zeros(0, dtype=bool)
+        
+        missing = ~trading_days.isin(self._settled_dates(local_data))
+        for cover_start, cover_end in self.db_manager.get_price_coverage(symbol):
+            missing &= ~((trading_days >= cover_start) & (trading_days <= cover_end))
+        return missing
+    
+    @staticmethod
+    def _day_ranges(
+        days: pd.DatetimeIndex,
+        mask: np.ndarray
+    ) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """将标记为True的连续交易日合并为 (开始, 结束) 区间"""
+        positions = np.flatnonzero(mask)
+        if len(positions) == 0:
+            return []
+        breaks = np.flatnonzero(np.diff(positions) > 1)
+        starts = np.concatenate([positions[:1], positions[breaks + 1]])
+        ends = np.concatenate([positions[breaks], positions[-1:]])
+        return [(days[s], days[e]) for s, e in zip(starts, ends)]
+    
+    def _update_coverage(self, symbol: str, ranges: List[Tuple[pd.Timestamp, pd.Timestamp]]):
+        """合并新的已获取区间到覆盖记录（中间没有交易日的相邻区间合并为一个）"""
+        calendar = self._calendar if self._calendar is not None else pd.DatetimeIndex([])
+        
+        def next_trading_day(day: pd.Timestamp) -> pd.Timestamp:
+            pos = calendar.searchsorted(day, side="right")
+            if pos < len(calendar):
+                return calendar[pos]
+            return day + pd.offsets.BDay(1)
+        
+        existing = [
+            (pd.Timestamp(start), pd.Timestamp(end))
+            for start, end in self.db_manager.get_price_coverage(symbol)
+        ]
+        merged: List[Tuple[pd.Timestamp, pd.Timestamp]] = []
+        for start, end in sorted(existing + list(ranges)):
+            if merged and start <= next_trading_day(merged[-1][1]):
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
         
-        # 如果数据超过阈值天数，需要更新
-        return days_diff > self.update_threshold_days
+        self.db_manager.save_price_coverage(
+            symbol,
+            [(start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")) for start, end in merged]
+        )
     
     def _standardize_date(self, date_str: str) -> str:
         """
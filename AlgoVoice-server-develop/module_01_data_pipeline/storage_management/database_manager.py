@@ -4,27 +4,75 @@
 
 import json
 import sqlite3
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
 
+from common.db_connection_pool import pooled_connect
 from common.exceptions import DataError
 from common.logging_system import setup_logger
+from module_01_data_pipeline.storage_management.file_storage import (
+    HAS_PYARROW,
+    ColumnarMarketStore,
+)
 
 logger = setup_logger("database_manager")
 
+# 批量写入时使用的SQLite参数
+BULK_WRITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+)
+
+PRICE_COLUMNS = (
+    "symbol",
+    "date",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "amount",
+    "pct_change",
+    "created_at",
+)
+
+INDICATOR_VALUE_COLUMNS = (
+    "sma_5",
+    "sma_10",
+    "sma_20",
+    "sma_50",
+    "ema_12",
+    "ema_26",
+    "rsi",
+    "macd",
+    "macd_signal",
+    "macd_histogram",
+    "bb_upper",
+    "bb_middle",
+    "bb_lower",
+    "atr",
+    "stoch_k",
+    "stoch_d",
+)
+
 
 class DatabaseManager:
     """数据库管理器类"""
 
-    def __init__(self, db_path: str = None):
+    def __init__(self, db_path: str = None, columnar_dir: Optional[str] = None):
         """初始化数据库管理器
 
         Args:
             db_path: 数据库文件路径
+            columnar_dir: 列式行情存储目录，默认为数据库所在目录下的 columnar；
+                安装了pyarrow时价格数据会同步写入该存储
         """
         if db_path is None:
             import os
@@ -33,10 +81,16 @@ class DatabaseManager:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._init_database()
 
+        self.columnar_store: Optional[ColumnarMarketStore] = None
+        if HAS_PYARROW:
+            self.columnar_store = ColumnarMarketStore(
+                columnar_dir or str(self.db_path.parent / "columnar")
+            )
+
     def _init_database(self):
         """初始化数据库表结构"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = pooled_connect(self.db_path)
             cursor = conn.cursor()
 
             # 创建股票基本信息表
@@ -73,6 +127,24 @@ class DatabaseManager:
                 )
             """)
 
+            # 创建交易日历表
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS trading_calendar (
+                    date TEXT PRIMARY KEY
+                )
+            """)
+
+            # 创建价格数据覆盖区间表（记录已从数据源完整获取过的日期区间）
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS price_coverage (
+                    symbol TEXT NOT NULL,
+                    start_date TEXT NOT NULL,
+                    end_date TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    PRIMARY KEY (symbol, start_date)
+                )
+            """)
+
             # 创建技术指标表
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS technical_indicators (
@@ -333,6 +405,222 @@ class DatabaseManager:
         except (ValueError, TypeError):
             return default
 
+    # ------------------------------------------------------------------
+    # 批量写入
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def _bulk_write_connection(self):
+        """批量写入连接：WAL日志 + 单个事务，出错时整体回滚"""
+        conn = pooled_connect(self.db_path, timeout=30.0, isolation_level=None)
+        try:
+            for pragma in BULK_WRITE_PRAGMAS:
+                conn.execute(pragma)
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    def bulk_upsert(
+        self,
+        table: str,
+        columns: List[str],
+        records: List[tuple],
+        conflict: str = "REPLACE",
+        conn: Optional[sqlite3.Connection] = None,
+    ) -> int:
+        """在单个事务中批量写入记录
+
+        Args:
+            table: 表名
+            columns: 列名
+            records: 与列名对应的记录元组
+            conflict: 冲突处理方式 (REPLACE / IGNORE)
+            conn: 已开启事务的连接（可选，用于多次写入合并为一个事务）
+
+        Returns:
+            写入的记录数
+        """
+        if not records:
+            return 0
+
+        sql = (
+            f"INSERT OR {conflict} INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' * len(columns))})"
+        )
+        if conn is not None:
+            conn.executemany(sql, records)
+        else:
+            with self._bulk_write_connection() as bulk_conn:
+                bulk_conn.executemany(sql, records)
+        return len(records)
+
+    @staticmethod
+    def _date_strings(
+        values: Union[pd.Series, pd.Index], fallback_len: Optional[int] = None
+    ) -> List[str]:
+        """将日期列批量转换为YYYY-MM-DD字符串，无法解析的值按原样截取"""
+        values = pd.Series(values, copy=False).reset_index(drop=True)
+        parsed = pd.to_datetime(values, errors="coerce", format="mixed")
+        result = parsed.dt.strftime("%Y-%m-%d").astype(object)
+
+        unparsed = parsed.isna() & values.notna()
+        for i in np.flatnonzero(unparsed.to_numpy()):
+            text = str(values.iloc[i])
+            if " " in text:
+                text = text.split()[0]
+            elif fallback_len:
+                text = text[:fallback_len]
+            result.iloc[i] = text
+        return result.tolist()
+
+    @staticmethod
+    def _numeric_column(
+        df: pd.DataFrame, column: str, default=None, fill=None
+    ) -> np.ndarray:
+        """取出数值列；缺失列返回default，NaN替换为fill"""
+        if column not in df.columns:
+            return np.full(len(df), default, dtype=object)
+        values = pd.to_numeric(df[column], errors="coerce")
+        return values.astype(object).where(values.notna(), fill).to_numpy()
+
+    @staticmethod
+    def _first_column(df: pd.DataFrame, *candidates: str) -> Optional[str]:
+        """返回第一个存在的候选列名"""
+        for column in candidates:
+            if column in df.columns:
+                return column
+        return None
+
+    def _price_records(self, symbol: str, df: pd.DataFrame, now: str) -> List[tuple]:
+        """将价格DataFrame转换为stock_prices记录元组"""
+        if "date" in df.columns:
+            keep = df["date"].map(lambda v: v is not None).to_numpy(dtype=bool)
+            df = df[keep]
+            dates = self._date_strings(df["date"])
+        else:
+            dates = self._date_strings(df.index)
+
+        n = len(df)
+        symbols = [symbol] * n
+        ohlc = [
+            self._numeric_column(df, col, default=0.0, fill=0.0)
+            for col in ("open", "high", "low", "close")
+        ]
+        volume = pd.to_numeric(
+            df["volume"] if "volume" in df.columns else pd.Series(0, index=df.index),
+            errors="coerce",
+        ).fillna(0).astype("int64").tolist()
+        # 缺失值（None/NaN）统一按0.0写入，与开高低收一致
+        amount = self._numeric_column(df, "amount", default=0.0, fill=0.0)
+        pct_change = self._numeric_column(df, "pct_change", default=0.0, fill=0.0)
+
+        return list(
+            zip(
+                symbols,
+                dates,
+                *(col.tolist() for col in ohlc),
+                volume,
+                amount.tolist(),
+                pct_change.tolist(),
+                [now] * n,
+            )
+        )
+
+    def _indicator_records(
+        self, symbol: str, df: pd.DataFrame, now: str
+    ) -> List[tuple]:
+        """将技术指标DataFrame转换为technical_indicators记录元组"""
+        if "date" in df.columns:
+            keep = df["date"].map(lambda v: v is not None).to_numpy(dtype=bool)
+            df = df[keep]
+            dates = self._date_strings(df["date"])
+        else:
+            dates = self._date_strings(df.index)
+
+        n = len(df)
+        values = [
+            self._numeric_column(df, col).tolist() for col in INDICATOR_VALUE_COLUMNS
+        ]
+        return list(zip([symbol] * n, dates, *values, [now] * n))
+
+    def save_stock_prices_bulk(self, frames: Dict[str, pd.DataFrame]) -> int:
+        """在单个事务中批量保存多只股票的价格数据
+
+        Args:
+            frames: 股票代码到价格DataFrame的字典
+
+        Returns:
+            写入的记录数
+        """
+        now = datetime.now().isoformat()
+        try:
+            total = 0
+            written = {}
+            with self._bulk_write_connection() as conn:
+                for symbol, df in frames.items():
+                    if df is None or df.empty:
+                        continue
+                    written[symbol] = self._price_records(symbol, df, now)
+                    total += self.bulk_upsert(
+                        "stock_prices", PRICE_COLUMNS, written[symbol], conn=conn
+                    )
+            self._mirror_columnar(written)
+            logger.info(f"Saved {total} price records for {len(frames)} symbols")
+            return total
+
+        except Exception as e:
+            logger.error(f"Failed to bulk save stock prices: {e}")
+            return 0
+
+    def _mirror_columnar(self, records: Dict[str, List[tuple]]):
+        """将已写入SQLite的价格记录同步到列式存储（SQLite为主存储，同步失败只记录警告）
+
+        写入的是与SQLite相同的记录（缺失值已按0.0处理）；列式存储中还没有的股票
+        先从SQLite回填全部历史，保证两边数据一致。
+        """
+        if self.columnar_store is None:
+            return
+        try:
+            updates, backfill = {}, {}
+            for symbol, rows in records.items():
+                if not rows:
+                    continue
+                if self.columnar_store.has_symbol(symbol):
+                    updates[symbol] = pd.DataFrame(rows, columns=PRICE_COLUMNS)
+                else:
+                    backfill[symbol] = self.get_stock_prices(symbol)
+            self.columnar_store.write_many(updates)
+            self.columnar_store.write_many(backfill, merge=False)
+        except Exception as e:
+            logger.warning(f"Failed to mirror prices to columnar store: {e}")
+
+    def sync_columnar_store(self, symbols: Optional[List[str]] = None) -> int:
+        """从SQLite回填列式存储（用于启用列式存储之前已入库的数据）
+
+        Args:
+            symbols: 股票代码列表，None表示全部
+
+        Returns:
+            写入的股票数
+        """
+        if self.columnar_store is None:
+            raise DataError("Columnar store is not available (pyarrow not installed)")
+
+        written = 0
+        for symbol in symbols or self.get_symbols_list():
+            df = self.get_stock_prices(symbol)
+            if not df.empty:
+                self.columnar_store.write_symbol(symbol, df, merge=False)
+                written += 1
+        logger.info(f"Synced {written} symbols to columnar store")
+        return written
+
     def save_stock_info(
         self,
         symbol: str,
@@ -351,7 +639,7 @@ class DatabaseManager:
             **kwargs: 其他信息
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = pooled_connect(self.db_path)
             cursor = conn.cursor()
 
             now = datetime.now().isoformat()
@@ -399,75 +687,63 @@ class DatabaseManager:
                 logger.warning(f"Empty DataFrame provided for {symbol}")
                 return False
 
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
             now = datetime.now().isoformat()
+            records = self._price_records(symbol, df, now)
+            self.bulk_upsert("stock_prices", PRICE_COLUMNS, records)
+            self._mirror_columnar({symbol: records})
 
-            # 批量插入数据
-            records = []
-            for _, row in df.iterrows():
-                # 处理日期字段 - 简化版本避免类型错误
-                if "date" in row:
-                    date_value = row["date"]
-                    # 简单检查None值
-                    if date_value is None:
-                        continue
+            logger.info(f"Saved {len(records)} price records for {symbol}")
+            return True
 
-                    # 直接使用pandas转换
-                    try:
-                        date_str = pd.to_datetime(date_value).strftime("%Y-%m-%d")
-                    except Exception:
-                        # 如果转换失败，直接使用字符串
-                        date_str = (
-                            str(date_value).split()[0]
-                            if " " in str(date_value)
-                            else str(date_value)
-                        )
-                else:
-                    # 使用DataFrame索引作为日期
-                    index_value = df.index[_]
-                    try:
-                        date_str = pd.to_datetime(index_value).strftime("%Y-%m-%d")
-                    except Exception:
-                        date_str = (
-                            str(index_value).split()[0]
-                            if " " in str(index_value)
-                            else str(index_value)
-                        )
-
-                record = (
-                    symbol,
-                    date_str,
-                    float(row.get("open", 0.0) or 0.0),
-                    float(row.get("high", 0.0) or 0.0),
-                    float(row.get("low", 0.0) or 0.0),
-                    float(row.get("close", 0.0) or 0.0),
-                    int(row.get("volume", 0) or 0),
-                    float(row.get("amount", 0.0) or 0.0),
-                    float(row.get("pct_change", 0.0) or 0.0),
-                    now,
-                )
-                records.append(record)
+        except Exception as e:
+            logger.error(f"Failed to save stock prices for {symbol}: {e}")
+            return False
 
-            # 使用executemany提高性能
-            cursor.executemany(
-                """
-                INSERT OR REPLACE INTO stock_prices 
-                (symbol, date, open, high, low, close, volume, amount, 
-                 pct_change, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                records,
-            )
+    def save_trading_calendar(self, dates: Union[pd.Index, List[str]]) -> int:
+        """保存交易日历
 
-            conn.commit()
-            conn.close()
-            logger.info(f"Saved {len(records)} price records for {symbol}")
+        Args:
+            dates: 交易日列表
+
+        Returns:
+            写入的交易日数
+        """
+        try:
+            records = [(d,) for d in self._date_strings(pd.Index(dates)) if d]
+            self.bulk_upsert("trading_calendar", ("date",), records, conflict="IGNORE")
+            logger.info(f"Saved {len(records)} trading calendar dates")
+            return len(records)
+
+        except Exception as e:
+            logger.error(f"Failed to save trading calendar: {e}")
+            return 0
+
+    def save_price_coverage(
+        self, symbol: str, ranges: List[Tuple[str, str]]
+    ) -> bool:
+        """替换股票的价格数据覆盖区间
+
+        Args:
+            symbol: 股票代码
+            ranges: 已合并的 (start_date, end_date) 区间列表，日期格式 YYYY-MM-DD
+
+        Returns:
+            是否保存成功
+        """
+        try:
+            now = datetime.now().isoformat()
+            with self._bulk_write_connection() as conn:
+                conn.execute("DELETE FROM price_coverage WHERE symbol = ?", (symbol,))
+                self.bulk_upsert(
+                    "price_coverage",
+                    ("symbol", "start_date", "end_date", "updated_at"),
+                    [(symbol, start, end, now) for start, end in ranges],
+                    conn=conn,
+                )
             return True
 
         except Exception as e:
-            logger.error(f"Failed to save stock prices for {symbol}: {e}")
+            logger.error(f"Failed to save price coverage for {symbol}: {e}")
             return False
 
     def save_technical_indicators(self, symbol: str, df: pd.DataFrame) -> bool:
@@ -485,86 +761,14 @@ class DatabaseManager:
                 logger.warning(f"Empty DataFrame provided for {symbol}")
                 return False
 
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
             now = datetime.now().isoformat()
-
-            # 批量插入数据
-            records = []
-            for _, row in df.iterrows():
-                # 处理日期字段 - 简化版本避免类型错误
-                if "date" in row:
-                    date_value = row["date"]
-                    # 简单检查None值
-                    if date_value is None:
-                        continue
-
-                    # 直接使用pandas转换
-                    try:
-                        date_str = pd.to_datetime(date_value).strftime("%Y-%m-%d")
-                    except Exception:
-                        # 如果转换失败，直接使用字符串
-                        date_str = (
-                            str(date_value).split()[0]
-                            if " " in str(date_value)
-                            else str(date_value)
-                        )
-                else:
-                    # 使用DataFrame索引作为日期
-                    index_value = df.index[_]
-                    try:
-                        date_str = pd.to_datetime(index_value).strftime("%Y-%m-%d")
-                    except Exception:
-                        date_str = (
-                            str(index_value).split()[0]
-                            if " " in str(index_value)
-                            else str(index_value)
-                        )
-
-                # 安全地处理可能为None的值
-                def safe_float(value):
-                    if value is None or pd.isna(value):
-                        return None
-                    return float(value)
-
-                record = (
-                    symbol,
-                    date_str,
-                    safe_float(row.get("sma_5")),
-                    safe_float(row.get("sma_10")),
-                    safe_float(row.get("sma_20")),
-                    safe_float(row.get("sma_50")),
-                    safe_float(row.get("ema_12")),
-                    safe_float(row.get("ema_26")),
-                    safe_float(row.get("rsi")),
-                    safe_float(row.get("macd")),
-                    safe_float(row.get("macd_signal")),
-                    safe_float(row.get("macd_histogram")),
-                    safe_float(row.get("bb_upper")),
-                    safe_float(row.get("bb_middle")),
-                    safe_float(row.get("bb_lower")),
-                    safe_float(row.get("atr")),
-                    safe_float(row.get("stoch_k")),
-                    safe_float(row.get("stoch_d")),
-                    now,
-                )
-                records.append(record)
-
-            # 使用executemany提高性能
-            cursor.executemany(
-                """
-                INSERT OR REPLACE INTO technical_indicators 
-                (symbol, date, sma_5, sma_10, sma_20, sma_50, ema_12, ema_26,
-                 rsi, macd, macd_signal, macd_histogram, bb_upper, bb_middle, 
-                 bb_lower, atr, stoch_k, stoch_d, created_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+            records = self._indicator_records(symbol, df, now)
+            self.bulk_upsert(
+                "technical_indicators",
+                ("symbol", "date") + INDICATOR_VALUE_COLUMNS + ("created_at",),
                 records,
             )
 
-            conn.commit()
-            conn.close()
             logger.info(
                 f"Saved {len(records)} technical indicator records for {symbol}"
             )
@@ -581,7 +785,7 @@ class DatabaseManager:
             signal_data: 信号数据字典
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = pooled_connect(self.db_path)
             cursor = conn.cursor()
 
             now = datetime.now().isoformat()
@@ -621,7 +825,7 @@ class DatabaseManager:
             result_data: 回测结果数据字典
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = pooled_connect(self.db_path)
             cursor = conn.cursor()
 
             now = datetime.now().isoformat()
@@ -678,86 +882,59 @@ class DatabaseManager:
                 logger.warning(f"Empty DataFrame provided for {indicator_type}")
                 return False
 
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
             now = datetime.now().isoformat()
 
-            # 批量插入数据
+            date_column = self._first_column(df, "日期", "date")
+            value_column = self._first_column(df, "今值", "value", "同比增长")
             records = []
-            for _, row in df.iterrows():
-                # 处理日期字段
-                if "日期" in row:
-                    date_value = row["日期"]
-                elif "date" in row:
-                    date_value = row["date"]
+            if date_column and value_column:
+                values = pd.to_numeric(df[value_column], errors="coerce")
+                keep = (df[date_column].notna() & values.notna()).to_numpy()
+                frame = df[keep]
+
+                def optional_float(*candidates):
+                    column = self._first_column(frame, *candidates)
+                    if column is None:
+                        return [None] * len(frame)
+                    numbers = pd.to_numeric(frame[column], errors="coerce")
+                    # 与原逻辑一致：0和缺失值都记为NULL
+                    valid = numbers.notna() & (numbers != 0)
+                    return numbers.astype(object).where(valid, None).tolist()
+
+                report_column = self._first_column(frame, "商品", "report_name")
+                if report_column:
+                    report_names = [
+                        str(name) if name else None for name in frame[report_column]
+                    ]
                 else:
-                    continue
-
-                if date_value is None:
-                    continue
-
-                try:
-                    date_str = pd.to_datetime(date_value).strftime("%Y-%m-%d")
-                except Exception:
-                    date_str = (
-                        str(date_value).split()[0]
-                        if " " in str(date_value)
-                        else str(date_value)[:10]
-                    )
-
-                # 处理值字段
-                value = None
-                if "今值" in row:
-                    value = row["今值"]
-                elif "value" in row:
-                    value = row["value"]
-                elif "同比增长" in row:
-                    value = row["同比增长"]
-
-                if value is None or pd.isna(value):
-                    continue
-
-                # 处理其他字段
-                report_name = row.get("商品", row.get("report_name", ""))
-                forecast_value = row.get("预测值", row.get("forecast_value", None))
-                previous_value = row.get("前值", row.get("previous_value", None))
-
-                records.append(
-                    (
-                        indicator_type,
-                        date_str,
-                        float(value),
-                        str(report_name) if report_name else None,
-                        float(forecast_value)
-                        if forecast_value and not pd.isna(forecast_value)
-                        else None,
-                        float(previous_value)
-                        if previous_value and not pd.isna(previous_value)
-                        else None,
-                        now,
+                    report_names = [None] * len(frame)
+
+                records = list(
+                    zip(
+                        [indicator_type] * len(frame),
+                        self._date_strings(frame[date_column], fallback_len=10),
+                        values[keep].astype(float).tolist(),
+                        report_names,
+                        optional_float("预测值", "forecast_value"),
+                        optional_float("前值", "previous_value"),
+                        [now] * len(frame),
                     )
                 )
 
             if records:
-                cursor.executemany(
-                    """
-                    INSERT OR REPLACE INTO macro_data 
-                    (indicator_type, date, value, report_name, forecast_value, previous_value, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
+                self.bulk_upsert(
+                    "macro_data",
+                    (
+                        "indicator_type", "date", "value", "report_name",
+                        "forecast_value", "previous_value", "created_at",
+                    ),
                     records,
                 )
-
-                conn.commit()
                 logger.info(f"Saved {len(records)} {indicator_type} records")
-                result = True
-            else:
-                logger.warning(f"No valid records found for {indicator_type}")
-                result = False
+                return True
 
-            conn.close()
-            return result
+            logger.warning(f"No valid records found for {indicator_type}")
+            return False
 
         except Exception as e:
             logger.error(f"Failed to save macro data for {indicator_type}: {e}")
@@ -781,63 +958,51 @@ class DatabaseManager:
             if date is None:
                 date = datetime.now().strftime("%Y-%m-%d")
 
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
             now = datetime.now().isoformat()
 
+            name_column = self._first_column(df, "板块", "sector_name")
             records = []
-            for _, row in df.iterrows():
-                sector_name = row.get("板块", row.get("sector_name", ""))
-                if not sector_name:
-                    continue
-
-                records.append(
-                    (
-                        str(sector_name),
-                        int(row.get("公司家数", row.get("company_count", 0)))
-                        if not pd.isna(row.get("公司家数", row.get("company_count", 0)))
-                        else 0,
-                        float(row.get("平均价格", row.get("avg_price", 0)))
-                        if not pd.isna(row.get("平均价格", row.get("avg_price", 0)))
-                        else 0,
-                        float(row.get("涨跌额", row.get("change_amount", 0)))
-                        if not pd.isna(row.get("涨跌额", row.get("change_amount", 0)))
-                        else 0,
-                        float(row.get("涨跌幅", row.get("change_pct", 0)))
-                        if not pd.isna(row.get("涨跌幅", row.get("change_pct", 0)))
-                        else 0,
-                        int(row.get("总成交量", row.get("total_volume", 0)))
-                        if not pd.isna(row.get("总成交量", row.get("total_volume", 0)))
-                        else 0,
-                        float(row.get("总成交额", row.get("total_amount", 0)))
-                        if not pd.isna(row.get("总成交额", row.get("total_amount", 0)))
-                        else 0,
-                        date,
-                        now,
+            if name_column:
+                names = df[name_column]
+                keep = (names.notna() & (names.astype(str) != "")).to_numpy()
+                frame = df[keep]
+
+                def number(dtype, *candidates):
+                    column = self._first_column(frame, *candidates)
+                    if column is None:
+                        return [dtype(0)] * len(frame)
+                    numbers = pd.to_numeric(frame[column], errors="coerce").fillna(0)
+                    return numbers.astype(dtype).tolist()
+
+                records = list(
+                    zip(
+                        frame[name_column].astype(str).tolist(),
+                        number(int, "公司家数", "company_count"),
+                        number(float, "平均价格", "avg_price"),
+                        number(float, "涨跌额", "change_amount"),
+                        number(float, "涨跌幅", "change_pct"),
+                        number(int, "总成交量", "total_volume"),
+                        number(float, "总成交额", "total_amount"),
+                        [date] * len(frame),
+                        [now] * len(frame),
                     )
                 )
 
             if records:
-                cursor.executemany(
-                    """
-                    INSERT OR REPLACE INTO sector_data 
-                    (sector_name, company_count, avg_price, change_amount, change_pct, 
-                     total_volume, total_amount, date, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+                self.bulk_upsert(
+                    "sector_data",
+                    (
+                        "sector_name", "company_count", "avg_price", "change_amount",
+                        "change_pct", "total_volume", "total_amount", "date",
+                        "created_at",
+                    ),
                     records,
                 )
-
-                conn.commit()
                 logger.info(f"Saved {len(records)} sector records for {date}")
-                result = True
-            else:
-                logger.warning("No valid sector records found")
-                result = False
+                return True
 
-            conn.close()
-            return result
+            logger.warning("No valid sector records found")
+            return False
 
         except Exception as e:
             logger.error(f"Failed to save sector data: {e}")
@@ -859,55 +1024,43 @@ class DatabaseManager:
                 logger.warning(f"Empty DataFrame provided for stock news {symbol}")
                 return False
 
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
             now = datetime.now().isoformat()
 
-            records = []
-            for _, row in df.iterrows():
-                keyword = row.get("关键词", symbol)
-                title = row.get("新闻标题", "")
-                content = row.get("新闻内容", "")
-                publish_time = row.get("发布时间", "")
-                source = row.get("文章来源", "")
-                news_url = row.get("新闻链接", "")
-
-                if not title:
-                    continue
-
-                records.append(
-                    (
-                        symbol,
-                        str(keyword),
-                        str(title),
-                        str(content),
-                        str(publish_time),
-                        str(source),
-                        str(news_url),
-                        now,
-                    )
+            def text(column, default=""):
+                if column not in frame.columns:
+                    return [str(default)] * len(frame)
+                return frame[column].astype(str).tolist()
+
+            keep = [bool(title) for title in df.get("新闻标题", [""] * len(df))]
+            frame = df[keep]
+            records = list(
+                zip(
+                    [symbol] * len(frame),
+                    text("关键词", symbol),
+                    text("新闻标题"),
+                    text("新闻内容"),
+                    text("发布时间"),
+                    text("文章来源"),
+                    text("新闻链接"),
+                    [now] * len(frame),
                 )
+            )
 
             if records:
-                cursor.executemany(
-                    """
-                    INSERT OR IGNORE INTO stock_news 
-                    (symbol, keyword, title, content, publish_time, source, news_url, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+                self.bulk_upsert(
+                    "stock_news",
+                    (
+                        "symbol", "keyword", "title", "content", "publish_time",
+                        "source", "news_url", "created_at",
+                    ),
                     records,
+                    conflict="IGNORE",
                 )
-
-                conn.commit()
                 logger.info(f"Saved {len(records)} stock news records for {symbol}")
-                result = True
-            else:
-                logger.warning(f"No valid stock news records found for {symbol}")
-                result = False
+                return True
 
-            conn.close()
-            return result
+            logger.warning(f"No valid stock news records found for {symbol}")
+            return False
 
         except Exception as e:
             logger.error(f"Failed to save stock news for {symbol}: {e}")
@@ -940,7 +1093,7 @@ class DatabaseManager:
                 date_str = str(date)
                 date = f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}"
 
-            conn = sqlite3.connect(self.db_path)
+            conn = pooled_connect(self.db_path)
             cursor = conn.cursor()
             now = datetime.now().isoformat()
 
@@ -1108,7 +1261,7 @@ class DatabaseManager:
             是否保存成功
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = pooled_connect(self.db_path)
             cursor = conn.cursor()
 
             now = datetime.now().isoformat()
@@ -1218,51 +1371,38 @@ class DatabaseManager:
                 logger.warning("Empty DataFrame provided for news data")
                 return False
 
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
             now = datetime.now().isoformat()
 
-            records = []
-            for _, row in df.iterrows():
-                date_value = row.get("date", "")
-                title = row.get("title", "")
-                content = row.get("content", "")
-                sentiment = row.get("sentiment", "neutral")
-
-                if not title:
-                    continue
-
-                records.append(
-                    (
-                        str(date_value),
-                        str(title),
-                        str(content),
-                        str(sentiment),
-                        "CCTV",
-                        now,
-                    )
+            def text(column, default=""):
+                if column not in frame.columns:
+                    return [str(default)] * len(frame)
+                return frame[column].astype(str).tolist()
+
+            keep = [bool(title) for title in df.get("title", [""] * len(df))]
+            frame = df[keep]
+            records = list(
+                zip(
+                    text("date"),
+                    text("title"),
+                    text("content"),
+                    text("sentiment", "neutral"),
+                    ["CCTV"] * len(frame),
+                    [now] * len(frame),
                 )
+            )
 
             if records:
-                cursor.executemany(
-                    """
-                    INSERT OR IGNORE INTO news_data 
-                    (date, title, content, sentiment, source, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """,
+                self.bulk_upsert(
+                    "news_data",
+                    ("date", "title", "content", "sentiment", "source", "created_at"),
                     records,
+                    conflict="IGNORE",
                 )
-
-                conn.commit()
                 logger.info(f"Saved {len(records)} news records")
-                result = True
-            else:
-                logger.warning("No valid news records found")
-                result = False
+                return True
 
-            conn.close()
-            return result
+            logger.warning("No valid news records found")
+            return False
 
         except Exception as e:
             logger.error(f"Failed to save news data: {e}")
@@ -1275,7 +1415,7 @@ class DatabaseManager:
             股票列表DataFrame，包含symbol和name列
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = pooled_connect(self.db_path, readonly=True)
             
             # 从stock_info表获取股票列表
             query = "SELECT DISTINCT symbol, name FROM stock_info ORDER BY symbol"
@@ -1315,7 +1455,7 @@ class DatabaseManager:
             价格数据DataFrame
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = pooled_connect(self.db_path, readonly=True)
 
             query = "SELECT * FROM stock_prices WHERE symbol = ?"
             params = [symbol]
@@ -1344,6 +1484,148 @@ class DatabaseManager:
             logger.error(f"Failed to get stock prices for {symbol}: {e}")
             return pd.DataFrame()
 
+    def get_stock_prices_panel(
+        self,
+        symbols: List[str],
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """一次读取多只股票的价格面板
+
+        优先从列式存储读取（内存映射，只读取所需列和日期范围），
+        列式存储中没有的股票、以及行数与SQLite不一致（如启用列式存储前入库、
+        尚未回填）的股票用一条SQL查询补齐。
+
+        Args:
+            symbols: 股票代码列表
+            start_date: 开始日期
+            end_date: 结束日期
+            columns: 价格列（open/high/low/close/volume/amount/pct_change），None表示全部
+
+        Returns:
+            以 (date, symbol) 为MultiIndex的DataFrame
+        """
+        columns = list(columns) if columns else list(PRICE_COLUMNS[2:-1])
+        unknown = set(columns) - set(PRICE_COLUMNS[2:-1])
+        if unknown:
+            raise DataError(f"Unknown price columns: {sorted(unknown)}")
+        if not symbols:
+            return pd.DataFrame()
+
+        def select(fields: str, selected: List[str]) -> Tuple[str, list]:
+            query = (
+                f"SELECT {fields} FROM stock_prices "
+                f"WHERE symbol IN ({', '.join('?' * len(selected))})"
+            )
+            params = list(selected)
+            if start_date:
+                query += " AND date >= ?"
+                params.append(start_date)
+            if end_date:
+                query += " AND date <= ?"
+                params.append(end_date)
+            return query, params
+
+        parts = []
+        remaining = list(symbols)
+        try:
+            conn = pooled_connect(self.db_path, readonly=True)
+            if self.columnar_store is not None:
+                stored = set(self.columnar_store.list_symbols())
+                hits = [s for s in symbols if s in stored]
+                if hits:
+                    mirrored = self.columnar_store.read_panel(
+                        hits, start_date, end_date, columns
+                    )
+                    # 按区间行数与SQLite核对，不一致的股票改从SQLite读取
+                    query, params = select("symbol, COUNT(*)", hits)
+                    expected = dict(
+                        conn.execute(query + " GROUP BY symbol", params).fetchall()
+                    )
+                    actual = mirrored.groupby(level="symbol").size()
+                    complete = {
+                        s for s in hits if actual.get(s, 0) == expected.get(s, 0)
+                    }
+                    parts.append(
+                        mirrored[
+                            mirrored.index.get_level_values("symbol").isin(complete)
+                        ]
+                    )
+                    remaining = [s for s in symbols if s not in complete]
+
+            if remaining:
+                query, params = select(f"date, symbol, {', '.join(columns)}", remaining)
+                df = pd.read_sql_query(query, conn, params=params)
+                df["date"] = pd.to_datetime(df["date"]).astype("datetime64[ms]")
+                df[columns] = df[columns].astype("float64")
+                parts.append(df.set_index(["date", "symbol"]))
+            conn.close()
+
+            panel = pd.concat(parts) if len(parts) > 1 else parts[0]
+            logger.info(f"Retrieved price panel for {len(symbols)} symbols ({len(panel)} rows)")
+            return panel.sort_index()
+
+        except Exception as e:
+            logger.error(f"Failed to get price panel: {e}")
+            return pd.DataFrame()
+
+    def get_trading_calendar(
+        self, start_date: Optional[str] = None, end_date: Optional[str] = None
+    ) -> pd.DatetimeIndex:
+        """获取交易日历
+
+        Args:
+            start_date: 开始日期
+            end_date: 结束日期
+
+        Returns:
+            交易日DatetimeIndex（升序）
+        """
+        try:
+            conn = pooled_connect(self.db_path, readonly=True)
+
+            query = "SELECT date FROM trading_calendar WHERE 1=1"
+            params = []
+            if start_date:
+                query += " AND date >= ?"
+                params.append(start_date)
+            if end_date:
+                query += " AND date <= ?"
+                params.append(end_date)
+            query += " ORDER BY date"
+
+            rows = conn.execute(query, params).fetchall()
+            conn.close()
+            return pd.DatetimeIndex([row[0] for row in rows])
+
+        except Exception as e:
+            logger.error(f"Failed to get trading calendar: {e}")
+            return pd.DatetimeIndex([])
+
+    def get_price_coverage(self, symbol: str) -> List[Tuple[str, str]]:
+        """获取股票的价格数据覆盖区间
+
+        Args:
+            symbol: 股票代码
+
+        Returns:
+            按开始日期排序的 (start_date, end_date) 区间列表
+        """
+        try:
+            conn = pooled_connect(self.db_path, readonly=True)
+            rows = conn.execute(
+                "SELECT start_date, end_date FROM price_coverage "
+                "WHERE symbol = ? ORDER BY start_date",
+                (symbol,),
+            ).fetchall()
+            conn.close()
+            return [(row[0], row[1]) for row in rows]
+
+        except Exception as e:
+            logger.error(f"Failed to get price coverage for {symbol}: {e}")
+            return []
+
     def get_technical_indicators(
         self,
         symbol: str,
@@ -1361,7 +1643,7 @@ class DatabaseManager:
             技术指标数据DataFrame
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = pooled_connect(self.db_path, readonly=True)
 
             query = "SELECT * FROM technical_indicators WHERE symbol = ?"
             params = [symbol]
@@ -1409,7 +1691,7 @@ class DatabaseManager:
             交易信号列表
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = pooled_connect(self.db_path, readonly=True)
             cursor = conn.cursor()
 
             query = "SELECT * FROM trading_signals WHERE 1=1"
@@ -1472,7 +1754,7 @@ class DatabaseManager:
             宏观数据 DataFrame
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = pooled_connect(self.db_path, readonly=True)
 
             query = "SELECT * FROM macro_data WHERE 1=1"
             params = []
@@ -1519,7 +1801,7 @@ class DatabaseManager:
             板块数据 DataFrame
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = pooled_connect(self.db_path, readonly=True)
 
             query = "SELECT * FROM sector_data WHERE 1=1"
             params = []
@@ -1564,7 +1846,7 @@ class DatabaseManager:
             个股新闻数据 DataFrame
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = pooled_connect(self.db_path, readonly=True)
 
             query = "SELECT * FROM stock_news WHERE 1=1"
             params = []
@@ -1610,7 +1892,7 @@ class DatabaseManager:
             市场概况数据 DataFrame
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = pooled_connect(self.db_path, readonly=True)
 
             query = "SELECT * FROM daily_market_overview WHERE 1=1"
             params = []
@@ -1646,7 +1928,7 @@ class DatabaseManager:
             股票详细信息字典
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = pooled_connect(self.db_path, readonly=True)
             cursor = conn.cursor()
 
             cursor.execute(
@@ -1684,7 +1966,7 @@ class DatabaseManager:
             新闻数据 DataFrame
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = pooled_connect(self.db_path, readonly=True)
 
             query = "SELECT * FROM news_data WHERE 1=1"
             params = []
@@ -1723,7 +2005,7 @@ class DatabaseManager:
             回测结果列表
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = pooled_connect(self.db_path, readonly=True)
             cursor = conn.cursor()
 
             query = "SELECT * FROM backtest_results WHERE 1=1"
@@ -1770,7 +2052,7 @@ class DatabaseManager:
             数据库统计信息字典
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = pooled_connect(self.db_path, readonly=True)
             cursor = conn.cursor()
 
             stats = {}
@@ -1825,7 +2107,7 @@ class DatabaseManager:
             是否清理成功
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = pooled_connect(self.db_path)
             cursor = conn.cursor()
 
             # 计算截止日期
@@ -1871,7 +2153,7 @@ class DatabaseManager:
             股票代码列表
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = pooled_connect(self.db_path, readonly=True)
             cursor = conn.cursor()
 
             cursor.execute("SELECT DISTINCT symbol FROM stock_prices ORDER BY symbol")
@@ -6,15 +6,41 @@
 
 import json
 import os
-from typing import Any
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 
+# 尝试导入可选依赖
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
 from common.exceptions import DataError
 from common.logging_system import setup_logger
 
 logger = setup_logger("file_storage")
 
+# 列式行情存储的列（date之外均为数值列）
+MARKET_DATA_COLUMNS = (
+    "date",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "amount",
+    "pct_change",
+)
+
 
 class FileStorage:
     """
@@ -64,3 +90,234 @@ class FileStorage:
         except Exception as e:
             logger.error(f"Failed to load JSON: {filename}, error: {e}")
             raise DataError(f"Load JSON failed: {e}")
+
+    def save_parquet(self, df: pd.DataFrame, filename: str) -> None:
+        try:
+            if not HAS_PYARROW:
+                raise DataError("pyarrow is not installed")
+            path = os.path.join(self.base_dir, filename)
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            df.to_parquet(path, index=False)
+            logger.info(f"Saved Parquet: {path}")
+        except Exception as e:
+            logger.error(f"Failed to save Parquet: {filename}, error: {e}")
+            raise DataError(f"Save Parquet failed: {e}")
+
+    def load_parquet(
+        self, filename: str, columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        try:
+            if not HAS_PYARROW:
+                raise DataError("pyarrow is not installed")
+            path = os.path.join(self.base_dir, filename)
+            df = pq.read_table(path, columns=columns, memory_map=True).to_pandas()
+            logger.info(f"Loaded Parquet: {path}")
+            return df
+        except Exception as e:
+            logger.error(f"Failed to load Parquet: {filename}, error: {e}")
+            raise DataError(f"Load Parquet failed: {e}")
+
+
+class ColumnarMarketStore(FileStorage):
+    """
+    列式行情存储
+
+    每只股票一个按日期排序的Arrow IPC（Feather v2）文件：``<base_dir>/<dataset>/<代码>.arrow``。
+    读取时以内存映射方式打开，只取所需列，并在日期列上二分查找截取日期范围，
+    多只股票一次读取为 (date, symbol) 面板。
+    """
+
+    def __init__(
+        self,
+        base_dir: str = "data/columnar",
+        dataset: str = "stock_prices",
+        compression: str = "uncompressed",
+    ):
+        """
+        Args:
+            base_dir: 存储根目录
+            dataset: 数据集名称（子目录）
+            compression: Feather压缩方式，"uncompressed" 时读取为零拷贝内存映射，
+                "lz4"/"zstd" 可减少磁盘占用
+        """
+        if not HAS_PYARROW:
+            raise DataError("ColumnarMarketStore requires pyarrow: pip install pyarrow")
+        super().__init__(base_dir)
+        self.root = Path(self.base_dir) / dataset
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.compression = compression
+        self.schema = pa.schema(
+            [("date", pa.timestamp("ms"))]
+            + [(col, pa.float64()) for col in MARKET_DATA_COLUMNS[1:]]
+        )
+        self._write_lock = threading.Lock()
+
+    def _symbol_path(self, symbol: str) -> Path:
+        return self.root / f"{symbol}.arrow"
+
+    def _to_table(self, df: pd.DataFrame) -> "pa.Table":
+        """将价格DataFrame（date列或日期索引）转换为统一schema、按日期排序的Arrow表"""
+        if "date" in df.columns:
+            dates = df["date"]
+        else:
+            dates = pd.Series(df.index, index=df.index)
+        dates = pd.to_datetime(dates, errors="coerce", format="mixed")
+
+        data = {"date": dates.to_numpy(dtype="datetime64[ms]")}
+        for col in MARKET_DATA_COLUMNS[1:]:
+            if col in df.columns:
+                data[col] = pd.to_numeric(df[col], errors="coerce").to_numpy(
+                    dtype="float64"
+                )
+            else:
+                data[col] = np.full(len(df), np.nan)
+
+        frame = pd.DataFrame(data)
+        frame = frame[frame["date"].notna()]
+        frame = frame.drop_duplicates("date", keep="last").sort_values("date")
+        return pa.Table.from_pandas(frame, schema=self.schema, preserve_index=False)
+
+    def write_symbol(self, symbol: str, df: pd.DataFrame, merge: bool = True) -> int:
+        """
+        写入单只股票的价格数据
+
+        Args:
+            symbol: 股票代码
+            df: 价格数据
+            merge: 是否与已有数据合并（同一日期以新数据为准），False时覆盖
+
+        Returns:
+            文件中的总行数
+        """
+        try:
+            if df is None or df.empty:
+                return 0
+            path = self._symbol_path(symbol)
+            with self._write_lock:
+                table = self._to_table(df)
+                if merge and path.exists():
+                    # 不用内存映射读取，避免替换文件时仍被映射（Windows下无法替换）
+                    existing = feather.read_table(str(path), memory_map=False)
+                    keep = pc.invert(
+                        pc.is_in(
+                            existing.column("date"), value_set=table.column("date")
+                        )
+                    )
+                    table = pa.concat_tables([existing.filter(keep), table])
+                    table = table.sort_by("date")
+
+                tmp_path = path.with_suffix(".tmp")
+                feather.write_feather(
+                    table, str(tmp_path), compression=self.compression
+                )
+                os.replace(tmp_path, path)
+            return table.num_rows
+
+        except Exception as e:
+            logger.error(f"Failed to write columnar data for {symbol}: {e}")
+            raise DataError(f"Columnar write failed: {e}")
+
+    def write_many(self, frames: Dict[str, pd.DataFrame], merge: bool = True) -> int:
+        """批量写入多只股票，返回写入的股票数"""
+        written = 0
+        for symbol, df in frames.items():
+            if self.write_symbol(symbol, df, merge=merge):
+                written += 1
+        logger.info(f"Saved columnar data for {written} symbols")
+        return written
+
+    def list_symbols(self) -> List[str]:
+        """列出存储中的股票代码"""
+        return sorted(p.stem for p in self.root.glob("*.arrow"))
+
+    def has_symbol(self, symbol: str) -> bool:
+        """存储中是否已有该股票"""
+        return self._symbol_path(symbol).exists()
+
+    def _read_slice(
+        self,
+        path: Path,
+        columns: List[str],
+        start: Optional[np.datetime64],
+        end: Optional[np.datetime64],
+    ) -> "pa.Table":
+        """内存映射读取文件，按日期二分截取后只保留所需列"""
+        with pa.memory_map(str(path)) as source:
+            table = pa.ipc.open_file(source).read_all()
+        dates = table.column("date").to_numpy()
+        lo = int(np.searchsorted(dates, start, side="left")) if start is not None else 0
+        hi = (
+            int(np.searchsorted(dates, end, side="right"))
+            if end is not None
+            else len(dates)
+        )
+        return table.select(["date"] + columns).slice(lo, max(hi - lo, 0))
+
+    def read_panel(
+        self,
+        symbols: Optional[List[str]] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        读取 (date, symbol) 面板
+
+        Args:
+            symbols: 股票代码列表，None表示全部
+            start_date: 开始日期
+            end_date: 结束日期
+            columns: 数值列，None表示全部
+
+        Returns:
+            以 (date, symbol) 为MultiIndex、按日期和代码排序的DataFrame
+        """
+        try:
+            if symbols is None:
+                symbols = self.list_symbols()
+            columns = list(columns) if columns else list(MARKET_DATA_COLUMNS[1:])
+            start = (
+                np.datetime64(pd.Timestamp(start_date), "ms") if start_date else None
+            )
+            end = np.datetime64(pd.Timestamp(end_date), "ms") if end_date else None
+
+            tables, hits = [], []
+            for symbol in symbols:
+                path = self._symbol_path(symbol)
+                if path.exists():
+                    tables.append(self._read_slice(path, columns, start, end))
+                    hits.append(symbol)
+
+            if tables:
+                df = pa.concat_tables(tables).to_pandas()
+                counts = [t.num_rows for t in tables]
+                df.insert(1, "symbol", np.repeat(np.array(hits, dtype=object), counts))
+            else:
+                df = pd.DataFrame(columns=["date", "symbol"] + columns)
+            return df.set_index(["date", "symbol"]).sort_index()
+
+        except Exception as e:
+            logger.error(f"Failed to read columnar panel: {e}")
+            raise DataError(f"Columnar read failed: {e}")
+
+    def read_symbol(
+        self,
+        symbol: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """读取单只股票，返回以日期为索引的DataFrame"""
+        panel = self.read_panel([symbol], start_date, end_date, columns)
+        return panel.droplevel("symbol")
+
+    def read_field(
+        self,
+        field: str = "close",
+        symbols: Optional[List[str]] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """读取单个字段的宽表（行为日期，列为股票代码）"""
+        panel = self.read_panel(symbols, start_date, end_date, [field])
+        return panel[field].unstack("symbol")
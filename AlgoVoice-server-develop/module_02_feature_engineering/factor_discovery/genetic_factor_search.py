@@ -13,13 +13,15 @@ warnings.filterwarnings("ignore")
 import copy
 import logging
 import random
-from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import partial
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
+from common.parallel_executor import ParallelTrialExecutor
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,6 +38,7 @@ class GeneticConfig:
     tournament_size: int = 3  # 锦标赛选择大小
     early_stopping: int = 20  # 早停代数
     n_jobs: int = 4  # 并行数
+    parallel_backend: str = "thread"  # 并行方式：'thread'，或在独立脚本中使用 'process'
 
 
 @dataclass
@@ -48,6 +51,28 @@ class FactorGene:
     fitness: float = 0.0  # 适应度
 
 
+def _evaluate_gene_task(
+    searcher: "GeneticFactorSearch",
+    fitness_func: Callable,
+    task: Tuple[FactorGene, Optional[FactorGene]],
+    shared: Dict[str, Any],
+) -> float:
+    """在工作进程中评估单个基因（并行执行器的目标函数）
+
+    Args:
+        searcher: 搜索器（工作进程启动时复制一次）
+        fitness_func: 适应度函数
+        task: (基因, 当前最佳个体)，最佳个体用于默认适应度函数的复杂度惩罚
+        shared: 共享数据 {"data": 输入数据, "target": 目标变量}
+
+    Returns:
+        适应度
+    """
+    gene, best_individual = task
+    searcher.best_individual = best_individual
+    return searcher._evaluate_gene(gene, shared["data"], shared["target"], fitness_func)
+
+
 class GeneticFactorSearch:
     """遗传算法因子搜索器"""
 
@@ -103,6 +128,16 @@ class GeneticFactorSearch:
         self.best_individual = None
         self.best_fitness = float("-inf")
 
+        # 并行执行器（search期间常驻，数据只共享一次）
+        self._executor: Optional[ParallelTrialExecutor] = None
+        self.executor_stats: Optional[Dict[str, Any]] = None
+
+    def __getstate__(self):
+        # 传给工作进程时不带执行器本身
+        state = self.__dict__.copy()
+        state["_executor"] = None
+        return state
+
     def search(
         self,
         data: pd.DataFrame,
@@ -129,6 +164,14 @@ class GeneticFactorSearch:
             if fitness_func is None:
                 fitness_func = self._default_fitness_func
 
+            if self.config.n_jobs > 1:
+                self._executor = ParallelTrialExecutor(
+                    partial(_evaluate_gene_task, self, fitness_func),
+                    n_workers=self.config.n_jobs,
+                    shared_data={"data": data, "target": target},
+                    backend=self.config.parallel_backend,
+                )
+
             # 初始化种群
             population = self._initialize_population()
 
@@ -195,6 +238,12 @@ class GeneticFactorSearch:
             logger.error(f"Failed to perform genetic factor search: {e}")
             return None, 0.0
 
+        finally:
+            if self._executor is not None:
+                self.executor_stats = self._executor.get_stats()
+                self._executor.close()
+                self._executor = None
+
     def _initialize_population(self) -> List[FactorGene]:
         """初始化种群"""
         population = []
@@ -255,24 +304,22 @@ class GeneticFactorSearch:
         fitness_func: Callable,
     ) -> List[FactorGene]:
         """评估种群适应度"""
+        if self._executor is None:
+            for gene in population:
+                gene.fitness = self._evaluate_gene(gene, data, target, fitness_func)
+            return population
+
         try:
-            # 并行评估
-            with ThreadPoolExecutor(max_workers=self.config.n_jobs) as executor:
-                futures = []
-                for gene in population:
-                    future = executor.submit(
-                        self._evaluate_gene, gene, data, target, fitness_func
-                    )
-                    futures.append(future)
-
-                # 获取结果
-                for i, future in enumerate(futures):
-                    try:
-                        fitness = future.result(timeout=30)  # 30秒超时
-                        population[i].fitness = fitness
-                    except Exception as e:
-                        logger.warning(f"Failed to evaluate gene {i}: {e}")
-                        population[i].fitness = float("-inf")
+            # 并行评估：任务只传递基因本身，数据已映射到各工作进程
+            outcomes = self._executor.evaluate(
+                [(gene, self.best_individual) for gene in population]
+            )
+            for i, outcome in enumerate(outcomes):
+                if outcome.ok:
+                    population[i].fitness = outcome.value
+                else:
+                    logger.warning(f"Failed to evaluate gene {i}: {outcome.error}")
+                    population[i].fitness = float("-inf")
 
             return population
 
@@ -17,6 +17,175 @@ from common.logging_system import setup_logger
 logger = setup_logger("statistical_features")
 
 
+def _window_moments(windows: np.ndarray) -> Dict[str, np.ndarray]:
+    """按行计算窗口的均值、方差、偏度和峰度
+
+    与pandas rolling一致：方差为样本方差(ddof=1)，偏度/峰度为偏差校正后的
+    G1/G2（峰度为超额峰度），窗口内有NaN的行结果为NaN。
+
+    Args:
+        windows: 形状为 (样本数, 窗口长度) 的数组
+
+    Returns:
+        各统计量数组，长度为样本数
+    """
+    n = windows.shape[1]
+    mean = windows.mean(axis=1)
+    dev = windows - mean[:, None]
+    dev2 = dev * dev
+    m2 = dev2.mean(axis=1)
+    m3 = (dev2 * dev).mean(axis=1)
+    m4 = (dev2 * dev2).mean(axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        var = m2 * n / (n - 1) if n > 1 else np.full_like(m2, np.nan)
+        flat = m2 <= 1e-14 * np.maximum(mean * mean, 1.0)
+        if n >= 3:
+            skew = np.sqrt(n * (n - 1.0)) / (n - 2) * m3 / m2**1.5
+            skew = np.where(flat, 0.0, skew)
+        else:
+            skew = np.full_like(m2, np.nan)
+        if n >= 4:
+            kurt = (
+                ((n + 1) * m4 / (m2 * m2) - 3 * (n - 1)) * (n - 1) / ((n - 2) * (n - 3))
+            )
+            kurt = np.where(flat, -3.0, kurt)
+        else:
+            kurt = np.full_like(m2, np.nan)
+
+    return {"mean": mean, "var": var, "std": np.sqrt(var), "skew": skew, "kurt": kurt}
+
+
+def _jarque_bera(windows: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """按行计算Jarque-Bera统计量（忽略NaN，与 ``stats.jarque_bera(x.dropna())`` 一致）
+
+    Returns:
+        (统计量, p值, 有效样本数)
+    """
+    count = np.sum(~np.isnan(windows), axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dev = windows - np.nanmean(windows, axis=1)[:, None]
+        m2 = np.nanmean(dev**2, axis=1)
+        skew = np.nanmean(dev**3, axis=1) / m2**1.5
+        kurt = np.nanmean(dev**4, axis=1) / m2**2 - 3.0
+    jb_stat = count / 6.0 * (skew**2 + kurt**2 / 4.0)
+    # 自由度为2的卡方分布生存函数
+    return jb_stat, np.exp(-jb_stat / 2.0), count
+
+
+def _snapshot_statistics(
+    values: np.ndarray,
+    window: int,
+    percentiles: List[float],
+    distribution: bool = True,
+    outlier: bool = True,
+) -> Dict[str, np.ndarray]:
+    """只用末尾数据计算滚动统计特征在最后一个时点的值
+
+    结果等于对完整序列做 ``rolling(window)`` 后取 ``iloc[-1]``，
+    但计算量只与窗口长度有关，与序列长度无关。
+
+    Args:
+        values: 形状为 (样本数, 长度) 的数组，每行是一个序列的末尾部分，
+            长度至少为 window，提供 2*window-1 个点时才能计算 std_stability
+        window: 滚动窗口大小
+        percentiles: 分位数列表
+        distribution: 是否计算分布特征
+        outlier: 是否计算异常值特征
+
+    Returns:
+        特征名到数组的有序字典，特征名与逐窗口rolling实现一致
+    """
+    windows = values[:, -window:]
+    current = windows[:, -1]
+    moments = _window_moments(windows)
+    mean, std, skew, kurt = (
+        moments["mean"],
+        moments["std"],
+        moments["skew"],
+        moments["kurt"],
+    )
+
+    # 有NaN的窗口在rolling中结果为NaN，分位数同样处理
+    complete = ~np.isnan(windows).any(axis=1)
+    quantile_levels = sorted({0.25, 0.5, 0.75, *percentiles})
+    quantiles = dict(
+        zip(quantile_levels, np.quantile(windows, quantile_levels, axis=1))
+    )
+    for level in quantiles:
+        quantiles[level] = np.where(complete, quantiles[level], np.nan)
+    window_min = windows.min(axis=1)
+    window_max = windows.max(axis=1)
+    iqr = quantiles[0.75] - quantiles[0.25]
+
+    features = {
+        f"mean_{window}": mean,
+        f"std_{window}": std,
+        f"var_{window}": moments["var"],
+        f"min_{window}": window_min,
+        f"max_{window}": window_max,
+        f"median_{window}": quantiles[0.5],
+        f"skew_{window}": skew,
+        f"kurt_{window}": kurt,
+        f"range_{window}": window_max - window_min,
+        f"iqr_{window}": iqr,
+    }
+
+    for percentile in percentiles:
+        features[f"p{int(percentile * 100)}_{window}"] = quantiles[percentile]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if distribution:
+            jb_stat, jb_pvalue, count = _jarque_bera(windows)
+            enough = count > 8
+            features[f"jb_stat_{window}"] = np.where(enough, jb_stat, np.nan)
+            features[f"jb_pvalue_{window}"] = np.where(enough, jb_pvalue, np.nan)
+            features[f"is_normal_{window}"] = np.where(
+                enough, np.where(jb_pvalue > 0.05, 1.0, 0.0), np.nan
+            )
+            features[f"skew_normalized_{window}"] = (
+                skew / np.sqrt(6.0 / window) if window > 6 else skew
+            )
+            features[f"excess_kurtosis_{window}"] = kurt - 3
+
+        if outlier:
+            lower_bound = quantiles[0.25] - 1.5 * iqr
+            upper_bound = quantiles[0.75] + 1.5 * iqr
+            is_outlier = (current < lower_bound) | (current > upper_bound)
+            features[f"is_outlier_{window}"] = is_outlier.astype(float)
+            valid = ~np.isnan(mean) & ~np.isnan(std) & (std > 0)
+            z_score = np.abs(current - mean) / std
+            features[f"z_score_{window}"] = np.where(valid, z_score, np.nan)
+            features[f"is_extreme_{window}"] = np.where(
+                valid, np.where(z_score > 3, 1.0, 0.0), np.nan
+            )
+
+        # 稳定性特征
+        cv = std / mean
+        features[f"cv_{window}"] = np.where(np.isnan(cv), 0.0, cv)
+
+        x = np.arange(window, dtype=float)
+        x_dev = x - x.mean()
+        y_dev = windows - mean[:, None]
+        r_value = (y_dev @ x_dev) / np.sqrt(
+            (x_dev @ x_dev) * np.sum(y_dev * y_dev, axis=1)
+        )
+        features[f"trend_stability_{window}"] = (
+            r_value**2 if window >= 3 else np.full_like(mean, np.nan)
+        )
+
+        if values.shape[1] >= 2 * window - 1:
+            tail = values[:, -(2 * window - 1) :]
+            rolling_std = np.lib.stride_tricks.sliding_window_view(
+                tail, window, axis=1
+            ).std(axis=2, ddof=1)
+            features[f"std_stability_{window}"] = rolling_std.std(axis=1, ddof=1)
+        else:
+            features[f"std_stability_{window}"] = np.full_like(mean, np.nan)
+
+    return features
+
+
 @dataclass
 class StatisticalFeatureConfig:
     """统计特征配置"""
@@ -26,6 +195,9 @@ class StatisticalFeatureConfig:
     enable_distribution_features: bool = True
     enable_outlier_features: bool = True
     enable_correlation_features: bool = True
+    # 快照模式：滚动窗口特征只用末尾数据计算最后一个时点的值，
+    # 关闭时对整条序列做rolling后取最后一个值
+    snapshot_mode: bool = True
 
     def __post_init__(self):
         if self.windows is None:
@@ -283,7 +455,21 @@ class StatisticalFeatures:
             # 转换为DataFrame
             df = pd.DataFrame(data_dict)
 
-            if window is not None:
+            if window is not None and self.config.snapshot_mode:
+                # 只用最后一个窗口计算相关系数矩阵，有NaN的列不参与
+                if len(df) >= window:
+                    tail = df.tail(window)
+                    tail = tail.loc[:, tail.notna().all()]
+                    values = tail.to_numpy(dtype=float)
+                    with np.errstate(divide="ignore", invalid="ignore"):
+                        corr_matrix = np.corrcoef(values, rowvar=False)
+                    columns = list(tail.columns)
+                    for i, col1 in enumerate(columns):
+                        for j in range(i + 1, len(columns)):
+                            corr = corr_matrix[i, j]
+                            if np.isfinite(corr):
+                                features[f"corr_{col1}_{columns[j]}_{window}"] = corr
+            elif window is not None:
                 # 滚动相关性
                 for i, col1 in enumerate(df.columns):
                     for j, col2 in enumerate(df.columns):
@@ -356,6 +542,72 @@ class StatisticalFeatures:
             logger.error(f"Failed to extract stability features: {e}")
             return {}
 
+    def extract_window_snapshot(self, data: pd.Series, window: int) -> Dict[str, float]:
+        """快照模式下提取单个窗口的全部滚动特征
+
+        等价于依次调用 extract_basic_statistics / extract_percentile_features /
+        extract_distribution_features / extract_outlier_features /
+        extract_stability_features 并传入window，但只计算最后一个时点。
+
+        Args:
+            data: 时间序列数据
+            window: 滚动窗口大小
+
+        Returns:
+            特征字典
+        """
+        try:
+            if len(data) < window:
+                return {}
+            values = data.to_numpy(dtype=float)[-(2 * window - 1) :]
+            snapshot = _snapshot_statistics(
+                values[None, :],
+                window,
+                self.config.percentiles,
+                distribution=self.config.enable_distribution_features,
+                outlier=self.config.enable_outlier_features,
+            )
+            features = {k: float(v[0]) for k, v in snapshot.items()}
+            return {k: v for k, v in features.items() if pd.notna(v)}
+
+        except Exception as e:
+            logger.error(f"Failed to extract window snapshot: {e}")
+            return {}
+
+    def extract_snapshot_panel(
+        self, panel: pd.DataFrame, windows: Optional[List[int]] = None
+    ) -> pd.DataFrame:
+        """批量提取多只股票的滚动窗口特征快照
+
+        Args:
+            panel: 宽表，行为日期、列为股票代码（如收盘价或收益率）
+            windows: 窗口列表，默认使用配置中的windows
+
+        Returns:
+            行为股票代码、列为特征名的DataFrame；数据不足的股票对应特征为NaN
+        """
+        windows = windows or self.config.windows
+        if panel.empty:
+            return pd.DataFrame(index=panel.columns)
+
+        values = panel.to_numpy(dtype=float).T
+        frames = []
+        for window in windows:
+            if values.shape[1] < window:
+                continue
+            snapshot = _snapshot_statistics(
+                values[:, -(2 * window - 1) :],
+                window,
+                self.config.percentiles,
+                distribution=self.config.enable_distribution_features,
+                outlier=self.config.enable_outlier_features,
+            )
+            frames.append(pd.DataFrame(snapshot, index=panel.columns))
+
+        if not frames:
+            return pd.DataFrame(index=panel.columns)
+        return pd.concat(frames, axis=1)
+
     def extract_all_statistical_features(
         self, data: Union[pd.Series, Dict[str, pd.Series]]
     ) -> Dict[str, float]:
@@ -432,7 +684,14 @@ class StatisticalFeatures:
 
         # 滚动窗口特征
         for window in self.config.windows:
-            if len(data) >= window:
+            if len(data) >= window and self.config.snapshot_mode:
+                window_features = self.extract_window_snapshot(data, window)
+                if prefix:
+                    window_features = {
+                        f"{prefix}_{k}": v for k, v in window_features.items()
+                    }
+                features.update(window_features)
+            elif len(data) >= window:
                 window_basic = self.extract_basic_statistics(data, window)
                 window_percentile = self.extract_percentile_features(data, window)
                 window_distribution = self.extract_distribution_features(data, window)
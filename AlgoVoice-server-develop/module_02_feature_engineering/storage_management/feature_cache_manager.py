@@ -3,32 +3,42 @@
 专门用于特征工程数据的内存缓存
 """
 
-import time
-from collections import OrderedDict
 from typing import Any, Dict, Optional
 
-import numpy as np
-import pandas as pd
-
+from common.bounded_cache import BoundedCache, get_memory_budget
 from common.logging_system import setup_logger
 
 logger = setup_logger("feature_cache_manager")
 
 
 class FeatureCacheManager:
-    """特征缓存管理器类"""
+    """特征缓存管理器类
+
+    基于BoundedCache：单分片严格LRU，访问时刷新过期时间，
+    按DataFrame/ndarray估算的字节数计入进程级内存预算。
+    """
 
-    def __init__(self, max_size: int = 1000, ttl: int = 3600):
+    def __init__(
+        self, max_size: int = 1000, ttl: int = 3600, max_bytes: Optional[int] = None
+    ):
         """初始化特征缓存管理器
 
         Args:
             max_size: 最大缓存条目数
             ttl: 缓存生存时间(秒)
+            max_bytes: 最大缓存字节数，None表示只受进程级内存预算约束
         """
         self.max_size = max_size
         self.ttl = ttl
-        self.cache: OrderedDict = OrderedDict()
-        self.access_times: Dict[str, float] = {}
+        self._store = BoundedCache(
+            max_entries=max_size,
+            max_bytes=max_bytes,
+            default_ttl=ttl,
+            n_shards=1,
+            sliding_ttl=True,
+            budget=get_memory_budget(),
+            name="feature_cache",
+        )
 
     def _generate_key(self, data_type: str, symbol: str, **kwargs) -> str:
         """生成缓存键"""
@@ -38,32 +48,6 @@ class FeatureCacheManager:
                 key_parts.append(f"{k}={v}")
         return ":".join(key_parts)
 
-    def _is_expired(self, key: str) -> bool:
-        """检查缓存是否过期"""
-        if key not in self.access_times:
-            return True
-        return (time.time() - self.access_times[key]) > self.ttl
-
-    def _evict_expired(self):
-        """清理过期缓存"""
-        current_time = time.time()
-        expired_keys = [
-            key
-            for key, access_time in self.access_times.items()
-            if (current_time - access_time) > self.ttl
-        ]
-
-        for key in expired_keys:
-            self.cache.pop(key, None)
-            self.access_times.pop(key, None)
-
-    def _evict_lru(self):
-        """LRU淘汰"""
-        while len(self.cache) >= self.max_size:
-            oldest_key = next(iter(self.cache))
-            self.cache.pop(oldest_key)
-            self.access_times.pop(oldest_key, None)
-
     def set(self, data_type: str, symbol: str, data: Any, **kwargs) -> None:
         """设置缓存
 
@@ -74,15 +58,8 @@ class FeatureCacheManager:
             **kwargs: 额外的键值参数
         """
         key = self._generate_key(data_type, symbol, **kwargs)
-
-        self._evict_expired()
-        self._evict_lru()
-
-        self.cache[key] = data
-        self.access_times[key] = time.time()
-
-        # 移到末尾(最近使用)
-        self.cache.move_to_end(key)
+        if not self._store.set(key, data):
+            logger.warning(f"特征缓存 {key} 超出内存限额，未缓存")
 
     def get(self, data_type: str, symbol: str, **kwargs) -> Optional[Any]:
         """获取缓存
@@ -95,33 +72,20 @@ class FeatureCacheManager:
         Returns:
             缓存的数据或None
         """
-        key = self._generate_key(data_type, symbol, **kwargs)
-
-        if key not in self.cache:
-            return None
-
-        if self._is_expired(key):
-            self.cache.pop(key)
-            self.access_times.pop(key, None)
-            return None
-
-        # 更新访问时间并移到末尾
-        self.access_times[key] = time.time()
-        self.cache.move_to_end(key)
-
-        return self.cache[key]
+        return self._store.get(self._generate_key(data_type, symbol, **kwargs))
 
     def clear(self) -> None:
         """清空所有缓存"""
-        self.cache.clear()
-        self.access_times.clear()
+        self._store.clear()
 
     def get_stats(self) -> Dict[str, Any]:
         """获取缓存统计信息"""
+        stats = self._store.get_stats()
         return {
-            "cache_size": len(self.cache),
+            "cache_size": stats["entries"],
             "max_size": self.max_size,
             "ttl": self.ttl,
-            "hit_rate": getattr(self, "_hit_count", 0)
-            / max(getattr(self, "_access_count", 1), 1),
+            "hit_rate": stats["hit_rate"],
+            "memory_bytes": stats["memory_bytes"],
+            "evictions": stats["evictions"],
         }
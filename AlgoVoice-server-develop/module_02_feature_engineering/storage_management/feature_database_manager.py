@@ -5,18 +5,27 @@
 
 import json
 import sqlite3
+import zlib
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
 
+from common.db_connection_pool import pooled_connect
 from common.exceptions import DataError
 from common.logging_system import setup_logger
 
 logger = setup_logger("feature_database_manager")
 
+# 行情列不作为特征保存
+PRICE_COLUMNS = ("open", "high", "low", "close", "volume")
+# 单只股票的特征块超过该数量时合并为一个块
+MAX_BLOCKS_PER_SYMBOL = 32
+# 特征块的zlib压缩级别（1最快）
+BLOCK_COMPRESSION_LEVEL = 1
+
 
 class FeatureDatabaseManager:
     """特征数据库管理器类"""
@@ -31,6 +40,8 @@ class FeatureDatabaseManager:
             import os
             db_path = os.path.join("data", "module02_features.db")
         self.db_path = db_path
+        # (feature_set, 列名, dtype) -> schema_id
+        self._schema_cache: Dict[Tuple[str, Tuple[str, ...], str], int] = {}
         self._ensure_database_exists()
         self._init_tables()
 
@@ -41,7 +52,7 @@ class FeatureDatabaseManager:
 
     def _get_connection(self) -> sqlite3.Connection:
         """获取数据库连接"""
-        conn = sqlite3.connect(self.db_path)
+        conn = pooled_connect(self.db_path)
         conn.execute("PRAGMA foreign_keys = ON")
         return conn
 
@@ -149,6 +160,36 @@ class FeatureDatabaseManager:
                 )
             """)
 
+            # 特征矩阵的schema注册表（列名、数据类型）
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS feature_schemas (
+                    schema_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    feature_set TEXT NOT NULL,
+                    columns TEXT NOT NULL,
+                    dtype TEXT NOT NULL,
+                    metadata TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE(feature_set, columns, dtype)
+                )
+            """)
+
+            # 特征矩阵块：每行保存一只股票一段连续日期的整块特征（压缩二进制）
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS feature_blocks (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    feature_set TEXT NOT NULL,
+                    symbol TEXT NOT NULL,
+                    start_date DATE NOT NULL,
+                    end_date DATE NOT NULL,
+                    n_rows INTEGER NOT NULL,
+                    schema_id INTEGER NOT NULL REFERENCES feature_schemas(schema_id),
+                    dates BLOB NOT NULL,
+                    data BLOB NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE(feature_set, symbol, start_date)
+                )
+            """)
+
             # 创建索引
             self._create_indexes(conn)
 
@@ -169,16 +210,438 @@ class FeatureDatabaseManager:
             "CREATE INDEX IF NOT EXISTS idx_graph_symbol_date ON graph_features(symbol, date)",
             "CREATE INDEX IF NOT EXISTS idx_ts_symbol_date ON time_series_features(symbol, date)",
             "CREATE INDEX IF NOT EXISTS idx_embedding_symbol ON graph_embeddings(symbol)",
+            "CREATE INDEX IF NOT EXISTS idx_blocks_set_symbol_end ON feature_blocks(feature_set, symbol, end_date)",
         ]
 
         for index_sql in indexes:
             conn.execute(index_sql)
 
+    # 特征矩阵块存储
+    def _register_schema(
+        self,
+        conn: sqlite3.Connection,
+        feature_set: str,
+        columns: List[str],
+        dtype: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """注册（或查找）特征矩阵的schema，返回schema_id"""
+        key = (feature_set, tuple(columns), dtype)
+        schema_id = self._schema_cache.get(key)
+        if schema_id is not None:
+            return schema_id
+
+        columns_json = json.dumps(list(columns), ensure_ascii=False)
+        conn.execute(
+            """
+            INSERT OR IGNORE INTO feature_schemas (feature_set, columns, dtype, metadata)
+            VALUES (?, ?, ?, ?)
+        """,
+            (
+                feature_set,
+                columns_json,
+                dtype,
+                json.dumps(metadata, ensure_ascii=False) if metadata else None,
+            ),
+        )
+        row = conn.execute(
+            "SELECT schema_id FROM feature_schemas WHERE feature_set = ? AND columns = ? AND dtype = ?",
+            (feature_set, columns_json, dtype),
+        ).fetchone()
+        self._schema_cache[key] = row[0]
+        return row[0]
+
+    def _load_schemas(
+        self, conn: sqlite3.Connection, schema_ids
+    ) -> Dict[int, Tuple[List[str], str]]:
+        """读取schema_id对应的列名和数据类型"""
+        ids = sorted(set(schema_ids))
+        if not ids:
+            return {}
+        rows = conn.execute(
+            f"SELECT schema_id, columns, dtype FROM feature_schemas "
+            f"WHERE schema_id IN ({', '.join('?' * len(ids))})",
+            ids,
+        ).fetchall()
+        return {row[0]: (json.loads(row[1]), row[2]) for row in rows}
+
+    @staticmethod
+    def _encode_block(frame: pd.DataFrame, dtype: str) -> Tuple[bytes, bytes]:
+        """将特征矩阵编码为压缩的日期块和数值块（数值按列连续存放，压缩率更高）"""
+        days = frame.index.values.astype("datetime64[D]").astype(np.int32)
+        values = frame.to_numpy(dtype=dtype).T
+        return (
+            zlib.compress(days.tobytes(), BLOCK_COMPRESSION_LEVEL),
+            zlib.compress(np.ascontiguousarray(values).tobytes(), BLOCK_COMPRESSION_LEVEL),
+        )
+
+    @staticmethod
+    def _decode_block(
+        dates_blob: bytes, data_blob: bytes, n_rows: int, n_cols: int, dtype: str
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """解码特征块，返回 (datetime64[D]日期, n_rows×n_cols数值矩阵)"""
+        days = np.frombuffer(zlib.decompress(dates_blob), dtype=np.int32)
+        values = np.frombuffer(zlib.decompress(data_blob), dtype=dtype)
+        return days.astype("datetime64[D]"), values.reshape(n_cols, n_rows).T
+
+    @staticmethod
+    def _normalize_feature_frame(df: pd.DataFrame) -> pd.DataFrame:
+        """整理为以日期为索引、只含数值列、按日期排序去重的特征矩阵"""
+        frame = df
+        if "date" in frame.columns:
+            frame = frame.set_index("date")
+        frame = frame.drop(columns=[c for c in PRICE_COLUMNS if c in frame.columns])
+        frame = frame.select_dtypes(exclude=["datetime", "datetimetz", "timedelta"])
+        frame = frame.apply(pd.to_numeric, errors="coerce")
+        frame = frame.loc[:, frame.notna().any()]
+
+        frame.index = pd.to_datetime(frame.index, errors="coerce", format="mixed").normalize()
+        frame = frame[frame.index.notna()]
+        frame = frame[~frame.index.duplicated(keep="last")].sort_index()
+        frame.columns = [str(c) for c in frame.columns]
+        return frame
+
+    def _read_blocks(
+        self,
+        conn: sqlite3.Connection,
+        feature_set: str,
+        symbols: Optional[List[str]] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> List[tuple]:
+        """查询与日期范围相交的特征块"""
+        query = """
+            SELECT id, symbol, n_rows, schema_id, dates, data
+            FROM feature_blocks
+            WHERE feature_set = ?
+        """
+        params: List[Any] = [feature_set]
+        if symbols is not None:
+            query += f" AND symbol IN ({', '.join('?' * len(symbols))})"
+            params.extend(symbols)
+        if start_date:
+            query += " AND end_date >= ?"
+            params.append(start_date)
+        if end_date:
+            query += " AND start_date <= ?"
+            params.append(end_date)
+        query += " ORDER BY symbol, start_date"
+        return conn.execute(query, params).fetchall()
+
+    def _blocks_to_frame(
+        self, conn: sqlite3.Connection, blocks: List[tuple]
+    ) -> pd.DataFrame:
+        """将单只股票的多个特征块合并为一个DataFrame"""
+        schemas = self._load_schemas(conn, [b[3] for b in blocks])
+        frames = []
+        for _, _, n_rows, schema_id, dates_blob, data_blob in blocks:
+            columns, dtype = schemas[schema_id]
+            dates, values = self._decode_block(
+                dates_blob, data_blob, n_rows, len(columns), dtype
+            )
+            frames.append(pd.DataFrame(values, index=pd.DatetimeIndex(dates), columns=columns))
+        return pd.concat(frames) if len(frames) > 1 else frames[0]
+
+    def save_feature_matrix(
+        self,
+        feature_set: str,
+        symbol: str,
+        features_df: pd.DataFrame,
+        dtype: str = "float64",
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """以整块矩阵保存一只股票的特征（按日期追加）
+
+        新数据的日期都晚于已有数据时直接追加为新块；与已有块日期重叠时，
+        重叠的块与新数据合并（同一日期同一特征以新的非空值为准）后重写。
+
+        Args:
+            feature_set: 特征集名称（如 "technical"、"time_series"）
+            symbol: 股票代码
+            features_df: 以日期为索引（或含date列）的特征DataFrame
+            dtype: 存储精度 ("float64" / "float32")
+            metadata: 记录到schema注册表的附加信息（如特征说明）
+
+        Returns:
+            写入的行数
+        """
+        frame = self._normalize_feature_frame(features_df)
+        if frame.empty:
+            return 0
+
+        conn = self._get_connection()
+        try:
+            first_date = frame.index[0].strftime("%Y-%m-%d")
+            overlapping = conn.execute(
+                """
+                SELECT id, symbol, n_rows, schema_id, dates, data
+                FROM feature_blocks
+                WHERE feature_set = ? AND symbol = ? AND end_date >= ?
+                ORDER BY start_date
+            """,
+                (feature_set, symbol, first_date),
+            ).fetchall()
+            block_count = conn.execute(
+                "SELECT COUNT(*) FROM feature_blocks WHERE feature_set = ? AND symbol = ?",
+                (feature_set, symbol),
+            ).fetchone()[0]
+
+            # 块数过多时整体合并，避免读取时解码大量小块
+            if block_count - len(overlapping) >= MAX_BLOCKS_PER_SYMBOL:
+                overlapping = self._read_blocks(conn, feature_set, [symbol])
+
+            if overlapping:
+                old = self._blocks_to_frame(conn, overlapping)
+                frame = frame.combine_first(old)
+                frame = frame[[c for c in old.columns if c in frame.columns]
+                              + [c for c in frame.columns if c not in old.columns]]
+                conn.executemany(
+                    "DELETE FROM feature_blocks WHERE id = ?",
+                    [(b[0],) for b in overlapping],
+                )
+
+            schema_id = self._register_schema(
+                conn, feature_set, list(frame.columns), dtype, metadata
+            )
+            dates_blob, data_blob = self._encode_block(frame, dtype)
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO feature_blocks
+                (feature_set, symbol, start_date, end_date, n_rows, schema_id, dates, data)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+                (
+                    feature_set,
+                    symbol,
+                    frame.index[0].strftime("%Y-%m-%d"),
+                    frame.index[-1].strftime("%Y-%m-%d"),
+                    len(frame),
+                    schema_id,
+                    dates_blob,
+                    data_blob,
+                ),
+            )
+            conn.commit()
+            return len(frame)
+
+        except Exception as e:
+            logger.error(f"Failed to save feature matrix {feature_set} for {symbol}: {e}")
+            raise DataError(f"Feature matrix save failed: {e}")
+        finally:
+            conn.close()
+
+    def get_feature_matrix(
+        self,
+        feature_set: str,
+        symbol: str,
+        start_date: str = None,
+        end_date: str = None,
+        columns: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """读取一只股票的特征矩阵
+
+        Returns:
+            以日期为索引的特征DataFrame
+        """
+        panel = self.get_feature_panel(feature_set, [symbol], start_date, end_date, columns)
+        if panel.empty:
+            return pd.DataFrame()
+        return panel.droplevel("symbol")
+
+    def get_feature_panel(
+        self,
+        feature_set: str,
+        symbols: Optional[List[str]] = None,
+        start_date: str = None,
+        end_date: str = None,
+        columns: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """读取多只股票的特征面板（直接拼接特征块，不做透视）
+
+        Args:
+            feature_set: 特征集名称
+            symbols: 股票代码列表，None表示全部
+            start_date: 开始日期
+            end_date: 结束日期
+            columns: 特征列，None表示所有出现过的特征
+
+        Returns:
+            以 (date, symbol) 为MultiIndex的特征DataFrame
+        """
+        try:
+            conn = self._get_connection()
+            try:
+                blocks = self._read_blocks(conn, feature_set, symbols, start_date, end_date)
+                schemas = self._load_schemas(conn, [b[3] for b in blocks])
+            finally:
+                conn.close()
+
+            if not blocks:
+                return pd.DataFrame()
+
+            if columns is None:
+                columns = []
+                for schema_columns, _ in schemas.values():
+                    columns.extend(c for c in schema_columns if c not in columns)
+            column_pos = {c: i for i, c in enumerate(columns)}
+            lo = np.datetime64(pd.Timestamp(start_date), "D") if start_date else None
+            hi = np.datetime64(pd.Timestamp(end_date), "D") if end_date else None
+
+            date_parts, symbol_parts, value_parts = [], [], []
+            for _, symbol, n_rows, schema_id, dates_blob, data_blob in blocks:
+                block_columns, dtype = schemas[schema_id]
+                dates, values = self._decode_block(
+                    dates_blob, data_blob, n_rows, len(block_columns), dtype
+                )
+                i = np.searchsorted(dates, lo) if lo is not None else 0
+                j = np.searchsorted(dates, hi, side="right") if hi is not None else n_rows
+                if j <= i:
+                    continue
+
+                src = [k for k, c in enumerate(block_columns) if c in column_pos]
+                if [block_columns[k] for k in src] == columns:
+                    block = values[i:j, src]
+                else:
+                    block = np.full((j - i, len(columns)), np.nan)
+                    block[:, [column_pos[block_columns[k]] for k in src]] = values[i:j, src]
+
+                date_parts.append(dates[i:j])
+                symbol_parts.append(np.full(j - i, symbol, dtype=object))
+                value_parts.append(block)
+
+            if not value_parts:
+                return pd.DataFrame()
+
+            index = pd.MultiIndex.from_arrays(
+                [
+                    pd.DatetimeIndex(np.concatenate(date_parts)),
+                    np.concatenate(symbol_parts),
+                ],
+                names=["date", "symbol"],
+            )
+            panel = pd.DataFrame(np.vstack(value_parts), index=index, columns=columns)
+            return panel.sort_index()
+
+        except Exception as e:
+            logger.error(f"Failed to get feature panel {feature_set}: {e}")
+            return pd.DataFrame()
+
+    def get_feature_schemas(self, feature_set: str = None) -> List[Dict[str, Any]]:
+        """获取已注册的特征schema
+
+        Args:
+            feature_set: 特征集名称 (可选)
+
+        Returns:
+            schema列表
+        """
+        try:
+            conn = self._get_connection()
+            query = "SELECT schema_id, feature_set, columns, dtype, metadata, created_at FROM feature_schemas"
+            params = []
+            if feature_set:
+                query += " WHERE feature_set = ?"
+                params.append(feature_set)
+            rows = conn.execute(query + " ORDER BY schema_id", params).fetchall()
+            conn.close()
+            return [
+                {
+                    "schema_id": row[0],
+                    "feature_set": row[1],
+                    "columns": json.loads(row[2]),
+                    "dtype": row[3],
+                    "metadata": json.loads(row[4]) if row[4] else {},
+                    "created_at": row[5],
+                }
+                for row in rows
+            ]
+
+        except Exception as e:
+            logger.error(f"Failed to get feature schemas: {e}")
+            return []
+
+    def _get_legacy_features(
+        self,
+        table: str,
+        name_column: str,
+        value_column: str,
+        symbol: str,
+        start_date: str = None,
+        end_date: str = None,
+    ) -> pd.DataFrame:
+        """读取旧版逐值存储（每个特征值一行）的数据并透视为宽表"""
+        conn = self._get_connection()
+
+        query = f"""
+            SELECT date, {name_column}, {value_column}
+            FROM {table}
+            WHERE symbol = ?
+        """
+        params = [symbol]
+
+        if start_date:
+            query += " AND date >= ?"
+            params.append(start_date)
+        if end_date:
+            query += " AND date <= ?"
+            params.append(end_date)
+
+        query += f" ORDER BY date, {name_column}"
+
+        df = pd.read_sql_query(query, conn, params=params)
+        conn.close()
+
+        if df.empty:
+            return pd.DataFrame()
+
+        # 透视表转换
+        result_df = df.pivot(index="date", columns=name_column, values=value_column)
+        result_df.index = pd.to_datetime(result_df.index)
+        result_df.index.name = "date"
+        result_df.columns.name = None
+        return result_df
+
+    def _get_features_with_legacy(
+        self,
+        feature_set: str,
+        table: str,
+        name_column: str,
+        value_column: str,
+        symbol: str,
+        start_date: str = None,
+        end_date: str = None,
+    ) -> pd.DataFrame:
+        """读取特征矩阵，并按日期合并特征矩阵存储之前写入的旧版数据
+
+        同一日期同一特征两边都有值时以特征矩阵中的为准。
+        """
+        result_df = self.get_feature_matrix(feature_set, symbol, start_date, end_date)
+        legacy_df = self._get_legacy_features(
+            table, name_column, value_column, symbol, start_date, end_date
+        )
+        if legacy_df.empty:
+            return result_df
+        if result_df.empty:
+            return legacy_df
+
+        columns = list(result_df.columns) + [
+            c for c in legacy_df.columns if c not in result_df.columns
+        ]
+        return result_df.combine_first(legacy_df)[columns]
+
+    @staticmethod
+    def _window_size(feature_name: str) -> Optional[int]:
+        """从特征名中提取窗口大小（如 "volatility_20" -> 20）"""
+        parts = str(feature_name).split("_")
+        if len(parts) > 1 and parts[-1].isdigit():
+            return int(parts[-1])
+        return None
+
     # 技术指标相关方法
     def save_technical_indicators(
         self, symbol: str, indicators_df: pd.DataFrame
     ) -> bool:
-        """保存技术指标数据
+        """保存技术指标数据（整块写入特征矩阵存储）
 
         Args:
             symbol: 股票代码
@@ -188,49 +651,9 @@ class FeatureDatabaseManager:
             是否保存成功
         """
         try:
-            conn = self._get_connection()
-
-            for date, row in indicators_df.iterrows():
-                for indicator_name, value in row.items():
-                    if pd.notna(value) and indicator_name not in [
-                        "open",
-                        "high",
-                        "low",
-                        "close",
-                        "volume",
-                    ]:
-                        # 处理日期格式
-                        if hasattr(date, "strftime"):
-                            date_str = date.strftime("%Y-%m-%d")
-                        else:
-                            date_str = str(date)[:10]  # 假设是YYYY-MM-DD格式的字符串
-
-                        # 安全转换数值
-                        float_value = self._safe_float_convert(value)
-                        if float_value is None:
-                            continue  # 跳过无效数值
-
-                        conn.execute(
-                            """
-                            INSERT OR REPLACE INTO technical_indicators 
-                            (symbol, date, indicator_name, indicator_value, metadata)
-                            VALUES (?, ?, ?, ?, ?)
-                        """,
-                            (
-                                symbol,
-                                date_str,
-                                indicator_name,
-                                float_value,
-                                json.dumps({"source": "technical_indicators"}),
-                            ),
-                        )
+            rows = self.save_feature_matrix("technical", symbol, indicators_df)
 
-            conn.commit()
-            conn.close()
-
-            logger.info(
-                f"Saved technical indicators for {symbol}: {len(indicators_df)} records"
-            )
+            logger.info(f"Saved technical indicators for {symbol}: {rows} records")
             return True
 
         except Exception as e:
@@ -251,42 +674,34 @@ class FeatureDatabaseManager:
             技术指标DataFrame
         """
         try:
-            conn = self._get_connection()
-
-            query = """
-                SELECT date, indicator_name, indicator_value 
-                FROM technical_indicators 
-                WHERE symbol = ?
-            """
-            params = [symbol]
-
-            if start_date:
-                query += " AND date >= ?"
-                params.append(start_date)
-            if end_date:
-                query += " AND date <= ?"
-                params.append(end_date)
-
-            query += " ORDER BY date, indicator_name"
-
-            df = pd.read_sql_query(query, conn, params=params)
-            conn.close()
-
-            if df.empty:
-                return pd.DataFrame()
-
-            # 透视表转换
-            result_df = df.pivot(
-                index="date", columns="indicator_name", values="indicator_value"
+            return self._get_features_with_legacy(
+                "technical",
+                "technical_indicators",
+                "indicator_name",
+                "indicator_value",
+                symbol,
+                start_date,
+                end_date,
             )
-            result_df.index = pd.to_datetime(result_df.index)
-
-            return result_df
 
         except Exception as e:
             logger.error(f"Failed to get technical indicators for {symbol}: {e}")
             return pd.DataFrame()
 
+    def get_technical_indicators_panel(
+        self,
+        symbols: List[str],
+        start_date: str = None,
+        end_date: str = None,
+        columns: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """获取多只股票的技术指标面板
+
+        Returns:
+            以 (date, symbol) 为MultiIndex的技术指标DataFrame
+        """
+        return self.get_feature_panel("technical", symbols, start_date, end_date, columns)
+
     # 因子数据相关方法
     def save_factor_data(
         self,
@@ -603,7 +1018,7 @@ class FeatureDatabaseManager:
     def save_time_series_features(
         self, symbol: str, features_dict: Dict[str, Any]
     ) -> bool:
-        """保存时间序列特征
+        """保存时间序列特征（整块写入特征矩阵存储）
 
         Args:
             symbol: 股票代码
@@ -613,45 +1028,27 @@ class FeatureDatabaseManager:
             是否保存成功
         """
         try:
-            conn = self._get_connection()
-
+            columns = {}
+            descriptions = {}
+            window_sizes = {}
             for feature_name, feature_obj in features_dict.items():
                 if hasattr(feature_obj, "values") and hasattr(
                     feature_obj, "description"
                 ):
-                    # 从特征名中提取窗口大小
-                    window_size = None
-                    if "_" in feature_name:
-                        parts = feature_name.split("_")
-                        if parts[-1].isdigit():
-                            window_size = int(parts[-1])
-
-                    for date, value in feature_obj.values.items():
-                        if pd.notna(value):
-                            # 处理日期格式
-                            if hasattr(date, "strftime"):
-                                date_str = date.strftime("%Y-%m-%d")
-                            else:
-                                date_str = str(date)[:10]
-
-                            conn.execute(
-                                """
-                                INSERT OR REPLACE INTO time_series_features 
-                                (symbol, date, feature_name, feature_value, window_size, description)
-                                VALUES (?, ?, ?, ?, ?, ?)
-                            """,
-                                (
-                                    symbol,
-                                    date_str,
-                                    feature_name,
-                                    float(value),
-                                    window_size,
-                                    feature_obj.description,
-                                ),
-                            )
-
-            conn.commit()
-            conn.close()
+                    columns[feature_name] = pd.Series(feature_obj.values)
+                    descriptions[feature_name] = feature_obj.description
+                    window_sizes[feature_name] = self._window_size(feature_name)
+
+            if columns:
+                self.save_feature_matrix(
+                    "time_series",
+                    symbol,
+                    pd.DataFrame(columns),
+                    metadata={
+                        "descriptions": descriptions,
+                        "window_sizes": window_sizes,
+                    },
+                )
 
             logger.info(
                 f"Saved time series features for {symbol}: {len(features_dict)} features"
@@ -663,7 +1060,11 @@ class FeatureDatabaseManager:
             return False
 
     def get_time_series_features(
-        self, symbol: str, start_date: str = None, end_date: str = None
+        self,
+        symbol: str,
+        start_date: str = None,
+        end_date: str = None,
+        window_size: Optional[int] = None,
     ) -> pd.DataFrame:
         """获取时间序列特征
 
@@ -671,41 +1072,25 @@ class FeatureDatabaseManager:
             symbol: 股票代码
             start_date: 开始日期
             end_date: 结束日期
+            window_size: 只返回该窗口大小的特征（按特征名后缀，如 "volatility_20"）
 
         Returns:
             时间序列特征DataFrame
         """
         try:
-            conn = self._get_connection()
-
-            query = """
-                SELECT date, feature_name, feature_value 
-                FROM time_series_features 
-                WHERE symbol = ?
-            """
-            params = [symbol]
-
-            if start_date:
-                query += " AND date >= ?"
-                params.append(start_date)
-            if end_date:
-                query += " AND date <= ?"
-                params.append(end_date)
-
-            query += " ORDER BY date, feature_name"
-
-            df = pd.read_sql_query(query, conn, params=params)
-            conn.close()
-
-            if df.empty:
-                return pd.DataFrame()
-
-            # 透视表转换
-            result_df = df.pivot(
-                index="date", columns="feature_name", values="feature_value"
+            result_df = self._get_features_with_legacy(
+                "time_series",
+                "time_series_features",
+                "feature_name",
+                "feature_value",
+                symbol,
+                start_date,
+                end_date,
             )
-            result_df.index = pd.to_datetime(result_df.index)
-
+            if window_size is not None and not result_df.empty:
+                result_df = result_df[
+                    [c for c in result_df.columns if self._window_size(c) == window_size]
+                ]
             return result_df
 
         except Exception as e:
@@ -810,6 +1195,8 @@ class FeatureDatabaseManager:
                 "graph_features",
                 "time_series_features",
                 "graph_embeddings",
+                "feature_schemas",
+                "feature_blocks",
             ]
 
             for table in tables:
@@ -825,7 +1212,12 @@ class FeatureDatabaseManager:
 
             # 唯一股票数量
             cursor = conn.execute(
-                "SELECT COUNT(DISTINCT symbol) FROM technical_indicators"
+                """
+                SELECT COUNT(DISTINCT symbol) FROM (
+                    SELECT symbol FROM technical_indicators
+                    UNION SELECT symbol FROM feature_blocks
+                )
+            """
             )
             stats["unique_symbols"] = cursor.fetchone()[0]
 
@@ -866,6 +1258,12 @@ class FeatureDatabaseManager:
                 )
                 total_deleted += cursor.rowcount
 
+            # 特征块按整块清理（只删除完全早于截止日期的块）
+            cursor = conn.execute(
+                "DELETE FROM feature_blocks WHERE end_date < ?", (cutoff_date,)
+            )
+            total_deleted += cursor.rowcount
+
             conn.commit()
             conn.close()
 
@@ -11,10 +11,14 @@ import networkx as nx
 import numpy as np
 import pandas as pd
 from common.constants import TRADING_DAYS_PER_YEAR
+from common.covariance_estimator import (
+    IncrementalCovarianceEstimator,
+    estimate_covariance,
+)
 from common.exceptions import DataError
 from common.logging_system import setup_logger
 from scipy import signal, stats
-from sklearn.covariance import EmpiricalCovariance, LedoitWolf
+from sklearn.covariance import EmpiricalCovariance
 
 logger = setup_logger("dynamic_correlation")
 
@@ -272,25 +276,16 @@ class DynamicCorrelationAnalyzer:
         Returns:
             滚动相关性DataFrame
         """
-        window = self.config.window_size
-        min_periods = self.config.min_periods
-
         if self.config.exponential_weighting:
             # 指数加权相关性
-            corr_matrix = returns_df.ewm(
-                halflife=self.config.halflife, min_periods=min_periods
-            ).corr(method=method)
-        else:
-            # 简单滚动相关性
-            corr_matrix = returns_df.rolling(
-                window=window, min_periods=min_periods
-            ).corr(method=method)
-
-        # 提取最新的相关性矩阵
-        latest_date = returns_df.index[-1]
-        latest_corr = corr_matrix.loc[latest_date]
+            return self._latest_correlation(
+                returns_df, method, halflife=self.config.halflife
+            )
 
-        return latest_corr
+        # 简单滚动相关性：只需要最新一个窗口
+        return self._latest_correlation(
+            returns_df.iloc[-self.config.window_size :], method
+        )
 
     def _calculate_expanding_correlation(
         self, returns_df: pd.DataFrame, method: str
@@ -304,15 +299,46 @@ class DynamicCorrelationAnalyzer:
         Returns:
             扩展相关性DataFrame
         """
-        corr_matrix = returns_df.expanding(min_periods=self.config.min_periods).corr(
-            method=method
-        )
+        return self._latest_correlation(returns_df, method)
+
+    def _latest_correlation(
+        self, returns_df: pd.DataFrame, method: str, halflife: Optional[float] = None
+    ) -> pd.DataFrame:
+        """计算最新时点的相关性矩阵
+
+        Pearson相关由增量协方差估计器一次性累积矩得到（不再生成每个时点的矩阵）；
+        秩相关（spearman/kendall）没有可累积的矩，直接在同一段数据上计算。
+        估计器会跳过含缺失值的整行，收益率存在缺失（停牌、上市较晚）时改用
+        pandas的成对删除口径，避免一列缺失拖累整个矩阵。
+
+        Args:
+            returns_df: 收益率DataFrame
+            method: 相关性方法
+            halflife: EWMA半衰期，None表示等权
 
-        # 提取最新的相关性矩阵
-        latest_date = returns_df.index[-1]
-        latest_corr = corr_matrix.loc[latest_date]
+        Returns:
+            相关性DataFrame
+        """
+        if method != "pearson":
+            return returns_df.corr(method=method, min_periods=self.config.min_periods)
 
-        return latest_corr
+        if returns_df.isna().values.any():
+            if halflife is None:
+                return returns_df.corr(min_periods=self.config.min_periods)
+            corr_matrix = returns_df.ewm(
+                halflife=halflife, min_periods=self.config.min_periods
+            ).corr()
+            return corr_matrix.loc[returns_df.index[-1]]
+
+        estimator = IncrementalCovarianceEstimator(
+            columns=list(returns_df.columns),
+            halflife=halflife,
+            min_periods=self.config.min_periods,
+            track_shrinkage=False,
+        )
+        estimator.update_many(returns_df)
+        columns = returns_df.columns
+        return pd.DataFrame(estimator.correlation(), index=columns, columns=columns)
 
     def _calculate_shrunk_correlation(self, returns_df: pd.DataFrame) -> pd.DataFrame:
         """计算收缩相关性矩阵
@@ -323,18 +349,9 @@ class DynamicCorrelationAnalyzer:
         Returns:
             收缩后的相关性矩阵
         """
-        # 使用Ledoit-Wolf收缩估计
-        lw = LedoitWolf()
-        lw.fit(returns_df.dropna())
-
-        # 转换协方差矩阵为相关性矩阵
-        cov_matrix = lw.covariance_
-        std_devs = np.sqrt(np.diag(cov_matrix))
-        corr_matrix = cov_matrix / np.outer(std_devs, std_devs)
-
-        return pd.DataFrame(
-            corr_matrix, index=returns_df.columns, columns=returns_df.columns
-        )
+        # 使用Ledoit-Wolf收缩估计（含NaN的行整行跳过）
+        snapshot = estimate_covariance(returns_df, shrink=True)
+        return snapshot.to_frame(correlation=True)
 
     def _calculate_correlation_stability(self, returns_df: pd.DataFrame) -> float:
         """计算相关性稳定性
@@ -10,6 +10,12 @@ from .mean_variance_optimizer import (
     OptimizationResult,
     optimize_mean_variance,
 )
+from .qp_solver import (
+    ActiveSetQPSolver,
+    EfficientFrontierSolver,
+    QPAccuracyError,
+    get_factorized_covariance,
+)
 from .risk_budgeting import (
     RiskBudget,
     RiskBudgetConfig,
@@ -25,6 +31,11 @@ __all__ = [
     "OptimizationResult",
     "EfficientFrontier",
     "optimize_mean_variance",
+    # 二次规划求解
+    "ActiveSetQPSolver",
+    "EfficientFrontierSolver",
+    "QPAccuracyError",
+    "get_factorized_covariance",
     # 风险预算
     "RiskBudgetingOptimizer",
     "RiskBudget",
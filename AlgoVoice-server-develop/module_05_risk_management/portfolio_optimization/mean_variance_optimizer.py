@@ -15,6 +15,13 @@ from common.exceptions import ModelError
 from common.logging_system import setup_logger
 from scipy import optimize
 
+from .qp_solver import (
+    ActiveSetQPSolver,
+    EfficientFrontierSolver,
+    budget_box_feasible,
+    max_return_weights,
+)
+
 logger = setup_logger("mean_variance_optimizer")
 
 
@@ -44,6 +51,7 @@ class MVOConfig:
     shrinkage_intensity: float = 0.1
     robust_estimation: bool = True
     constraints: Optional[Dict[str, Any]] = None
+    use_qp_solver: bool = True  # 仅有预算和边界约束时使用有效集QP求解器
 
 
 @dataclass
@@ -88,6 +96,7 @@ class MeanVarianceOptimizer:
         """
         self.config = config or MVOConfig()
         self.optimization_history: List[OptimizationResult] = []
+        self._last_solver = "slsqp"
 
     def optimize_portfolio(
         self,
@@ -121,6 +130,7 @@ class MeanVarianceOptimizer:
             cov_matrix_adj = cov_matrix.values
 
         # 根据目标选择优化方法
+        self._last_solver = "slsqp"
         if self.config.objective == OptimizationObjective.MAX_SHARPE:
             weights = self._maximize_sharpe_ratio(expected_returns_adj, cov_matrix_adj)
         elif self.config.objective == OptimizationObjective.MIN_VARIANCE:
@@ -167,6 +177,7 @@ class MeanVarianceOptimizer:
                 "objective": self.config.objective.value,
                 "risk_free_rate": self.config.risk_free_rate,
                 "regularization": self.config.regularization,
+                "solver": self._last_solver,
             },
         )
 
@@ -201,15 +212,36 @@ class MeanVarianceOptimizer:
             returns = expected_returns.values
             cov = cov_matrix.values
 
+        frontier_solver = self._get_frontier_solver(returns, cov)
+        if frontier_solver is not None:
+            # 两端点由有效集QP和线性规划直接求得，前沿点依次热启动
+            min_var_weights = frontier_solver.min_variance_weights
+            max_ret_weights = frontier_solver.max_return_weights
+
+            def solve_for_return(target_return):
+                try:
+                    return frontier_solver.solve_for_return(target_return)
+                except np.linalg.LinAlgError as e:
+                    logger.warning(f"Active-set QP failed, falling back to SLSQP: {e}")
+                    return self._minimize_variance_for_target_return(
+                        returns, cov, target_return
+                    )
+
+        else:
+            min_var_weights = self._minimize_variance(cov)
+            max_ret_weights = self._maximize_return(returns, cov)
+
+            def solve_for_return(target_return):
+                return self._minimize_variance_for_target_return(
+                    returns, cov, target_return
+                )
+
         # 计算最小方差组合
-        min_var_weights = self._minimize_variance(cov)
         min_var_return = min_var_weights @ returns
         min_var_vol = np.sqrt(min_var_weights @ cov @ min_var_weights)
 
         # 计算最大收益组合
-        max_ret_weights = self._maximize_return(returns, cov)
         max_ret_return = max_ret_weights @ returns
-        max_ret_vol = np.sqrt(max_ret_weights @ cov @ max_ret_weights)
 
         # 生成目标收益率范围
         target_returns = np.linspace(min_var_return, max_ret_return, n_portfolios)
@@ -221,9 +253,7 @@ class MeanVarianceOptimizer:
         frontier_sharpes = []
 
         for target_return in target_returns:
-            weights = self._minimize_variance_for_target_return(
-                returns, cov, target_return
-            )
+            weights = solve_for_return(target_return)
 
             if weights is not None:
                 portfolio_return = weights @ returns
@@ -344,6 +374,20 @@ class MeanVarianceOptimizer:
         """
         n_assets = len(expected_returns)
 
+        if self.config.regularization == 0:
+            frontier_solver = self._get_frontier_solver(expected_returns, cov_matrix)
+            # 存在正超额收益时切线组合在有效前沿上，对目标收益率做一维搜索；
+            # 否则夏普比率随波动率增大而增大，最优解不在前沿上
+            if (
+                frontier_solver is not None
+                and frontier_solver.max_return > self.config.risk_free_rate
+            ):
+                try:
+                    return frontier_solver.max_ratio(self.config.risk_free_rate)
+                except np.linalg.LinAlgError as e:
+                    logger.warning(f"Active-set QP failed, falling back to SLSQP: {e}")
+            self._last_solver = "slsqp"
+
         # 目标函数（负夏普比率）
         def neg_sharpe(weights):
             portfolio_return = weights @ expected_returns
@@ -357,6 +401,17 @@ class MeanVarianceOptimizer:
 
             return -sharpe
 
+        # 解析梯度：∇(r/σ) = μ/σ - r·Σw/σ³
+        def neg_sharpe_grad(weights):
+            cov_weights = cov_matrix @ weights
+            portfolio_vol = np.sqrt(weights @ cov_weights)
+            excess_return = weights @ expected_returns - self.config.risk_free_rate
+            grad = -(
+                expected_returns / portfolio_vol
+                - excess_return * cov_weights / portfolio_vol**3
+            )
+            return grad + 2 * self.config.regularization * weights
+
         # 约束和边界
         constraints = self._get_optimization_constraints(n_assets)
         bounds = self._get_optimization_bounds(n_assets)
@@ -369,6 +424,7 @@ class MeanVarianceOptimizer:
             neg_sharpe,
             x0,
             method="SLSQP",
+            jac=neg_sharpe_grad,
             bounds=bounds,
             constraints=constraints,
             options={"ftol": 1e-9, "maxiter": 1000},
@@ -390,10 +446,23 @@ class MeanVarianceOptimizer:
         """
         n_assets = len(cov_matrix)
 
+        if self._box_qp_applicable(n_assets):
+            lower, upper = self._get_bound_arrays(n_assets)
+            try:
+                solver = ActiveSetQPSolver(cov_matrix, lower, upper)
+                weights = solver.solve(np.ones((1, n_assets)), [1.0])
+                self._last_solver = "active_set_qp"
+                return weights
+            except np.linalg.LinAlgError as e:
+                logger.warning(f"Active-set QP failed, falling back to SLSQP: {e}")
+
         # 目标函数
         def portfolio_variance(weights):
             return weights @ cov_matrix @ weights
 
+        def portfolio_variance_grad(weights):
+            return 2 * cov_matrix @ weights
+
         # 约束和边界
         constraints = self._get_optimization_constraints(n_assets)
         bounds = self._get_optimization_bounds(n_assets)
@@ -406,6 +475,7 @@ class MeanVarianceOptimizer:
             portfolio_variance,
             x0,
             method="SLSQP",
+            jac=portfolio_variance_grad,
             bounds=bounds,
             constraints=constraints,
         )
@@ -426,10 +496,19 @@ class MeanVarianceOptimizer:
         """
         n_assets = len(expected_returns)
 
+        if self.config.target_volatility is None and self._box_qp_applicable(n_assets):
+            # 没有风险约束时是线性规划，按收益率从高到低依次填满上界
+            lower, upper = self._get_bound_arrays(n_assets)
+            self._last_solver = "active_set_qp"
+            return max_return_weights(expected_returns, lower, upper)
+
         # 目标函数（负收益）
         def neg_return(weights):
             return -weights @ expected_returns
 
+        def neg_return_grad(weights):
+            return -expected_returns
+
         # 约束
         constraints = self._get_optimization_constraints(n_assets)
 
@@ -440,6 +519,7 @@ class MeanVarianceOptimizer:
                     "type": "ineq",
                     "fun": lambda x: self.config.target_volatility**2
                     - x @ cov_matrix @ x,
+                    "jac": lambda x: -2 * cov_matrix @ x,
                 }
             )
 
@@ -450,7 +530,12 @@ class MeanVarianceOptimizer:
 
         # 优化
         result = optimize.minimize(
-            neg_return, x0, method="SLSQP", bounds=bounds, constraints=constraints
+            neg_return,
+            x0,
+            method="SLSQP",
+            jac=neg_return_grad,
+            bounds=bounds,
+            constraints=constraints,
         )
 
         return result.x
@@ -469,12 +554,29 @@ class MeanVarianceOptimizer:
         # 计算标准差
         stds = np.sqrt(np.diag(cov_matrix))
 
+        # 分散化比率即以波动率代替收益率、无风险利率为0的夏普比率
+        frontier_solver = self._get_frontier_solver(stds, cov_matrix)
+        if frontier_solver is not None:
+            try:
+                return frontier_solver.max_ratio(0.0)
+            except np.linalg.LinAlgError as e:
+                logger.warning(f"Active-set QP failed, falling back to SLSQP: {e}")
+                self._last_solver = "slsqp"
+
         # 目标函数（负分散化比率）
         def neg_diversification(weights):
             weighted_avg_vol = weights @ stds
             portfolio_vol = np.sqrt(weights @ cov_matrix @ weights)
             return -weighted_avg_vol / portfolio_vol
 
+        def neg_diversification_grad(weights):
+            cov_weights = cov_matrix @ weights
+            portfolio_vol = np.sqrt(weights @ cov_weights)
+            return -(
+                stds / portfolio_vol
+                - (weights @ stds) * cov_weights / portfolio_vol**3
+            )
+
         # 约束和边界
         constraints = self._get_optimization_constraints(n_assets)
         bounds = self._get_optimization_bounds(n_assets)
@@ -487,6 +589,7 @@ class MeanVarianceOptimizer:
             neg_diversification,
             x0,
             method="SLSQP",
+            jac=neg_diversification_grad,
             bounds=bounds,
             constraints=constraints,
         )
@@ -512,10 +615,21 @@ class MeanVarianceOptimizer:
         def portfolio_variance(weights):
             return weights @ cov_matrix @ weights
 
+        def portfolio_variance_grad(weights):
+            return 2 * cov_matrix @ weights
+
         # 约束
         constraints = [
-            {"type": "eq", "fun": lambda x: np.sum(x) - 1},
-            {"type": "eq", "fun": lambda x: x @ expected_returns - target_return},
+            {
+                "type": "eq",
+                "fun": lambda x: np.sum(x) - 1,
+                "jac": lambda x: np.ones(n_assets),
+            },
+            {
+                "type": "eq",
+                "fun": lambda x: x @ expected_returns - target_return,
+                "jac": lambda x: expected_returns,
+            },
         ]
 
         bounds = self._get_optimization_bounds(n_assets)
@@ -528,6 +642,7 @@ class MeanVarianceOptimizer:
             portfolio_variance,
             x0,
             method="SLSQP",
+            jac=portfolio_variance_grad,
             bounds=bounds,
             constraints=constraints,
             options={"ftol": 1e-9},
@@ -548,7 +663,11 @@ class MeanVarianceOptimizer:
             约束列表
         """
         constraints = [
-            {"type": "eq", "fun": lambda x: np.sum(x) - 1}  # 权重和为1
+            {
+                "type": "eq",
+                "fun": lambda x: np.sum(x) - 1,  # 权重和为1
+                "jac": lambda x: np.ones(n_assets),
+            }
         ]
 
         # 添加自定义约束
@@ -589,6 +708,61 @@ class MeanVarianceOptimizer:
                 for _ in range(n_assets)
             ]
 
+    def _get_bound_arrays(self, n_assets: int) -> Tuple[np.ndarray, np.ndarray]:
+        """获取权重上下界数组
+
+        Args:
+            n_assets: 资产数量
+
+        Returns:
+            (下界, 上界)
+        """
+        bounds = np.array(self._get_optimization_bounds(n_assets), dtype=float)
+        return bounds[:, 0], bounds[:, 1]
+
+    def _box_qp_applicable(self, n_assets: int) -> bool:
+        """判断是否只有预算和边界约束，可用有效集QP求解
+
+        Args:
+            n_assets: 资产数量
+
+        Returns:
+            是否可用QP求解器
+        """
+        if not self.config.use_qp_solver or self.config.constraints:
+            return False
+        lower, upper = self._get_bound_arrays(n_assets)
+        return budget_box_feasible(lower, upper)
+
+    def _get_frontier_solver(
+        self, expected_returns: np.ndarray, cov_matrix: np.ndarray
+    ) -> Optional[EfficientFrontierSolver]:
+        """构建有效前沿求解器，不适用或协方差矩阵无法精确求解时返回None
+
+        返回的求解器后续求解结果不满足等式约束时抛出QPAccuracyError
+        （np.linalg.LinAlgError的子类），调用方据此回退到SLSQP。
+
+        Args:
+            expected_returns: 期望收益率
+            cov_matrix: 协方差矩阵
+
+        Returns:
+            有效前沿求解器或None
+        """
+        n_assets = len(expected_returns)
+        if not self._box_qp_applicable(n_assets):
+            return None
+        lower, upper = self._get_bound_arrays(n_assets)
+        try:
+            frontier_solver = EfficientFrontierSolver(
+                expected_returns, cov_matrix, lower, upper
+            )
+        except np.linalg.LinAlgError as e:
+            logger.warning(f"Active-set QP failed, falling back to SLSQP: {e}")
+            return None
+        self._last_solver = "active_set_qp"
+        return frontier_solver
+
     def _shrink_expected_returns(self, expected_returns: pd.Series) -> np.ndarray:
         """收缩期望收益估计
 
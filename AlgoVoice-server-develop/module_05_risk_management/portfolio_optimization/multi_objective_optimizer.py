@@ -12,6 +12,15 @@ import numpy as np
 import pandas as pd
 from common.exceptions import ModelError
 from common.logging_system import setup_logger
+from common.pareto import (
+    crowding_distance,
+    non_dominated_mask,
+    non_dominated_sort,
+    polynomial_mutation,
+    sbx_crossover,
+    select_survivors,
+    tournament_selection,
+)
 from scipy import optimize
 
 logger = setup_logger("multi_objective_optimizer")
@@ -474,6 +483,7 @@ class MultiObjectiveOptimizer:
 
             # 交叉和变异
             offspring = self._crossover_mutation(parents, bounds)
+            self._evaluate_population(offspring)
 
             # 环境选择
             population = self._environmental_selection(population + offspring)
@@ -752,16 +762,39 @@ class MultiObjectiveOptimizer:
         return population
 
     def _evaluate_population(self, population: List[ParetoSolution]) -> None:
-        """评估种群
+        """评估种群中尚未计算目标值的解
 
         Args:
             population: 种群
         """
         for solution in population:
+            if solution.objective_values:
+                continue
             solution.objective_values = {
                 obj.name: obj.function(solution.weights) for obj in self.objectives
             }
 
+    def _objective_matrix(self, solutions: List[ParetoSolution]) -> np.ndarray:
+        """构建最小化约定的目标矩阵，最大化目标取负
+
+        Args:
+            solutions: 解列表
+
+        Returns:
+            目标矩阵 (n_solutions, n_objectives)
+        """
+        matrix = np.array(
+            [
+                [sol.objective_values.get(obj.name, 0) for obj in self.objectives]
+                for sol in solutions
+            ],
+            dtype=float,
+        ).reshape(len(solutions), len(self.objectives))
+        signs = np.array(
+            [1.0 if obj.direction == "minimize" else -1.0 for obj in self.objectives]
+        )
+        return matrix * signs
+
     def _non_dominated_sort(
         self, population: List[ParetoSolution]
     ) -> List[List[ParetoSolution]]:
@@ -771,50 +804,17 @@ class MultiObjectiveOptimizer:
             population: 种群
 
         Returns:
-            分层的非支配前沿
+            分层的非支配前沿（rank从1开始）
         """
         fronts = []
-        current_front = []
-
-        # 计算支配关系
-        for i, sol1 in enumerate(population):
-            sol1.rank = 0
-            dominated_count = 0
-
-            for j, sol2 in enumerate(population):
-                if i != j:
-                    if self._dominates(sol1, sol2):
-                        sol2.is_dominated = True
-                    elif self._dominates(sol2, sol1):
-                        dominated_count += 1
-
-            if dominated_count == 0:
-                sol1.rank = 1
-                current_front.append(sol1)
-
-        fronts.append(current_front)
-
-        # 后续前沿
-        while current_front:
-            next_front = []
-            for sol in population:
-                if sol.rank == 0:  # 未分配
-                    # 检查是否被当前前沿支配
-                    dominated = False
-                    for front_sol in current_front:
-                        if self._dominates(front_sol, sol):
-                            dominated = True
-                            break
-
-                    if not dominated:
-                        sol.rank = len(fronts) + 1
-                        next_front.append(sol)
-
-            if next_front:
-                fronts.append(next_front)
-                current_front = next_front
-            else:
-                break
+        for level, front in enumerate(
+            non_dominated_sort(self._objective_matrix(population))
+        ):
+            members = [population[i] for i in front]
+            for sol in members:
+                sol.rank = level + 1
+                sol.is_dominated = level > 0
+            fronts.append(members)
 
         return fronts
 
@@ -853,38 +853,9 @@ class MultiObjectiveOptimizer:
         Args:
             front: 前沿
         """
-        n = len(front)
-        if n <= 2:
-            for sol in front:
-                sol.crowding_distance = float("inf")
-            return
-
-        # 初始化
-        for sol in front:
-            sol.crowding_distance = 0
-
-        # 对每个目标
-        for obj in self.objectives:
-            # 按目标值排序
-            front.sort(key=lambda x: x.objective_values.get(obj.name, 0))
-
-            # 边界解设为无穷大
-            front[0].crowding_distance = float("inf")
-            front[-1].crowding_distance = float("inf")
-
-            # 计算中间解的拥挤距离
-            obj_range = (
-                front[-1].objective_values[obj.name]
-                - front[0].objective_values[obj.name]
-            )
-
-            if obj_range > 0:
-                for i in range(1, n - 1):
-                    distance = (
-                        front[i + 1].objective_values[obj.name]
-                        - front[i - 1].objective_values[obj.name]
-                    ) / obj_range
-                    front[i].crowding_distance += distance
+        distances = crowding_distance(self._objective_matrix(front))
+        for sol, distance in zip(front, distances):
+            sol.crowding_distance = float(distance)
 
     def _tournament_selection(
         self, population: List[ParetoSolution]
@@ -897,25 +868,24 @@ class MultiObjectiveOptimizer:
         Returns:
             选中的父代
         """
-        parents = []
-
-        for _ in range(len(population)):
-            # 随机选择参赛者
-            tournament = np.random.choice(
-                population, size=self.config.tournament_size, replace=False
-            )
-
-            # 选择最好的
-            winner = min(tournament, key=lambda x: (x.rank, -x.crowding_distance))
-            parents.append(winner)
-
-        return parents
+        ranks = np.array([sol.rank for sol in population])
+        distances = np.array([sol.crowding_distance for sol in population])
+        winners = tournament_selection(
+            ranks,
+            distances,
+            len(population),
+            np.random,
+            tournament_size=self.config.tournament_size,
+        )
+        return [population[i] for i in winners]
 
     def _crossover_mutation(
         self, parents: List[ParetoSolution], bounds: List[Tuple[float, float]]
     ) -> List[ParetoSolution]:
         """交叉和变异
 
+        所有父代对的权重矩阵一次完成SBX交叉和多项式变异。
+
         Args:
             parents: 父代
             bounds: 边界
@@ -923,144 +893,54 @@ class MultiObjectiveOptimizer:
         Returns:
             子代
         """
-        offspring = []
+        n_pairs = len(parents) // 2
+        if n_pairs == 0:
+            return []
 
-        for i in range(0, len(parents) - 1, 2):
-            parent1 = parents[i]
-            parent2 = parents[i + 1]
+        eta = 20  # 分布指数
+        lower = np.array([low for low, _ in bounds], dtype=float)
+        upper = np.array([high for _, high in bounds], dtype=float)
 
-            # 交叉
-            if np.random.random() < self.config.crossover_probability:
-                # SBX交叉
-                child1_weights, child2_weights = self._sbx_crossover(
-                    parent1.weights, parent2.weights, bounds
-                )
-            else:
-                child1_weights = parent1.weights.copy()
-                child2_weights = parent2.weights.copy()
-
-            # 变异
-            if np.random.random() < self.config.mutation_probability:
-                child1_weights = self._polynomial_mutation(child1_weights, bounds)
-            if np.random.random() < self.config.mutation_probability:
-                child2_weights = self._polynomial_mutation(child2_weights, bounds)
-
-            # 标准化权重
-            child1_weights = child1_weights / child1_weights.sum()
-            child2_weights = child2_weights / child2_weights.sum()
-
-            # 创建子代
-            child1 = ParetoSolution(
-                weights=child1_weights,
-                objective_values={},
-                is_dominated=False,
-                crowding_distance=0,
-                rank=0,
+        weights = np.array([parent.weights for parent in parents[: 2 * n_pairs]])
+        parents1, parents2 = weights[0::2], weights[1::2]
+
+        # 交叉
+        child1, child2 = sbx_crossover(
+            parents1, parents2, lower, upper, np.random, eta=eta
+        )
+        no_crossover = np.random.random(n_pairs) >= self.config.crossover_probability
+        child1[no_crossover] = parents1[no_crossover]
+        child2[no_crossover] = parents2[no_crossover]
+
+        children = np.empty_like(weights)
+        children[0::2] = child1
+        children[1::2] = child2
+
+        # 变异：按个体概率选中后，每个资产权重以1/n的概率变异
+        mutate_rows = np.random.random(len(children)) < self.config.mutation_probability
+        if mutate_rows.any():
+            children[mutate_rows] = polynomial_mutation(
+                children[mutate_rows],
+                lower,
+                upper,
+                np.random,
+                prob=1.0 / children.shape[1],
+                eta=eta,
             )
 
-            child2 = ParetoSolution(
-                weights=child2_weights,
+        # 标准化权重
+        children = children / children.sum(axis=1, keepdims=True)
+
+        return [
+            ParetoSolution(
+                weights=child_weights,
                 objective_values={},
                 is_dominated=False,
                 crowding_distance=0,
                 rank=0,
             )
-
-            offspring.extend([child1, child2])
-
-        return offspring
-
-    def _sbx_crossover(
-        self,
-        parent1: np.ndarray,
-        parent2: np.ndarray,
-        bounds: List[Tuple[float, float]],
-    ) -> Tuple[np.ndarray, np.ndarray]:
-        """模拟二进制交叉
-
-        Args:
-            parent1: 父代1
-            parent2: 父代2
-            bounds: 边界
-
-        Returns:
-            (子代1, 子代2)
-        """
-        eta = 20  # 分布指数
-
-        child1 = parent1.copy()
-        child2 = parent2.copy()
-
-        for i in range(len(parent1)):
-            if np.random.random() < 0.5:
-                if abs(parent1[i] - parent2[i]) > 1e-10:
-                    if parent1[i] < parent2[i]:
-                        y1 = parent1[i]
-                        y2 = parent2[i]
-                    else:
-                        y1 = parent2[i]
-                        y2 = parent1[i]
-
-                    yl = bounds[i][0]
-                    yu = bounds[i][1]
-
-                    beta = 1 + (2 * (y1 - yl) / (y2 - y1))
-                    alpha = 2 - beta ** (-(eta + 1))
-
-                    u = np.random.random()
-
-                    if u <= 1 / alpha:
-                        betaq = (u * alpha) ** (1 / (eta + 1))
-                    else:
-                        betaq = (1 / (2 - u * alpha)) ** (1 / (eta + 1))
-
-                    c1 = 0.5 * ((y1 + y2) - betaq * (y2 - y1))
-                    c2 = 0.5 * ((y1 + y2) + betaq * (y2 - y1))
-
-                    child1[i] = np.clip(c1, yl, yu)
-                    child2[i] = np.clip(c2, yl, yu)
-
-        return child1, child2
-
-    def _polynomial_mutation(
-        self, individual: np.ndarray, bounds: List[Tuple[float, float]]
-    ) -> np.ndarray:
-        """多项式变异
-
-        Args:
-            individual: 个体
-            bounds: 边界
-
-        Returns:
-            变异后的个体
-        """
-        eta = 20  # 分布指数
-        mutated = individual.copy()
-
-        for i in range(len(individual)):
-            if np.random.random() < 1.0 / len(individual):
-                y = individual[i]
-                yl = bounds[i][0]
-                yu = bounds[i][1]
-
-                delta1 = (y - yl) / (yu - yl)
-                delta2 = (yu - y) / (yu - yl)
-
-                u = np.random.random()
-
-                if u <= 0.5:
-                    xy = 1 - delta1
-                    val = 2 * u + (1 - 2 * u) * (xy ** (eta + 1))
-                    deltaq = val ** (1 / (eta + 1)) - 1
-                else:
-                    xy = 1 - delta2
-                    val = 2 * (1 - u) + 2 * (u - 0.5) * (xy ** (eta + 1))
-                    deltaq = 1 - val ** (1 / (eta + 1))
-
-                y = y + deltaq * (yu - yl)
-                mutated[i] = np.clip(y, yl, yu)
-
-        return mutated
+            for child_weights in children
+        ]
 
     def _environmental_selection(
         self, combined_population: List[ParetoSolution]
@@ -1073,28 +953,10 @@ class MultiObjectiveOptimizer:
         Returns:
             下一代种群
         """
-        # 非支配排序
-        fronts = self._non_dominated_sort(combined_population)
-
-        next_population = []
-
-        for front in fronts:
-            if len(next_population) + len(front) <= self.config.population_size:
-                next_population.extend(front)
-            else:
-                # 需要部分选择
-                remaining = self.config.population_size - len(next_population)
-
-                # 计算拥挤距离
-                self._calculate_crowding_distance(front)
-
-                # 按拥挤距离排序
-                front.sort(key=lambda x: x.crowding_distance, reverse=True)
-
-                next_population.extend(front[:remaining])
-                break
-
-        return next_population
+        selected = select_survivors(
+            self._objective_matrix(combined_population), self.config.population_size
+        )
+        return [combined_population[i] for i in selected]
 
     def _filter_non_dominated(
         self, solutions: List[ParetoSolution]
@@ -1107,20 +969,10 @@ class MultiObjectiveOptimizer:
         Returns:
             非支配解列表
         """
-        non_dominated = []
-
-        for i, sol1 in enumerate(solutions):
-            is_dominated = False
-
-            for j, sol2 in enumerate(solutions):
-                if i != j and self._dominates(sol2, sol1):
-                    is_dominated = True
-                    break
-
-            if not is_dominated:
-                non_dominated.append(sol1)
-
-        return non_dominated
+        if not solutions:
+            return []
+        mask = non_dominated_mask(self._objective_matrix(solutions))
+        return [sol for sol, keep in zip(solutions, mask) if keep]
 
     def _calculate_hypervolume_2d(
         self, points: np.ndarray, reference: np.ndarray
@@ -0,0 +1,493 @@
+"""
+二次规划求解模块
+为均值方差优化提供只含预算约束和边界约束时的专用求解器
+
+- 协方差矩阵的Cholesky分解按内容缓存，重复请求同一协方差时直接复用
+- 不触及边界时直接用闭式解；否则用原始有效集法，海森矩阵即协方差矩阵本身
+- 协方差矩阵病态（如资产数多于样本数）时加对角抖动并对KKT解做迭代精化，
+  结果仍不满足等式约束时抛出QPAccuracyError，由调用方回退到通用优化器
+- 有效前沿逐点求解时从上一个前沿点热启动，夏普比率类目标沿前沿做一维搜索
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import numpy as np
+from common.logging_system import setup_logger
+from scipy import linalg
+from scipy import optimize
+from scipy.linalg import lapack
+
+logger = setup_logger("qp_solver")
+
+# 分解后矩阵条件数（LAPACK估计值）的上限
+_MAX_CONDITION = 1e10
+# KKT解的迭代精化次数
+_REFINE_STEPS = 2
+# 等式约束的相对残差上限
+_CONSTRAINT_TOL = 1e-8
+# 牛顿步小于该值时视为子问题最优；病态矩阵上求解的舍入噪声约为cond·eps·|x|
+_STEP_TOL = 1e-9
+
+
+class QPAccuracyError(np.linalg.LinAlgError):
+    """二次规划的解不满足等式约束（协方差矩阵过于病态）"""
+
+    pass
+
+
+class FactorizedCovariance:
+    """协方差矩阵及其Cholesky分解"""
+
+    def __init__(self, cov_matrix: np.ndarray):
+        """分解协方差矩阵
+
+        矩阵不正定或近似奇异（如资产数多于样本数）时逐步加大对角抖动，
+        直到可以分解且条件数不超过_MAX_CONDITION。奇异矩阵有时也能完成分解，
+        但主元接近舍入误差，直接用于求解会丢失约束精度。
+
+        Args:
+            cov_matrix: 协方差矩阵
+        """
+        self.matrix = np.asarray(cov_matrix, dtype=float)
+        self.jitter = 0.0
+        self.factor = _cholesky(self.matrix)
+        if self.factor is None:
+            scale = max(np.mean(np.diag(self.matrix)), 1e-16)
+            for exponent in range(-12, -3):
+                self.jitter = scale * 10.0**exponent
+                self.factor = _cholesky(
+                    self.matrix + self.jitter * np.eye(len(self.matrix))
+                )
+                if self.factor is not None:
+                    break
+            else:
+                raise np.linalg.LinAlgError("Covariance matrix cannot be factorized")
+            logger.debug(f"Added jitter {self.jitter:.3e} to factorize covariance")
+
+    def solve(self, rhs: np.ndarray) -> np.ndarray:
+        """求解 (Σ + jitter·I)x = rhs"""
+        return linalg.cho_solve(self.factor, rhs)
+
+    def matvec(self, x: np.ndarray) -> np.ndarray:
+        """计算 (Σ + jitter·I)x，即solve对应的矩阵乘积"""
+        return self.matrix @ x + self.jitter * x
+
+
+def _cholesky(matrix: np.ndarray) -> Optional[Tuple[np.ndarray, bool]]:
+    """Cholesky分解，矩阵不正定或条件数超过_MAX_CONDITION时返回None"""
+    try:
+        factor = linalg.cho_factor(matrix, lower=True, check_finite=False)
+    except linalg.LinAlgError:
+        return None
+    # LAPACK按分解结果估计1-范数条件数的倒数，O(n²)
+    rcond, _ = lapack.dpocon(factor[0], np.abs(matrix).sum(axis=0).max(), uplo="L")
+    if rcond * _MAX_CONDITION < 1.0:
+        return None
+    return factor
+
+
+_factor_cache: "OrderedDict[str, FactorizedCovariance]" = OrderedDict()
+_factor_cache_lock = threading.Lock()
+_FACTOR_CACHE_SIZE = 16
+
+
+def get_factorized_covariance(cov_matrix: np.ndarray) -> FactorizedCovariance:
+    """获取协方差矩阵的分解（按矩阵内容缓存）
+
+    Args:
+        cov_matrix: 协方差矩阵
+
+    Returns:
+        分解结果
+    """
+    matrix = np.ascontiguousarray(cov_matrix, dtype=float)
+    key = hashlib.sha1(matrix.tobytes()).hexdigest() + str(matrix.shape)
+
+    with _factor_cache_lock:
+        cached = _factor_cache.get(key)
+        if cached is not None:
+            _factor_cache.move_to_end(key)
+            return cached
+
+    factorized = FactorizedCovariance(matrix)
+    with _factor_cache_lock:
+        _factor_cache[key] = factorized
+        while len(_factor_cache) > _FACTOR_CACHE_SIZE:
+            _factor_cache.popitem(last=False)
+    return factorized
+
+
+def budget_box_feasible(
+    lower: np.ndarray, upper: np.ndarray, budget: float = 1.0
+) -> bool:
+    """预算约束和边界约束是否有可行解"""
+    return bool(np.all(lower <= upper) and lower.sum() <= budget <= upper.sum())
+
+
+def project_budget_box(
+    v: np.ndarray, lower: np.ndarray, upper: np.ndarray, budget: float = 1.0
+) -> np.ndarray:
+    """把向量投影到 {sum(w) = budget, lower <= w <= upper}
+
+    投影形如 clip(v - τ, lower, upper)，用二分法求平移量τ。
+
+    Args:
+        v: 待投影向量
+        lower: 下界
+        upper: 上界
+        budget: 权重和
+
+    Returns:
+        可行权重
+    """
+    tau_low = np.min(v - upper)
+    tau_high = np.max(v - lower)
+    for _ in range(100):
+        tau = 0.5 * (tau_low + tau_high)
+        if np.clip(v - tau, lower, upper).sum() > budget:
+            tau_low = tau
+        else:
+            tau_high = tau
+    return np.clip(v - 0.5 * (tau_low + tau_high), lower, upper)
+
+
+def max_return_weights(
+    expected_returns: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    budget: float = 1.0,
+) -> np.ndarray:
+    """预算和边界约束下的最大收益组合（线性规划的贪心解）
+
+    从下界出发，按期望收益从高到低依次把资产加到上界，直到用完预算。
+
+    Args:
+        expected_returns: 期望收益率
+        lower: 下界
+        upper: 上界
+        budget: 权重和
+
+    Returns:
+        最大收益组合权重
+    """
+    weights = lower.astype(float).copy()
+    order = np.argsort(-expected_returns, kind="stable")
+    room = (upper - lower)[order]
+    remaining = budget - weights.sum()
+    filled = np.clip(remaining - (np.cumsum(room) - room), 0.0, room)
+    weights[order] += filled
+    return weights
+
+
+class ActiveSetQPSolver:
+    """边界约束二次规划的原始有效集求解器
+
+    求解 min ½wᵀΣw - cᵀw  s.t.  Aw = b, lower <= w <= upper。
+    每次迭代在自由变量上求解等式约束子问题（KKT系统），
+    沿可行方向前进到第一个边界；子问题最优时检查边界乘子，释放符号错误的变量。
+    """
+
+    def __init__(
+        self,
+        cov_matrix: np.ndarray,
+        lower: np.ndarray,
+        upper: np.ndarray,
+        max_iter: Optional[int] = None,
+    ):
+        """初始化求解器
+
+        Args:
+            cov_matrix: 协方差矩阵（即目标函数的海森矩阵）
+            lower: 权重下界
+            upper: 权重上界
+            max_iter: 最大迭代次数，默认10n+100
+        """
+        self.factorized = get_factorized_covariance(cov_matrix)
+        self.cov = self.factorized.matrix
+        self.n = len(self.cov)
+        # 加过抖动时按 Σ + jitter·I 求解（微小的岭正则，使解唯一），
+        # 子矩阵都是它的主子阵，条件数不超过整体，无需再加抖动
+        self.hessian = self.cov + self.factorized.jitter * np.eye(self.n)
+        self.lower = np.broadcast_to(np.asarray(lower, dtype=float), (self.n,)).copy()
+        self.upper = np.broadcast_to(np.asarray(upper, dtype=float), (self.n,)).copy()
+        self.max_iter = max_iter or 10 * self.n + 100
+
+        # 统计
+        self.n_solves = 0
+        self.n_closed_form = 0
+        self.total_iterations = 0
+
+    def solve(
+        self,
+        A: np.ndarray,
+        b: np.ndarray,
+        c: Optional[np.ndarray] = None,
+        x0: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """求解二次规划
+
+        Args:
+            A: 等式约束矩阵 (m, n)
+            b: 等式约束右端 (m,)
+            c: 线性项系数，None表示0
+            x0: 可行初始点（热启动）；只有预算约束时可省略
+
+        Returns:
+            最优权重
+        """
+        A = np.atleast_2d(np.asarray(A, dtype=float))
+        b = np.atleast_1d(np.asarray(b, dtype=float))
+        c = np.zeros(self.n) if c is None else np.asarray(c, dtype=float)
+        self.n_solves += 1
+
+        # 不考虑边界的闭式解若恰好满足边界即为最优解
+        _, x = self._solve_kkt(A, b, c, self.factorized)
+        if np.all(x >= self.lower - 1e-12) and np.all(x <= self.upper + 1e-12):
+            self.n_closed_form += 1
+            return self._check_constraints(A, b, np.clip(x, self.lower, self.upper))
+
+        if x0 is None:
+            if A.shape[0] != 1:
+                raise ValueError("x0 is required when more than one equality applies")
+            x0 = project_budget_box(
+                np.full(self.n, b[0] / self.n), self.lower, self.upper, b[0]
+            )
+        x = self._active_set(A, c, np.clip(x0, self.lower, self.upper))
+        return self._check_constraints(A, b, x)
+
+    def _check_constraints(self, A: np.ndarray, b: np.ndarray, x: np.ndarray):
+        """检查解满足等式约束
+
+        Raises:
+            QPAccuracyError: 残差超过_CONSTRAINT_TOL
+        """
+        residual = np.abs(A @ x - b).max()
+        if residual > _CONSTRAINT_TOL * max(1.0, np.abs(b).max()):
+            raise QPAccuracyError(
+                f"QP solution violates equality constraints by {residual:.3e} "
+                f"(jitter {self.factorized.jitter:.3e})"
+            )
+        return x
+
+    def _active_set(self, A: np.ndarray, c: np.ndarray, x: np.ndarray) -> np.ndarray:
+        """从可行点x出发的有效集迭代（每一步都保持Ax不变）"""
+        lower, upper = self.lower, self.upper
+        fixed = lower >= upper  # 上下界相等的变量始终固定
+        at_lower = (x <= lower + 1e-12) | fixed
+        at_upper = (x >= upper - 1e-12) & ~at_lower
+
+        grad_scale = max(np.abs(np.diag(self.cov)).max(), np.abs(c).max(), 1e-16)
+        multiplier_tol = 1e-10 * grad_scale
+
+        for iteration in range(self.max_iter):
+            free = ~(at_lower | at_upper)
+            gradient = self.hessian @ x - c
+            step, nu = self._free_step(A, gradient, free)
+
+            if np.max(np.abs(step), initial=0.0) <= _STEP_TOL:
+                # 子问题最优：检查边界变量的乘子符号
+                multipliers = gradient - A.T @ nu
+                violation = np.where(at_lower & ~fixed, -multipliers, 0.0)
+                violation = np.maximum(violation, np.where(at_upper, multipliers, 0.0))
+                j = int(np.argmax(violation))
+                if violation[j] <= multiplier_tol:
+                    self.total_iterations += iteration + 1
+                    return x
+                at_lower[j] = at_upper[j] = False
+                continue
+
+            # 沿step前进到第一个阻挡边界
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ratios = np.where(
+                    step < 0,
+                    (lower - x) / step,
+                    np.where(step > 0, (upper - x) / step, np.inf),
+                )
+            ratios[~free] = np.inf
+            j = int(np.argmin(ratios))
+            alpha = min(1.0, max(ratios[j], 0.0))
+            x = x + alpha * step
+
+            if alpha < 1.0:
+                if step[j] < 0:
+                    x[j] = lower[j]
+                    at_lower[j] = True
+                else:
+                    x[j] = upper[j]
+                    at_upper[j] = True
+
+        logger.warning(f"Active-set QP did not converge in {self.max_iter} iterations")
+        self.total_iterations += self.max_iter
+        return x
+
+    def _free_step(
+        self, A: np.ndarray, gradient: np.ndarray, free: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """固定边界变量，求自由变量上保持Ax不变的牛顿步
+
+        求解 min ½pᵀΣ_FF p + g_Fᵀp  s.t.  A_F p = 0。
+
+        Returns:
+            (步长方向（固定变量为0）, 等式约束乘子ν)
+        """
+        step = np.zeros(self.n)
+        if not free.any():
+            # 没有自由变量时用梯度最小二乘估计乘子
+            nu = np.linalg.lstsq(A.T, gradient, rcond=None)[0]
+            return step, nu
+
+        if free.all():
+            factorized = self.factorized
+        else:
+            factorized = FactorizedCovariance(self.hessian[np.ix_(free, free)])
+        nu, step[free] = self._solve_kkt(
+            A[:, free], np.zeros(len(A)), -gradient[free], factorized
+        )
+        return step, nu
+
+    @staticmethod
+    def _solve_kkt(
+        A: np.ndarray, b: np.ndarray, r: np.ndarray, factorized: FactorizedCovariance
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """求解KKT系统 Σy - Aᵀν = r, Ay = b
+
+        通过Schur补求解：y = Σ⁻¹(r + Aᵀν)，(AΣ⁻¹Aᵀ)ν = b - AΣ⁻¹r。
+        A行秩不足时右端仍在Schur补的值域内，最小二乘给出精确解。
+        Σ病态时Schur补的舍入误差会破坏Ay = b，用残差再求解_REFINE_STEPS次修正。
+
+        Returns:
+            (乘子ν, 解y)
+        """
+        inv_At = factorized.solve(A.T)
+        schur = A @ inv_At
+
+        def solve_once(r, b):
+            inv_r = factorized.solve(r)
+            nu = np.linalg.lstsq(schur, b - A @ inv_r, rcond=None)[0]
+            return nu, inv_r + inv_At @ nu
+
+        nu, y = solve_once(r, b)
+        for _ in range(_REFINE_STEPS):
+            d_nu, d_y = solve_once(r - factorized.matvec(y) + A.T @ nu, b - A @ y)
+            nu, y = nu + d_nu, y + d_y
+        return nu, y
+
+    def get_stats(self) -> dict:
+        """求解统计"""
+        return {
+            "solves": self.n_solves,
+            "closed_form": self.n_closed_form,
+            "active_set_iterations": self.total_iterations,
+            "jitter": self.factorized.jitter,
+        }
+
+
+class EfficientFrontierSolver:
+    """预算和边界约束下的有效前沿求解器
+
+    先求最小方差组合和最大收益组合作为前沿两端；每个目标收益率的初始点取
+    上一个前沿点与相应端点的凸组合（恰好满足目标收益率且可行），
+    相邻前沿点的有效集通常只差少数资产，有效集迭代很快收敛。
+    """
+
+    def __init__(
+        self,
+        expected_returns: np.ndarray,
+        cov_matrix: np.ndarray,
+        lower: np.ndarray,
+        upper: np.ndarray,
+    ):
+        """初始化前沿求解器
+
+        Args:
+            expected_returns: 期望收益率
+            cov_matrix: 协方差矩阵
+            lower: 权重下界
+            upper: 权重上界
+        """
+        self.expected_returns = np.asarray(expected_returns, dtype=float)
+        self.qp = ActiveSetQPSolver(cov_matrix, lower, upper)
+        n = self.qp.n
+        self._budget = np.ones((1, n))
+
+        self.min_variance_weights = self.qp.solve(self._budget, [1.0])
+        self.max_return_weights = max_return_weights(
+            self.expected_returns, self.qp.lower, self.qp.upper
+        )
+        self.min_return = float(self.min_variance_weights @ self.expected_returns)
+        self.max_return = float(self.max_return_weights @ self.expected_returns)
+
+        self._last_weights = self.min_variance_weights
+        self._last_return = self.min_return
+
+    def solve_for_return(self, target_return: float) -> np.ndarray:
+        """目标收益率下的最小方差组合
+
+        Args:
+            target_return: 目标收益率，应在[min_return, max_return]内
+
+        Returns:
+            最优权重
+        """
+        span = self.max_return - self.min_return
+        target_return = float(np.clip(target_return, self.min_return, self.max_return))
+        if target_return <= self.min_return + 1e-12 * span or span <= 1e-15:
+            return self.min_variance_weights.copy()
+        if target_return >= self.max_return - 1e-12 * span:
+            # 最大收益端点通常是退化顶点（可行域只剩一个点），直接取线性规划解
+            return self.max_return_weights.copy()
+
+        # 热启动：上一个前沿点与端点的凸组合
+        if target_return >= self._last_return:
+            anchor, anchor_return = self.max_return_weights, self.max_return
+        else:
+            anchor, anchor_return = self.min_variance_weights, self.min_return
+        span = anchor_return - self._last_return
+        theta = (target_return - self._last_return) / span if abs(span) > 1e-15 else 1.0
+        x0 = (1 - theta) * self._last_weights + theta * anchor
+
+        A = np.vstack([self._budget, self.expected_returns])
+        weights = self.qp.solve(A, [1.0, target_return], x0=x0)
+
+        self._last_weights = weights
+        self._last_return = float(weights @ self.expected_returns)
+        return weights
+
+    def max_ratio(self, offset: float = 0.0) -> np.ndarray:
+        """最大化 (wᵀμ - offset) / sqrt(wᵀΣw)
+
+        比率最大的组合位于有效前沿上，且比率沿前沿为单峰函数，
+        因此对目标收益率做有界一维搜索。μ取期望收益率、offset取无风险利率时
+        为最大夏普组合；μ取各资产波动率、offset=0时为最大分散化组合。
+
+        Args:
+            offset: 分子的常数项
+
+        Returns:
+            最优权重
+        """
+
+        def ratio(weights: np.ndarray) -> float:
+            volatility = np.sqrt(max(weights @ self.qp.cov @ weights, 1e-300))
+            return (weights @ self.expected_returns - offset) / volatility
+
+        if self.max_return - self.min_return <= 1e-15:
+            return self.min_variance_weights.copy()
+
+        result = optimize.minimize_scalar(
+            lambda target: -ratio(self.solve_for_return(target)),
+            bounds=(self.min_return, self.max_return),
+            method="bounded",
+            options={"xatol": (self.max_return - self.min_return) * 1e-8},
+        )
+
+        # 有界搜索不会取到区间端点，端点更优时取端点
+        candidates = [
+            self.solve_for_return(result.x),
+            self.min_variance_weights,
+            self.solve_for_return(self.max_return),
+        ]
+        return max(candidates, key=ratio)
@@ -10,6 +10,7 @@ from typing import Any, Dict, List, Optional, Tuple, Union
 import numpy as np
 import pandas as pd
 from common.constants import TRADING_DAYS_PER_YEAR
+from common.covariance_estimator import IncrementalCovarianceEstimator
 from common.exceptions import ModelError
 from common.logging_system import setup_logger
 from scipy import optimize
@@ -299,26 +300,15 @@ class RiskParity:
         Returns:
             EWMA协方差矩阵
         """
-        n_periods = len(returns_data)
-        n_assets = len(returns_data.columns)
-
-        # 计算权重
-        weights = np.array(
-            [(1 - decay_factor) * decay_factor**i for i in range(n_periods - 1, -1, -1)]
+        # 权重∝λ^(T-1-t)的加权协方差（归一化权重，不做无偏修正）
+        estimator = IncrementalCovarianceEstimator(
+            columns=list(returns_data.columns),
+            decay=decay_factor,
+            min_periods=1,
+            track_shrinkage=False,
         )
-        weights = weights / weights.sum()
-
-        # 中心化收益率
-        mean_returns = (returns_data * weights.reshape(-1, 1)).sum()
-        centered_returns = returns_data - mean_returns
-
-        # 计算加权协方差
-        cov_matrix = np.zeros((n_assets, n_assets))
-        for i in range(n_periods):
-            ret_i = centered_returns.iloc[i].values.reshape(-1, 1)
-            cov_matrix += weights[i] * (ret_i @ ret_i.T)
-
-        return cov_matrix
+        estimator.update_many(returns_data)
+        return estimator.covariance(bias=True)
 
     def _optimize_risk_parity_weights(
         self, cov_matrix: np.ndarray, target_risk_contributions: np.ndarray
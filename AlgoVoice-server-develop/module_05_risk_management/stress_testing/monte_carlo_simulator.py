@@ -3,10 +3,11 @@
 实现投资组合风险的蒙特卡洛模拟
 """
 
+import warnings
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -14,6 +15,7 @@ from common.constants import TRADING_DAYS_PER_YEAR
 from common.exceptions import ModelError
 from common.logging_system import setup_logger
 from scipy import stats
+from scipy.stats import qmc
 
 logger = setup_logger("monte_carlo_simulator")
 
@@ -39,6 +41,10 @@ class SimulationConfig:
     confidence_levels: List[float] = field(default_factory=lambda: [0.95, 0.99])
     use_antithetic: bool = True  # 对偶变量法
     use_control_variates: bool = False  # 控制变量法
+    use_quasi_random: bool = False  # Sobol低差异序列代替伪随机数
+    use_float32: bool = False  # 单精度生成和累积路径，内存减半
+    chunk_size: int = 10000  # 每批生成的路径数，限制峰值内存
+    n_stored_paths: int = 100  # 结果中保留的完整路径数
     random_seed: Optional[int] = None
     parallel_processing: bool = True
     n_jobs: int = -1  # -1表示使用所有CPU
@@ -57,6 +63,20 @@ class SimulationPath:
     final_value: float
 
 
+@dataclass
+class SimulationSummary:
+    """全部模拟路径的逐路径统计量（数组形式），只保留少量完整路径"""
+
+    cumulative_returns: np.ndarray
+    final_values: np.ndarray
+    max_drawdowns: np.ndarray
+    volatilities: np.ndarray
+    paths: List[SimulationPath]
+
+    def __len__(self) -> int:
+        return len(self.cumulative_returns)
+
+
 @dataclass
 class MonteCarloResult:
     """蒙特卡洛结果"""
@@ -82,10 +102,13 @@ class MonteCarloSimulator:
             config: 模拟配置
         """
         self.config = config or SimulationConfig()
-        if self.config.random_seed is not None:
-            np.random.seed(self.config.random_seed)
+        self.rng = np.random.default_rng(self.config.random_seed)
+        self.dtype = np.float32 if self.config.use_float32 else np.float64
         self.simulation_cache: Dict[str, Any] = {}
 
+        # 准随机序列引擎，每次模拟开始时重建
+        self._sobol: Optional[qmc.Sobol] = None
+
     def simulate_portfolio_returns(
         self,
         expected_returns: pd.Series,
@@ -112,6 +135,7 @@ class MonteCarloSimulator:
         portfolio_return = weights @ expected_returns
         portfolio_variance = weights @ covariance_matrix @ weights
         portfolio_vol = np.sqrt(portfolio_variance)
+        self._sobol = None
 
         # 生成模拟路径
         if self.config.distribution_type == DistributionType.NORMAL:
@@ -148,12 +172,11 @@ class MonteCarloSimulator:
         convergence_data = self._calculate_convergence_data(paths)
 
         # 汇总统计
-        all_final_values = [p.final_value for p in paths]
-        expected_return_sim = np.mean([p.cumulative_return for p in paths])
-        expected_vol_sim = np.std([p.cumulative_return for p in paths])
+        expected_return_sim = np.mean(paths.cumulative_returns)
+        expected_vol_sim = np.std(paths.cumulative_returns)
 
         result = MonteCarloResult(
-            simulation_paths=paths[:100],  # 只保存前100条路径
+            simulation_paths=paths.paths,  # 只保存前n_stored_paths条路径
             expected_return=expected_return_sim,
             expected_volatility=expected_vol_sim,
             var_estimates=var_estimates,
@@ -196,7 +219,7 @@ class MonteCarloSimulator:
         std_return = portfolio_returns.std()
 
         # 模拟未来收益
-        simulated_returns = np.random.normal(
+        simulated_returns = self.rng.normal(
             mean_return * n_days,
             std_return * np.sqrt(n_days),
             self.config.n_simulations,
@@ -217,28 +240,53 @@ class MonteCarloSimulator:
     def bootstrap_confidence_intervals(
         self,
         data: pd.Series,
-        statistic_func: callable,
+        statistic_func: Callable,
         n_bootstrap: int = 1000,
         confidence_level: float = 0.95,
+        vectorized: bool = False,
     ) -> Tuple[float, float, float]:
         """Bootstrap置信区间估计
 
+        vectorized为True时statistic_func直接作用于 (n_resamples, n_obs)
+        样本矩阵并按行返回统计量（如 ``lambda x: x.mean(axis=1)``），
+        重采样索引和样本矩阵按chunk_size分批生成；否则逐个重采样生成索引并
+        调用statistic_func（传入Series，与原接口一致）。两种方式的随机数序列
+        相同，内存占用与n_bootstrap无关。
+
         Args:
             data: 数据序列
             statistic_func: 统计函数
             n_bootstrap: Bootstrap次数
             confidence_level: 置信水平
+            vectorized: statistic_func是否支持按行批量计算
 
         Returns:
             (点估计, 下界, 上界)
         """
-        bootstrap_stats = []
+        values = np.asarray(data)
+        n_obs = len(values)
 
-        for _ in range(n_bootstrap):
-            # 重采样
-            sample = data.sample(n=len(data), replace=True)
-            stat = statistic_func(sample)
-            bootstrap_stats.append(stat)
+        if vectorized:
+            # 每批样本矩阵的元素数与路径生成的一批相当
+            rows_per_chunk = max(
+                1, self.config.chunk_size * self.config.time_horizon // max(n_obs, 1)
+            )
+            chunks = []
+            for i in range(0, n_bootstrap, rows_per_chunk):
+                n_rows = min(rows_per_chunk, n_bootstrap - i)
+                indices = self.rng.integers(0, n_obs, size=(n_rows, n_obs))
+                chunks.append(np.asarray(statistic_func(values[indices])))
+            bootstrap_stats = np.concatenate(chunks)
+        else:
+            index = data.index if isinstance(data, pd.Series) else None
+            bootstrap_stats = np.empty(n_bootstrap)
+            for i in range(n_bootstrap):
+                row = self.rng.integers(0, n_obs, size=n_obs)
+                bootstrap_stats[i] = statistic_func(
+                    pd.Series(
+                        values[row], index=index[row] if index is not None else None
+                    )
+                )
 
         # 计算置信区间
         alpha = 1 - confidence_level
@@ -267,7 +315,7 @@ class MonteCarloSimulator:
             (估计值, 标准误差)
         """
         # 从提议分布采样
-        samples = np.random.normal(
+        samples = self.rng.normal(
             proposal_params["mean"], proposal_params["std"], n_samples
         )
 
@@ -292,9 +340,111 @@ class MonteCarloSimulator:
 
         return estimate, std_error
 
+    def _uniforms(self, n_paths: int) -> np.ndarray:
+        """生成 (n_paths, time_horizon) 的均匀分布矩阵
+
+        启用准随机时取加扰Sobol序列的后续n_paths个点（每个时间步一维），
+        同一次模拟的各批次共用一个引擎，保证整体仍是一段连续的低差异序列。
+        """
+        if not self.config.use_quasi_random:
+            return self.rng.random((n_paths, self.config.time_horizon))
+
+        if self._sobol is None:
+            self._sobol = qmc.Sobol(
+                d=self.config.time_horizon, scramble=True, seed=self.rng
+            )
+        with warnings.catch_warnings():
+            # 批大小不是2的幂时Sobol会提示平衡性下降
+            warnings.simplefilter("ignore", UserWarning)
+            u = self._sobol.random(n_paths)
+        return np.clip(u, 1e-12, 1 - 1e-12)
+
+    def _standard_shocks(self, n_paths: int, df: Optional[int] = None) -> np.ndarray:
+        """生成 (n_paths, time_horizon) 的标准化冲击矩阵
+
+        Args:
+            n_paths: 路径数
+            df: t分布自由度，None表示标准正态
+
+        Returns:
+            冲击矩阵；启用对偶变量时后半部分是前半部分的相反数
+        """
+        horizon = self.config.time_horizon
+        n_base = (n_paths + 1) // 2 if self.config.use_antithetic else n_paths
+
+        if self.config.use_quasi_random:
+            u = self._uniforms(n_base)
+            shocks = stats.norm.ppf(u) if df is None else stats.t.ppf(u, df)
+        elif df is None:
+            shocks = self.rng.standard_normal((n_base, horizon), dtype=self.dtype)
+        else:
+            shocks = self.rng.standard_t(df, size=(n_base, horizon))
+
+        shocks = shocks.astype(self.dtype, copy=False)
+        if self.config.use_antithetic:
+            shocks = np.concatenate([shocks, -shocks])[:n_paths]
+        return shocks
+
+    def _generate_paths(
+        self, generate_returns: Callable[[int], np.ndarray], initial_value: float
+    ) -> SimulationSummary:
+        """分批生成收益率矩阵并汇总逐路径统计量
+
+        每批只在内存中保留 (chunk_size, time_horizon) 的收益率和价格矩阵，
+        统计量按列向量化计算，只为前n_stored_paths条路径创建路径对象。
+
+        Args:
+            generate_returns: 给定路径数返回 (n, time_horizon) 日对数收益率矩阵的函数
+            initial_value: 初始价值
+
+        Returns:
+            模拟汇总
+        """
+        n_total = self.config.n_simulations
+        chunk_size = max(1, self.config.chunk_size)
+
+        cumulative_returns = []
+        final_values = []
+        max_drawdowns = []
+        volatilities = []
+        stored_paths: List[SimulationPath] = []
+
+        for start in range(0, n_total, chunk_size):
+            n_paths = min(chunk_size, n_total - start)
+            returns = generate_returns(n_paths).astype(self.dtype, copy=False)
+
+            # 价格路径（首列为初始价值）
+            prices = np.empty((n_paths, returns.shape[1] + 1), dtype=self.dtype)
+            prices[:, 0] = initial_value
+            np.cumsum(returns, axis=1, out=prices[:, 1:])
+            np.exp(prices[:, 1:], out=prices[:, 1:])
+            prices[:, 1:] *= initial_value
+
+            running_max = np.maximum.accumulate(prices, axis=1)
+            drawdowns = ((prices - running_max) / running_max).min(axis=1)
+
+            cumulative_returns.append(prices[:, -1] / initial_value - 1)
+            final_values.append(prices[:, -1])
+            max_drawdowns.append(drawdowns)
+            volatilities.append(returns.std(axis=1) * np.sqrt(TRADING_DAYS_PER_YEAR))
+
+            n_keep = min(self.config.n_stored_paths - len(stored_paths), n_paths)
+            for i in range(max(n_keep, 0)):
+                stored_paths.append(
+                    self._create_simulation_path(start + i, returns[i], prices[i])
+                )
+
+        return SimulationSummary(
+            cumulative_returns=np.concatenate(cumulative_returns).astype(float),
+            final_values=np.concatenate(final_values).astype(float),
+            max_drawdowns=np.concatenate(max_drawdowns).astype(float),
+            volatilities=np.concatenate(volatilities).astype(float),
+            paths=stored_paths,
+        )
+
     def _simulate_normal_paths(
         self, mean_return: float, volatility: float, initial_value: float
-    ) -> List[SimulationPath]:
+    ) -> SimulationSummary:
         """模拟正态分布路径
 
         Args:
@@ -303,48 +453,20 @@ class MonteCarloSimulator:
             initial_value: 初始价值
 
         Returns:
-            模拟路径列表
+            模拟汇总
         """
-        paths = []
-
         # 日收益率参数
         daily_return = mean_return / TRADING_DAYS_PER_YEAR
         daily_vol = volatility / np.sqrt(TRADING_DAYS_PER_YEAR)
 
-        n_paths = self.config.n_simulations
-        if self.config.use_antithetic:
-            n_paths = n_paths // 2
-
-        for i in range(n_paths):
-            # 生成随机收益率
-            random_returns = np.random.normal(
-                daily_return, daily_vol, self.config.time_horizon
-            )
-
-            # 计算价格路径
-            price_path = initial_value * np.exp(np.cumsum(random_returns))
-            price_path = np.insert(price_path, 0, initial_value)
-
-            # 创建路径对象
-            path = self._create_simulation_path(i, random_returns, price_path)
-            paths.append(path)
+        def generate_returns(n_paths: int) -> np.ndarray:
+            return daily_return + daily_vol * self._standard_shocks(n_paths)
 
-            # 对偶变量法
-            if self.config.use_antithetic:
-                anti_returns = 2 * daily_return - random_returns
-                anti_price_path = initial_value * np.exp(np.cumsum(anti_returns))
-                anti_price_path = np.insert(anti_price_path, 0, initial_value)
-
-                anti_path = self._create_simulation_path(
-                    i + n_paths, anti_returns, anti_price_path
-                )
-                paths.append(anti_path)
-
-        return paths
+        return self._generate_paths(generate_returns, initial_value)
 
     def _simulate_t_distribution_paths(
         self, mean_return: float, volatility: float, initial_value: float, df: int = 5
-    ) -> List[SimulationPath]:
+    ) -> SimulationSummary:
         """模拟t分布路径
 
         Args:
@@ -354,66 +476,53 @@ class MonteCarloSimulator:
             df: 自由度
 
         Returns:
-            模拟路径列表
+            模拟汇总
         """
-        paths = []
-
         daily_return = mean_return / TRADING_DAYS_PER_YEAR
         daily_vol = volatility / np.sqrt(TRADING_DAYS_PER_YEAR)
 
-        for i in range(self.config.n_simulations):
-            # 生成t分布随机数
-            t_random = stats.t.rvs(df, size=self.config.time_horizon)
+        # 标准化为单位方差
+        scale = daily_vol / np.sqrt(df / (df - 2))
 
-            # 标准化并调整
-            random_returns = daily_return + daily_vol * t_random / np.sqrt(
-                df / (df - 2)
-            )
-
-            # 计算价格路径
-            price_path = initial_value * np.exp(np.cumsum(random_returns))
-            price_path = np.insert(price_path, 0, initial_value)
+        def generate_returns(n_paths: int) -> np.ndarray:
+            return daily_return + scale * self._standard_shocks(n_paths, df=df)
 
-            path = self._create_simulation_path(i, random_returns, price_path)
-            paths.append(path)
-
-        return paths
+        return self._generate_paths(generate_returns, initial_value)
 
     def _simulate_historical_bootstrap(
         self, returns_data: pd.Series, weights: pd.Series, initial_value: float
-    ) -> List[SimulationPath]:
+    ) -> SimulationSummary:
         """历史Bootstrap模拟
 
+        有放回地抽取历史收益率；启用准随机时由Sobol点映射为抽样下标。
+        重采样路径没有对称结构，不使用对偶变量。
+
         Args:
             returns_data: 历史收益率
             weights: 权重
             initial_value: 初始价值
 
         Returns:
-            模拟路径列表
+            模拟汇总
         """
-        paths = []
-
         # 计算历史组合收益率
         if isinstance(returns_data, pd.DataFrame):
             historical_returns = (returns_data @ weights).values
         else:
             historical_returns = returns_data.values
+        historical_returns = historical_returns.astype(self.dtype)
+        n_obs = len(historical_returns)
 
-        for i in range(self.config.n_simulations):
-            # Bootstrap采样
-            random_returns = np.random.choice(
-                historical_returns, size=self.config.time_horizon, replace=True
-            )
-
-            # 计算价格路径
-            price_path = initial_value * np.exp(np.cumsum(random_returns))
-            price_path = np.insert(price_path, 0, initial_value)
-
-            path = self._create_simulation_path(i, random_returns, price_path)
-            paths.append(path)
+        def generate_returns(n_paths: int) -> np.ndarray:
+            if self.config.use_quasi_random:
+                indices = (self._uniforms(n_paths) * n_obs).astype(np.intp)
+            else:
+                indices = self.rng.integers(
+                    0, n_obs, size=(n_paths, self.config.time_horizon)
+                )
+            return historical_returns[indices]
 
-        return paths
+        return self._generate_paths(generate_returns, initial_value)
 
     def _simulate_jump_diffusion_paths(
         self,
@@ -423,9 +532,12 @@ class MonteCarloSimulator:
         jump_intensity: float = 0.1,
         jump_mean: float = -0.02,
         jump_std: float = 0.03,
-    ) -> List[SimulationPath]:
+    ) -> SimulationSummary:
         """模拟跳跃扩散路径
 
+        每个时间步的跳跃次数服从泊松分布；k次独立正态跳跃之和服从
+        N(k·jump_mean, k·jump_std²)，因此整批跳跃可以一次抽样得到。
+
         Args:
             mean_return: 平均收益率
             volatility: 波动率
@@ -435,42 +547,30 @@ class MonteCarloSimulator:
             jump_std: 跳跃标准差
 
         Returns:
-            模拟路径列表
+            模拟汇总
         """
-        paths = []
-
         daily_return = mean_return / TRADING_DAYS_PER_YEAR
         daily_vol = volatility / np.sqrt(TRADING_DAYS_PER_YEAR)
         dt = 1 / TRADING_DAYS_PER_YEAR
+        diffusion_scale = daily_vol * np.sqrt(dt)
 
-        for i in range(self.config.n_simulations):
-            returns = []
+        def generate_returns(n_paths: int) -> np.ndarray:
+            shape = (n_paths, self.config.time_horizon)
 
-            for t in range(self.config.time_horizon):
-                # 布朗运动部分
-                diffusion = (
-                    daily_return * dt + daily_vol * np.sqrt(dt) * np.random.normal()
-                )
-
-                # 跳跃部分
-                n_jumps = np.random.poisson(jump_intensity * dt)
-                if n_jumps > 0:
-                    jumps = np.sum(np.random.normal(jump_mean, jump_std, n_jumps))
-                else:
-                    jumps = 0
-
-                returns.append(diffusion + jumps)
-
-            returns = np.array(returns)
+            # 布朗运动部分
+            diffusion = daily_return * dt + diffusion_scale * self._standard_shocks(
+                n_paths
+            )
 
-            # 计算价格路径
-            price_path = initial_value * np.exp(np.cumsum(returns))
-            price_path = np.insert(price_path, 0, initial_value)
+            # 跳跃部分
+            n_jumps = self.rng.poisson(jump_intensity * dt, size=shape)
+            jumps = n_jumps * jump_mean + np.sqrt(n_jumps) * jump_std * (
+                self.rng.standard_normal(shape, dtype=self.dtype)
+            )
 
-            path = self._create_simulation_path(i, returns, price_path)
-            paths.append(path)
+            return diffusion + jumps.astype(self.dtype, copy=False)
 
-        return paths
+        return self._generate_paths(generate_returns, initial_value)
 
     def _create_simulation_path(
         self, path_id: int, returns: np.ndarray, prices: np.ndarray
@@ -491,8 +591,8 @@ class MonteCarloSimulator:
 
         return SimulationPath(
             path_id=path_id,
-            returns=returns,
-            prices=prices,
+            returns=returns.copy(),
+            prices=prices.copy(),
             cumulative_return=cumulative_return,
             max_drawdown=max_drawdown,
             volatility=volatility,
@@ -512,16 +612,16 @@ class MonteCarloSimulator:
         drawdown = (prices - cummax) / cummax
         return np.min(drawdown)
 
-    def _calculate_var(self, paths: List[SimulationPath]) -> Dict[float, float]:
+    def _calculate_var(self, paths: SimulationSummary) -> Dict[float, float]:
         """计算VaR
 
         Args:
-            paths: 模拟路径列表
+            paths: 模拟汇总
 
         Returns:
             VaR估计字典
         """
-        final_returns = [p.cumulative_return for p in paths]
+        final_returns = paths.cumulative_returns
 
         var_estimates = {}
         for confidence in self.config.confidence_levels:
@@ -531,48 +631,47 @@ class MonteCarloSimulator:
 
         return var_estimates
 
-    def _calculate_cvar(self, paths: List[SimulationPath]) -> Dict[float, float]:
+    def _calculate_cvar(self, paths: SimulationSummary) -> Dict[float, float]:
         """计算CVaR
 
         Args:
-            paths: 模拟路径列表
+            paths: 模拟汇总
 
         Returns:
             CVaR估计字典
         """
-        final_returns = [p.cumulative_return for p in paths]
+        final_returns = paths.cumulative_returns
 
         cvar_estimates = {}
         for confidence in self.config.confidence_levels:
             var_threshold = np.percentile(final_returns, (1 - confidence) * 100)
-            tail_returns = [r for r in final_returns if r <= var_threshold]
+            tail_returns = final_returns[final_returns <= var_threshold]
 
-            if tail_returns:
+            if tail_returns.size:
                 cvar_estimates[confidence] = -np.mean(tail_returns)
             else:
                 cvar_estimates[confidence] = 0
 
         return cvar_estimates
 
-    def _calculate_probability_of_loss(self, paths: List[SimulationPath]) -> float:
+    def _calculate_probability_of_loss(self, paths: SimulationSummary) -> float:
         """计算亏损概率
 
         Args:
-            paths: 模拟路径列表
+            paths: 模拟汇总
 
         Returns:
             亏损概率
         """
-        losses = sum(1 for p in paths if p.cumulative_return < 0)
-        return losses / len(paths)
+        return float(np.mean(paths.cumulative_returns < 0))
 
     def _calculate_probability_of_target(
-        self, paths: List[SimulationPath], initial_value: float
+        self, paths: SimulationSummary, initial_value: float
     ) -> Dict[float, float]:
         """计算达到目标的概率
 
         Args:
-            paths: 模拟路径列表
+            paths: 模拟汇总
             initial_value: 初始价值
 
         Returns:
@@ -582,42 +681,35 @@ class MonteCarloSimulator:
         probabilities = {}
 
         for target in targets:
-            hits = sum(1 for p in paths if p.cumulative_return >= target)
-            probabilities[target] = hits / len(paths)
+            probabilities[target] = float(np.mean(paths.cumulative_returns >= target))
 
         return probabilities
 
-    def _calculate_percentile_outcomes(
-        self, paths: List[SimulationPath]
-    ) -> pd.DataFrame:
+    def _calculate_percentile_outcomes(self, paths: SimulationSummary) -> pd.DataFrame:
         """计算百分位结果
 
         Args:
-            paths: 模拟路径列表
+            paths: 模拟汇总
 
         Returns:
             百分位结果DataFrame
         """
         percentiles = [1, 5, 10, 25, 50, 75, 90, 95, 99]
 
-        final_values = [p.final_value for p in paths]
-        cumulative_returns = [p.cumulative_return for p in paths]
-        max_drawdowns = [p.max_drawdown for p in paths]
-
         results = pd.DataFrame(index=percentiles)
-        results["final_value"] = [np.percentile(final_values, p) for p in percentiles]
-        results["cumulative_return"] = [
-            np.percentile(cumulative_returns, p) for p in percentiles
-        ]
-        results["max_drawdown"] = [np.percentile(max_drawdowns, p) for p in percentiles]
+        results["final_value"] = np.percentile(paths.final_values, percentiles)
+        results["cumulative_return"] = np.percentile(
+            paths.cumulative_returns, percentiles
+        )
+        results["max_drawdown"] = np.percentile(paths.max_drawdowns, percentiles)
 
         return results
 
-    def _calculate_convergence_data(self, paths: List[SimulationPath]) -> pd.DataFrame:
+    def _calculate_convergence_data(self, paths: SimulationSummary) -> pd.DataFrame:
         """计算收敛数据
 
         Args:
-            paths: 模拟路径列表
+            paths: 模拟汇总
 
         Returns:
             收敛数据DataFrame
@@ -628,10 +720,10 @@ class MonteCarloSimulator:
         convergence_data = []
 
         for n in checkpoints:
-            subset_paths = paths[:n]
+            subset_returns = paths.cumulative_returns[:n]
 
-            mean_return = np.mean([p.cumulative_return for p in subset_paths])
-            std_return = np.std([p.cumulative_return for p in subset_paths])
+            mean_return = np.mean(subset_returns)
+            std_return = np.std(subset_returns)
 
             convergence_data.append(
                 {
@@ -14,6 +14,7 @@ from .alert_manager import (
     AlertStatus,
     create_alert_manager,
 )
+from .rule_engine import RuleEngine, ThresholdIndex
 
 __all__ = [
     "AlertManager",
@@ -25,4 +26,6 @@ __all__ = [
     "AlertCategory",
     "AlertStatus",
     "create_alert_manager",
+    "RuleEngine",
+    "ThresholdIndex",
 ]
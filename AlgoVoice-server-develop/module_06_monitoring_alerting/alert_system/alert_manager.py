@@ -4,18 +4,20 @@
 """
 
 import asyncio
-from collections import defaultdict
+import heapq
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 from queue import PriorityQueue
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
-import numpy as np
 import pandas as pd
 from common.exceptions import ModelError
 from common.logging_system import setup_logger
 
+from .rule_engine import COMPARATORS, RuleEngine
+
 logger = setup_logger("alert_manager")
 
 
@@ -68,6 +70,11 @@ class AlertRule:
     escalation_time: int = 600  # 升级时间（秒）
     enabled: bool = True
     metadata: Dict[str, Any] = field(default_factory=dict)
+    window_seconds: int = 0  # 大于0时比较窗口内指标的聚合值
+    aggregation: str = "mean"  # 窗口聚合方式: mean, max, min, sum
+    # 附加条件[(指标, 比较符, 阈值)]，需与主条件同时满足
+    extra_conditions: List[Tuple[str, str, float]] = field(default_factory=list)
+    dedup_key: Optional[str] = None  # 同一去重键的规则只触发最严重的一条
 
 
 @dataclass
@@ -104,6 +111,7 @@ class AlertConfig:
     suppression_window: int = 300  # 抑制窗口（秒）
     enable_alert_aggregation: bool = True
     aggregation_window: int = 60  # 聚合窗口（秒）
+    max_alerts_per_minute: int = 0  # 全局触发速率上限，0表示不限制
 
 
 @dataclass
@@ -120,6 +128,85 @@ class AlertStatistics:
     top_triggered_rules: List[Tuple[str, int]]
 
 
+class AlertStatisticsTracker:
+    """增量维护预警统计
+
+    预警进入统计范围时add，离开时remove；预警状态变化前remove、变化后再add，
+    因此统计始终与活跃预警和历史预警的当前状态一致。
+    """
+
+    def __init__(self):
+        """初始化统计计数"""
+        self.total = 0
+        self.by_severity: Dict[AlertSeverity, int] = defaultdict(int)
+        self.by_category: Dict[AlertCategory, int] = defaultdict(int)
+        self.by_status: Dict[AlertStatus, int] = defaultdict(int)
+        self.by_rule: Dict[str, int] = defaultdict(int)
+        self.escalated = 0
+        self.resolved = 0
+        self.resolution_seconds = 0.0
+
+    def add(self, alert: Alert, sign: int = 1) -> None:
+        """计入一条预警
+
+        Args:
+            alert: 预警对象
+            sign: 1表示计入，-1表示移除
+        """
+        self.total += sign
+        self.by_severity[alert.severity] += sign
+        self.by_category[alert.category] += sign
+        self.by_status[alert.status] += sign
+        self.by_rule[alert.rule_id] += sign
+        if alert.escalated:
+            self.escalated += sign
+        if alert.status == AlertStatus.RESOLVED and alert.resolved_at:
+            self.resolved += sign
+            self.resolution_seconds += (
+                sign * (alert.resolved_at - alert.timestamp).total_seconds()
+            )
+
+    def remove(self, alert: Alert) -> None:
+        """移除一条预警
+
+        Args:
+            alert: 预警对象
+        """
+        self.add(alert, -1)
+
+    def to_statistics(self) -> AlertStatistics:
+        """生成统计结果
+
+        Returns:
+            预警统计信息
+        """
+        if self.total == 0:
+            return AlertStatistics(
+                total_alerts=0,
+                alerts_by_severity={},
+                alerts_by_category={},
+                alerts_by_status={},
+                average_resolution_time=0,
+                escalation_rate=0,
+                false_positive_rate=0,
+                top_triggered_rules=[],
+            )
+
+        rule_counts = [(rule_id, n) for rule_id, n in self.by_rule.items() if n]
+        return AlertStatistics(
+            total_alerts=self.total,
+            alerts_by_severity={k: n for k, n in self.by_severity.items() if n},
+            alerts_by_category={k: n for k, n in self.by_category.items() if n},
+            alerts_by_status={k: n for k, n in self.by_status.items() if n},
+            average_resolution_time=(
+                self.resolution_seconds / self.resolved if self.resolved else 0
+            ),
+            escalation_rate=self.escalated / self.total,
+            false_positive_rate=0,  # 需要额外跟踪
+            top_triggered_rules=heapq.nlargest(10, rule_counts, key=lambda x: x[1]),
+        )
+
+
 class AlertManager:
     """预警管理器类"""
 
@@ -135,6 +222,12 @@ class AlertManager:
         self.alert_history: List[Alert] = []
         self.alert_queue: PriorityQueue = PriorityQueue()
         self.rule_cooldowns: Dict[str, datetime] = {}
+        # 去重键 -> (冷却结束时间, 已触发的严重级别)
+        self.dedup_cooldowns: Dict[str, Tuple[datetime, int]] = {}
+        self.rule_engine = RuleEngine()
+        self.rate_limited_count = 0
+        self._recent_firings: deque = deque()
+        self._statistics = AlertStatisticsTracker()
         self.suppressed_alerts: Dict[str, List[Alert]] = defaultdict(list)
         self.alert_handlers: Dict[AlertSeverity, List[Callable]] = {
             severity: [] for severity in AlertSeverity
@@ -144,9 +237,18 @@ class AlertManager:
     def add_rule(self, rule: AlertRule) -> None:
         """添加预警规则
 
+        规则在添加时编译进按指标和阈值建立的索引，修改已添加规则的指标、阈值、
+        比较符或窗口后需重新调用add_rule。
+
         Args:
             rule: 预警规则
         """
+        if rule.comparison not in COMPARATORS:
+            logger.warning(
+                f"Alert rule {rule.rule_id} has unknown comparison "
+                f"'{rule.comparison}' and will never trigger"
+            )
+        self.rule_engine.add(rule)
         self.rules[rule.rule_id] = rule
         logger.info(f"Added alert rule: {rule.name}")
 
@@ -158,6 +260,7 @@ class AlertManager:
         """
         if rule_id in self.rules:
             del self.rules[rule_id]
+            self.rule_engine.remove(rule_id)
             logger.info(f"Removed alert rule: {rule_id}")
 
     def enable_rule(self, rule_id: str) -> None:
@@ -180,37 +283,54 @@ class AlertManager:
             self.rules[rule_id].enabled = False
             logger.info(f"Disabled alert rule: {rule_id}")
 
-    def check_rules(self, metrics: Dict[str, float]) -> List[Alert]:
+    def check_rules(
+        self, metrics: Dict[str, float], timestamp: Optional[datetime] = None
+    ) -> List[Alert]:
         """检查预警规则
 
+        只评估本次更新中出现的指标上的规则，满足条件的规则由阈值索引一次查出。
+
         Args:
             metrics: 指标字典
+            timestamp: 指标采样时间，用于窗口条件，默认为当前时间
 
         Returns:
             触发的预警列表
         """
         triggered_alerts = []
 
-        for rule_id, rule in self.rules.items():
-            if not rule.enabled:
-                continue
+        matched = [
+            (rule, value)
+            for rule, value in self.rule_engine.match(metrics, timestamp)
+            if rule.enabled
+        ]
+        for rule, value in self._deduplicate(matched):
+            rule_id = rule.rule_id
 
             # 检查冷却时间
-            if self._is_in_cooldown(rule_id):
+            if self._is_in_cooldown(rule_id) or self._is_deduplicated(rule):
                 continue
 
-            # 检查条件
-            if self._evaluate_rule(rule, metrics):
-                alert = self._create_alert(rule, metrics.get(rule.metric, 0))
+            alert = self._create_alert(rule, value)
+
+            # 检查是否应该抑制
+            if self.config.enable_alert_suppression:
+                if self._should_suppress_alert(alert):
+                    self.suppressed_alerts[rule_id].append(alert)
+                    continue
 
-                # 检查是否应该抑制
-                if self.config.enable_alert_suppression:
-                    if self._should_suppress_alert(alert):
-                        self.suppressed_alerts[rule_id].append(alert)
-                        continue
+            # 检查全局触发速率
+            if self._is_rate_limited():
+                self.rate_limited_count += 1
+                continue
 
-                triggered_alerts.append(alert)
-                self._update_cooldown(rule_id, rule.cooldown_seconds)
+            triggered_alerts.append(alert)
+            self._update_cooldown(rule_id, rule.cooldown_seconds)
+            if rule.dedup_key is not None:
+                self.dedup_cooldowns[rule.dedup_key] = (
+                    self.rule_cooldowns[rule_id],
+                    rule.severity.value,
+                )
 
         return triggered_alerts
 
@@ -249,9 +369,11 @@ class AlertManager:
         """
         if alert_id in self.active_alerts:
             alert = self.active_alerts[alert_id]
+            self._statistics.remove(alert)
             alert.status = AlertStatus.ACKNOWLEDGED
             alert.acknowledged_by = acknowledged_by
             alert.acknowledged_at = datetime.now()
+            self._statistics.add(alert)
 
             logger.info(f"Alert {alert_id} acknowledged by {acknowledged_by}")
             return True
@@ -272,8 +394,10 @@ class AlertManager:
         """
         if alert_id in self.active_alerts:
             alert = self.active_alerts[alert_id]
+            self._statistics.remove(alert)
             alert.status = AlertStatus.RESOLVED
             alert.resolved_at = datetime.now()
+            self._statistics.add(alert)
 
             if resolution_notes:
                 alert.metadata["resolution_notes"] = resolution_notes
@@ -298,9 +422,11 @@ class AlertManager:
         """
         if alert_id in self.active_alerts:
             alert = self.active_alerts[alert_id]
+            self._statistics.remove(alert)
             alert.escalated = True
             alert.escalation_level += 1
             alert.status = AlertStatus.ESCALATED
+            self._statistics.add(alert)
 
             # 触发升级处理
             self._handle_escalation(alert)
@@ -366,70 +492,12 @@ class AlertManager:
     def get_alert_statistics(self) -> AlertStatistics:
         """获取预警统计
 
+        统计随预警的产生、状态变化和清理增量维护，不再扫描全部预警。
+
         Returns:
             预警统计信息
         """
-        all_alerts = list(self.active_alerts.values()) + self.alert_history
-
-        if not all_alerts:
-            return AlertStatistics(
-                total_alerts=0,
-                alerts_by_severity={},
-                alerts_by_category={},
-                alerts_by_status={},
-                average_resolution_time=0,
-                escalation_rate=0,
-                false_positive_rate=0,
-                top_triggered_rules=[],
-            )
-
-        # 按严重级别统计
-        alerts_by_severity = defaultdict(int)
-        for alert in all_alerts:
-            alerts_by_severity[alert.severity] += 1
-
-        # 按类别统计
-        alerts_by_category = defaultdict(int)
-        for alert in all_alerts:
-            alerts_by_category[alert.category] += 1
-
-        # 按状态统计
-        alerts_by_status = defaultdict(int)
-        for alert in all_alerts:
-            alerts_by_status[alert.status] += 1
-
-        # 计算平均解决时间
-        resolved_alerts = [a for a in all_alerts if a.status == AlertStatus.RESOLVED]
-        if resolved_alerts:
-            resolution_times = [
-                (a.resolved_at - a.timestamp).total_seconds()
-                for a in resolved_alerts
-                if a.resolved_at
-            ]
-            avg_resolution_time = np.mean(resolution_times) if resolution_times else 0
-        else:
-            avg_resolution_time = 0
-
-        # 计算升级率
-        escalated_count = sum(1 for a in all_alerts if a.escalated)
-        escalation_rate = escalated_count / len(all_alerts) if all_alerts else 0
-
-        # 统计触发最多的规则
-        rule_counts = defaultdict(int)
-        for alert in all_alerts:
-            rule_counts[alert.rule_id] += 1
-        top_rules = sorted(rule_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-
-        return AlertStatistics(
-            total_alerts=len(all_alerts),
-            alerts_by_severity=dict(alerts_by_severity),
-            alerts_by_category=dict(alerts_by_category),
-            alerts_by_status=dict(alerts_by_status),
-            average_resolution_time=avg_resolution_time,
-            escalation_rate=escalation_rate,
-            false_positive_rate=0,  # 需要额外跟踪
-            top_triggered_rules=top_rules,
-        )
+        return self._statistics.to_statistics()
 
     def register_handler(self, severity: AlertSeverity, handler: Callable) -> None:
         """注册预警处理器
@@ -441,32 +509,33 @@ class AlertManager:
         self.alert_handlers[severity].append(handler)
         logger.info(f"Registered handler for {severity.name} alerts")
 
-    def _evaluate_rule(self, rule: AlertRule, metrics: Dict[str, float]) -> bool:
-        """评估规则条件
+    def _deduplicate(
+        self, matched: List[Tuple[AlertRule, float]]
+    ) -> List[Tuple[AlertRule, float]]:
+        """同一去重键下只保留严重级别最高的规则（同级取先添加的）
 
         Args:
-            rule: 预警规则
-            metrics: 指标字典
+            matched: 满足条件的(规则, 指标值)列表
 
         Returns:
-            是否触发
+            去重后的列表
         """
-        if rule.metric not in metrics:
-            return False
-
-        metric_value = metrics[rule.metric]
-        threshold = rule.threshold
-
-        comparisons = {
-            ">": metric_value > threshold,
-            "<": metric_value < threshold,
-            ">=": metric_value >= threshold,
-            "<=": metric_value <= threshold,
-            "==": metric_value == threshold,
-            "!=": metric_value != threshold,
-        }
-
-        return comparisons.get(rule.comparison, False)
+        best: Dict[str, int] = {}
+        for position, (rule, _) in enumerate(matched):
+            if rule.dedup_key is None:
+                continue
+            current = best.get(rule.dedup_key)
+            if (
+                current is None
+                or rule.severity.value > matched[current][0].severity.value
+            ):
+                best[rule.dedup_key] = position
+
+        return [
+            (rule, value)
+            for position, (rule, value) in enumerate(matched)
+            if rule.dedup_key is None or best[rule.dedup_key] == position
+        ]
 
     def _create_alert(
         self, rule: AlertRule, metric_value: float, custom_message: Optional[str] = None
@@ -514,7 +583,10 @@ class AlertManager:
             alert: 预警对象
         """
         # 添加到活跃预警
+        if alert.alert_id in self.active_alerts:
+            self._statistics.remove(self.active_alerts[alert.alert_id])
         self.active_alerts[alert.alert_id] = alert
+        self._statistics.add(alert)
 
         # 添加到队列
         priority = -alert.severity.value  # 负数使高严重级别优先
@@ -555,6 +627,41 @@ class AlertManager:
             seconds=cooldown_seconds
         )
 
+    def _is_deduplicated(self, rule: AlertRule) -> bool:
+        """同一去重键已在冷却期内以不低于本规则的严重级别触发过
+
+        Args:
+            rule: 预警规则
+
+        Returns:
+            是否去重
+        """
+        if rule.dedup_key is None or rule.dedup_key not in self.dedup_cooldowns:
+            return False
+
+        cooldown_end, severity = self.dedup_cooldowns[rule.dedup_key]
+        return datetime.now() < cooldown_end and rule.severity.value <= severity
+
+    def _is_rate_limited(self) -> bool:
+        """按最近一分钟的触发次数判断是否超过全局速率上限，未超过时记录本次触发
+
+        Returns:
+            是否限流
+        """
+        limit = self.config.max_alerts_per_minute
+        if limit <= 0:
+            return False
+
+        now = datetime.now()
+        cutoff = now - timedelta(minutes=1)
+        while self._recent_firings and self._recent_firings[0] <= cutoff:
+            self._recent_firings.popleft()
+        if len(self._recent_firings) >= limit:
+            return True
+
+        self._recent_firings.append(now)
+        return False
+
     def _should_suppress_alert(self, alert: Alert) -> bool:
         """判断是否应该抑制预警
 
@@ -620,9 +727,13 @@ class AlertManager:
         cutoff_date = datetime.now() - timedelta(days=self.config.alert_retention_days)
 
         # 清理历史预警
-        self.alert_history = [
-            a for a in self.alert_history if a.timestamp > cutoff_date
-        ]
+        retained = []
+        for alert in self.alert_history:
+            if alert.timestamp > cutoff_date:
+                retained.append(alert)
+            else:
+                self._statistics.remove(alert)
+        self.alert_history = retained
 
         # 清理抑制的预警
         for rule_id in list(self.suppressed_alerts.keys()):
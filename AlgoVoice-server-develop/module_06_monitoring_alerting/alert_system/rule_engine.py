@@ -0,0 +1,292 @@
+"""
+预警规则引擎模块
+按指标名和阈值为预警规则建立索引，每次指标更新只需对每个相关指标做一次二分查找
+"""
+
+import bisect
+import operator
+from collections import defaultdict, deque
+from datetime import datetime, timedelta
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+# 比较符到比较函数的映射
+COMPARATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+# 窗口条件支持的聚合方式
+WINDOW_AGGREGATIONS: Dict[str, Callable[[List[float]], float]] = {
+    "mean": lambda values: sum(values) / len(values),
+    "max": max,
+    "min": min,
+    "sum": sum,
+}
+
+# 不带窗口的规则直接比较指标的最新值
+RAW_SIGNAL: Tuple[str, int] = ("last", 0)
+
+
+def compare(value: Any, comparison: str, threshold: Any) -> bool:
+    """按比较符比较指标值和阈值，未知比较符视为不满足
+
+    Args:
+        value: 指标值
+        comparison: 比较符
+        threshold: 阈值
+
+    Returns:
+        是否满足
+    """
+    comparator = COMPARATORS.get(comparison)
+    return comparator is not None and bool(comparator(value, threshold))
+
+
+class ThresholdIndex:
+    """单个信号上的阈值索引
+
+    >、>=、<、<=规则按阈值排序保存，满足条件的规则总是有序列表的一个前缀或后缀，
+    一次二分即可全部取出；==、!=规则按阈值分桶。
+    """
+
+    def __init__(self):
+        """初始化阈值索引"""
+        self._sorted: Dict[str, Tuple[List[float], List[str]]] = {
+            comparison: ([], []) for comparison in (">", ">=", "<", "<=")
+        }
+        self._equal: Dict[float, List[str]] = defaultdict(list)
+        self._not_equal: Dict[float, List[str]] = defaultdict(list)
+        self._never: Set[str] = set()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, rule_id: str, comparison: str, threshold: float) -> None:
+        """加入一条规则
+
+        Args:
+            rule_id: 规则ID
+            comparison: 比较符
+            threshold: 阈值
+        """
+        if comparison in self._sorted and threshold == threshold:
+            thresholds, rule_ids = self._sorted[comparison]
+            position = bisect.bisect_right(thresholds, threshold)
+            thresholds.insert(position, threshold)
+            rule_ids.insert(position, rule_id)
+        elif comparison == "==":
+            self._equal[threshold].append(rule_id)
+        elif comparison == "!=":
+            self._not_equal[threshold].append(rule_id)
+        else:
+            # 未知比较符或NaN阈值的大小比较永远不满足
+            self._never.add(rule_id)
+        self._size += 1
+
+    def remove(self, rule_id: str, comparison: str, threshold: float) -> None:
+        """移除一条规则
+
+        Args:
+            rule_id: 规则ID
+            comparison: 比较符
+            threshold: 阈值
+        """
+        if comparison in self._sorted and threshold == threshold:
+            thresholds, rule_ids = self._sorted[comparison]
+            start = bisect.bisect_left(thresholds, threshold)
+            end = bisect.bisect_right(thresholds, threshold)
+            for position in range(start, end):
+                if rule_ids[position] == rule_id:
+                    del thresholds[position]
+                    del rule_ids[position]
+                    self._size -= 1
+                    return
+        elif comparison in ("==", "!="):
+            buckets = self._equal if comparison == "==" else self._not_equal
+            bucket = buckets.get(threshold)
+            if bucket and rule_id in bucket:
+                bucket.remove(rule_id)
+                if not bucket:
+                    del buckets[threshold]
+                self._size -= 1
+        elif rule_id in self._never:
+            self._never.remove(rule_id)
+            self._size -= 1
+
+    def match(self, value: float) -> List[str]:
+        """找出在给定值下满足条件的全部规则
+
+        Args:
+            value: 信号值
+
+        Returns:
+            规则ID列表
+        """
+        if value != value:  # NaN只满足!=
+            return [rule_id for ids in self._not_equal.values() for rule_id in ids]
+
+        fired = []
+        thresholds, rule_ids = self._sorted[">"]
+        fired.extend(rule_ids[: bisect.bisect_left(thresholds, value)])
+        thresholds, rule_ids = self._sorted[">="]
+        fired.extend(rule_ids[: bisect.bisect_right(thresholds, value)])
+        thresholds, rule_ids = self._sorted["<"]
+        fired.extend(rule_ids[bisect.bisect_right(thresholds, value) :])
+        thresholds, rule_ids = self._sorted["<="]
+        fired.extend(rule_ids[bisect.bisect_left(thresholds, value) :])
+        fired.extend(self._equal.get(value, ()))
+        for threshold, ids in self._not_equal.items():
+            if threshold != value:
+                fired.extend(ids)
+        return fired
+
+
+class RuleEngine:
+    """编译后的预警规则集合
+
+    规则按(指标, 聚合方式, 窗口)分组为信号，每个信号一个ThresholdIndex。指标更新时
+    只访问更新中出现的指标，窗口信号由该指标最近的采样聚合得到。附加条件
+    (extra_conditions)只对主条件已满足的规则检查，使用各指标最近一次的值。
+    """
+
+    def __init__(self):
+        """初始化规则引擎"""
+        self.rules: Dict[str, Any] = {}
+        self.latest_values: Dict[str, float] = {}
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+        self._compiled: Dict[str, Tuple[str, Tuple[str, int], str, float]] = {}
+        self._signals: Dict[str, Dict[Tuple[str, int], ThresholdIndex]] = {}
+        self._samples: Dict[str, Deque[Tuple[datetime, float]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def add(self, rule: Any) -> None:
+        """编译并加入规则，同ID规则被替换但保持原有顺序
+
+        Args:
+            rule: 预警规则（AlertRule）
+
+        Raises:
+            ValueError: 窗口聚合方式不支持
+        """
+        if rule.window_seconds > 0:
+            if rule.aggregation not in WINDOW_AGGREGATIONS:
+                raise ValueError(f"Unsupported window aggregation: {rule.aggregation}")
+            signal = (rule.aggregation, rule.window_seconds)
+        else:
+            signal = RAW_SIGNAL
+
+        if rule.rule_id in self.rules:
+            self.remove(rule.rule_id, keep_order=True)
+        else:
+            self._order[rule.rule_id] = self._next_order
+            self._next_order += 1
+
+        signals = self._signals.setdefault(rule.metric, {})
+        signals.setdefault(signal, ThresholdIndex()).add(
+            rule.rule_id, rule.comparison, rule.threshold
+        )
+        if signal != RAW_SIGNAL:
+            self._samples.setdefault(rule.metric, deque())
+        self.rules[rule.rule_id] = rule
+        self._compiled[rule.rule_id] = (
+            rule.metric,
+            signal,
+            rule.comparison,
+            rule.threshold,
+        )
+
+    def remove(self, rule_id: str, keep_order: bool = False) -> None:
+        """移除规则
+
+        Args:
+            rule_id: 规则ID
+            keep_order: 是否保留规则的顺序号（替换规则时使用）
+        """
+        if rule_id not in self.rules:
+            return
+        metric, signal, comparison, threshold = self._compiled.pop(rule_id)
+        del self.rules[rule_id]
+        if not keep_order:
+            del self._order[rule_id]
+
+        signals = self._signals[metric]
+        index = signals[signal]
+        index.remove(rule_id, comparison, threshold)
+        if not index:
+            del signals[signal]
+        if not signals:
+            del self._signals[metric]
+        if all(window == 0 for _, window in signals):
+            self._samples.pop(metric, None)
+
+    def match(
+        self, metrics: Dict[str, float], timestamp: Optional[datetime] = None
+    ) -> List[Tuple[Any, float]]:
+        """找出本次指标更新下满足条件的规则
+
+        Args:
+            metrics: 指标字典
+            timestamp: 采样时间，默认为当前时间
+
+        Returns:
+            按规则加入顺序排列的(规则, 触发时的信号值)列表
+        """
+        timestamp = timestamp or datetime.now()
+        self.latest_values.update(metrics)
+
+        fired: List[Tuple[int, str, float]] = []
+        for metric, value in metrics.items():
+            signals = self._signals.get(metric)
+            if not signals:
+                continue
+
+            samples = self._samples.get(metric)
+            if samples is not None:
+                samples.append((timestamp, value))
+                horizon = max(window for _, window in signals)
+                cutoff = timestamp - timedelta(seconds=horizon)
+                while samples and samples[0][0] <= cutoff:
+                    samples.popleft()
+
+            for (aggregation, window), index in signals.items():
+                if window > 0:
+                    cutoff = timestamp - timedelta(seconds=window)
+                    values = [v for t, v in samples if t > cutoff]
+                    signal_value = WINDOW_AGGREGATIONS[aggregation](values)
+                else:
+                    signal_value = value
+                for rule_id in index.match(signal_value):
+                    fired.append((self._order[rule_id], rule_id, signal_value))
+
+        fired.sort(key=operator.itemgetter(0))
+        matched = []
+        for _, rule_id, signal_value in fired:
+            rule = self.rules[rule_id]
+            if rule.extra_conditions and not self._check_extra_conditions(rule):
+                continue
+            matched.append((rule, signal_value))
+        return matched
+
+    def _check_extra_conditions(self, rule: Any) -> bool:
+        """检查规则的附加条件，指标从未出现过视为不满足
+
+        Args:
+            rule: 预警规则
+
+        Returns:
+            是否全部满足
+        """
+        for metric, comparison, threshold in rule.extra_conditions:
+            if metric not in self.latest_values:
+                return False
+            if not compare(self.latest_values[metric], comparison, threshold):
+                return False
+        return True
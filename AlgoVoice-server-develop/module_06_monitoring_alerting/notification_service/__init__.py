@@ -10,6 +10,7 @@ from .email_notifier import (
     create_email_notifier,
 )
 from .notification_manager import (
+    DeliveryLatencyHistogram,
     Notification,
     NotificationChannel,
     NotificationConfig,
@@ -42,6 +43,7 @@ __all__ = [
     "NotificationPriority",
     "NotificationType",
     "NotificationTemplate",
+    "DeliveryLatencyHistogram",
     "create_notification_manager",
     # 邮件通知器
     "EmailNotifier",
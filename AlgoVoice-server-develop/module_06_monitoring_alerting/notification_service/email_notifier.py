@@ -1,9 +1,14 @@
 ﻿"""
 邮件通知器模块
 通过SMTP发送邮件通知
+
+登录后的SMTP连接在多次发送间复用，空闲较久时先NOOP检查，断开后自动重连。
 """
 
+import asyncio
 import smtplib
+import threading
+import time
 from dataclasses import dataclass
 from datetime import datetime
 from email.mime.multipart import MIMEMultipart
@@ -27,6 +32,7 @@ class EmailConfig:
     use_tls: bool = True
     use_ssl: bool = False
     timeout: int = 30
+    keepalive_check_interval: int = 30  # 连接空闲超过该秒数时先检查是否可用
 
 
 @dataclass
@@ -52,6 +58,9 @@ class EmailNotifier:
             config: 邮件配置
         """
         self.config = config
+        self._server: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+        self._lock = threading.Lock()
         self._validate_config()
 
     def _validate_config(self) -> None:
@@ -74,34 +83,32 @@ class EmailNotifier:
         Returns:
             是否发送成功
         """
-        try:
-            # 创建邮件消息
-            msg = self._create_message(message)
+        return self.send_emails([message])[0]
 
-            # 连接SMTP服务器并发送
-            if self.config.use_ssl:
-                with smtplib.SMTP_SSL(
-                    self.config.smtp_host,
-                    self.config.smtp_port,
-                    timeout=self.config.timeout,
-                ) as server:
-                    self._send_via_server(server, msg, message.to_addresses)
-            else:
-                with smtplib.SMTP(
-                    self.config.smtp_host,
-                    self.config.smtp_port,
-                    timeout=self.config.timeout,
-                ) as server:
-                    if self.config.use_tls:
-                        server.starttls()
-                    self._send_via_server(server, msg, message.to_addresses)
+    def send_emails(self, messages: List[EmailMessage]) -> List[bool]:
+        """通过同一个SMTP连接批量发送邮件
 
-            logger.info(f"Email sent successfully to {', '.join(message.to_addresses)}")
-            return True
+        Args:
+            messages: 邮件消息列表
 
-        except Exception as e:
-            logger.error(f"Failed to send email: {e}")
-            return False
+        Returns:
+            每封邮件是否发送成功
+        """
+        with self._lock:
+            return [self._send_one(message) for message in messages]
+
+    async def send_email_async(self, message: EmailMessage) -> bool:
+        """在线程池中发送邮件，不阻塞事件循环"""
+        return await asyncio.to_thread(self.send_email, message)
+
+    async def send_emails_async(self, messages: List[EmailMessage]) -> List[bool]:
+        """在线程池中批量发送邮件，不阻塞事件循环"""
+        return await asyncio.to_thread(self.send_emails, messages)
+
+    def close(self) -> None:
+        """关闭SMTP连接"""
+        with self._lock:
+            self._reset_server()
 
     def send_alert_email(
         self,
@@ -195,17 +202,102 @@ class EmailNotifier:
 
         return msg
 
+    def _send_one(self, message: EmailMessage) -> bool:
+        """发送单封邮件（调用方持有锁）
+
+        Args:
+            message: 邮件消息
+
+        Returns:
+            是否发送成功
+        """
+        try:
+            # 创建邮件消息
+            msg = self._create_message(message)
+
+            # 复用的连接可能已被服务器关闭，断开时重连一次
+            for attempt in range(2):
+                server = self._get_server()
+                try:
+                    self._send_via_server(server, msg, message.to_addresses)
+                    break
+                except smtplib.SMTPServerDisconnected:
+                    self._reset_server()
+                    if attempt == 1:
+                        raise
+            self._last_used = time.monotonic()
+
+            logger.info(f"Email sent successfully to {', '.join(message.to_addresses)}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to send email: {e}")
+            if isinstance(e, (smtplib.SMTPServerDisconnected, ConnectionError)):
+                self._reset_server()
+            return False
+
+    def _get_server(self) -> smtplib.SMTP:
+        """获取已登录的SMTP连接
+
+        Returns:
+            SMTP服务器对象
+        """
+        idle = time.monotonic() - self._last_used
+        if self._server is not None and idle > self.config.keepalive_check_interval:
+            try:
+                if self._server.noop()[0] != 250:
+                    self._reset_server()
+            except (smtplib.SMTPException, OSError):
+                self._reset_server()
+
+        if self._server is None:
+            self._server = self._connect()
+            self._last_used = time.monotonic()
+        return self._server
+
+    def _connect(self) -> smtplib.SMTP:
+        """连接SMTP服务器并登录
+
+        Returns:
+            SMTP服务器对象
+        """
+        if self.config.use_ssl:
+            server = smtplib.SMTP_SSL(
+                self.config.smtp_host,
+                self.config.smtp_port,
+                timeout=self.config.timeout,
+            )
+        else:
+            server = smtplib.SMTP(
+                self.config.smtp_host,
+                self.config.smtp_port,
+                timeout=self.config.timeout,
+            )
+            if self.config.use_tls:
+                server.starttls()
+        server.login(self.config.smtp_user, self.config.smtp_password)
+        return server
+
+    def _reset_server(self) -> None:
+        """关闭并丢弃当前连接"""
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+        self._server = None
+
     def _send_via_server(
         self, server: smtplib.SMTP, msg: MIMEMultipart, to_addresses: List[str]
     ) -> None:
         """通过SMTP服务器发送邮件
 
         Args:
-            server: SMTP服务器对象
+            server: 已登录的SMTP服务器对象
             msg: 邮件消息
             to_addresses: 收件人地址列表
         """
-        server.login(self.config.smtp_user, self.config.smtp_password)
         server.send_message(msg)
 
     def _generate_alert_body(
@@ -1,22 +1,36 @@
 """
 通知管理器模块
 管理和协调各种通知渠道
+
+通知先进入线程安全的优先级队列，分发协程按渠道转入各渠道队列，由每个渠道
+独立的工作协程发送；失败重试和安静时间内的通知放在延迟队列中等待到期，
+某个渠道变慢或重试不会阻塞其他通知。
 """
 
 import asyncio
+import heapq
+import itertools
 import json
+import time
+from bisect import bisect_left
 from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
-from queue import PriorityQueue
+from queue import Empty, PriorityQueue
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from common.exceptions import ModelError
 from common.logging_system import setup_logger
 
+from .email_notifier import EmailMessage, EmailNotifier
+from .webhook_notifier import WebhookMessage, WebhookNotifier
+
 logger = setup_logger("notification_manager")
 
+# 送达延迟直方图的桶上界（秒）
+DELIVERY_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900)
+
 
 class NotificationChannel(Enum):
     """通知渠道枚举"""
@@ -63,9 +77,12 @@ class NotificationConfig:
         default_factory=dict
     )  # 每分钟最大数量
     retry_attempts: int = 3
-    retry_delay: int = 60  # 秒
+    retry_delay: int = 60  # 秒，首次重试的延迟
+    retry_backoff: float = 2.0  # 每次重试的延迟倍数
+    max_retry_delay: int = 3600  # 秒
     queue_size: int = 1000
-    batch_size: int = 10
+    workers_per_channel: int = 4
+    batch_size: int = 10  # 渠道支持批量发送时每批的最大数量
     batch_interval: int = 30  # 秒
     enable_aggregation: bool = True
     aggregation_window: int = 300  # 秒
@@ -124,6 +141,64 @@ class NotificationStats:
     success_rate: float
 
 
+class DeliveryLatencyHistogram:
+    """送达延迟直方图"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DELIVERY_LATENCY_BUCKETS):
+        """初始化直方图
+
+        Args:
+            buckets: 桶上界（秒），升序
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """记录一次送达延迟
+
+        Args:
+            seconds: 延迟（秒）
+        """
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        """估算分位数（返回所在桶的上界）
+
+        Args:
+            q: 分位点，0-1
+
+        Returns:
+            延迟（秒）
+        """
+        if self.count == 0:
+            return 0.0
+        target = q * self.count
+        cumulative = 0
+        for upper, count in zip(self.buckets, self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return min(upper, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        labels = [f"<={upper}" for upper in self.buckets] + [f">{self.buckets[-1]}"]
+        return {
+            "count": self.count,
+            "avg": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
 class NotificationManager:
     """通知管理器类"""
 
@@ -141,11 +216,25 @@ class NotificationManager:
         self.sent_notifications: List[Notification] = []
         self.templates: Dict[str, NotificationTemplate] = {}
         self.channel_handlers: Dict[NotificationChannel, Callable] = {}
+        self.batch_handlers: Dict[NotificationChannel, Callable] = {}
+        self.latency_histograms: Dict[
+            NotificationChannel, DeliveryLatencyHistogram
+        ] = defaultdict(DeliveryLatencyHistogram)
         self.rate_limiters: Dict[NotificationChannel, List[datetime]] = defaultdict(
             list
         )
         self.aggregation_buffer: Dict[str, List[Notification]] = defaultdict(list)
         self.processing_active = False
+        self._seq = itertools.count()
+        # 延迟队列：(到期时间, 序号, 通知)，用于失败重试和安静时间后发送
+        self._delayed: List[Tuple[float, int, Notification]] = []
+        # 通知进入队列（或计划发送）的时间，用于统计送达延迟
+        self._enqueued_at: Dict[str, float] = {}
+        self._channel_queues: Dict[NotificationChannel, asyncio.PriorityQueue] = {}
+        self._workers: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopped: Optional[asyncio.Event] = None
         self._initialize_handlers()
         self._load_templates()
 
@@ -302,19 +391,26 @@ class NotificationManager:
     async def start_processing(self) -> None:
         """启动通知处理"""
         logger.info("Starting notification processing")
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._stopped = asyncio.Event()
         self.processing_active = True
 
         # 启动多个协程
-        await asyncio.gather(
-            self._process_queue(),
-            self._process_aggregation_buffer(),
-            self._retry_failed_notifications(),
-        )
+        try:
+            await asyncio.gather(
+                self._process_queue(),
+                self._process_aggregation_buffer(),
+            )
+        finally:
+            await self._stop_workers()
 
     def stop_processing(self) -> None:
         """停止通知处理"""
         logger.info("Stopping notification processing")
         self.processing_active = False
+        self._notify_loop(self._stopped)
+        self._notify_loop(self._wakeup)
 
     def get_notification_status(self, notification_id: str) -> Optional[Dict[str, Any]]:
         """获取通知状态
@@ -431,17 +527,113 @@ class NotificationManager:
         logger.info(f"Added notification template: {template.name}")
 
     def register_channel_handler(
-        self, channel: NotificationChannel, handler: Callable
+        self,
+        channel: NotificationChannel,
+        handler: Callable,
+        batch_handler: Optional[Callable] = None,
     ) -> None:
         """注册渠道处理器
 
+        同步处理器在线程池中执行，不阻塞事件循环
+
         Args:
             channel: 通知渠道
-            handler: 处理函数
+            handler: 处理函数，接收单个通知，返回是否成功
+            batch_handler: 批量处理函数，接收通知列表，返回整体或逐条的成功标志
         """
         self.channel_handlers[channel] = handler
+        if batch_handler is not None:
+            self.batch_handlers[channel] = batch_handler
+        else:
+            self.batch_handlers.pop(channel, None)
         logger.info(f"Registered handler for channel: {channel.value}")
 
+    def register_email_notifier(
+        self,
+        notifier: EmailNotifier,
+        channel: NotificationChannel = NotificationChannel.EMAIL,
+    ) -> None:
+        """使用邮件通知器发送该渠道的通知，同一批邮件复用一个SMTP连接
+
+        Args:
+            notifier: 邮件通知器
+            channel: 通知渠道
+        """
+
+        def to_email(notification: Notification) -> EmailMessage:
+            return EmailMessage(
+                to_addresses=[notification.recipient],
+                subject=notification.subject,
+                body=notification.message,
+            )
+
+        async def send(notification: Notification) -> bool:
+            return await notifier.send_email_async(to_email(notification))
+
+        async def send_batch(notifications: List[Notification]) -> List[bool]:
+            messages = [to_email(n) for n in notifications]
+            return await notifier.send_emails_async(messages)
+
+        self.register_channel_handler(channel, send, batch_handler=send_batch)
+
+    def register_webhook_notifier(
+        self,
+        notifier: WebhookNotifier,
+        channel: NotificationChannel = NotificationChannel.WEBHOOK,
+    ) -> None:
+        """使用Webhook通知器发送该渠道的通知
+
+        接收端支持批量payload（supports_batch）时，同一批通知合并为一次请求。
+        通知器每次只发送一次，失败的通知由延迟重试队列按retry_attempts重试
+
+        Args:
+            notifier: Webhook通知器
+            channel: 通知渠道
+        """
+
+        def to_message(notification: Notification) -> WebhookMessage:
+            return WebhookMessage(
+                event_type=notification.type.value,
+                payload={
+                    "notification_id": notification.notification_id,
+                    "priority": notification.priority.name,
+                    "recipient": notification.recipient,
+                    "subject": notification.subject,
+                    "message": notification.message,
+                    "data": notification.data or {},
+                },
+                timestamp=notification.timestamp,
+            )
+
+        async def send(notification: Notification) -> bool:
+            return await notifier.send_webhook_async(
+                to_message(notification), retry_count=1
+            )
+
+        async def send_batch(notifications: List[Notification]) -> bool:
+            return await notifier.send_batch_webhook_async(
+                [to_message(n) for n in notifications], retry_count=1
+            )
+
+        self.register_channel_handler(
+            channel,
+            send,
+            batch_handler=send_batch if notifier.config.supports_batch else None,
+        )
+
+    def get_delivery_latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """获取各渠道的送达延迟直方图
+
+        延迟从通知进入队列（计划发送的通知从计划时间）算起，包含重试等待
+
+        Returns:
+            {渠道: {count, avg, max, p50, p95, buckets}}，单位为秒
+        """
+        return {
+            channel.value: histogram.to_dict()
+            for channel, histogram in self.latency_histograms.items()
+        }
+
     def _initialize_handlers(self) -> None:
         """初始化处理器"""
         # 默认处理器（应该被实际的处理器替换）
@@ -504,11 +696,14 @@ class NotificationManager:
             ],
         )
 
-    def _queue_notification(self, notification: Notification) -> None:
+    def _queue_notification(
+        self, notification: Notification, not_before: Optional[float] = None
+    ) -> None:
         """将通知加入队列
 
         Args:
             notification: 通知对象
+            not_before: 最早发送时间（时间戳），默认立即发送
         """
         # 检查速率限制
         if not self._check_rate_limit(notification.channel):
@@ -519,8 +714,29 @@ class NotificationManager:
 
         # 加入优先级队列
         priority = -notification.priority.value  # 负数使高优先级先处理
-        self.notification_queue.put((priority, notification.timestamp, notification))
+        not_before = not_before or 0.0
+        self.notification_queue.put(
+            (priority, next(self._seq), not_before, notification)
+        )
         self.pending_notifications[notification.notification_id] = notification
+        self._enqueued_at.setdefault(
+            notification.notification_id, max(time.time(), not_before)
+        )
+        self._notify_loop(self._wakeup)
+
+    def _notify_loop(self, event: Optional[asyncio.Event]) -> None:
+        """从任意线程唤醒事件循环中等待的协程
+
+        Args:
+            event: 要设置的事件
+        """
+        if self._loop is None or event is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            # 事件循环已关闭
+            pass
 
     def _add_to_aggregation_buffer(self, notification: Notification) -> None:
         """添加到聚合缓冲区
@@ -532,37 +748,149 @@ class NotificationManager:
         self.aggregation_buffer[key].append(notification)
 
     async def _process_queue(self) -> None:
-        """处理通知队列"""
+        """分发通知队列
+
+        就绪的通知转入所属渠道的队列；未到期的通知进入延迟队列，
+        在最近的到期时间或有新通知时被唤醒
+        """
         while self.processing_active:
             try:
-                if not self.notification_queue.empty():
-                    _, _, notification = self.notification_queue.get_nowait()
+                self._wakeup.clear()
+                now = time.time()
+
+                # 取出新加入的通知
+                while True:
+                    try:
+                        _, seq, not_before, notification = (
+                            self.notification_queue.get_nowait()
+                        )
+                    except Empty:
+                        break
+                    if not_before > now:
+                        heapq.heappush(self._delayed, (not_before, seq, notification))
+                    else:
+                        self._dispatch(notification)
 
-                    # 发送通知
-                    success = await self._send_notification(notification)
+                # 到期的重试和计划发送
+                while self._delayed and self._delayed[0][0] <= now:
+                    _, _, notification = heapq.heappop(self._delayed)
+                    self._dispatch(notification)
 
-                    if success:
-                        notification.delivered = True
-                        notification.sent_at = datetime.now()
-                        self.sent_notifications.append(notification)
-                        del self.pending_notifications[notification.notification_id]
-                    else:
-                        # 重试逻辑
-                        notification.retry_count += 1
-                        if notification.retry_count < self.config.retry_attempts:
-                            await asyncio.sleep(self.config.retry_delay)
-                            self._queue_notification(notification)
-                        else:
-                            notification.delivered = False
-                            self.sent_notifications.append(notification)
-                            del self.pending_notifications[notification.notification_id]
-
-                await asyncio.sleep(0.1)
+                timeout = self._delayed[0][0] - now if self._delayed else None
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
 
             except Exception as e:
                 logger.error(f"Error processing notification queue: {e}")
                 await asyncio.sleep(1)
 
+    def _dispatch(self, notification: Notification) -> None:
+        """将通知放入所属渠道的队列，首次使用渠道时启动其工作协程
+
+        Args:
+            notification: 通知对象
+        """
+        channel = notification.channel
+        queue = self._channel_queues.get(channel)
+        if queue is None:
+            queue = self._channel_queues[channel] = asyncio.PriorityQueue()
+            for _ in range(self.config.workers_per_channel):
+                self._workers.append(
+                    asyncio.create_task(self._run_channel_worker(channel, queue))
+                )
+        queue.put_nowait((-notification.priority.value, next(self._seq), notification))
+
+    async def _run_channel_worker(
+        self, channel: NotificationChannel, queue: asyncio.PriorityQueue
+    ) -> None:
+        """渠道工作协程：发送通知，渠道支持批量时一次取出多条
+
+        Args:
+            channel: 通知渠道
+            queue: 渠道队列
+        """
+        while True:
+            batch = [(await queue.get())[-1]]
+            if channel in self.batch_handlers:
+                while len(batch) < self.config.batch_size and not queue.empty():
+                    batch.append(queue.get_nowait()[-1])
+
+            try:
+                if len(batch) > 1:
+                    results = await self._send_batch(channel, batch)
+                else:
+                    results = [await self._send_notification(batch[0])]
+            except asyncio.CancelledError:
+                # 停止处理时未完成的通知放回队列，重新启动后发送
+                for notification in batch:
+                    self._requeue(notification)
+                raise
+
+            for notification, success in zip(batch, results):
+                self._complete(notification, success)
+
+    def _complete(self, notification: Notification, success: bool) -> None:
+        """记录发送结果，失败时按指数退避放入延迟队列
+
+        Args:
+            notification: 通知对象
+            success: 是否发送成功
+        """
+        notification_id = notification.notification_id
+        if success:
+            notification.delivered = True
+            notification.sent_at = datetime.now()
+            started = self._enqueued_at.pop(notification_id, None)
+            if started is not None:
+                self.latency_histograms[notification.channel].observe(
+                    max(time.time() - started, 0.0)
+                )
+            self.sent_notifications.append(notification)
+            self.pending_notifications.pop(notification_id, None)
+            return
+
+        # 重试逻辑
+        notification.retry_count += 1
+        if notification.retry_count < self.config.retry_attempts:
+            delay = min(
+                self.config.retry_delay
+                * self.config.retry_backoff ** (notification.retry_count - 1),
+                self.config.max_retry_delay,
+            )
+            heapq.heappush(
+                self._delayed, (time.time() + delay, next(self._seq), notification)
+            )
+            self._wakeup.set()
+        else:
+            notification.delivered = False
+            self._enqueued_at.pop(notification_id, None)
+            self.sent_notifications.append(notification)
+            self.pending_notifications.pop(notification_id, None)
+
+    def _requeue(self, notification: Notification) -> None:
+        """将未发送的通知放回入口队列
+
+        Args:
+            notification: 通知对象
+        """
+        self.notification_queue.put(
+            (-notification.priority.value, next(self._seq), 0.0, notification)
+        )
+
+    async def _stop_workers(self) -> None:
+        """停止渠道工作协程，未发送的通知放回入口队列"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        for queue in self._channel_queues.values():
+            while not queue.empty():
+                self._requeue(queue.get_nowait()[-1])
+        self._channel_queues = {}
+
     async def _process_aggregation_buffer(self) -> None:
         """处理聚合缓冲区"""
         while self.processing_active:
@@ -585,48 +913,17 @@ class NotificationManager:
                         # 清空缓冲区
                         self.aggregation_buffer[key] = []
 
-                await asyncio.sleep(self.config.batch_interval)
+                try:
+                    await asyncio.wait_for(
+                        self._stopped.wait(), self.config.batch_interval
+                    )
+                except asyncio.TimeoutError:
+                    pass
 
             except Exception as e:
                 logger.error(f"Error processing aggregation buffer: {e}")
                 await asyncio.sleep(5)
 
-    async def _retry_failed_notifications(self) -> None:
-        """重试失败的通知"""
-        while self.processing_active:
-            try:
-                # 查找需要重试的通知
-                for notification_id, notification in list(
-                    self.pending_notifications.items()
-                ):
-                    if (
-                        notification.retry_count > 0
-                        and notification.retry_count < self.config.retry_attempts
-                    ):
-                        time_since_last_try = (
-                            datetime.now() - notification.timestamp
-                        ).total_seconds()
-
-                        if (
-                            time_since_last_try
-                            >= self.config.retry_delay * notification.retry_count
-                        ):
-                            success = await self._send_notification(notification)
-
-                            if success:
-                                notification.delivered = True
-                                notification.sent_at = datetime.now()
-                                self.sent_notifications.append(notification)
-                                del self.pending_notifications[notification_id]
-                            else:
-                                notification.retry_count += 1
-
-                await asyncio.sleep(30)  # 检查间隔
-
-            except Exception as e:
-                logger.error(f"Error in retry logic: {e}")
-                await asyncio.sleep(60)
-
     async def _send_notification(self, notification: Notification) -> bool:
         """发送单个通知
 
@@ -650,7 +947,7 @@ class NotificationManager:
             if asyncio.iscoroutinefunction(handler):
                 success = await handler(notification)
             else:
-                success = handler(notification)
+                success = await asyncio.to_thread(handler, notification)
 
             # 更新速率限制
             if success:
@@ -663,6 +960,43 @@ class NotificationManager:
             notification.error_message = str(e)
             return False
 
+    async def _send_batch(
+        self, channel: NotificationChannel, notifications: List[Notification]
+    ) -> List[bool]:
+        """批量发送同一渠道的通知
+
+        Args:
+            channel: 通知渠道
+            notifications: 通知列表
+
+        Returns:
+            每条通知是否成功
+        """
+        handler = self.batch_handlers[channel]
+        try:
+            if asyncio.iscoroutinefunction(handler):
+                result = await handler(notifications)
+            else:
+                result = await asyncio.to_thread(handler, notifications)
+        except Exception as e:
+            logger.error(f"Error sending notification batch: {e}")
+            for notification in notifications:
+                notification.error_message = str(e)
+            return [False] * len(notifications)
+
+        if isinstance(result, (list, tuple)):
+            results = [bool(success) for success in result]
+            results += [False] * (len(notifications) - len(results))
+        else:
+            results = [bool(result)] * len(notifications)
+
+        # 更新速率限制
+        for success in results:
+            if success:
+                self._update_rate_limit(channel)
+
+        return results
+
     def _create_aggregated_notification(
         self, notifications: List[Notification]
     ) -> Notification:
@@ -807,7 +1141,7 @@ class NotificationManager:
             metadata={"scheduled": True, "original_time": now},
         )
 
-        self._queue_notification(notification)
+        self._queue_notification(notification, not_before=scheduled_time.timestamp())
 
         return notification.notification_id
 
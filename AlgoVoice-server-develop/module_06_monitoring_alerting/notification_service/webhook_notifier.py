@@ -1,20 +1,36 @@
 ﻿"""
 Webhook通知器模块
 通过HTTP Webhook发送通知
+
+同步发送复用requests.Session的连接池；send_webhook_async使用aiohttp连接池，
+重试按指数退避异步等待，不阻塞事件循环。
 """
 
+import asyncio
 import json
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from common.logging_system import setup_logger
 
+try:
+    import aiohttp
+
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
 logger = setup_logger("webhook_notifier")
 
+# 视为发送成功的HTTP状态码
+SUCCESS_STATUS_CODES = (200, 201, 202, 204)
+
 
 class WebhookMethod(Enum):
     """HTTP方法枚举"""
@@ -44,8 +60,11 @@ class WebhookConfig:
     timeout: int = 30
     retry_count: int = 3
     retry_delay: int = 5
+    retry_backoff: float = 2.0  # 每次重试的延迟倍数
     verify_ssl: bool = True
     auth_token: Optional[str] = None
+    pool_size: int = 10  # 连接池大小
+    supports_batch: bool = False  # 接收端是否接受批量payload
 
 
 @dataclass
@@ -68,6 +87,9 @@ class WebhookNotifier:
             config: Webhook配置
         """
         self.config = config
+        self._session: Optional[requests.Session] = None
+        self._async_session = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
         self._validate_config()
         self._prepare_headers()
 
@@ -109,14 +131,83 @@ class WebhookNotifier:
         if message.timestamp is None:
             message.timestamp = datetime.now()
 
-        payload = self._prepare_payload(message)
+        return self._send_payload(self._prepare_payload(message))
+
+    async def send_webhook_async(
+        self, message: WebhookMessage, retry_count: Optional[int] = None
+    ) -> bool:
+        """异步发送Webhook
+
+        Args:
+            message: Webhook消息
+            retry_count: 最多尝试次数，None表示使用config.retry_count；
+                调用方自己负责重试时传1
+
+        Returns:
+            是否发送成功
+        """
+        if message.timestamp is None:
+            message.timestamp = datetime.now()
+
+        return await self._send_payload_async(
+            self._prepare_payload(message), retry_count
+        )
+
+    async def send_batch_webhook_async(
+        self, messages: List[WebhookMessage], retry_count: Optional[int] = None
+    ) -> bool:
+        """一次请求发送多条消息，接收端需要支持批量payload（supports_batch）
+
+        Args:
+            messages: Webhook消息列表
+            retry_count: 最多尝试次数，None表示使用config.retry_count
+
+        Returns:
+            是否发送成功
+        """
+        for message in messages:
+            if message.timestamp is None:
+                message.timestamp = datetime.now()
 
+        payload = {
+            "event": "batch",
+            "timestamp": datetime.now().isoformat(),
+            "events": [self._prepare_payload(message) for message in messages],
+        }
+        return await self._send_payload_async(payload, retry_count)
+
+    async def close(self) -> None:
+        """关闭连接池"""
+        if self._async_session is not None and not self._async_session.closed:
+            await self._async_session.close()
+        self._async_session = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def _retry_delay(self, attempt: int) -> float:
+        """第attempt次失败后的重试等待时间（秒），按指数退避"""
+        return self.config.retry_delay * self.config.retry_backoff**attempt
+
+    def _send_payload(
+        self, payload: Dict[str, Any], retry_count: Optional[int] = None
+    ) -> bool:
+        """同步发送payload，失败时按指数退避重试
+
+        Args:
+            payload: 准备好的payload
+            retry_count: 最多尝试次数，None表示使用config.retry_count
+
+        Returns:
+            是否发送成功
+        """
+        attempts = self.config.retry_count if retry_count is None else retry_count
         # 尝试发送
-        for attempt in range(self.config.retry_count):
+        for attempt in range(attempts):
             try:
                 response = self._send_request(payload)
 
-                if response.status_code in (200, 201, 202, 204):
+                if response.status_code in SUCCESS_STATUS_CODES:
                     logger.info(
                         f"Webhook sent successfully to {self.config.url} "
                         f"(status: {response.status_code})"
@@ -128,35 +219,64 @@ class WebhookNotifier:
                         f"{response.text}"
                     )
 
-                    if attempt < self.config.retry_count - 1:
-                        import time
-
-                        time.sleep(self.config.retry_delay)
-                        continue
-                    else:
-                        return False
-
             except requests.exceptions.Timeout:
                 logger.error(
-                    f"Webhook request timeout (attempt {attempt + 1}/{self.config.retry_count})"
+                    f"Webhook request timeout (attempt {attempt + 1}/{attempts})"
                 )
-                if attempt < self.config.retry_count - 1:
-                    import time
-
-                    time.sleep(self.config.retry_delay)
-                    continue
-                else:
-                    return False
 
             except requests.exceptions.RequestException as e:
                 logger.error(f"Webhook request failed: {e}")
-                if attempt < self.config.retry_count - 1:
-                    import time
 
-                    time.sleep(self.config.retry_delay)
-                    continue
-                else:
-                    return False
+            if attempt < attempts - 1:
+                time.sleep(self._retry_delay(attempt))
+
+        return False
+
+    async def _send_payload_async(
+        self, payload: Dict[str, Any], retry_count: Optional[int] = None
+    ) -> bool:
+        """异步发送payload，失败时按指数退避异步等待后重试
+
+        Args:
+            payload: 准备好的payload
+            retry_count: 最多尝试次数，None表示使用config.retry_count
+
+        Returns:
+            是否发送成功
+        """
+        if not HAS_AIOHTTP:
+            return await asyncio.to_thread(self._send_payload, payload, retry_count)
+
+        attempts = self.config.retry_count if retry_count is None else retry_count
+        session = self._get_async_session()
+        for attempt in range(attempts):
+            try:
+                async with session.request(
+                    self.config.method.value,
+                    self.config.url,
+                    **self._async_request_kwargs(payload),
+                ) as response:
+                    if response.status in SUCCESS_STATUS_CODES:
+                        logger.info(
+                            f"Webhook sent successfully to {self.config.url} "
+                            f"(status: {response.status})"
+                        )
+                        return True
+                    logger.warning(
+                        f"Webhook request failed with status {response.status}: "
+                        f"{await response.text()}"
+                    )
+
+            except asyncio.TimeoutError:
+                logger.error(
+                    f"Webhook request timeout (attempt {attempt + 1}/{attempts})"
+                )
+
+            except aiohttp.ClientError as e:
+                logger.error(f"Webhook request failed: {e}")
+
+            if attempt < attempts - 1:
+                await asyncio.sleep(self._retry_delay(attempt))
 
         return False
 
@@ -310,18 +430,12 @@ class WebhookNotifier:
         Raises:
             requests.exceptions.RequestException: 请求失败
         """
-        # 准备请求数据
-        if self.config.format == WebhookFormat.JSON:
-            data = json.dumps(payload)
-        elif self.config.format == WebhookFormat.FORM:
-            data = payload
-        else:
-            # XML格式需要转换
-            data = self._dict_to_xml(payload)
+        data = self._encode_payload(payload)
+        session = self._get_session()
 
         # 发送请求
         if self.config.method == WebhookMethod.GET:
-            response = requests.get(
+            response = session.get(
                 self.config.url,
                 params=payload,
                 headers=self.config.headers,
@@ -329,7 +443,7 @@ class WebhookNotifier:
                 verify=self.config.verify_ssl,
             )
         elif self.config.method == WebhookMethod.POST:
-            response = requests.post(
+            response = session.post(
                 self.config.url,
                 data=data,
                 headers=self.config.headers,
@@ -337,7 +451,7 @@ class WebhookNotifier:
                 verify=self.config.verify_ssl,
             )
         elif self.config.method == WebhookMethod.PUT:
-            response = requests.put(
+            response = session.put(
                 self.config.url,
                 data=data,
                 headers=self.config.headers,
@@ -345,7 +459,7 @@ class WebhookNotifier:
                 verify=self.config.verify_ssl,
             )
         elif self.config.method == WebhookMethod.PATCH:
-            response = requests.patch(
+            response = session.patch(
                 self.config.url,
                 data=data,
                 headers=self.config.headers,
@@ -357,6 +471,60 @@ class WebhookNotifier:
 
         return response
 
+    def _encode_payload(self, payload: Dict[str, Any]) -> Any:
+        """按配置的格式编码请求数据"""
+        if self.config.format == WebhookFormat.JSON:
+            return json.dumps(payload, default=str)
+        elif self.config.format == WebhookFormat.FORM:
+            return payload
+        else:
+            # XML格式需要转换
+            return self._dict_to_xml(payload)
+
+    def _get_session(self) -> requests.Session:
+        """获取复用连接的requests会话"""
+        if self._session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=1, pool_maxsize=self.config.pool_size
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+        return self._session
+
+    def _get_async_session(self) -> "aiohttp.ClientSession":
+        """获取当前事件循环的aiohttp会话（连接池）"""
+        loop = asyncio.get_running_loop()
+        if (
+            self._async_session is None
+            or self._async_session.closed
+            or self._async_loop is not loop
+        ):
+            self._async_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.config.pool_size)
+            )
+            self._async_loop = loop
+        return self._async_session
+
+    def _async_request_kwargs(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """aiohttp请求参数"""
+        kwargs = {
+            "headers": self.config.headers,
+            "timeout": aiohttp.ClientTimeout(total=self.config.timeout),
+            "ssl": None if self.config.verify_ssl else False,
+        }
+        if self.config.method == WebhookMethod.GET:
+            kwargs["params"] = {
+                key: value
+                if isinstance(value, (str, int, float))
+                else json.dumps(value, default=str)
+                for key, value in payload.items()
+            }
+        else:
+            kwargs["data"] = self._encode_payload(payload)
+        return kwargs
+
     def _dict_to_xml(self, data: Dict[str, Any], root: str = "webhook") -> str:
         """将字典转换为XML
 
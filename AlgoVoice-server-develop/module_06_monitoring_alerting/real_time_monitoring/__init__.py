@@ -24,6 +24,7 @@ from .portfolio_monitor import (
     PortfolioMonitor,
     PositionMetrics,
 )
+from .tick_store import RollingMoments, TickRingBuffer
 
 __all__ = [
     # Performance Monitor
@@ -39,6 +40,8 @@ __all__ = [
     "MarketAnomaly",
     "MarketRegime",
     "MarketCondition",
+    "TickRingBuffer",
+    "RollingMoments",
     # Portfolio Monitor
     "PortfolioMonitor",
     "PortfolioMetrics",
@@ -15,10 +15,16 @@ import pandas as pd
 from scipy import stats
 
 from common.constants import TRADING_DAYS_PER_YEAR
+from common.covariance_estimator import (
+    CovarianceSnapshot,
+    IncrementalCovarianceEstimator,
+)
 from common.data_structures import MarketData
 from common.exceptions import ModelError
 from common.logging_system import setup_logger
 
+from .tick_store import RollingMoments, TickRingBuffer
+
 logger = setup_logger("market_monitor")
 
 
@@ -101,6 +107,8 @@ class MarketMonitor:
 
     LIQUIDITY_THRESHOLDS = {"poor": 0.3, "fair": 0.5, "good": 0.7, "excellent": 0.9}
 
+    VOLUME_SURGE_WINDOW = 20  # 成交量激增检测的均量窗口
+
     def __init__(
         self,
         symbols: List[str],
@@ -121,19 +129,64 @@ class MarketMonitor:
         self.metrics_history: deque = deque(maxlen=lookback_period)
         self.anomaly_history: List[MarketAnomaly] = []
         self.event_history: List[MarketEvent] = []
-        self.price_data: pd.DataFrame = pd.DataFrame()
-        self.volume_data: pd.DataFrame = pd.DataFrame()
+        # 价格、成交量窗口保存在预分配的环形缓冲区中，price_data/volume_data为其视图
+        self._price_buffer = TickRingBuffer(lookback_period)
+        self._volume_buffer = TickRingBuffer(lookback_period)
+        # 检测器所需的滚动统计随每行数据增量更新
+        self._return_moments = RollingMoments(complete_rows=True)
+        self._volume_moments = RollingMoments()
+        self._last_returns = np.array([])
+        self._rows_since_rebuild = 0
+        # 价格窗口内收益率的滚动协方差，随新数据增量更新
+        self.return_covariance = IncrementalCovarianceEstimator(
+            window=max(lookback_period - 1, 1), track_shrinkage=False
+        )
+        self._covariance_synced_to: Optional[Any] = None  # 已同步到的最后一个时间戳
         self.monitoring_active = False
         self.anomaly_detectors: Dict[str, callable] = {}
         self._initialize_detectors()
 
+    @property
+    def price_data(self) -> pd.DataFrame:
+        """价格窗口，环形缓冲区的零拷贝视图，下次更新后内容可能变化"""
+        return self._price_buffer.to_frame()
+
+    @price_data.setter
+    def price_data(self, frame: pd.DataFrame) -> None:
+        self._price_buffer.load_frame(frame)
+        self._rebuild_tick_statistics()
+
+    @property
+    def volume_data(self) -> pd.DataFrame:
+        """成交量窗口，环形缓冲区的零拷贝视图，下次更新后内容可能变化"""
+        return self._volume_buffer.to_frame()
+
+    @volume_data.setter
+    def volume_data(self, frame: pd.DataFrame) -> None:
+        self._volume_buffer.load_frame(frame)
+        self._rebuild_tick_statistics()
+
     def update_market_data(self, market_data: List[MarketData]) -> None:
         """更新市场数据
 
         Args:
             market_data: 市场数据列表
         """
-        # 转换为DataFrame
+        n_new_rows = self._store_market_data(market_data)
+        self._sync_return_covariance(n_new_rows)
+
+        # 计算市场指标
+        self._calculate_market_metrics()
+
+    def _store_market_data(self, market_data: List[MarketData]) -> int:
+        """把一批行情逐行写入环形缓冲区，并增量更新检测器统计
+
+        Args:
+            market_data: 市场数据列表
+
+        Returns:
+            新增的行数
+        """
         data_dict = defaultdict(dict)
         volume_dict = defaultdict(dict)
 
@@ -141,20 +194,93 @@ class MarketMonitor:
             data_dict[data.symbol][data.timestamp] = data.close
             volume_dict[data.symbol][data.timestamp] = data.volume
 
-        # 更新价格数据
-        new_prices = pd.DataFrame(data_dict)
-        self.price_data = pd.concat([self.price_data, new_prices]).tail(
-            self.lookback_period
-        )
+        # 行按时间戳首次出现的顺序排列，与由字典构造DataFrame一致
+        timestamps, price_rows = self._align_rows(self._price_buffer, data_dict)
+        _, volume_rows = self._align_rows(self._volume_buffer, volume_dict)
+
+        volume_window = min(self.VOLUME_SURGE_WINDOW, self.lookback_period)
+        for timestamp, price_row, volume_row in zip(
+            timestamps, price_rows, volume_rows
+        ):
+            # 缓冲区已满时最旧的收益率随最旧价格一起移出窗口
+            prices = self._price_buffer
+            if len(prices) == prices.capacity and len(prices) > 1:
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    self._return_moments.remove(prices.row(1) / prices.row(0) - 1)
+            prices.append(timestamp, price_row)
+            if len(prices) > 1:
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    self._last_returns = prices.row(-1) / prices.row(-2) - 1
+                self._return_moments.add(self._last_returns)
+            else:
+                self._last_returns = np.full(prices.n_columns, np.nan)
+
+            volumes = self._volume_buffer
+            if len(volumes) >= volume_window:
+                self._volume_moments.remove(volumes.row(-volume_window))
+            volumes.append(timestamp, volume_row)
+            self._volume_moments.add(volume_row)
 
-        # 更新成交量数据
-        new_volumes = pd.DataFrame(volume_dict)
-        self.volume_data = pd.concat([self.volume_data, new_volumes]).tail(
-            self.lookback_period
+            # 定期从缓冲区重算，避免加减累积的浮点误差
+            self._rows_since_rebuild += 1
+            if self._rows_since_rebuild >= self.lookback_period:
+                self._rebuild_tick_statistics()
+
+        return len(timestamps)
+
+    def _align_rows(
+        self, buffer: TickRingBuffer, values: Dict[str, Dict[Any, float]]
+    ) -> Tuple[List[Any], np.ndarray]:
+        """把{标的: {时间戳: 值}}整理成按缓冲区列顺序排列的行，必要时为新标的加列
+
+        Args:
+            buffer: 目标缓冲区
+            values: 按标的分组的数据
+
+        Returns:
+            (时间戳列表, 形状为(行数, 列数)的数组)
+        """
+        timestamps = list(
+            dict.fromkeys(
+                timestamp for series in values.values() for timestamp in series
+            )
         )
+        added = buffer.add_columns(list(values))
+        if added:
+            if buffer is self._price_buffer:
+                # 旧行在新列上为NaN，窗口内已没有完整的收益率行
+                self._return_moments.reset(buffer.n_columns)
+                self._last_returns = np.concatenate(
+                    [self._last_returns, np.full(len(added), np.nan)]
+                )
+            else:
+                self._volume_moments.add_columns(len(added))
+
+        positions = {timestamp: i for i, timestamp in enumerate(timestamps)}
+        rows = np.full((len(timestamps), buffer.n_columns), np.nan)
+        for symbol, series in values.items():
+            column = buffer.column_index[symbol]
+            for timestamp, value in series.items():
+                rows[positions[timestamp], column] = value
+        return timestamps, rows
+
+    def _rebuild_tick_statistics(self) -> None:
+        """用缓冲区内的全部窗口重算检测器统计"""
+        prices = self._price_buffer.window()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns = prices[1:] / prices[:-1] - 1
+        self._return_moments.reset(self._price_buffer.n_columns)
+        self._return_moments.add_many(returns)
+        if len(returns) > 0:
+            self._last_returns = returns[-1].copy()
+        else:
+            self._last_returns = np.full(self._price_buffer.n_columns, np.nan)
 
-        # 计算市场指标
-        self._calculate_market_metrics()
+        self._volume_moments.reset(self._volume_buffer.n_columns)
+        self._volume_moments.add_many(
+            self._volume_buffer.window(self.VOLUME_SURGE_WINDOW)
+        )
+        self._rows_since_rebuild = 0
 
     def calculate_market_regime(self) -> MarketRegime:
         """计算市场状态
@@ -292,26 +418,63 @@ class MarketMonitor:
         if self.price_data.empty or len(self.price_data) < 20:
             return np.array([[]])
 
-        returns = self.price_data.pct_change().dropna()
-
-        if len(returns) > 0:
-            return returns.corr().values
+        self._sync_return_covariance()
+        if self.return_covariance.n_observations > 0:
+            return self.return_covariance.correlation()
         else:
             return np.array([[]])
 
+    def get_covariance_snapshot(self) -> CovarianceSnapshot:
+        """获取价格窗口内收益率协方差的只读快照，供风险、优化模块共享
+
+        Returns:
+            协方差快照（未年化）
+        """
+        self._sync_return_covariance()
+        return self.return_covariance.snapshot()
+
+    def _sync_return_covariance(self, n_new_rows: Optional[int] = None) -> None:
+        """把新增价格行对应的收益率加入增量协方差估计器
+
+        标的集合变化，或price_data被直接替换而无法确认新增行时，用窗口内全部收益率重建。
+
+        Args:
+            n_new_rows: 本次新增的价格行数，None表示只检查是否同步
+        """
+        if self.price_data.empty:
+            return
+        last_index = self.price_data.index[-1]
+        synced_to = self._covariance_synced_to
+        incremental = False
+        if synced_to is not None and (
+            list(self.price_data.columns) == self.return_covariance.columns
+        ):
+            if n_new_rows is None:
+                if last_index == synced_to:
+                    return
+            elif n_new_rows < len(self.price_data):
+                # 新增行之前的一行应是上次同步到的位置
+                incremental = self.price_data.index[-(n_new_rows + 1)] == synced_to
+
+        if not incremental:
+            self.return_covariance.reset(list(self.price_data.columns))
+            n_new_rows = len(self.price_data)
+        recent = self.price_data.iloc[-(n_new_rows + 1) :]
+        self.return_covariance.update_many(recent.pct_change().iloc[1:])
+        self._covariance_synced_to = last_index
+
     def calculate_market_breadth(self) -> float:
         """计算市场广度
 
         Returns:
             市场广度（0-1）
         """
-        if self.price_data.empty or len(self.price_data) < 2:
+        if len(self._price_buffer) < 2:
             return 0.5
 
         # 计算上涨股票比例
-        recent_returns = self.price_data.pct_change().iloc[-1]
-        advancing = (recent_returns > 0).sum()
-        declining = (recent_returns < 0).sum()
+        advancing = (self._last_returns > 0).sum()
+        declining = (self._last_returns < 0).sum()
         total = advancing + declining
 
         if total > 0:
@@ -332,12 +495,13 @@ class MarketMonitor:
         sectors = ["Technology", "Finance", "Healthcare", "Energy", "Consumer"]
         sector_performance = {}
 
-        if not self.price_data.empty and len(self.price_data) > 1:
-            returns = self.price_data.pct_change().iloc[-1]
+        if len(self._price_buffer) > 1:
+            returns = pd.Series(self._last_returns, index=self._price_buffer.columns)
 
+            returns = returns.dropna()
             for sector in sectors:
                 # 简化：取部分股票作为板块代表
-                sector_returns = returns.dropna().sample(min(5, len(returns)))
+                sector_returns = returns.sample(min(5, len(returns)))
                 sector_performance[sector] = sector_returns.mean()
         else:
             sector_performance = {sector: 0.0 for sector in sectors}
@@ -489,12 +653,12 @@ class MarketMonitor:
         Returns:
             年化波动率
         """
-        if self.price_data.empty or len(self.price_data) < 2:
+        if len(self._price_buffer) < 2:
             return 0.0
 
-        returns = self.price_data.pct_change().dropna()
-        if len(returns) > 0:
-            volatility = returns.std().mean() * np.sqrt(252)
+        # 窗口内完整收益率行的滚动矩，等价于pct_change().dropna().std()
+        if self._return_moments.count.size and self._return_moments.count[0] > 0:
+            volatility = float(np.mean(self._return_moments.std()) * np.sqrt(252))
         else:
             volatility = 0.0
 
@@ -634,15 +798,12 @@ class MarketMonitor:
         """
         anomalies = []
 
-        if self.price_data.empty or len(self.price_data) < 2:
+        if len(self._price_buffer) < 2:
             return anomalies
 
-        # 计算价格变化
-        price_changes = self.price_data.pct_change().iloc[-1]
-
-        for symbol in price_changes.index:
-            change = price_changes[symbol]
-
+        # 最新一行的价格变化在写入缓冲区时已算好
+        changes = self._last_returns.tolist()
+        for symbol, change in zip(self._price_buffer.columns, changes):
             if abs(change) > 0.05:  # 5%阈值
                 anomaly = MarketAnomaly(
                     anomaly_id=f"price_spike_{symbol}_{datetime.now().timestamp()}",
@@ -667,16 +828,18 @@ class MarketMonitor:
         """
         anomalies = []
 
-        if self.volume_data.empty or len(self.volume_data) < 20:
+        if len(self._volume_buffer) < self.VOLUME_SURGE_WINDOW:
             return anomalies
 
-        # 计算成交量比率
-        current_volume = self.volume_data.iloc[-1]
-        avg_volume = self.volume_data.tail(20).mean()
+        # 计算成交量比率，均量由滚动窗口增量维护
+        current_volume = self._volume_buffer.row(-1)
+        avg_volume = self._volume_moments.mean()
 
-        for symbol in current_volume.index:
-            if avg_volume[symbol] > 0:
-                ratio = current_volume[symbol] / avg_volume[symbol]
+        for symbol, current, average in zip(
+            self._volume_buffer.columns, current_volume, avg_volume
+        ):
+            if average > 0:
+                ratio = float(current / average)
 
                 if ratio > 3:  # 3倍阈值
                     anomaly = MarketAnomaly(
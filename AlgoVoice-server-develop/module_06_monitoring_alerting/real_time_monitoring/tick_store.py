@@ -0,0 +1,297 @@
+"""
+行情环形缓冲区模块
+为实时监控提供预分配的(时间 × 标的)数值窗口，追加为O(1)，窗口读取为零拷贝视图
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+class TickRingBuffer:
+    """预分配的行情环形缓冲区
+
+    每行同时写入槽位和其镜像槽位（槽位 + capacity），因此任意最近n行在底层数组中
+    总是连续的，窗口读取直接返回切片视图而不需要拼接。新标的按首次出现顺序追加列，
+    列容量按倍数扩展。
+    """
+
+    def __init__(self, capacity: int, columns: Optional[Sequence[str]] = None):
+        """初始化环形缓冲区
+
+        Args:
+            capacity: 保留的最大行数
+            columns: 初始列（标的）列表
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.columns: List[str] = []
+        self.column_index: Dict[str, int] = {}
+        self._data = np.full((2 * capacity, max(len(columns or []), 1)), np.nan)
+        self._index = np.empty(2 * capacity, dtype=object)
+        self._size = 0
+        self._next_slot = 0
+        self._end = capacity  # 最近一行的下一个位置（位于镜像区）
+        self._frame: Optional[pd.DataFrame] = None
+        self.version = 0
+        if columns:
+            self.add_columns(columns)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def n_columns(self) -> int:
+        """当前列数"""
+        return len(self.columns)
+
+    def add_columns(self, columns: Sequence[str]) -> List[str]:
+        """追加新列，已有列忽略，新列在已有行上为NaN
+
+        Args:
+            columns: 列名列表
+
+        Returns:
+            实际新增的列名列表
+        """
+        added = []
+        for column in columns:
+            if column not in self.column_index:
+                self.column_index[column] = len(self.columns)
+                self.columns.append(column)
+                added.append(column)
+        if len(self.columns) > self._data.shape[1]:
+            width = max(2 * self._data.shape[1], len(self.columns))
+            data = np.full((2 * self.capacity, width), np.nan)
+            data[:, : self._data.shape[1]] = self._data
+            self._data = data
+        if added:
+            self._touch()
+        return added
+
+    def append(self, index_value: Any, row: np.ndarray) -> None:
+        """追加一行，缓冲区已满时覆盖最旧的一行
+
+        Args:
+            index_value: 行索引（时间戳）
+            row: 按columns顺序排列的数值，长度为n_columns
+        """
+        slot = self._next_slot
+        n = len(self.columns)
+        self._data[slot, :n] = row
+        self._data[slot + self.capacity, :n] = row
+        self._index[slot] = index_value
+        self._index[slot + self.capacity] = index_value
+        self._next_slot = (slot + 1) % self.capacity
+        self._end = slot + 1 + self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        self._touch()
+
+    def window(self, n: Optional[int] = None) -> np.ndarray:
+        """最近n行的只读视图
+
+        Args:
+            n: 行数，None表示全部
+
+        Returns:
+            形状为(n, n_columns)的数组视图，下次写入后内容可能变化
+        """
+        n = self._size if n is None else min(n, self._size)
+        view = self._data[self._end - n : self._end, : len(self.columns)]
+        view.flags.writeable = False
+        return view
+
+    def index(self, n: Optional[int] = None) -> np.ndarray:
+        """最近n行的索引视图
+
+        Args:
+            n: 行数，None表示全部
+
+        Returns:
+            索引数组视图
+        """
+        n = self._size if n is None else min(n, self._size)
+        return self._index[self._end - n : self._end]
+
+    def row(self, position: int) -> np.ndarray:
+        """按位置取一行，支持负数位置
+
+        Args:
+            position: 行位置，0为最旧一行，-1为最新一行
+
+        Returns:
+            行数据视图
+        """
+        if position < 0:
+            position += self._size
+        if not 0 <= position < self._size:
+            raise IndexError("row position out of range")
+        return self._data[self._end - self._size + position, : len(self.columns)]
+
+    def to_frame(self) -> pd.DataFrame:
+        """以DataFrame形式返回全部窗口，底层数据不复制
+
+        同一版本内重复调用返回同一对象；缓冲区更新后旧对象的内容可能被覆盖，
+        需要长期保留时请自行copy()。
+
+        Returns:
+            以时间戳为索引、标的为列的DataFrame
+        """
+        if self._frame is None:
+            if self._size == 0:
+                self._frame = pd.DataFrame(columns=list(self.columns), dtype=float)
+            else:
+                self._frame = pd.DataFrame(
+                    self.window(),
+                    index=pd.Index(list(self.index())),
+                    columns=list(self.columns),
+                    copy=False,
+                )
+        return self._frame
+
+    def load_frame(self, frame: pd.DataFrame) -> None:
+        """用DataFrame的最后capacity行替换缓冲区内容
+
+        Args:
+            frame: 以时间戳为索引、标的为列的DataFrame
+        """
+        self.reset(list(frame.columns))
+        recent = frame.tail(self.capacity)
+        n = len(recent)
+        if n == 0:
+            return
+        values = recent.to_numpy(dtype=float, na_value=np.nan)
+        width = len(self.columns)
+        self._data[:n, :width] = values
+        self._data[self.capacity : self.capacity + n, :width] = values
+        self._index[:n] = list(recent.index)
+        self._index[self.capacity : self.capacity + n] = list(recent.index)
+        self._size = n
+        self._next_slot = n % self.capacity
+        self._end = self.capacity + n
+        self._touch()
+
+    def reset(self, columns: Optional[Sequence[str]] = None) -> None:
+        """清空缓冲区
+
+        Args:
+            columns: 新的列列表
+        """
+        self.columns = []
+        self.column_index = {}
+        self._data = np.full((2 * self.capacity, max(len(columns or []), 1)), np.nan)
+        self._index = np.empty(2 * self.capacity, dtype=object)
+        self._size = 0
+        self._next_slot = 0
+        self._end = self.capacity
+        self._touch()
+        if columns:
+            self.add_columns(columns)
+
+    def _touch(self) -> None:
+        """内容变化后使DataFrame缓存失效"""
+        self.version += 1
+        self._frame = None
+
+
+class RollingMoments:
+    """逐列维护滚动窗口内有效值的个数、和与平方和
+
+    窗口边界由调用方控制：行进入窗口时add，离开时remove。NaN视为缺失，
+    complete_rows为True时只统计所有列都有效的行（对应DataFrame.dropna()）。
+    """
+
+    def __init__(self, n_columns: int = 0, complete_rows: bool = False):
+        """初始化滚动矩
+
+        Args:
+            n_columns: 列数
+            complete_rows: 是否只统计完整行
+        """
+        self.complete_rows = complete_rows
+        self.reset(n_columns)
+
+    def reset(self, n_columns: int) -> None:
+        """清零
+
+        Args:
+            n_columns: 列数
+        """
+        self.count = np.zeros(n_columns)
+        self.total = np.zeros(n_columns)
+        self.total_sq = np.zeros(n_columns)
+
+    def add_columns(self, n: int) -> None:
+        """追加n个空列
+
+        Args:
+            n: 新增列数
+        """
+        padding = np.zeros(n)
+        self.count = np.concatenate([self.count, padding])
+        self.total = np.concatenate([self.total, padding])
+        self.total_sq = np.concatenate([self.total_sq, padding])
+
+    def add(self, row: np.ndarray, sign: float = 1.0) -> None:
+        """加入一行
+
+        Args:
+            row: 行数据
+            sign: 1表示加入，-1表示移除
+        """
+        valid = ~np.isnan(row)
+        if self.complete_rows:
+            if not valid.all():
+                return
+            values = row
+        else:
+            values = np.where(valid, row, 0.0)
+        self.count += sign * valid
+        self.total += sign * values
+        self.total_sq += sign * values * values
+
+    def remove(self, row: np.ndarray) -> None:
+        """移除一行
+
+        Args:
+            row: 行数据
+        """
+        self.add(row, -1.0)
+
+    def add_many(self, rows: np.ndarray) -> None:
+        """批量加入多行
+
+        Args:
+            rows: 形状为(n, n_columns)的数组
+        """
+        if len(rows) == 0:
+            return
+        valid = ~np.isnan(rows)
+        if self.complete_rows:
+            rows = rows[valid.all(axis=1)]
+            valid = np.ones(rows.shape, dtype=bool)
+        values = np.where(valid, rows, 0.0)
+        self.count += valid.sum(axis=0)
+        self.total += values.sum(axis=0)
+        self.total_sq += (values * values).sum(axis=0)
+
+    def mean(self) -> np.ndarray:
+        """逐列均值，没有有效值的列为NaN"""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > 0, self.total / self.count, np.nan)
+
+    def std(self, ddof: int = 1) -> np.ndarray:
+        """逐列标准差，有效值不超过ddof个的列为NaN
+
+        Args:
+            ddof: 自由度修正
+
+        Returns:
+            标准差数组
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = self.total / self.count
+            variance = (self.total_sq - self.total * mean) / (self.count - ddof)
+        return np.where(self.count > ddof, np.sqrt(np.maximum(variance, 0.0)), np.nan)
@@ -17,6 +17,10 @@ from module_07_optimization.hyperparameter_tuning.bayesian_optimizer import (
     BayesianOptimizer,
 )
 from module_07_optimization.hyperparameter_tuning.grid_search import GridSearchOptimizer
+from module_07_optimization.hyperparameter_tuning.pruners import (
+    MedianPrefixPruner,
+    SuccessiveHalvingPruner,
+)
 from module_07_optimization.hyperparameter_tuning.random_search import (
     RandomSearchOptimizer,
 )
@@ -50,6 +54,9 @@ from module_07_optimization.multi_objective_opt.objective_functions import (
 )
 from module_07_optimization.multi_objective_opt.pareto_frontier import ParetoFrontier
 
+# 试验缓存
+from module_07_optimization.trial_cache import TrialCache, fingerprint_data
+
 # 优化管理器
 from module_07_optimization.optimization_manager import (
     OptimizationManager,
@@ -89,6 +96,11 @@ from module_07_optimization.strategy_optimization.performance_evaluator import (
 from module_07_optimization.strategy_optimization.strategy_optimizer import (
     StrategyOptimizer,
     StrategyPerformance,
+    evaluate_strategy,
+)
+from module_07_optimization.strategy_optimization.strategy_protocol import (
+    StreamingStrategy,
+    VectorizedStrategy,
 )
 
 __all__ = [
@@ -103,6 +115,8 @@ __all__ = [
     "GridSearchOptimizer",
     "OptunaOptimizer",
     "RandomSearchOptimizer",
+    "SuccessiveHalvingPruner",
+    "MedianPrefixPruner",
     # 多目标优化
     "NSGAOptimizer",
     "NSGAIndividual",
@@ -114,6 +128,9 @@ __all__ = [
     # 策略优化
     "StrategyOptimizer",
     "StrategyPerformance",
+    "evaluate_strategy",
+    "StreamingStrategy",
+    "VectorizedStrategy",
     "PerformanceEvaluator",
     "PerformanceMetrics",
     "get_strategy_space",
@@ -135,6 +152,8 @@ __all__ = [
     # 数据库
     "OptimizationDatabaseManager",
     "get_optimization_database_manager",
+    "TrialCache",
+    "fingerprint_data",
     # 管理器
     "OptimizationManager",
     "get_optimization_manager",
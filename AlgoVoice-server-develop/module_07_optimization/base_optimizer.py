@@ -3,6 +3,7 @@
 提供所有优化器的基类和通用功能
 """
 
+import copy
 import json
 import pickle
 from abc import ABC, abstractmethod
@@ -17,6 +18,8 @@ import pandas as pd
 
 from common.exceptions import QuantSystemError
 from common.logging_system import setup_logger
+from common.parallel_executor import ParallelTrialExecutor, TrialOutcome
+from module_07_optimization.trial_cache import TrialCache
 
 logger = setup_logger("base_optimizer")
 
@@ -206,6 +209,14 @@ class BaseOptimizer(ABC):
         self.best_value: Optional[float] = None
         self.optimization_id = datetime.now().strftime("%Y%m%d_%H%M%S")
 
+        # 并行执行器（见set_executor），未设置时串行评估
+        self.executor: Optional[ParallelTrialExecutor] = None
+        self.batch_size = 1
+
+        # 试验缓存与前缀剪枝器（见set_trial_cache / set_pruner）
+        self.trial_cache: Optional[TrialCache] = None
+        self.pruner = None
+
     @abstractmethod
     def suggest_parameters(self) -> Dict[str, Any]:
         """建议下一组参数
@@ -215,62 +226,197 @@ class BaseOptimizer(ABC):
         """
         pass
 
-    def optimize(self) -> OptimizationResult:
-        """执行优化
+    def set_executor(
+        self, executor: ParallelTrialExecutor, batch_size: Optional[int] = None
+    ) -> None:
+        """使用并行执行器评估试验
 
-        Returns:
-            优化结果
+        执行器的目标函数代替objective_function（签名见ParallelTrialExecutor），
+        每批向优化器请求batch_size组参数并行评估。
+
+        Args:
+            executor: 并行试验执行器
+            batch_size: 每批试验数，默认等于工作进程数
         """
-        logger.info(f"Starting optimization with {self.n_trials} trials")
-        start_time = datetime.now()
-        convergence_history = []
+        self.executor = executor
+        self.batch_size = max(1, batch_size or executor.n_workers)
 
-        for i in range(self.n_trials):
-            # 创建试验
-            trial = Trial(
-                trial_id=f"{self.optimization_id}_{i:04d}",
-                parameters=self.suggest_parameters(),
-                start_time=datetime.now(),
-            )
+    def set_trial_cache(self, trial_cache: TrialCache) -> None:
+        """使用试验缓存
 
-            try:
-                # 评估目标函数
-                trial.status = OptimizationStatus.RUNNING
-                objective_value = self.objective_function(trial.parameters)
+        命中缓存的参数不再评估，新完成的试验结果写入缓存。
 
-                # 如果需要最大化，取负值
-                if self.maximize:
-                    objective_value = -objective_value
+        Args:
+            trial_cache: 试验缓存
+        """
+        self.trial_cache = trial_cache
 
-                trial.objective_value = objective_value
-                trial.status = OptimizationStatus.COMPLETED
+    def set_pruner(self, pruner) -> None:
+        """使用前缀剪枝器评估试验
 
-                # 更新最佳结果
-                if self.best_value is None or objective_value < self.best_value:
-                    self.best_value = objective_value
-                    self.best_parameters = trial.parameters.copy()
-                    logger.info(f"New best value: {self.best_value:.6f}")
+        剪枝器的目标函数代替objective_function，候选先在较短的数据前缀上评估，
+        落后者提前终止（状态为CANCELLED）。剪枝方向与优化器的maximize一致。
 
-                convergence_history.append(
-                    self.best_value if not self.maximize else -self.best_value
-                )
+        Args:
+            pruner: SuccessiveHalvingPruner 或 MedianPrefixPruner
+        """
+        pruner.maximize = self.maximize
+        self.pruner = pruner
+
+    def suggest_batch(self, n: int) -> List[Dict[str, Any]]:
+        """一次建议多组参数（供并行评估）
+
+        默认逐个调用suggest_parameters；依赖历史结果的优化器应重写该方法，
+        避免同一批内给出重复的建议。
+
+        Args:
+            n: 参数组数
+
+        Returns:
+            参数字典列表
+        """
+        return [self.suggest_parameters() for _ in range(n)]
+
+    def _evaluate_batch(self, param_batch: List[Dict[str, Any]]) -> List[TrialOutcome]:
+        """评估一批参数：有执行器时并行，否则在当前进程中调用目标函数"""
+        if self.executor is not None:
+            return self.executor.evaluate(param_batch)
 
+        outcomes = []
+        for i, params in enumerate(param_batch):
+            outcome = TrialOutcome(index=i, start_time=datetime.now())
+            try:
+                outcome.value = self.objective_function(params)
             except Exception as e:
-                trial.status = OptimizationStatus.FAILED
-                trial.error_message = str(e)
-                logger.error(f"Trial {trial.trial_id} failed: {e}")
-                convergence_history.append(
-                    convergence_history[-1] if convergence_history else float("inf")
+                outcome.error = str(e)
+            outcome.end_time = datetime.now()
+            outcomes.append(outcome)
+        return outcomes
+
+    def _run_batch(self, param_batch: List[Dict[str, Any]]) -> List[TrialOutcome]:
+        """评估一批参数：先查试验缓存，同一批内的重复参数只评估一次"""
+        if self.trial_cache is None:
+            return self._dispatch_batch(param_batch)
+
+        outcomes: List[Optional[TrialOutcome]] = [None] * len(param_batch)
+        pending: Dict[str, List[int]] = {}
+        for i, params in enumerate(param_batch):
+            cache_key = self.trial_cache.key(params)
+            if cache_key in pending:
+                pending[cache_key].append(i)
+                continue
+            cached = self.trial_cache.get(params)
+            if cached is None:
+                pending[cache_key] = [i]
+            else:
+                now = datetime.now()
+                outcomes[i] = TrialOutcome(
+                    index=i, value=cached, start_time=now, end_time=now, cached=True
                 )
 
-            finally:
-                trial.end_time = datetime.now()
-                self.trials.append(trial)
-                self._update_optimization_state(trial)
+        groups = list(pending.values())
+        evaluated = self._dispatch_batch([param_batch[g[0]] for g in groups])
+        for group, outcome in zip(groups, evaluated):
+            if outcome.ok and not outcome.pruned:
+                self.trial_cache.put(param_batch[group[0]], outcome.value)
+            for k, i in enumerate(group):
+                outcomes[i] = outcome if k == 0 else copy.copy(outcome)
+                outcomes[i].index = i
+                outcomes[i].cached = k > 0
+        return outcomes
+
+    def _dispatch_batch(self, param_batch: List[Dict[str, Any]]) -> List[TrialOutcome]:
+        """把一批参数交给剪枝器、并行执行器或当前进程评估"""
+        if not param_batch:
+            return []
+        if self.pruner is not None:
+            return self.pruner.evaluate_batch(param_batch)
+        return self._evaluate_batch(param_batch)
+
+    def optimize(self) -> OptimizationResult:
+        """执行优化
+
+        Returns:
+            优化结果
+        """
+        logger.info(f"Starting optimization with {self.n_trials} trials")
+        start_time = datetime.now()
+        convergence_history = []
+
+        i = 0
+        while i < self.n_trials:
+            if self.pruner is not None:
+                capacity = self.pruner.batch_size
+            else:
+                capacity = self.batch_size if self.executor else 1
+            n = min(capacity, self.n_trials - i)
+            param_batch = (
+                self.suggest_batch(n) if n > 1 else [self.suggest_parameters()]
+            )
+            outcomes = self._run_batch(param_batch)
+
+            for params, outcome in zip(param_batch, outcomes):
+                # 创建试验
+                trial = Trial(
+                    trial_id=f"{self.optimization_id}_{i:04d}",
+                    parameters=params,
+                    start_time=outcome.start_time,
+                    end_time=outcome.end_time,
+                )
+                if outcome.worker:
+                    trial.metrics["worker"] = outcome.worker
+                if outcome.cached:
+                    trial.metrics["cached"] = True
+
+                try:
+                    if not outcome.ok:
+                        raise QuantSystemError(outcome.error)
+
+                    if outcome.pruned:
+                        # 在数据前缀上落后而提前终止，不参与最佳结果比较
+                        trial.status = OptimizationStatus.CANCELLED
+                        trial.error_message = "Pruned on data prefix"
+                        trial.metrics["intermediate_value"] = outcome.value
+                        convergence_history.append(
+                            convergence_history[-1]
+                            if convergence_history
+                            else float("inf")
+                        )
+                    else:
+                        # 如果需要最大化，取负值
+                        objective_value = outcome.value
+                        if self.maximize:
+                            objective_value = -objective_value
+
+                        trial.objective_value = objective_value
+                        trial.status = OptimizationStatus.COMPLETED
+
+                        # 更新最佳结果
+                        if self.best_value is None or objective_value < self.best_value:
+                            self.best_value = objective_value
+                            self.best_parameters = trial.parameters.copy()
+                            logger.info(f"New best value: {self.best_value:.6f}")
+
+                        convergence_history.append(
+                            self.best_value if not self.maximize else -self.best_value
+                        )
+
+                except Exception as e:
+                    trial.status = OptimizationStatus.FAILED
+                    trial.error_message = str(e)
+                    logger.error(f"Trial {trial.trial_id} failed: {e}")
+                    convergence_history.append(
+                        convergence_history[-1] if convergence_history else float("inf")
+                    )
+
+                finally:
+                    self.trials.append(trial)
+                    self._update_optimization_state(trial)
 
                 # 进度日志
-                if (i + 1) % 10 == 0:
-                    logger.info(f"Progress: {i + 1}/{self.n_trials} trials completed")
+                i += 1
+                if i % 10 == 0:
+                    logger.info(f"Progress: {i}/{self.n_trials} trials completed")
 
         end_time = datetime.now()
         total_time = (end_time - start_time).total_seconds()
@@ -295,6 +441,11 @@ class BaseOptimizer(ABC):
                 "optimizer_class": self.__class__.__name__,
                 "maximize": self.maximize,
                 "parameter_space": [p.__dict__ for p in self.parameter_space],
+                "executor_stats": self.executor.get_stats() if self.executor else None,
+                "cache_stats": self.trial_cache.get_stats()
+                if self.trial_cache
+                else None,
+                "pruner_stats": self.pruner.get_stats() if self.pruner else None,
             },
         )
 
@@ -5,7 +5,6 @@
 
 import json
 import pickle
-import sqlite3
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -13,6 +12,7 @@ from typing import Any, Dict, List, Optional
 import numpy as np
 import pandas as pd
 
+from common.db_connection_pool import pooled_connection
 from common.logging_system import setup_logger
 
 logger = setup_logger("optimization_db_manager")
@@ -40,7 +40,7 @@ class OptimizationDatabaseManager:
 
     def _init_database(self) -> None:
         """初始化数据库表结构"""
-        with sqlite3.connect(self.db_path) as conn:
+        with pooled_connection(self.db_path) as conn:
             cursor = conn.cursor()
 
             # 优化任务表
@@ -144,6 +144,26 @@ class OptimizationDatabaseManager:
             """
             )
 
+            # 试验结果缓存表（按策略、参数和数据指纹内容寻址）
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS trial_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    strategy_name TEXT NOT NULL,
+                    parameters TEXT NOT NULL,
+                    data_fingerprint TEXT NOT NULL,
+                    objective_value TEXT NOT NULL,
+                    created_at TIMESTAMP NOT NULL
+                )
+            """
+            )
+            cursor.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_trial_cache_strategy
+                ON trial_cache (strategy_name, data_fingerprint)
+            """
+            )
+
             conn.commit()
 
         logger.info(f"Database initialized at {self.db_path}")
@@ -171,7 +191,7 @@ class OptimizationDatabaseManager:
             是否成功
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with pooled_connection(self.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -209,7 +229,7 @@ class OptimizationDatabaseManager:
             是否成功
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with pooled_connection(self.db_path) as conn:
                 cursor = conn.cursor()
                 if completed_at:
                     cursor.execute(
@@ -260,7 +280,7 @@ class OptimizationDatabaseManager:
             是否成功
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with pooled_connection(self.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -319,7 +339,7 @@ class OptimizationDatabaseManager:
             是否成功
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with pooled_connection(self.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -347,6 +367,99 @@ class OptimizationDatabaseManager:
             logger.error(f"Failed to save trial: {e}")
             return False
 
+    def get_cached_trial(self, cache_key: str) -> Optional[Any]:
+        """查询缓存的试验结果
+
+        Args:
+            cache_key: 缓存键
+
+        Returns:
+            目标值（单目标为float，多目标为列表），不存在时返回None
+        """
+        try:
+            with pooled_connection(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "SELECT objective_value FROM trial_cache WHERE cache_key = ?",
+                    (cache_key,),
+                )
+                row = cursor.fetchone()
+            return json.loads(row[0]) if row else None
+        except Exception as e:
+            logger.error(f"Failed to get cached trial: {e}")
+            return None
+
+    def save_cached_trial(
+        self,
+        cache_key: str,
+        strategy_name: str,
+        parameters: str,
+        data_fingerprint: str,
+        objective_value: Any,
+    ) -> bool:
+        """保存试验结果到缓存
+
+        Args:
+            cache_key: 缓存键
+            strategy_name: 策略名称
+            parameters: 规范化后的参数JSON
+            data_fingerprint: 数据指纹
+            objective_value: 目标值（单目标为float，多目标为列表）
+
+        Returns:
+            是否成功
+        """
+        try:
+            with pooled_connection(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    INSERT OR REPLACE INTO trial_cache
+                    (cache_key, strategy_name, parameters, data_fingerprint,
+                     objective_value, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                    (
+                        cache_key,
+                        strategy_name,
+                        parameters,
+                        data_fingerprint,
+                        json.dumps(objective_value),
+                        datetime.now().isoformat(),
+                    ),
+                )
+                conn.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save cached trial: {e}")
+            return False
+
+    def clear_trial_cache(self, strategy_name: Optional[str] = None) -> int:
+        """清除试验缓存
+
+        Args:
+            strategy_name: 只清除指定策略的缓存，None表示全部清除
+
+        Returns:
+            删除的记录数
+        """
+        try:
+            with pooled_connection(self.db_path) as conn:
+                cursor = conn.cursor()
+                if strategy_name is None:
+                    cursor.execute("DELETE FROM trial_cache")
+                else:
+                    cursor.execute(
+                        "DELETE FROM trial_cache WHERE strategy_name = ?",
+                        (strategy_name,),
+                    )
+                deleted = cursor.rowcount
+                conn.commit()
+            return deleted
+        except Exception as e:
+            logger.error(f"Failed to clear trial cache: {e}")
+            return 0
+
     def save_strategy_optimization(
         self,
         strategy_name: str,
@@ -370,7 +483,7 @@ class OptimizationDatabaseManager:
             是否成功
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with pooled_connection(self.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -422,7 +535,7 @@ class OptimizationDatabaseManager:
             是否成功
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with pooled_connection(self.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -467,7 +580,7 @@ class OptimizationDatabaseManager:
             是否成功
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with pooled_connection(self.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -500,7 +613,7 @@ class OptimizationDatabaseManager:
             优化结果
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with pooled_connection(self.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -542,7 +655,7 @@ class OptimizationDatabaseManager:
             优化历史列表
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with pooled_connection(self.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -583,7 +696,7 @@ class OptimizationDatabaseManager:
         try:
             stats = {}
 
-            with sqlite3.connect(self.db_path) as conn:
+            with pooled_connection(self.db_path) as conn:
                 cursor = conn.cursor()
 
                 # 优化任务数
@@ -610,6 +723,10 @@ class OptimizationDatabaseManager:
                 cursor.execute("SELECT COUNT(*) FROM multi_objective_results")
                 stats["total_multi_objective_results"] = cursor.fetchone()[0]
 
+                # 试验缓存条目数
+                cursor.execute("SELECT COUNT(*) FROM trial_cache")
+                stats["total_cached_trials"] = cursor.fetchone()[0]
+
                 # 数据库大小
                 db_file = Path(self.db_path)
                 if db_file.exists():
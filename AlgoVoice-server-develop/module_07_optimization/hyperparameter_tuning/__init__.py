@@ -6,6 +6,10 @@ from module_07_optimization.hyperparameter_tuning.bayesian_optimizer import (
     BayesianOptimizer,
 )
 from module_07_optimization.hyperparameter_tuning.grid_search import GridSearchOptimizer
+from module_07_optimization.hyperparameter_tuning.pruners import (
+    MedianPrefixPruner,
+    SuccessiveHalvingPruner,
+)
 from module_07_optimization.hyperparameter_tuning.random_search import (
     RandomSearchOptimizer,
 )
@@ -19,12 +23,16 @@ try:
     __all__ = [
         "BayesianOptimizer",
         "GridSearchOptimizer",
+        "MedianPrefixPruner",
         "OptunaOptimizer",
         "RandomSearchOptimizer",
+        "SuccessiveHalvingPruner",
     ]
 except ImportError:
     __all__ = [
         "BayesianOptimizer",
         "GridSearchOptimizer",
+        "MedianPrefixPruner",
         "RandomSearchOptimizer",
+        "SuccessiveHalvingPruner",
     ]
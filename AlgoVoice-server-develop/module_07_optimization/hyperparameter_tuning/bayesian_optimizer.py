@@ -122,6 +122,39 @@ class BayesianOptimizer(BaseOptimizer):
         params = self._vector_to_params(x)
         return params
 
+    def suggest_batch(self, n: int) -> List[Dict[str, Any]]:
+        """一次建议多组参数（Constant Liar策略）
+
+        每选出一个点，就假设它的观测值等于当前最佳值并重新拟合高斯过程，
+        使同一批内的后续点避开已选区域；整批选完后恢复为只用真实观测拟合。
+
+        Args:
+            n: 参数组数
+
+        Returns:
+            参数字典列表
+        """
+        if len(self.X_observed) < self.n_initial_points:
+            return [self._vector_to_params(self._random_sample()) for _ in range(n)]
+
+        X = list(self.X_observed)
+        y = list(self.y_observed)
+        lie = np.max(y) if self.maximize else np.min(y)
+
+        batch = []
+        try:
+            for k in range(n):
+                x = self._optimize_acquisition()
+                batch.append(self._vector_to_params(x))
+                if k < n - 1:
+                    X.append(self._params_to_vector(batch[-1]))
+                    y.append(lie)
+                    self.gp.fit(np.array(X), np.array(y))
+        finally:
+            self.gp.fit(np.array(self.X_observed), np.array(self.y_observed))
+
+        return batch
+
     def _random_sample(self) -> np.ndarray:
         """随机采样一个点
 
@@ -184,10 +184,13 @@ class OptunaOptimizer(BaseOptimizer):
                 trial.end_time = datetime.now()
                 self.trials.append(trial)
 
-        # 运行优化
-        self.study.optimize(
-            wrapped_objective, n_trials=self.n_trials, show_progress_bar=True
-        )
+        # 运行优化：设置了并行执行器时按批ask/tell，否则由Optuna串行驱动
+        if self.executor is not None:
+            self._optimize_batched()
+        else:
+            self.study.optimize(
+                wrapped_objective, n_trials=self.n_trials, show_progress_bar=True
+            )
 
         end_time = datetime.now()
         total_time = (end_time - start_time).total_seconds()
@@ -216,12 +219,51 @@ class OptunaOptimizer(BaseOptimizer):
                 "pruner": self.pruner.__class__.__name__ if self.pruner else None,
                 "optuna_best_trial_number": best_trial.number,
                 "optuna_study_name": self.study.study_name,
+                "executor_stats": self.executor.get_stats() if self.executor else None,
             },
         )
 
         logger.info(f"Optimization completed. Best value: {self.best_value:.6f}")
         return result
 
+    def _optimize_batched(self) -> None:
+        """按批向study请求参数，交给并行执行器评估后逐个回报结果"""
+        n_done = 0
+        while n_done < self.n_trials:
+            n = min(self.batch_size, self.n_trials - n_done)
+            optuna_trials = [self.study.ask() for _ in range(n)]
+            param_batch = [self._sample_parameters(t) for t in optuna_trials]
+            outcomes = self.executor.evaluate(param_batch)
+
+            for optuna_trial, params, outcome in zip(
+                optuna_trials, param_batch, outcomes
+            ):
+                trial = Trial(
+                    trial_id=f"{self.optimization_id}_{len(self.trials):04d}",
+                    parameters=params,
+                    start_time=outcome.start_time,
+                    end_time=outcome.end_time,
+                    metrics={
+                        "optuna_trial_number": optuna_trial.number,
+                        "worker": outcome.worker,
+                    },
+                )
+
+                if outcome.ok:
+                    trial.objective_value = outcome.value
+                    trial.status = OptimizationStatus.COMPLETED
+                    self.study.tell(optuna_trial, outcome.value)
+                else:
+                    trial.status = OptimizationStatus.FAILED
+                    trial.error_message = outcome.error
+                    logger.error(f"Trial failed: {outcome.error}")
+                    self.study.tell(optuna_trial, state=optuna.trial.TrialState.FAIL)
+
+                self.trials.append(trial)
+
+            n_done += n
+            logger.info(f"Progress: {n_done}/{self.n_trials} trials completed")
+
     def _sample_parameters(self, trial: OptunaTrial) -> Dict[str, Any]:
         """使用Optuna trial采样参数
 
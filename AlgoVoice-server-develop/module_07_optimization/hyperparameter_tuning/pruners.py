@@ -0,0 +1,256 @@
+"""
+剪枝器模块
+在逐级增长的数据前缀上评估候选参数，提前放弃表现落后的候选
+
+- SuccessiveHalvingPruner: 一批候选先在最短前缀上评估，每级只保留前1/reduction_factor进入下一级
+- MedianPrefixPruner: 每级与此前试验在同一前缀长度上的中位数比较，落后者停止评估
+
+目标函数签名为 ``objective(params, data)``，data为完整数据的前N行。
+"""
+
+import math
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from common.logging_system import setup_logger
+from common.parallel_executor import ParallelTrialExecutor, TrialOutcome
+
+logger = setup_logger("pruners")
+
+
+def _evaluate_prefix(
+    objective: Callable, task: tuple, data: Union[pd.DataFrame, pd.Series]
+) -> float:
+    """在数据前缀上评估一组参数（并行执行器的目标函数）"""
+    params, n_rows = task
+    return objective(params, data.iloc[:n_rows])
+
+
+class PrefixPruner:
+    """前缀剪枝器基类"""
+
+    def __init__(
+        self,
+        objective: Callable[[Dict[str, Any], pd.DataFrame], float],
+        data: Union[pd.DataFrame, pd.Series],
+        maximize: bool = False,
+        min_fraction: float = 0.25,
+        reduction_factor: int = 2,
+        min_rows: int = 60,
+        n_workers: int = 1,
+    ):
+        """初始化剪枝器
+
+        Args:
+            objective: 目标函数 objective(params, data)
+            data: 完整数据，按时间升序
+            maximize: 目标是否越大越好（挂到优化器上时会与优化器保持一致）
+            min_fraction: 第一级前缀占完整数据的比例
+            reduction_factor: 相邻两级前缀长度之比（逐次减半时也是每级的淘汰比例）
+            min_rows: 前缀的最少行数，过短的级别会被跳过
+            n_workers: 并行评估的工作进程数
+        """
+        if not 0 < min_fraction <= 1:
+            raise ValueError("min_fraction must be in (0, 1]")
+        if reduction_factor < 2:
+            raise ValueError("reduction_factor must be at least 2")
+
+        self.maximize = maximize
+        self.reduction_factor = reduction_factor
+        self.n_rows = len(data)
+        self.rungs = self._prefix_lengths(self.n_rows, min_fraction, min_rows)
+        self.executor = ParallelTrialExecutor(
+            partial(_evaluate_prefix, objective), n_workers=n_workers, shared_data=data
+        )
+
+        # 统计
+        self.n_candidates = 0
+        self.n_pruned = 0
+        self.rows_evaluated = 0
+
+    def _prefix_lengths(
+        self, n_rows: int, min_fraction: float, min_rows: int
+    ) -> List[int]:
+        """计算各级前缀长度，最后一级为完整数据"""
+        n_levels = int(
+            math.ceil(math.log(1 / min_fraction, self.reduction_factor) - 1e-9)
+        )
+        lengths = []
+        for level in range(n_levels, 0, -1):
+            length = int(n_rows / self.reduction_factor**level)
+            if length >= min_rows and (not lengths or length > lengths[-1]):
+                lengths.append(length)
+        lengths.append(n_rows)
+        return lengths
+
+    @property
+    def batch_size(self) -> int:
+        """每批候选数"""
+        return self.executor.n_workers
+
+    def _evaluate_rung(
+        self, param_batch: List[Dict[str, Any]], indices: List[int], n_rows: int
+    ) -> List[TrialOutcome]:
+        """在长度为n_rows的前缀上评估指定候选"""
+        outcomes = self.executor.evaluate([(param_batch[i], n_rows) for i in indices])
+        self.rows_evaluated += n_rows * len(indices)
+        for i, outcome in zip(indices, outcomes):
+            outcome.index = i
+        return outcomes
+
+    def _score(self, value: float) -> float:
+        """排序用的分值，越小越好；NaN等非有限值（如前缀短于指标窗口）视为最差"""
+        if not np.isfinite(value):
+            return float("inf")
+        return -value if self.maximize else value
+
+    @staticmethod
+    def _merge(previous: Optional[TrialOutcome], current: TrialOutcome) -> TrialOutcome:
+        """合并同一候选在多级上的结果，保留首级的开始时间"""
+        if previous is not None:
+            current.start_time = previous.start_time
+        return current
+
+    def evaluate_batch(self, param_batch: List[Dict[str, Any]]) -> List[TrialOutcome]:
+        """评估一批候选
+
+        Args:
+            param_batch: 参数字典列表
+
+        Returns:
+            与param_batch顺序一致的结果；被剪枝的候选pruned为True
+        """
+        raise NotImplementedError
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取剪枝统计
+
+        Returns:
+            候选数、剪枝数、各级前缀长度，以及实际评估行数占全量评估行数的比例
+        """
+        full_rows = self.n_candidates * self.n_rows
+        return {
+            "pruner": self.__class__.__name__,
+            "rungs": list(self.rungs),
+            "candidates": self.n_candidates,
+            "pruned": self.n_pruned,
+            "rows_evaluated": self.rows_evaluated,
+            "work_fraction": self.rows_evaluated / full_rows if full_rows else 0.0,
+            "executor": self.executor.get_stats(),
+        }
+
+    def close(self):
+        """关闭并行执行器"""
+        self.executor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class SuccessiveHalvingPruner(PrefixPruner):
+    """逐次减半剪枝器
+
+    每批候选构成一轮：全部候选先在最短前缀上评估，按目标值排序后保留
+    ceil(n / reduction_factor) 个进入下一级更长的前缀，直到完整数据。
+    """
+
+    def __init__(self, *args, candidates_per_bracket: Optional[int] = None, **kwargs):
+        """初始化逐次减半剪枝器
+
+        Args:
+            candidates_per_bracket: 每轮候选数，默认使最后一级剩下一个候选
+            其余参数见PrefixPruner
+        """
+        super().__init__(*args, **kwargs)
+        if candidates_per_bracket is None:
+            candidates_per_bracket = self.reduction_factor ** (len(self.rungs) - 1)
+        self.candidates_per_bracket = candidates_per_bracket
+
+    @property
+    def batch_size(self) -> int:
+        return self.candidates_per_bracket
+
+    def evaluate_batch(self, param_batch: List[Dict[str, Any]]) -> List[TrialOutcome]:
+        results: List[Optional[TrialOutcome]] = [None] * len(param_batch)
+        alive = list(range(len(param_batch)))
+        self.n_candidates += len(param_batch)
+
+        for level, n_rows in enumerate(self.rungs):
+            outcomes = self._evaluate_rung(param_batch, alive, n_rows)
+            survivors = []
+            for outcome in outcomes:
+                results[outcome.index] = self._merge(results[outcome.index], outcome)
+                if outcome.ok:
+                    survivors.append(outcome)
+
+            if level == len(self.rungs) - 1:
+                break
+
+            survivors.sort(key=lambda o: self._score(o.value))
+            n_keep = max(1, int(math.ceil(len(survivors) / self.reduction_factor)))
+            for outcome in survivors[n_keep:]:
+                outcome.pruned = True
+                self.n_pruned += 1
+            alive = [outcome.index for outcome in survivors[:n_keep]]
+            if not alive:
+                break
+
+        return results
+
+
+class MedianPrefixPruner(PrefixPruner):
+    """中位数剪枝器
+
+    候选在每一级前缀上的目标值若劣于此前所有试验在同一级的中位数，则停止评估。
+    前n_startup_trials个试验不剪枝，只积累各级的参考值。
+    """
+
+    def __init__(self, *args, n_startup_trials: int = 5, **kwargs):
+        """初始化中位数剪枝器
+
+        Args:
+            n_startup_trials: 开始剪枝前需要积累的试验数
+            其余参数见PrefixPruner
+        """
+        super().__init__(*args, **kwargs)
+        self.n_startup_trials = n_startup_trials
+        # 各级已评估试验的分值（越小越好）
+        self._rung_values: List[List[float]] = [[] for _ in self.rungs]
+
+    def evaluate_batch(self, param_batch: List[Dict[str, Any]]) -> List[TrialOutcome]:
+        results: List[Optional[TrialOutcome]] = [None] * len(param_batch)
+        alive = list(range(len(param_batch)))
+        self.n_candidates += len(param_batch)
+
+        for level, n_rows in enumerate(self.rungs):
+            history = self._rung_values[level]
+            median = None
+            if len(history) >= self.n_startup_trials:
+                median = np.median(history)
+            is_last = level == len(self.rungs) - 1
+
+            outcomes = self._evaluate_rung(param_batch, alive, n_rows)
+            alive = []
+            for outcome in outcomes:
+                results[outcome.index] = self._merge(results[outcome.index], outcome)
+                if not outcome.ok:
+                    continue
+                score = self._score(outcome.value)
+                if np.isfinite(score):
+                    history.append(score)
+                if not is_last and median is not None and score > median:
+                    outcome.pruned = True
+                    self.n_pruned += 1
+                else:
+                    alive.append(outcome.index)
+
+            if not alive:
+                break
+
+        return results
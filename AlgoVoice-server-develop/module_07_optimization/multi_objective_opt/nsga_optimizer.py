@@ -5,10 +5,18 @@ NSGA-III多目标优化器模块
 
 import copy
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional
 
 import numpy as np
 from common.logging_system import setup_logger
+from common.pareto import (
+    crowding_distance,
+    non_dominated_sort,
+    polynomial_mutation,
+    sbx_crossover,
+    select_survivors,
+    tournament_selection,
+)
 from module_07_optimization.base_optimizer import (
     BaseOptimizer,
     OptimizationStatus,
@@ -149,6 +157,7 @@ class NSGAOptimizer(BaseOptimizer):
         # 最终评估
         self._evaluate_population()
         fronts = self._non_dominated_sort()
+        self._calculate_crowding_distance(fronts)
         self.pareto_front = fronts[0] if fronts else []
 
         # 创建结果
@@ -160,6 +169,9 @@ class NSGAOptimizer(BaseOptimizer):
             "metadata": {
                 "n_objectives": self.n_objectives,
                 "final_front_size": len(self.pareto_front),
+                "cache_stats": self.trial_cache.get_stats()
+                if self.trial_cache
+                else None,
             },
         }
 
@@ -181,13 +193,31 @@ class NSGAOptimizer(BaseOptimizer):
 
     def _evaluate_population(self) -> None:
         """评估种群中所有个体"""
-        for individual in self.population:
+        self._evaluate_individuals(self.population)
+
+    def _evaluate_individuals(self, individuals: List[NSGAIndividual]) -> None:
+        """评估尚未计算目标值的个体
+
+        设置了试验缓存时，解码后参数相同的个体（变异和交叉经常重新产生
+        相同的离散基因）直接复用缓存的目标值。
+
+        Args:
+            individuals: 个体列表
+        """
+        for individual in individuals:
             if individual.objectives is None:
                 # 解码参数
                 params = self._decode_genes(individual.genes)
 
+                if self.trial_cache is not None:
+                    cached = self.trial_cache.get(params)
+                    if cached is not None:
+                        individual.objectives = np.array(cached)
+                        continue
+
                 # 评估所有目标函数
                 objectives = []
+                failed = False
                 for obj_func in self.objective_functions:
                     try:
                         value = obj_func(params)
@@ -195,9 +225,14 @@ class NSGAOptimizer(BaseOptimizer):
                     except Exception as e:
                         logger.warning(f"Objective evaluation failed: {e}")
                         objectives.append(float("inf"))
+                        failed = True
 
                 individual.objectives = np.array(objectives)
 
+                # 评估失败的结果不写入缓存
+                if self.trial_cache is not None and not failed:
+                    self.trial_cache.put(params, individual.objectives)
+
     def _decode_genes(self, genes: np.ndarray) -> Dict[str, Any]:
         """将基因解码为参数
 
@@ -239,49 +274,27 @@ class NSGAOptimizer(BaseOptimizer):
                 better_in_any = True
         return better_in_any
 
+    def _objective_matrix(self, individuals: List[NSGAIndividual]) -> np.ndarray:
+        """把个体的目标值堆叠为矩阵 (n_individuals, n_objectives)"""
+        return np.array([ind.objectives for ind in individuals], dtype=float)
+
     def _non_dominated_sort(self) -> List[List[NSGAIndividual]]:
         """非支配排序
 
+        在目标矩阵上一次性计算支配矩阵后逐层剥离前沿，
+        避免逐对比较个体的O(MN^2)次Python调用。
+
         Returns:
             Pareto前沿列表
         """
+        objectives = self._objective_matrix(self.population)
+
         fronts = []
-        current_front = []
-
-        # 计算支配关系
-        for i, ind1 in enumerate(self.population):
-            ind1.dominated_set = []
-            ind1.dominated_count = 0
-
-            for j, ind2 in enumerate(self.population):
-                if i != j:
-                    if self._dominates(ind1, ind2):
-                        ind1.dominated_set.append(j)
-                    elif self._dominates(ind2, ind1):
-                        ind1.dominated_count += 1
-
-            if ind1.dominated_count == 0:
-                ind1.rank = 0
-                current_front.append(ind1)
-
-        fronts.append(current_front)
-
-        # 构建后续前沿
-        front_idx = 0
-        while fronts[front_idx]:
-            next_front = []
-            for ind1 in fronts[front_idx]:
-                for j in ind1.dominated_set:
-                    ind2 = self.population[j]
-                    ind2.dominated_count -= 1
-                    if ind2.dominated_count == 0:
-                        ind2.rank = front_idx + 1
-                        next_front.append(ind2)
-            front_idx += 1
-            if next_front:
-                fronts.append(next_front)
-            else:
-                break
+        for rank, front in enumerate(non_dominated_sort(objectives)):
+            members = [self.population[i] for i in front]
+            for ind in members:
+                ind.rank = rank
+            fronts.append(members)
 
         return fronts
 
@@ -292,170 +305,70 @@ class NSGAOptimizer(BaseOptimizer):
             fronts: Pareto前沿列表
         """
         for front in fronts:
-            if len(front) <= 2:
-                for ind in front:
-                    ind.crowding_distance = float("inf")
-            else:
-                # 初始化距离
-                for ind in front:
-                    ind.crowding_distance = 0.0
-
-                # 对每个目标函数计算距离
-                for m in range(self.n_objectives):
-                    # 按目标值排序
-                    front.sort(key=lambda x: x.objectives[m])
-
-                    # 边界个体距离无穷大
-                    front[0].crowding_distance = float("inf")
-                    front[-1].crowding_distance = float("inf")
-
-                    # 计算中间个体的距离
-                    obj_range = front[-1].objectives[m] - front[0].objectives[m]
-                    if obj_range > 0:
-                        for i in range(1, len(front) - 1):
-                            distance = (
-                                front[i + 1].objectives[m] - front[i - 1].objectives[m]
-                            ) / obj_range
-                            front[i].crowding_distance += distance
+            distances = crowding_distance(self._objective_matrix(front))
+            for ind, distance in zip(front, distances):
+                ind.crowding_distance = float(distance)
 
     def _tournament_selection(self) -> List[NSGAIndividual]:
-        """锦标赛选择
+        """二元锦标赛选择
 
         Returns:
             选中的父代
         """
-        parents = []
-
-        for _ in range(self.population_size):
-            # 随机选择两个个体
-            idx1, idx2 = self.random_state.choice(
-                len(self.population), 2, replace=False
-            )
-            ind1 = self.population[idx1]
-            ind2 = self.population[idx2]
-
-            # 选择更优的个体
-            if ind1.rank < ind2.rank:
-                parents.append(ind1)
-            elif ind1.rank > ind2.rank:
-                parents.append(ind2)
-            else:
-                # 相同等级，选择拥挤度更大的
-                if ind1.crowding_distance > ind2.crowding_distance:
-                    parents.append(ind1)
-                else:
-                    parents.append(ind2)
-
-        return parents
+        ranks = np.array([ind.rank for ind in self.population])
+        distances = np.array([ind.crowding_distance for ind in self.population])
+        winners = tournament_selection(
+            ranks, distances, self.population_size, self.random_state
+        )
+        return [self.population[i] for i in winners]
 
     def _create_offspring(self, parents: List[NSGAIndividual]) -> List[NSGAIndividual]:
         """创建子代
 
+        相邻父代两两配对，整个种群的基因矩阵一次完成SBX交叉和多项式变异。
+
         Args:
             parents: 父代列表
 
         Returns:
             子代列表
         """
-        offspring = []
-
-        for i in range(0, len(parents), 2):
-            if i + 1 < len(parents):
-                parent1 = parents[i]
-                parent2 = parents[i + 1]
-
-                # 交叉
-                if self.random_state.random() < self.crossover_prob:
-                    child1_genes, child2_genes = self._crossover(
-                        parent1.genes, parent2.genes
-                    )
-                else:
-                    child1_genes = parent1.genes.copy()
-                    child2_genes = parent2.genes.copy()
-
-                # 变异
-                child1_genes = self._mutate(child1_genes)
-                child2_genes = self._mutate(child2_genes)
-
-                # 创建子代个体
-                offspring.append(NSGAIndividual(genes=child1_genes))
-                offspring.append(NSGAIndividual(genes=child2_genes))
-
-        return offspring[: self.population_size]
-
-    def _crossover(
-        self, parent1_genes: np.ndarray, parent2_genes: np.ndarray
-    ) -> Tuple[np.ndarray, np.ndarray]:
-        """模拟二进制交叉（SBX）
-
-        Args:
-            parent1_genes: 父代1基因
-            parent2_genes: 父代2基因
-
-        Returns:
-            两个子代基因
-        """
-        child1_genes = parent1_genes.copy()
-        child2_genes = parent2_genes.copy()
+        n_pairs = len(parents) // 2
+        if n_pairs == 0:
+            return []
 
         eta = 20  # 分布指数
+        genes = np.array([parent.genes for parent in parents[: 2 * n_pairs]])
+        parents1, parents2 = genes[0::2], genes[1::2]
+
+        # 交叉
+        child1, child2 = sbx_crossover(
+            parents1,
+            parents2,
+            self.lower_bounds,
+            self.upper_bounds,
+            self.random_state,
+            eta=eta,
+        )
+        no_crossover = self.random_state.random(n_pairs) >= self.crossover_prob
+        child1[no_crossover] = parents1[no_crossover]
+        child2[no_crossover] = parents2[no_crossover]
+
+        children = np.empty_like(genes)
+        children[0::2] = child1
+        children[1::2] = child2
+
+        # 变异
+        children = polynomial_mutation(
+            children,
+            self.lower_bounds,
+            self.upper_bounds,
+            self.random_state,
+            prob=self.mutation_prob,
+            eta=eta,
+        )
 
-        for i in range(len(parent1_genes)):
-            if self.random_state.random() < 0.5:
-                # SBX交叉
-                u = self.random_state.random()
-
-                if u <= 0.5:
-                    beta = (2 * u) ** (1 / (eta + 1))
-                else:
-                    beta = (1 / (2 * (1 - u))) ** (1 / (eta + 1))
-
-                child1_genes[i] = 0.5 * (
-                    (1 + beta) * parent1_genes[i] + (1 - beta) * parent2_genes[i]
-                )
-                child2_genes[i] = 0.5 * (
-                    (1 - beta) * parent1_genes[i] + (1 + beta) * parent2_genes[i]
-                )
-
-                # 边界修正
-                child1_genes[i] = np.clip(
-                    child1_genes[i], self.lower_bounds[i], self.upper_bounds[i]
-                )
-                child2_genes[i] = np.clip(
-                    child2_genes[i], self.lower_bounds[i], self.upper_bounds[i]
-                )
-
-        return child1_genes, child2_genes
-
-    def _mutate(self, genes: np.ndarray) -> np.ndarray:
-        """多项式变异
-
-        Args:
-            genes: 基因
-
-        Returns:
-            变异后的基因
-        """
-        mutated_genes = genes.copy()
-        eta = 20  # 分布指数
-
-        for i in range(len(genes)):
-            if self.random_state.random() < self.mutation_prob:
-                u = self.random_state.random()
-
-                if u <= 0.5:
-                    delta = (2 * u) ** (1 / (eta + 1)) - 1
-                else:
-                    delta = 1 - (2 * (1 - u)) ** (1 / (eta + 1))
-
-                mutated_genes[i] = genes[i] + delta * (
-                    self.upper_bounds[i] - self.lower_bounds[i]
-                )
-                mutated_genes[i] = np.clip(
-                    mutated_genes[i], self.lower_bounds[i], self.upper_bounds[i]
-                )
-
-        return mutated_genes
+        return [NSGAIndividual(genes=g) for g in children[: self.population_size]]
 
     def _environmental_selection(
         self, combined_population: List[NSGAIndividual]
@@ -469,44 +382,12 @@ class NSGAOptimizer(BaseOptimizer):
             选中的个体
         """
         # 评估合并种群
-        for ind in combined_population:
-            if ind.objectives is None:
-                params = self._decode_genes(ind.genes)
-                objectives = []
-                for obj_func in self.objective_functions:
-                    try:
-                        value = obj_func(params)
-                        objectives.append(value)
-                    except:
-                        objectives.append(float("inf"))
-                ind.objectives = np.array(objectives)
+        self._evaluate_individuals(combined_population)
 
-        # 临时设置种群为合并种群
-        original_population = self.population
-        self.population = combined_population
-
-        # 非支配排序
-        fronts = self._non_dominated_sort()
-
-        # 计算拥挤度
-        self._calculate_crowding_distance(fronts)
-
-        # 恢复原始种群
-        self.population = original_population
-
-        # 选择个体
-        new_population = []
-        for front in fronts:
-            if len(new_population) + len(front) <= self.population_size:
-                new_population.extend(front)
-            else:
-                # 按拥挤度排序选择
-                front.sort(key=lambda x: x.crowding_distance, reverse=True)
-                remaining = self.population_size - len(new_population)
-                new_population.extend(front[:remaining])
-                break
-
-        return new_population
+        selected = select_survivors(
+            self._objective_matrix(combined_population), self.population_size
+        )
+        return [combined_population[i] for i in selected]
 
     def _extract_pareto_front(self) -> List[Dict[str, Any]]:
         """提取Pareto前沿解
@@ -9,6 +9,7 @@ import numpy as np
 import pandas as pd
 
 from common.logging_system import setup_logger
+from common.pareto import non_dominated_mask
 
 logger = setup_logger("pareto_frontier")
 
@@ -52,19 +53,13 @@ class ParetoFrontier:
         Returns:
             帕累托最优解列表
         """
-        n_solutions = len(self.solutions)
-        is_dominated = np.zeros(n_solutions, dtype=bool)
-
-        # 检查每个解是否被支配
-        for i in range(n_solutions):
-            for j in range(n_solutions):
-                if i != j and self._dominates(j, i):
-                    is_dominated[i] = True
-                    break
+        if not self.solutions:
+            return []
 
-        # 返回非支配解
+        # 在目标矩阵上一次性判断支配关系，返回非支配解
+        mask = non_dominated_mask(self.objective_matrix)
         pareto_solutions = [
-            self.solutions[i] for i in range(n_solutions) if not is_dominated[i]
+            solution for solution, keep in zip(self.solutions, mask) if keep
         ]
 
         logger.info(f"Found {len(pareto_solutions)} Pareto optimal solutions")
@@ -19,11 +19,19 @@ from module_07_optimization.strategy_optimization.performance_evaluator import (
 from module_07_optimization.strategy_optimization.strategy_optimizer import (
     StrategyOptimizer,
     StrategyPerformance,
+    evaluate_strategy,
+)
+from module_07_optimization.strategy_optimization.strategy_protocol import (
+    StreamingStrategy,
+    VectorizedStrategy,
 )
 
 __all__ = [
     "StrategyOptimizer",
     "StrategyPerformance",
+    "evaluate_strategy",
+    "StreamingStrategy",
+    "VectorizedStrategy",
     "PerformanceEvaluator",
     "PerformanceMetrics",
     "get_strategy_space",
@@ -3,7 +3,6 @@
 专门用于交易策略参数优化
 """
 
-import concurrent.futures
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from functools import partial
@@ -14,10 +13,15 @@ import pandas as pd
 
 from common.data_structures import Signal
 from common.logging_system import setup_logger
+from common.parallel_executor import ParallelTrialExecutor
 from module_07_optimization.base_optimizer import Parameter
 from module_07_optimization.hyperparameter_tuning.optuna_optimizer import (
     OptunaOptimizer,
 )
+from module_07_optimization.strategy_optimization.strategy_protocol import (
+    compute_positions,
+    supports_fast_evaluation,
+)
 
 logger = setup_logger("strategy_optimizer")
 
@@ -53,6 +57,60 @@ class StrategyPerformance:
         }
 
 
+def evaluate_strategy(
+    strategy_class: type, params: Dict[str, Any], data: pd.DataFrame
+) -> StrategyPerformance:
+    """完整评估一组策略参数的性能
+
+    模块级函数，可以pickle后交给并行执行器的工作进程调用。
+
+    Args:
+        strategy_class: 策略类
+        params: 策略参数
+        data: 市场数据
+
+    Returns:
+        完整性能指标，评估失败时返回最差的性能
+    """
+    try:
+        # 创建策略实例
+        strategy = strategy_class(**params)
+
+        # 按策略支持的接口（向量化/流式/历史前缀）计算每根K线的持仓
+        positions = compute_positions(strategy, data)
+
+        # 第i根K线的收益 = 持仓 × 收盘价涨跌幅（与信号同一根K线）
+        close = data["close"].to_numpy(dtype=float)
+        returns = np.zeros(len(close))
+        if len(close) > 1:
+            returns[1:] = positions[1:] * np.diff(close) / close[:-1]
+
+        return StrategyOptimizer._calculate_performance(returns)
+
+    except Exception as e:
+        logger.error(f"Strategy evaluation failed: {e}")
+        # 返回最差的性能
+        return StrategyPerformance(
+            total_return=-1.0,
+            annual_return=-1.0,
+            sharpe_ratio=-10.0,
+            max_drawdown=1.0,
+            win_rate=0.0,
+            profit_factor=0.0,
+            total_trades=0,
+            avg_trade_return=-1.0,
+            volatility=10.0,
+            calmar_ratio=-10.0,
+        )
+
+
+def _evaluate_metric(
+    strategy_class: type, metric: str, params: Dict[str, Any], data: pd.DataFrame
+) -> float:
+    """评估策略并返回单一优化指标（并行执行器的目标函数）"""
+    return getattr(evaluate_strategy(strategy_class, params, data), metric)
+
+
 class StrategyOptimizer:
     """策略优化器
 
@@ -76,7 +134,7 @@ class StrategyOptimizer:
             optimization_metric: 优化指标
             test_split: 测试集比例
             walk_forward_windows: 前进窗口数（用于Walk Forward分析）
-            n_jobs: 并行任务数
+            n_jobs: 并行任务数，大于1时用常驻进程池评估，市场数据只共享一次
         """
         self.strategy_class = strategy_class
         self.market_data = market_data
@@ -85,9 +143,18 @@ class StrategyOptimizer:
         self.walk_forward_windows = walk_forward_windows
         self.n_jobs = n_jobs
 
+        # parallel_evaluate使用的常驻执行器（首次调用时创建）
+        self._executor: Optional[ParallelTrialExecutor] = None
+
         # 分割训练/测试数据
         self._split_data()
 
+        if not supports_fast_evaluation(strategy_class):
+            logger.info(
+                f"{strategy_class.__name__} only implements generate_signal; "
+                "implement on_bar or generate_positions for faster evaluation"
+            )
+
     def _split_data(self) -> None:
         """分割训练和测试数据"""
         n_samples = len(self.market_data)
@@ -132,8 +199,15 @@ class StrategyOptimizer:
         else:
             raise ValueError(f"Unknown optimizer type: {optimizer_type}")
 
-        # 执行优化
-        result = optimizer.optimize()
+        # 执行优化（n_jobs>1时训练数据写入共享内存映射，各进程按批评估参数）
+        executor = self._create_metric_executor(self.train_data)
+        if executor is not None:
+            optimizer.set_executor(executor)
+        try:
+            result = optimizer.optimize()
+        finally:
+            if executor is not None:
+                executor.close()
 
         # 在测试集上评估最佳参数
         test_performance = self._evaluate_strategy_full(
@@ -183,111 +257,93 @@ class StrategyOptimizer:
         Returns:
             完整性能指标
         """
-        try:
-            # 创建策略实例
-            strategy = self.strategy_class(**params)
-
-            # 运行策略
-            signals = []
-            positions = []
-            returns = []
-
-            for i in range(len(data)):
-                # 获取历史数据
-                history = data.iloc[: i + 1]
-
-                # 生成信号
-                signal = strategy.generate_signal(history)
-                signals.append(signal)
-
-                # 计算收益
-                if i > 0 and signal:
-                    if signal.action == "BUY":
-                        position = signal.quantity
-                    elif signal.action == "SELL":
-                        position = -signal.quantity
-                    else:
-                        position = 0
-
-                    # 简单收益计算
-                    price_change = data.iloc[i]["close"] - data.iloc[i - 1]["close"]
-                    ret = position * price_change / data.iloc[i - 1]["close"]
-                    returns.append(ret)
-                else:
-                    returns.append(0)
-
-            # 计算性能指标（使用pandas Series以支持cummax等方法）
-            returns = pd.Series(returns)
-
-            # 总收益
-            total_return = (1 + returns).prod() - 1
-
-            # 年化收益
-            n_days = len(data)
-            annual_return = (1 + total_return) ** (252 / n_days) - 1
-
-            # 夏普比率
-            if returns.std() > 0:
-                sharpe_ratio = np.sqrt(252) * returns.mean() / returns.std()
-            else:
-                sharpe_ratio = 0
-
-            # 最大回撤
-            cumulative = (1 + returns).cumprod()
-            running_max = cumulative.cummax()
-            drawdown = (cumulative - running_max) / running_max
-            max_drawdown = abs(drawdown.min())
-
-            # 胜率
-            winning_trades = sum(1 for r in returns if r > 0)
-            total_trades = sum(1 for r in returns if r != 0)
-            win_rate = winning_trades / max(1, total_trades)
-
-            # 盈亏比
-            profits = returns[returns > 0]
-            losses = returns[returns < 0]
-            if len(losses) > 0 and losses.sum() != 0:
-                profit_factor = abs(profits.sum() / losses.sum())
-            else:
-                profit_factor = float("inf") if len(profits) > 0 else 0
-
-            # 平均交易收益
-            avg_trade_return = returns[returns != 0].mean() if total_trades > 0 else 0
-
-            # 波动率
-            volatility = returns.std() * np.sqrt(252)
-
-            # Calmar比率
-            calmar_ratio = annual_return / max(max_drawdown, 0.01)
-
-            return StrategyPerformance(
-                total_return=total_return,
-                annual_return=annual_return,
-                sharpe_ratio=sharpe_ratio,
-                max_drawdown=max_drawdown,
-                win_rate=win_rate,
-                profit_factor=min(profit_factor, 100),  # 限制最大值
-                total_trades=total_trades,
-                avg_trade_return=avg_trade_return,
-                volatility=volatility,
-                calmar_ratio=calmar_ratio,
-            )
+        return evaluate_strategy(self.strategy_class, params, data)
 
-        except Exception as e:
-            logger.error(f"Strategy evaluation failed: {e}")
-            # 返回最差的性能
-            return StrategyPerformance(
-                total_return=-1.0,
-                annual_return=-1.0,
-                sharpe_ratio=-10.0,
-                max_drawdown=1.0,
-                win_rate=0.0,
-                profit_factor=0.0,
-                total_trades=0,
-                avg_trade_return=-1.0,
-                volatility=10.0,
-                calmar_ratio=-10.0,
-            )
+    def _create_metric_executor(
+        self, data: pd.DataFrame
+    ) -> Optional[ParallelTrialExecutor]:
+        """创建按优化指标评估参数的并行执行器，n_jobs为1时返回None
+
+        Args:
+            data: 评估使用的市场数据（共享给所有工作进程）
+
+        Returns:
+            并行执行器
+        """
+        if self.n_jobs == 1:
+            return None
+        return ParallelTrialExecutor(
+            partial(_evaluate_metric, self.strategy_class, self.optimization_metric),
+            n_workers=self.n_jobs,
+            shared_data=data,
+        )
+
+    @staticmethod
+    def _calculate_performance(returns: np.ndarray) -> StrategyPerformance:
+        """根据逐K线收益率计算性能指标
+
+        Args:
+            returns: 收益率数组，未持仓的K线为0
+
+        Returns:
+            完整性能指标
+        """
+        n_days = len(returns)
+
+        # 总收益
+        growth = 1 + returns
+        total_return = growth.prod() - 1
+
+        # 年化收益
+        annual_return = (1 + total_return) ** (252 / n_days) - 1
+
+        # 夏普比率（样本标准差，与pandas一致）
+        std = returns.std(ddof=1) if n_days > 1 else np.nan
+        if std > 0:
+            sharpe_ratio = np.sqrt(252) * returns.mean() / std
+        else:
+            sharpe_ratio = 0
+
+        # 最大回撤
+        cumulative = np.cumprod(growth)
+        running_max = np.maximum.accumulate(cumulative)
+        drawdown = (cumulative - running_max) / running_max
+        max_drawdown = abs(drawdown.min())
+
+        # 胜率
+        traded = returns[returns != 0]
+        profits = returns[returns > 0]
+        losses = returns[returns < 0]
+        total_trades = len(traded)
+        win_rate = len(profits) / max(1, total_trades)
+
+        # 盈亏比
+        if len(losses) > 0 and losses.sum() != 0:
+            profit_factor = abs(profits.sum() / losses.sum())
+        else:
+            profit_factor = float("inf") if len(profits) > 0 else 0
+
+        # 平均交易收益
+        avg_trade_return = traded.mean() if total_trades > 0 else 0
+
+        # 波动率
+        volatility = std * np.sqrt(252)
+
+        # Calmar比率
+        calmar_ratio = annual_return / max(max_drawdown, 0.01)
+
+        return StrategyPerformance(
+            total_return=total_return,
+            annual_return=annual_return,
+            sharpe_ratio=sharpe_ratio,
+            max_drawdown=max_drawdown,
+            win_rate=win_rate,
+            profit_factor=min(profit_factor, 100),  # 限制最大值
+            total_trades=total_trades,
+            avg_trade_return=avg_trade_return,
+            volatility=volatility,
+            calmar_ratio=calmar_ratio,
+        )
 
     def _walk_forward_analysis(
         self, parameter_space: List[Parameter], n_trials: int = 10
@@ -329,7 +385,14 @@ class StrategyOptimizer:
                 n_trials=n_trials,
             )
 
-            opt_result = optimizer.optimize()
+            executor = self._create_metric_executor(train_data)
+            if executor is not None:
+                optimizer.set_executor(executor)
+            try:
+                opt_result = optimizer.optimize()
+            finally:
+                if executor is not None:
+                    executor.close()
 
             # 在测试窗口评估
             test_performance = self._evaluate_strategy_full(
@@ -368,11 +431,22 @@ class StrategyOptimizer:
                 self._evaluate_strategy_full(params, self.train_data)
                 for params in parameter_sets
             ]
-        else:
-            # 并行执行
-            with concurrent.futures.ProcessPoolExecutor(
-                max_workers=self.n_jobs
-            ) as executor:
-                eval_func = partial(self._evaluate_strategy_full, data=self.train_data)
-                results = list(executor.map(eval_func, parameter_sets))
-            return results
+
+        # 并行执行：常驻进程池在多次调用间复用，训练数据只共享一次
+        if self._executor is None:
+            self._executor = ParallelTrialExecutor(
+                partial(evaluate_strategy, self.strategy_class),
+                n_workers=self.n_jobs,
+                shared_data=self.train_data,
+            )
+        return self._executor.map(parameter_sets)
+
+    def get_executor_stats(self) -> Optional[Dict[str, Any]]:
+        """获取parallel_evaluate执行器的利用率统计"""
+        return self._executor.get_stats() if self._executor else None
+
+    def close(self) -> None:
+        """关闭并行执行器，释放工作进程和共享数据"""
+        if self._executor is not None:
+            self._executor.close()
+            self._executor = None
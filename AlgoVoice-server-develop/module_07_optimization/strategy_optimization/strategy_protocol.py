@@ -0,0 +1,115 @@
+"""
+策略评估协议模块
+定义StrategyOptimizer支持的三种策略接口及对应的持仓序列计算
+
+- generate_signal(history): 原有接口，每根K线传入完整历史前缀，评估复杂度O(n²)
+- on_bar(bar): 流式接口，每次只传入一根新K线，策略在实例属性中维护自身状态
+- generate_positions(data): 向量化接口，一次性基于预先计算的指标列返回整段持仓
+
+三种接口的持仓语义一致：第i根K线的持仓只能使用截至第i根（含）的数据，
+BUY对应 +quantity，SELL对应 -quantity，无信号或HOLD对应0。
+"""
+
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+from common.data_structures import Signal
+
+
+class StreamingStrategy:
+    """流式策略基类
+
+    子类实现 ``on_bar``，在实例属性中保存滚动状态（如均线累加和、上一根K线），
+    每根K线只做O(1)的增量更新。StrategyOptimizer每次评估都会新建策略实例，
+    并在评估开始前调用 ``reset``。
+    """
+
+    def reset(self) -> None:
+        """清空状态，开始新的一次评估"""
+        pass
+
+    def on_bar(self, bar: Any) -> Optional[Signal]:
+        """处理一根新K线
+
+        Args:
+            bar: ``DataFrame.itertuples()`` 产生的命名元组，
+                ``bar.Index`` 为日期，其余列可按属性访问（如 ``bar.close``）
+
+        Returns:
+            交易信号，无信号时返回None
+        """
+        raise NotImplementedError
+
+
+class VectorizedStrategy:
+    """向量化策略基类
+
+    子类实现 ``generate_positions``，用rolling/ewm等向量化运算预先计算指标面板，
+    一次返回每根K线的持仓。
+    """
+
+    def generate_positions(self, data: pd.DataFrame) -> Any:
+        """计算每根K线的持仓
+
+        Args:
+            data: 市场数据，至少包含close列
+
+        Returns:
+            与data等长的持仓序列（array-like），NaN视为0
+        """
+        raise NotImplementedError
+
+
+def signal_to_position(signal: Optional[Signal]) -> float:
+    """把交易信号转换为持仓"""
+    if not signal:
+        return 0.0
+    if signal.action == "BUY":
+        return float(signal.quantity)
+    if signal.action == "SELL":
+        return -float(signal.quantity)
+    return 0.0
+
+
+def compute_positions(strategy: Any, data: pd.DataFrame) -> np.ndarray:
+    """按策略支持的接口计算持仓序列
+
+    优先使用向量化接口，其次流式接口，最后回退到逐K线传入历史前缀的generate_signal。
+
+    Args:
+        strategy: 策略实例
+        data: 市场数据
+
+    Returns:
+        长度为len(data)的持仓数组
+    """
+    n = len(data)
+
+    if hasattr(strategy, "generate_positions"):
+        positions = np.asarray(strategy.generate_positions(data), dtype=float)
+        if positions.shape != (n,):
+            raise ValueError(
+                f"generate_positions returned shape {positions.shape}, expected ({n},)"
+            )
+        return np.nan_to_num(positions, nan=0.0)
+
+    positions = np.zeros(n)
+    if hasattr(strategy, "on_bar"):
+        if hasattr(strategy, "reset"):
+            strategy.reset()
+        for i, bar in enumerate(data.itertuples()):
+            positions[i] = signal_to_position(strategy.on_bar(bar))
+        return positions
+
+    for i in range(n):
+        positions[i] = signal_to_position(strategy.generate_signal(data.iloc[: i + 1]))
+    return positions
+
+
+def supports_fast_evaluation(strategy_class: type) -> bool:
+    """策略类是否实现了流式或向量化接口"""
+    return hasattr(strategy_class, "generate_positions") or hasattr(
+        strategy_class, "on_bar"
+    )
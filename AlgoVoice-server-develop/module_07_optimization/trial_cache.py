@@ -0,0 +1,185 @@
+"""
+试验结果缓存模块
+按 (策略, 参数, 数据指纹) 对试验结果做内容寻址缓存，避免重复回测相同的参数组合
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from common.logging_system import setup_logger
+from module_07_optimization.database_manager import (
+    OptimizationDatabaseManager,
+    get_optimization_database_manager,
+)
+
+logger = setup_logger("trial_cache")
+
+
+def fingerprint_data(data: Any) -> str:
+    """计算数据指纹
+
+    DataFrame/Series按索引、列名和全部取值哈希，字典按键排序后逐项合并；
+    数据内容或区间不同时指纹不同。
+
+    Args:
+        data: DataFrame、Series、ndarray，或名称到它们的字典；None表示不依赖数据
+
+    Returns:
+        十六进制指纹
+    """
+    digest = hashlib.sha256()
+
+    def update(obj: Any):
+        if obj is None:
+            digest.update(b"none")
+        elif isinstance(obj, dict):
+            for name in sorted(obj, key=str):
+                digest.update(str(name).encode("utf-8"))
+                update(obj[name])
+        elif isinstance(obj, (pd.DataFrame, pd.Series)):
+            columns = obj.columns if isinstance(obj, pd.DataFrame) else [obj.name]
+            digest.update(json.dumps([str(c) for c in columns]).encode("utf-8"))
+            hashed = pd.util.hash_pandas_object(obj, index=True).to_numpy()
+            digest.update(hashed.tobytes())
+        else:
+            array = np.ascontiguousarray(np.asarray(obj))
+            digest.update(str(array.dtype).encode("utf-8"))
+            digest.update(str(array.shape).encode("utf-8"))
+            digest.update(array.tobytes())
+
+    update(data)
+    return digest.hexdigest()
+
+
+def _normalize_value(value: Any, float_decimals: int) -> Any:
+    """把参数值规范化为可稳定序列化的形式"""
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        value = round(float(value), float_decimals)
+        # 整数值的浮点数与整数视为同一参数（如NSGA解码后的5.0和5）
+        return int(value) if value.is_integer() else value
+    if isinstance(value, (list, tuple)):
+        return [_normalize_value(v, float_decimals) for v in value]
+    return str(value)
+
+
+class TrialCache:
+    """试验结果缓存
+
+    缓存键为 (策略名, 规范化参数, 数据指纹) 的哈希。浮点参数按float_decimals位
+    小数取整后参与哈希，因此只差极小数值的近似重复参数也会命中。
+    结果先查内存，再查优化数据库中的trial_cache表，新结果同时写入两者。
+    """
+
+    def __init__(
+        self,
+        strategy_name: str,
+        data: Any = None,
+        data_fingerprint: Optional[str] = None,
+        db_manager: Optional[OptimizationDatabaseManager] = None,
+        float_decimals: int = 6,
+        persist: bool = True,
+    ):
+        """初始化试验缓存
+
+        Args:
+            strategy_name: 策略或目标函数名称
+            data: 评估使用的数据，用于计算数据指纹
+            data_fingerprint: 直接指定数据指纹（优先于data）
+            db_manager: 数据库管理器，默认使用全局实例
+            float_decimals: 浮点参数参与哈希前保留的小数位数
+            persist: 是否持久化到数据库，False时只在内存中缓存
+        """
+        self.strategy_name = strategy_name
+        self.data_fingerprint = data_fingerprint or fingerprint_data(data)
+        self.float_decimals = float_decimals
+        self.db_manager = (
+            (db_manager or get_optimization_database_manager()) if persist else None
+        )
+
+        self._memory: Dict[str, Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def canonical_parameters(self, params: Dict[str, Any]) -> str:
+        """参数的规范化JSON表示（键排序、数值取整）"""
+        normalized = {
+            str(name): _normalize_value(value, self.float_decimals)
+            for name, value in params.items()
+        }
+        return json.dumps(normalized, sort_keys=True)
+
+    def key(self, params: Dict[str, Any]) -> str:
+        """计算参数的缓存键"""
+        content = "|".join(
+            [
+                self.strategy_name,
+                self.data_fingerprint,
+                self.canonical_parameters(params),
+            ]
+        )
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def get(self, params: Dict[str, Any]) -> Optional[Any]:
+        """查询缓存结果
+
+        Args:
+            params: 参数字典
+
+        Returns:
+            缓存的目标值（单目标为float，多目标为列表），未命中返回None
+        """
+        cache_key = self.key(params)
+        value = self._memory.get(cache_key)
+        if value is None and self.db_manager is not None:
+            value = self.db_manager.get_cached_trial(cache_key)
+            if value is not None:
+                self._memory[cache_key] = value
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def put(self, params: Dict[str, Any], value: Union[float, list]) -> None:
+        """写入试验结果
+
+        Args:
+            params: 参数字典
+            value: 目标值（单目标为float，多目标为列表）
+        """
+        if isinstance(value, np.ndarray):
+            value = value.tolist()
+        elif isinstance(value, (np.floating, np.integer)):
+            value = value.item()
+
+        cache_key = self.key(params)
+        self._memory[cache_key] = value
+        if self.db_manager is not None:
+            self.db_manager.save_cached_trial(
+                cache_key,
+                self.strategy_name,
+                self.canonical_parameters(params),
+                self.data_fingerprint,
+                value,
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取命中统计"""
+        lookups = self.hits + self.misses
+        return {
+            "strategy_name": self.strategy_name,
+            "data_fingerprint": self.data_fingerprint[:16],
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries_in_memory": len(self._memory),
+        }
@@ -10,6 +10,7 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import pandas as pd
 
+from common.db_connection_pool import pooled_connect
 from common.exceptions import DatabaseError
 from common.logging_system import setup_logger
 
@@ -40,7 +41,7 @@ class ExecutionDatabaseManager:
         """初始化数据库表结构"""
         conn = None
         try:
-            conn = sqlite3.connect(str(self.db_path))
+            conn = pooled_connect(self.db_path)
             cursor = conn.cursor()
 
             # 订单表
@@ -237,7 +238,7 @@ class ExecutionDatabaseManager:
         """
         conn = None
         try:
-            conn = sqlite3.connect(str(self.db_path))
+            conn = pooled_connect(self.db_path)
             cursor = conn.cursor()
 
             created_at = timestamp or datetime.now()
@@ -282,6 +283,67 @@ class ExecutionDatabaseManager:
             if conn:
                 conn.close()
 
+    def save_orders(self, records: List[Dict[str, Any]]) -> bool:
+        """批量保存订单记录（一个事务）
+
+        Args:
+            records: 订单记录列表，字段与orders表一致
+
+        Returns:
+            是否保存成功
+        """
+        if not records:
+            return True
+
+        conn = None
+        try:
+            conn = pooled_connect(self.db_path)
+            cursor = conn.cursor()
+
+            now = datetime.now()
+            cursor.executemany(
+                """
+                INSERT OR REPLACE INTO orders
+                (order_id, signal_id, symbol, side, order_type, quantity, price,
+                 stop_price, status, filled_quantity, filled_price, strategy_name,
+                 created_at, updated_at, submitted_time, filled_time, metadata)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+                [
+                    (
+                        record["order_id"],
+                        record["signal_id"],
+                        record["symbol"],
+                        record["side"],
+                        record["order_type"],
+                        record["quantity"],
+                        record.get("price"),
+                        record.get("stop_price"),
+                        record["status"],
+                        record.get("filled_quantity", 0),
+                        record.get("filled_price"),
+                        record.get("strategy_name"),
+                        record.get("created_at") or now,
+                        record.get("updated_at") or now,
+                        record.get("submitted_time"),
+                        record.get("filled_time"),
+                        str(record.get("metadata", {})),
+                    )
+                    for record in records
+                ],
+            )
+
+            conn.commit()
+            logger.debug(f"Saved {len(records)} orders")
+            return True
+
+        except sqlite3.Error as e:
+            logger.error(f"Failed to save {len(records)} orders: {e}")
+            return False
+        finally:
+            if conn:
+                conn.close()
+
     def save_trade(
         self,
         order_id: str,
@@ -316,7 +378,7 @@ class ExecutionDatabaseManager:
         """
         conn = None
         try:
-            conn = sqlite3.connect(str(self.db_path))
+            conn = pooled_connect(self.db_path)
             cursor = conn.cursor()
 
             trade_time = timestamp or datetime.now()
@@ -384,7 +446,7 @@ class ExecutionDatabaseManager:
         """
         conn = None
         try:
-            conn = sqlite3.connect(str(self.db_path))
+            conn = pooled_connect(self.db_path)
             cursor = conn.cursor()
 
             signal_time = timestamp or datetime.now()
@@ -437,7 +499,7 @@ class ExecutionDatabaseManager:
         """
         conn = None
         try:
-            conn = sqlite3.connect(str(self.db_path))
+            conn = pooled_connect(self.db_path)
             cursor = conn.cursor()
 
             cursor.execute(
@@ -486,7 +548,7 @@ class ExecutionDatabaseManager:
         """
         conn = None
         try:
-            conn = sqlite3.connect(str(self.db_path))
+            conn = pooled_connect(self.db_path)
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
 
@@ -526,7 +588,7 @@ class ExecutionDatabaseManager:
         """
         conn = None
         try:
-            conn = sqlite3.connect(str(self.db_path))
+            conn = pooled_connect(self.db_path)
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
 
@@ -584,7 +646,7 @@ class ExecutionDatabaseManager:
         """
         conn = None
         try:
-            conn = sqlite3.connect(str(self.db_path))
+            conn = pooled_connect(self.db_path)
 
             query = "SELECT * FROM trades WHERE 1=1"
             params = []
@@ -628,7 +690,7 @@ class ExecutionDatabaseManager:
         """
         conn = None
         try:
-            conn = sqlite3.connect(str(self.db_path))
+            conn = pooled_connect(self.db_path)
 
             query = "SELECT * FROM execution_metrics WHERE 1=1"
             params = []
@@ -666,7 +728,7 @@ class ExecutionDatabaseManager:
         """
         conn = None
         try:
-            conn = sqlite3.connect(str(self.db_path))
+            conn = pooled_connect(self.db_path)
             cursor = conn.cursor()
 
             # 查询时间范围
@@ -732,7 +794,7 @@ class ExecutionDatabaseManager:
         """
         conn = None
         try:
-            conn = sqlite3.connect(str(self.db_path))
+            conn = pooled_connect(self.db_path)
             cursor = conn.cursor()
 
             stats = {}
@@ -3,6 +3,7 @@
 """
 
 import uuid
+from collections import defaultdict, deque
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
@@ -71,6 +72,7 @@ class Order:
     submitted_time: Optional[datetime] = None
     filled_time: Optional[datetime] = None
     metadata: Dict[str, Any] = None
+    account_id: Optional[str] = None
 
     def __post_init__(self):
         if self.created_at is None:
@@ -81,13 +83,54 @@ class Order:
             self.metadata = {}
 
 
+# 已提交未完成的状态与终态
+ACTIVE_STATUSES = (OrderStatus.SUBMITTED, OrderStatus.PARTIALLY_FILLED)
+TERMINAL_STATUSES = (OrderStatus.FILLED, OrderStatus.CANCELLED, OrderStatus.REJECTED)
+
+
 class OrderManager:
-    """订单管理器类"""
+    """订单管理器类
+
+    内存中的订单按股票、状态、账户和策略建立二级索引，状态变化统一经过
+    _set_status更新索引，因此查询只访问对应分组而不扫描全部订单。超过
+    max_orders_in_memory时最早完结的订单自动归档，归档订单累积到
+    archive_batch_size条后批量写入archive_store（剩余的由flush_archive写入），
+    内存中只保留最近history_size条。
+    """
+
+    def __init__(
+        self,
+        max_orders_in_memory: Optional[int] = None,
+        history_size: Optional[int] = 10000,
+        archive_store: Optional[Any] = None,
+        archive_batch_size: int = 500,
+    ):
+        """初始化订单管理器
 
-    def __init__(self):
-        """初始化订单管理器"""
+        Args:
+            max_orders_in_memory: 内存中保留的订单数上限，None表示不自动归档
+            history_size: 内存中保留的归档订单数，None表示不限制
+            archive_store: 归档订单存储（ExecutionDatabaseManager），None表示不持久化
+            archive_batch_size: 归档订单累积到该数量时批量写入archive_store
+        """
         self.orders: Dict[str, Order] = {}
-        self.order_history: List[Order] = []
+        self.order_history: deque = deque(maxlen=history_size)
+        self.max_orders_in_memory = max_orders_in_memory
+        self.archive_store = archive_store
+        self.archive_batch_size = max(1, archive_batch_size)
+        # 已归档、尚未写入archive_store的订单记录
+        self._pending_archive: List[Dict[str, Any]] = []
+
+        # 二级索引：键 -> {order_id: Order}，字典保持订单加入的顺序
+        self._by_symbol: Dict[str, Dict[str, Order]] = defaultdict(dict)
+        self._by_status: Dict[OrderStatus, Dict[str, Order]] = defaultdict(dict)
+        self._by_account: Dict[str, Dict[str, Order]] = defaultdict(dict)
+        self._by_strategy: Dict[str, Dict[str, Order]] = defaultdict(dict)
+        # 已完结未归档的订单，按完结顺序排列，供自动归档使用
+        self._completed: Dict[str, Order] = {}
+        # 归档订单按状态计数，历史被截断后统计仍然准确
+        self._archived_counts: Dict[OrderStatus, int] = defaultdict(int)
+        self._archived_total = 0
 
     def create_order_from_signal(self, signal: Signal) -> Order:
         """从信号创建订单
@@ -118,6 +161,7 @@ class OrderManager:
                     "Signal must have either 'signal_type' or 'action' attribute"
                 )
 
+            signal_metadata = signal.metadata or {}
             order = Order(
                 order_id=order_id,
                 signal_id=signal.signal_id,
@@ -131,9 +175,10 @@ class OrderManager:
                     "confidence": signal.confidence,
                     "signal_metadata": signal.metadata,
                 },
+                account_id=signal_metadata.get("account_id"),
             )
 
-            self.orders[order_id] = order
+            self._add(order)
             logger.info(f"Created order {order_id} from signal {signal.signal_id}")
             return order
 
@@ -141,6 +186,25 @@ class OrderManager:
             logger.error(f"Failed to create order from signal: {e}")
             raise ExecutionError(f"Order creation failed: {e}")
 
+    def add_order(self, order: Order) -> Order:
+        """加入外部创建的订单（例如TWAP/VWAP拆分的子订单）
+
+        Args:
+            order: 订单对象
+
+        Returns:
+            加入的订单
+
+        Raises:
+            ExecutionError: 订单ID已存在
+        """
+        if order.order_id in self.orders:
+            raise ExecutionError(f"Order {order.order_id} already exists")
+
+        self._add(order)
+        logger.debug(f"Added order {order.order_id} for {order.symbol}")
+        return order
+
     def submit_order(self, order: Order) -> bool:
         """提交订单
 
@@ -155,17 +219,17 @@ class OrderManager:
                 raise ExecutionError(f"Order {order.order_id} not found")
 
             # 更新订单状态
-            order.status = OrderStatus.SUBMITTED
             order.updated_at = datetime.now()
             order.submitted_time = datetime.now()
+            self._set_status(order, OrderStatus.SUBMITTED)
 
             logger.info(f"Order {order.order_id} submitted for {order.symbol}")
             return True
 
         except Exception as e:
             logger.error(f"Failed to submit order {order.order_id}: {e}")
-            order.status = OrderStatus.REJECTED
             order.updated_at = datetime.now()
+            self._set_status(order, OrderStatus.REJECTED)
             return False
 
     def fill_order(
@@ -192,13 +256,13 @@ class OrderManager:
             order.filled_price = filled_price
             order.updated_at = datetime.now()
 
-            # 更新订单状态
+            # 更新订单状态（先写完字段再改状态，进入终态时可能立即归档）
             if order.filled_quantity >= order.quantity:
-                order.status = OrderStatus.FILLED
-                order.filled_time = datetime.now()
+                order.filled_time = order.updated_at
+                self._set_status(order, OrderStatus.FILLED)
                 logger.info(f"Order {order_id} fully filled")
             else:
-                order.status = OrderStatus.PARTIALLY_FILLED
+                self._set_status(order, OrderStatus.PARTIALLY_FILLED)
                 logger.info(
                     f"Order {order_id} partially filled: {order.filled_quantity}/{order.quantity}"
                 )
@@ -232,8 +296,8 @@ class OrderManager:
                 return False
 
             # 更新订单状态
-            order.status = OrderStatus.CANCELLED
             order.updated_at = datetime.now()
+            self._set_status(order, OrderStatus.CANCELLED)
 
             logger.info(f"Order {order_id} cancelled")
             return True
@@ -242,6 +306,29 @@ class OrderManager:
             logger.error(f"Failed to cancel order {order_id}: {e}")
             return False
 
+    def apply_order_update(self, update: OrderUpdate) -> bool:
+        """应用券商回报的订单更新，可注册为BrokerConnector的订单回调
+
+        Args:
+            update: 订单更新
+
+        Returns:
+            是否更新成功
+        """
+        order = self.orders.get(update.order_id)
+        if order is None:
+            logger.warning(f"Received update for unknown order {update.order_id}")
+            return False
+
+        order.filled_quantity = update.filled_quantity
+        if update.filled_price is not None:
+            order.filled_price = update.filled_price
+        if update.status == OrderStatus.FILLED and order.filled_time is None:
+            order.filled_time = update.timestamp
+        order.updated_at = update.timestamp
+        self._set_status(order, update.status)
+        return True
+
     def get_order(self, order_id: str) -> Optional[Order]:
         """获取订单
 
@@ -262,7 +349,7 @@ class OrderManager:
         Returns:
             订单列表
         """
-        return [order for order in self.orders.values() if order.symbol == symbol]
+        return list(self._by_symbol.get(symbol, {}).values())
 
     def get_orders_by_status(self, status: OrderStatus) -> List[Order]:
         """获取指定状态的订单
@@ -270,10 +357,32 @@ class OrderManager:
         Args:
             status: 订单状态
 
+        Returns:
+            订单列表（按进入该状态的先后顺序）
+        """
+        return list(self._by_status.get(status, {}).values())
+
+    def get_orders_by_account(self, account_id: str) -> List[Order]:
+        """获取指定账户的订单
+
+        Args:
+            account_id: 账户ID
+
+        Returns:
+            订单列表
+        """
+        return list(self._by_account.get(account_id, {}).values())
+
+    def get_orders_by_strategy(self, strategy_name: str) -> List[Order]:
+        """获取指定策略的订单
+
+        Args:
+            strategy_name: 策略名称
+
         Returns:
             订单列表
         """
-        return [order for order in self.orders.values() if order.status == status]
+        return list(self._by_strategy.get(strategy_name, {}).values())
 
     def get_pending_orders(self) -> List[Order]:
         """获取待处理订单
@@ -287,11 +396,12 @@ class OrderManager:
         """获取活跃订单（已提交但未完成）
 
         Returns:
-            活跃订单列表
+            活跃订单列表（先已提交，后部分成交）
         """
-        active_statuses = [OrderStatus.SUBMITTED, OrderStatus.PARTIALLY_FILLED]
         return [
-            order for order in self.orders.values() if order.status in active_statuses
+            order
+            for status in ACTIVE_STATUSES
+            for order in self._by_status.get(status, {}).values()
         ]
 
     def archive_order(self, order_id: str) -> bool:
@@ -307,13 +417,7 @@ class OrderManager:
             if order_id not in self.orders:
                 raise ExecutionError(f"Order {order_id} not found")
 
-            order = self.orders[order_id]
-
-            # 添加到历史记录
-            self.order_history.append(order)
-
-            # 从活跃订单中移除
-            del self.orders[order_id]
+            self._archive([self.orders[order_id]])
 
             logger.info(f"Order {order_id} archived")
             return True
@@ -328,14 +432,10 @@ class OrderManager:
         Returns:
             统计信息字典
         """
-        total_orders = len(self.orders) + len(self.order_history)
+        total_orders = len(self.orders) + self._archived_total
         active_orders = len(self.orders)
-        filled_orders = len(
-            [o for o in self.order_history if o.status == OrderStatus.FILLED]
-        )
-        cancelled_orders = len(
-            [o for o in self.order_history if o.status == OrderStatus.CANCELLED]
-        )
+        filled_orders = self._archived_counts[OrderStatus.FILLED]
+        cancelled_orders = self._archived_counts[OrderStatus.CANCELLED]
 
         return {
             "total_orders": total_orders,
@@ -395,6 +495,151 @@ class OrderManager:
             )
             return False
 
+    def _add(self, order: Order) -> None:
+        """登记订单并写入各索引
+
+        Args:
+            order: 订单对象
+        """
+        order_id = order.order_id
+        self.orders[order_id] = order
+        self._by_symbol[order.symbol][order_id] = order
+        self._by_status[order.status][order_id] = order
+        if order.account_id is not None:
+            self._by_account[order.account_id][order_id] = order
+        strategy_name = order.metadata.get("strategy_name")
+        if strategy_name is not None:
+            self._by_strategy[strategy_name][order_id] = order
+        if order.status in TERMINAL_STATUSES:
+            self._completed[order_id] = order
+            self._enforce_retention()
+
+    def _set_status(self, order: Order, status: OrderStatus) -> None:
+        """更新订单状态并同步状态索引，订单进入终态时检查内存上限
+
+        Args:
+            order: 订单对象
+            status: 新状态
+        """
+        order_id = order.order_id
+        if self.orders.get(order_id) is not order:
+            # 未登记的订单只更新状态
+            order.status = status
+            return
+
+        self._by_status[order.status].pop(order_id, None)
+        order.status = status
+        self._by_status[status][order_id] = order
+        if status in TERMINAL_STATUSES:
+            self._completed[order_id] = order
+            self._enforce_retention()
+        else:
+            self._completed.pop(order_id, None)
+
+    def _enforce_retention(self) -> None:
+        """内存订单超过上限时归档最早完结的订单"""
+        if self.max_orders_in_memory is None:
+            return
+
+        excess = len(self.orders) - self.max_orders_in_memory
+        if excess <= 0 or not self._completed:
+            return
+
+        oldest = []
+        for order in self._completed.values():
+            oldest.append(order)
+            if len(oldest) >= excess:
+                break
+        self._archive(oldest)
+
+    def _archive(self, orders: List[Order]) -> None:
+        """把订单移出内存索引，加入历史并写入归档存储
+
+        Args:
+            orders: 订单列表
+        """
+        for order in orders:
+            order_id = order.order_id
+            del self.orders[order_id]
+            self._completed.pop(order_id, None)
+            self._remove_from(self._by_symbol, order.symbol, order_id)
+            self._remove_from(self._by_status, order.status, order_id)
+            self._remove_from(self._by_account, order.account_id, order_id)
+            self._remove_from(
+                self._by_strategy, order.metadata.get("strategy_name"), order_id
+            )
+            self.order_history.append(order)
+            self._archived_counts[order.status] += 1
+            self._archived_total += 1
+
+        if self.archive_store is not None:
+            self._pending_archive.extend(self._to_record(o) for o in orders)
+            if len(self._pending_archive) >= self.archive_batch_size:
+                self.flush_archive()
+
+    def flush_archive(self) -> bool:
+        """把尚未写入的归档订单批量写入archive_store（关闭前应调用一次）
+
+        Returns:
+            是否写入成功，失败时记录保留到下次写入
+        """
+        if self.archive_store is None or not self._pending_archive:
+            return True
+        if not self.archive_store.save_orders(self._pending_archive):
+            logger.warning(
+                f"Failed to save {len(self._pending_archive)} archived orders"
+            )
+            return False
+        self._pending_archive = []
+        return True
+
+    @staticmethod
+    def _remove_from(
+        index: Dict[Any, Dict[str, Order]], key: Any, order_id: str
+    ) -> None:
+        """从某个索引分组中移除订单，分组为空时删除分组
+
+        Args:
+            index: 索引
+            key: 分组键
+            order_id: 订单ID
+        """
+        bucket = index.get(key)
+        if bucket is not None:
+            bucket.pop(order_id, None)
+            if not bucket:
+                del index[key]
+
+    @staticmethod
+    def _to_record(order: Order) -> Dict[str, Any]:
+        """转换为归档存储的订单记录
+
+        Args:
+            order: 订单对象
+
+        Returns:
+            记录字典
+        """
+        return {
+            "order_id": order.order_id,
+            "signal_id": order.signal_id,
+            "symbol": order.symbol,
+            "side": order.side,
+            "order_type": order.order_type.value,
+            "quantity": order.quantity,
+            "price": order.price,
+            "stop_price": order.stop_price,
+            "status": order.status.value,
+            "filled_quantity": order.filled_quantity,
+            "filled_price": order.filled_price,
+            "strategy_name": order.metadata.get("strategy_name"),
+            "created_at": order.created_at,
+            "updated_at": order.updated_at,
+            "submitted_time": order.submitted_time,
+            "filled_time": order.filled_time,
+            "metadata": str(order.metadata),
+        }
+
 
 # 全局订单管理器实例
 _global_order_manager: Optional[OrderManager] = None
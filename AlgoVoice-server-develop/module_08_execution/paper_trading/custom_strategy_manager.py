@@ -1,11 +1,14 @@
 ﻿"""
 自定义策略管理器
 """
-import sqlite3
 import json
+import sqlite3
 from datetime import datetime
-from typing import List, Dict, Optional
 from pathlib import Path
+from typing import Dict, List, Optional
+
+from common.db_connection_pool import pooled_connect
+
 
 class CustomStrategyManager:
     """自定义策略管理器"""
@@ -15,7 +18,7 @@ class CustomStrategyManager:
     
     def _init_database(self):
         """初始化数据库表"""
-        conn = sqlite3.connect(self.db_path)
+        conn = pooled_connect(self.db_path)
         cursor = conn.cursor()
         
         # 创建策略表
@@ -67,7 +70,7 @@ class CustomStrategyManager:
         import uuid
         strategy_id = f"strategy_{uuid.uuid4().hex[:8]}"
         
-        conn = sqlite3.connect(self.db_path)
+        conn = pooled_connect(self.db_path)
         cursor = conn.cursor()
         
         now = datetime.now().isoformat()
@@ -85,7 +88,7 @@ class CustomStrategyManager:
     
     def get_strategy(self, strategy_id: str) -> Optional[Dict]:
         """获取策略"""
-        conn = sqlite3.connect(self.db_path)
+        conn = pooled_connect(self.db_path)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
@@ -101,7 +104,7 @@ class CustomStrategyManager:
     
     def get_user_strategies(self, user_id: str) -> List[Dict]:
         """获取用户所有策略"""
-        conn = sqlite3.connect(self.db_path)
+        conn = pooled_connect(self.db_path)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
@@ -119,7 +122,7 @@ class CustomStrategyManager:
     
     def activate_strategy(self, strategy_id: str, is_active: bool = True) -> bool:
         """激活/停用策略"""
-        conn = sqlite3.connect(self.db_path)
+        conn = pooled_connect(self.db_path)
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -143,7 +146,7 @@ class CustomStrategyManager:
         error_message: str = None
     ):
         """记录策略执行"""
-        conn = sqlite3.connect(self.db_path)
+        conn = pooled_connect(self.db_path)
         cursor = conn.cursor()
         
         now = datetime.now().isoformat()
@@ -165,7 +168,7 @@ class CustomStrategyManager:
     
     def get_strategy_performance(self, strategy_id: str) -> Dict:
         """获取策略表现"""
-        conn = sqlite3.connect(self.db_path)
+        conn = pooled_connect(self.db_path)
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
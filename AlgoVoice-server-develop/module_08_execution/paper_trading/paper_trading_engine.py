@@ -12,6 +12,9 @@ class PaperTradingEngine:
     def __init__(self):
         self.accounts: Dict[str, PaperTradingAccount] = {}
         self.orders: Dict[str, Order] = {}
+        # 账户 -> {order_id: Order}，以及订单所属账户
+        self.account_orders: Dict[str, Dict[str, Order]] = {}
+        self.order_accounts: Dict[str, str] = {}
     
     def create_account(self, account_id: str, initial_cash: float = 1000000.0) -> PaperTradingAccount:
         """创建账户"""
@@ -42,6 +45,8 @@ class PaperTradingEngine:
         
         order.status = OrderStatus.SUBMITTED
         self.orders[order.order_id] = order
+        self.account_orders.setdefault(account_id, {})[order.order_id] = order
+        self.order_accounts[order.order_id] = account_id
         return True
     
     def execute_order(self, order_id: str, execution_price: float) -> bool:
@@ -50,7 +55,7 @@ class PaperTradingEngine:
         if not order or order.status != OrderStatus.SUBMITTED:
             return False
         
-        account = self.get_account(order.order_id.split("_")[0])  # 简化：从order_id提取account_id
+        account = self.get_account(self.order_accounts.get(order_id, order_id.split("_")[0]))
         if not account:
             return False
         
@@ -104,5 +109,5 @@ class PaperTradingEngine:
     
     def get_orders(self, account_id: str) -> List[Order]:
         """获取账户所有订单"""
-        return [o for o in self.orders.values() if o.order_id.startswith(account_id)]
+        return list(self.account_orders.get(account_id, {}).values())
 
@@ -3,7 +3,7 @@
 """
 
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Any, Callable, Dict, List, Optional
 
 import numpy as np
@@ -18,6 +18,24 @@ from .database_manager import get_backtest_database_manager
 logger = setup_logger("backtest_engine")
 
 
+def _to_trading_days(index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    """将时间索引转换为不带时区的交易日（按当地日期，去掉时间部分）
+
+    带时区的行情按其当地日期归属交易日，与 ``index.date`` 的匹配方式一致。
+    """
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.normalize()
+
+
+def _to_trading_day(value) -> pd.Timestamp:
+    """将单个日期转换为不带时区的交易日"""
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_localize(None)
+    return timestamp.normalize()
+
+
 @dataclass
 class BacktestConfig:
     """回测配置"""
@@ -78,6 +96,13 @@ class BacktestEngine:
         self.market_data: Dict[str, pd.DataFrame] = {}
         self.risk_controller = risk_controller  # 新增：风险控制器
 
+        # 交易日历索引（在load_market_data中构建）
+        self.trading_calendar: pd.DatetimeIndex = pd.DatetimeIndex([])
+        self._index_symbols: List[str] = []
+        self._date_positions: np.ndarray = np.empty((0, 0), dtype=np.int64)
+        self._index_stale = False
+        self._panel_cache: Dict[str, pd.DataFrame] = {}
+
         # 生成唯一的backtest_id
         import uuid
 
@@ -144,10 +169,65 @@ class BacktestEngine:
                 else:
                     logger.warning(f"No data found for {symbol}")
 
+            self._build_trading_index()
+
         except Exception as e:
             logger.error(f"Failed to load market data: {e}")
             raise QuantSystemError(f"Market data loading failed: {e}")
 
+    def _build_trading_index(self):
+        """构建交易日历及每只股票的日期→行号索引
+
+        交易日历为所有股票交易日期（按当地日期归一化、去掉时区）的并集。
+        ``_date_positions[i, j]`` 为第i只股票在第j个交易日对应的行号，
+        无数据时为-1，这样每个交易日只需一次O(股票数)的数组取值。
+        """
+        normalized = {
+            symbol: _to_trading_days(df.index)
+            for symbol, df in self.market_data.items()
+        }
+
+        indexes = list(normalized.values())
+        if indexes:
+            calendar = indexes[0].append(indexes[1:]).unique().sort_values()
+        else:
+            calendar = pd.DatetimeIndex([])
+        self.trading_calendar = pd.DatetimeIndex(calendar)
+
+        self._index_symbols = list(normalized.keys())
+        positions = np.full(
+            (len(self._index_symbols), len(self.trading_calendar)), -1, dtype=np.int64
+        )
+        for i, symbol in enumerate(self._index_symbols):
+            index = normalized[symbol]
+            if len(index) == 0:
+                continue
+            # 同一日期有多条记录时取第一条，与逐行匹配时的行为一致
+            first_rows = np.flatnonzero(~index.duplicated(keep="first"))
+            columns = self.trading_calendar.get_indexer(index[first_rows])
+            positions[i, columns] = first_rows
+
+        self._date_positions = positions
+        self._panel_cache = {}
+        self._index_stale = False
+        logger.debug(
+            f"Built trading index: {len(self.trading_calendar)} dates x "
+            f"{len(self._index_symbols)} symbols"
+        )
+
+    def invalidate_trading_index(self):
+        """标记交易日历索引失效
+
+        绕过load_market_data直接修改market_data（增删股票、原地修改行情）后
+        需要调用，下次使用索引时重建。
+        """
+        self._index_stale = True
+
+    def _ensure_trading_index(self):
+        """索引被标记失效时重建"""
+        if self._index_stale:
+            self._build_trading_index()
+
     def set_strategy(self, strategy_func: Callable):
         """设置策略函数
 
@@ -187,6 +267,7 @@ class BacktestEngine:
             logger.info(f"🔍 Generated {len(trading_dates)} trading dates")
 
             # 逐日回测
+            date_columns = self._trading_date_columns(trading_dates)
             for i, date in enumerate(trading_dates):
                 if i % 50 == 0:  # 每50天打印一次
                     logger.info(
@@ -201,7 +282,7 @@ class BacktestEngine:
                             f"处理交易日 {date.strftime('%Y-%m-%d')}",
                         )
 
-                self._process_trading_day(date)
+                self._process_trading_day(date, date_columns[i])
 
             # 计算回测结果
             result = self._calculate_results()
@@ -225,62 +306,308 @@ class BacktestEngine:
             logger.error(f"Backtest failed: {e}")
             raise QuantSystemError(f"Backtest execution failed: {e}")
 
+    def get_price_panel(self, field: str = "close") -> pd.DataFrame:
+        """获取(交易日 × 股票)的行情面板
+
+        Args:
+            field: 行情字段，如close、open、volume
+
+        Returns:
+            以交易日历为索引、股票代码为列的DataFrame，缺失为NaN
+        """
+        self._ensure_trading_index()
+
+        cached = self._panel_cache.get(field)
+        if cached is not None:
+            return cached
+
+        values = np.full(self._date_positions.shape, np.nan)
+        for i, symbol in enumerate(self._index_symbols):
+            df = self.market_data[symbol]
+            if field not in df.columns:
+                continue
+            rows = self._date_positions[i]
+            has_row = rows >= 0
+            column = df[field].to_numpy(dtype=float)
+            values[i, has_row] = column[rows[has_row]]
+
+        panel = pd.DataFrame(
+            values.T, index=self.trading_calendar, columns=self._index_symbols
+        )
+        self._panel_cache[field] = panel
+        return panel
+
+    def run_vectorized(
+        self,
+        strategy: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+        signal_type: str = "weights",
+        record_trades: bool = True,
+    ) -> BacktestResult:
+        """以列式向量化方式运行回测
+
+        策略一次性返回(交易日 × 股票)的目标权重或信号矩阵，成交、手续费、
+        滑点、现金和权益曲线均以NumPy数组运算在整个面板上完成，适合参数寻优等
+        需要大量重复回测的场景。依赖持仓路径的策略（如风控触发减仓）仍应使用
+        事件驱动的 ``run``。
+
+        约定:
+            - 第t日的目标权重在第t日收盘价成交，从第t+1日起承担收益；
+            - 换手部分按 ``commission_rate + slippage_bps`` 扣除成本；
+            - 仅支持多头，负权重视为0，单日权重和超过1时按比例缩放；
+            - 停牌（缺失价格）日沿用前收盘价，上市前的权重视为0；
+            - 向量化模式不跟踪逐笔持仓成本，交易记录不含realized_pnl。
+
+        Args:
+            strategy: 策略函数，输入收盘价面板，返回与其对齐的权重/信号矩阵；
+                未提供时使用 ``set_strategy`` 设置的函数
+            signal_type: "weights" 表示目标权重；"signals" 表示信号矩阵，
+                正值的股票等权持有
+            record_trades: 是否生成逐笔交易记录；参数寻优时可关闭以省去
+                记录构建开销（交易次数仍会统计）
+
+        Returns:
+            回测结果
+        """
+        try:
+            strategy = strategy or self.strategy_func
+            if not strategy:
+                raise QuantSystemError("Strategy function not set")
+
+            if not self.market_data:
+                raise QuantSystemError("Market data not loaded")
+
+            trading_dates = self._generate_trading_dates()
+            if not trading_dates:
+                raise QuantSystemError("No trading dates in backtest range")
+
+            prices = self.get_price_panel("close").loc[trading_dates]
+            logger.info(
+                f"Starting vectorized backtest: {prices.shape[0]} dates x "
+                f"{prices.shape[1]} symbols"
+            )
+
+            raw = strategy(prices)
+            if not isinstance(raw, pd.DataFrame):
+                raise QuantSystemError(
+                    "Vectorized strategy must return a DataFrame of weights/signals"
+                )
+            targets = self._normalize_target_weights(
+                raw.reindex(index=prices.index, columns=prices.columns),
+                signal_type,
+            )
+
+            equity_df, trades, n_trades = self._simulate_weights(
+                prices, targets, record_trades
+            )
+            self.trades = trades
+            self.equity_curve = equity_df.reset_index().to_dict("records")
+            final_capital = float(equity_df["equity"].iloc[-1])
+            self.current_capital = float(equity_df["cash"].iloc[-1])
+
+            result = self._calculate_results(equity_df, final_capital)
+            result.total_trades = n_trades
+            result.performance_metrics["total_trades"] = n_trades
+
+            if self.config.save_to_db:
+                self._save_to_database(result)
+
+            if self.progress_callback:
+                self._call_progress_callback(
+                    len(trading_dates), len(trading_dates), "回测完成"
+                )
+
+            logger.info(
+                f"Vectorized backtest completed. Final capital: {final_capital:.2f}"
+            )
+            return result
+
+        except Exception as e:
+            logger.error(f"Vectorized backtest failed: {e}")
+            raise QuantSystemError(f"Vectorized backtest execution failed: {e}")
+
+    def _normalize_target_weights(
+        self, raw: pd.DataFrame, signal_type: str
+    ) -> np.ndarray:
+        """将策略输出转换为合法的目标权重矩阵
+
+        Args:
+            raw: 与价格面板对齐的策略输出
+            signal_type: "weights" 或 "signals"
+
+        Returns:
+            目标权重数组 (交易日 × 股票)
+        """
+        values = raw.to_numpy(dtype=float)
+        values = np.nan_to_num(values, nan=0.0)
+
+        if signal_type == "signals":
+            held = values > 0
+            counts = held.sum(axis=1, keepdims=True)
+            weights = np.divide(
+                held.astype(float),
+                counts,
+                out=np.zeros_like(values),
+                where=counts > 0,
+            )
+        elif signal_type == "weights":
+            weights = np.clip(values, 0.0, None)
+            gross = weights.sum(axis=1, keepdims=True)
+            weights = np.divide(weights, gross, out=weights, where=gross > 1.0)
+        else:
+            raise QuantSystemError(f"Unknown signal type: {signal_type}")
+
+        return weights
+
+    def _simulate_weights(
+        self, prices: pd.DataFrame, targets: np.ndarray, record_trades: bool = True
+    ) -> tuple:
+        """在整个面板上模拟目标权重组合
+
+        Args:
+            prices: 收盘价面板 (交易日 × 股票)
+            targets: 目标权重数组 (交易日 × 股票)
+            record_trades: 是否生成交易记录
+
+        Returns:
+            (权益曲线DataFrame, 交易记录列表, 交易次数)
+        """
+        close = prices.ffill().to_numpy(dtype=float)
+        listed = ~np.isnan(close)
+        targets = np.where(listed, targets, 0.0)
+
+        asset_returns = np.zeros_like(close)
+        asset_returns[1:] = np.where(
+            listed[:-1], close[1:] / np.where(listed[:-1], close[:-1], 1.0) - 1, 0.0
+        )
+        asset_returns = np.nan_to_num(asset_returns, nan=0.0)
+
+        # 上一日目标权重经当日价格变动后的漂移权重（调仓前权重）
+        held = np.zeros_like(targets)
+        held[1:] = targets[:-1]
+        grown = held * (1 + asset_returns)
+        gross_return = grown.sum(axis=1) - held.sum(axis=1)
+        drifted = grown / (1 + gross_return)[:, None]
+
+        trade_weights = targets - drifted
+        turnover = np.abs(trade_weights).sum(axis=1)
+        cost_rate = self.config.commission_rate + self.config.slippage_bps / 10000
+
+        equity = self.config.initial_capital * np.cumprod(
+            (1 + gross_return) * (1 - turnover * cost_rate)
+        )
+        pre_trade_equity = np.empty_like(equity)
+        pre_trade_equity[0] = self.config.initial_capital
+        pre_trade_equity[1:] = equity[:-1] * (1 + gross_return[1:])
+
+        invested = targets.sum(axis=1)
+        equity_df = pd.DataFrame(
+            {"equity": equity, "cash": equity * (1 - invested)},
+            index=prices.index,
+        )
+        equity_df.index.name = "date"
+
+        traded = np.abs(trade_weights) > 1e-10
+        n_trades = int(traded.sum())
+        trades = []
+        if record_trades and n_trades:
+            trades = self._weight_trades(
+                prices.index,
+                prices.columns,
+                close,
+                trade_weights,
+                traded,
+                pre_trade_equity,
+            )
+        return equity_df, trades, n_trades
+
+    def _weight_trades(
+        self,
+        dates: pd.DatetimeIndex,
+        symbols: pd.Index,
+        close: np.ndarray,
+        trade_weights: np.ndarray,
+        traded: np.ndarray,
+        pre_trade_equity: np.ndarray,
+    ) -> List[Dict[str, Any]]:
+        """由权重变化生成交易记录
+
+        Args:
+            dates: 交易日期
+            symbols: 股票代码
+            close: 收盘价数组
+            trade_weights: 权重变化数组
+            traded: 发生交易的位置掩码
+            pre_trade_equity: 调仓前总资产
+
+        Returns:
+            交易记录列表
+        """
+        day_idx, sym_idx = np.nonzero(traded)
+
+        delta = trade_weights[day_idx, sym_idx]
+        slip = self.config.slippage_bps / 10000
+        price = close[day_idx, sym_idx] * np.where(delta > 0, 1 + slip, 1 - slip)
+        value = np.abs(delta) * pre_trade_equity[day_idx]
+
+        trades = pd.DataFrame(
+            {
+                "date": dates[day_idx].to_pydatetime(),
+                "symbol": symbols[sym_idx],
+                "action": np.where(delta > 0, "BUY", "SELL"),
+                "quantity": value / price,
+                "price": price,
+                "value": value,
+                "commission": value * self.config.commission_rate,
+            }
+        )
+        date_labels = np.asarray(dates.strftime("%Y%m%d"), dtype=object)
+        trades["signal_id"] = (
+            "vec_" + trades["symbol"].astype(str) + "_" + date_labels[day_idx]
+        )
+        return trades.to_dict("records")
+
     def _generate_trading_dates(self) -> List[datetime]:
         """生成交易日期
 
         Returns:
             交易日期列表
         """
-        dates = []
+        self._ensure_trading_index()
+
         # 统一转换为日期（去掉时间部分）
-        start_date = (
-            self.config.start_date.date()
-            if hasattr(self.config.start_date, "date")
-            else self.config.start_date
-        )
-        end_date = (
-            self.config.end_date.date()
-            if hasattr(self.config.end_date, "date")
-            else self.config.end_date
-        )
+        start_date = _to_trading_day(self.config.start_date)
+        end_date = _to_trading_day(self.config.end_date)
 
-        current_date = start_date
+        calendar = self.trading_calendar
+        mask = (calendar >= start_date) & (calendar <= end_date)
 
-        while current_date <= end_date:
-            # 检查是否有市场数据
-            has_data = False
-            for symbol, data in self.market_data.items():
-                # 比较日期部分
-                if any(idx.date() == current_date for idx in data.index):
-                    has_data = True
-                    break
+        # 转换为datetime以保持一致性
+        return list(calendar[mask].to_pydatetime())
 
-            if has_data:
-                # 将日期转换回datetime以保持一致性
-                dates.append(datetime.combine(current_date, datetime.min.time()))
+    def _trading_date_columns(self, trading_dates: List[datetime]) -> np.ndarray:
+        """将交易日期映射为交易日历中的列号
 
-            current_date += timedelta(days=1)
+        Args:
+            trading_dates: 交易日期列表
 
-        return dates
+        Returns:
+            列号数组（不在日历中的日期为-1）
+        """
+        self._ensure_trading_index()
+        return self.trading_calendar.get_indexer(
+            _to_trading_days(pd.DatetimeIndex(trading_dates))
+        )
 
-    def _process_trading_day(self, date: datetime):
+    def _process_trading_day(self, date: datetime, date_column: Optional[int] = None):
         """处理单个交易日
 
         Args:
             date: 交易日期
+            date_column: 交易日期在交易日历中的列号（可选，未提供时自动查找）
         """
         try:
-            # 获取当日市场数据 - 只比较日期部分
-            current_data = {}
-            target_date = date.date() if hasattr(date, "date") else date
-
-            for symbol, data in self.market_data.items():
-                # 查找匹配的日期
-                matching_dates = [
-                    idx for idx in data.index if idx.date() == target_date
-                ]
-                if matching_dates:
-                    current_data[symbol] = data.loc[matching_dates[0]]
+            # 获取当日市场数据
+            current_data = self._get_day_data(date, date_column)
 
             if not current_data:
                 return
@@ -397,6 +724,31 @@ class BacktestEngine:
         except Exception as e:
             logger.error(f"Error processing trading day {date}: {e}")
 
+    def _get_day_data(
+        self, date: datetime, date_column: Optional[int] = None
+    ) -> Dict[str, pd.Series]:
+        """按交易日历索引取出当日各股票的行情
+
+        Args:
+            date: 交易日期
+            date_column: 交易日期在交易日历中的列号（可选）
+
+        Returns:
+            股票代码到当日行情的字典
+        """
+        if date_column is None:
+            self._ensure_trading_index()
+            date_column = self.trading_calendar.get_indexer([_to_trading_day(date)])[0]
+        if date_column < 0:
+            return {}
+
+        rows = self._date_positions[:, date_column]
+        current_data = {}
+        for i in np.flatnonzero(rows >= 0):
+            symbol = self._index_symbols[i]
+            current_data[symbol] = self.market_data[symbol].iloc[rows[i]]
+        return current_data
+
     def _update_positions_value(self, current_data: Dict[str, pd.Series]):
         """更新持仓市值
 
@@ -583,15 +935,24 @@ class BacktestEngine:
             f"Executed sell: {sell_quantity} {signal.symbol} at {execution_price:.2f}"
         )
 
-    def _calculate_results(self) -> BacktestResult:
+    def _calculate_results(
+        self,
+        equity_df: Optional[pd.DataFrame] = None,
+        final_capital: Optional[float] = None,
+    ) -> BacktestResult:
         """计算回测结果
 
+        Args:
+            equity_df: 权益曲线（可选，默认由逐日记录的equity_curve构建）
+            final_capital: 最终资产（可选，默认按当前持仓计算）
+
         Returns:
             回测结果
         """
         try:
             # 计算基本指标
-            final_capital = self._calculate_total_equity()
+            if final_capital is None:
+                final_capital = self._calculate_total_equity()
             total_return = (
                 final_capital - self.config.initial_capital
             ) / self.config.initial_capital
@@ -601,9 +962,11 @@ class BacktestEngine:
             annualized_return = (1 + total_return) ** (365 / days) - 1
 
             # 计算权益曲线
-            equity_df = pd.DataFrame(self.equity_curve)
+            if equity_df is None:
+                equity_df = pd.DataFrame(self.equity_curve)
+                if not equity_df.empty:
+                    equity_df.set_index("date", inplace=True)
             if not equity_df.empty:
-                equity_df.set_index("date", inplace=True)
                 equity_returns = equity_df["equity"].pct_change().dropna()
 
                 # 计算波动率
@@ -13,6 +13,7 @@ from typing import Any, Dict, List, Optional, Tuple
 import numpy as np
 import pandas as pd
 
+from common.db_connection_pool import pooled_connect, pooled_connection
 from common.exceptions import QuantSystemError
 from common.logging_system import setup_logger
 
@@ -44,7 +45,7 @@ class BacktestDatabaseManager:
 
     def _initialize_database(self):
         """初始化数据库表结构"""
-        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        conn = pooled_connect(self.db_path, timeout=30.0)
         cursor = conn.cursor()
 
         # 创建回测结果主表
@@ -195,7 +196,7 @@ class BacktestDatabaseManager:
             是否保存成功
         """
         try:
-            with sqlite3.connect(self.db_path, timeout=30.0) as conn:
+            with pooled_connection(self.db_path, timeout=30.0) as conn:
                 cursor = conn.cursor()
 
                 # 准备数据
@@ -256,7 +257,7 @@ class BacktestDatabaseManager:
             是否保存成功
         """
         try:
-            with sqlite3.connect(self.db_path, timeout=30.0) as conn:
+            with pooled_connection(self.db_path, timeout=30.0) as conn:
                 cursor = conn.cursor()
 
                 for trade in trades:
@@ -323,7 +324,7 @@ class BacktestDatabaseManager:
             是否保存成功
         """
         try:
-            with sqlite3.connect(self.db_path, timeout=30.0) as conn:
+            with pooled_connection(self.db_path, timeout=30.0) as conn:
                 cursor = conn.cursor()
 
                 # 计算每日收益率和回撤
@@ -391,7 +392,7 @@ class BacktestDatabaseManager:
             是否保存成功
         """
         try:
-            with sqlite3.connect(self.db_path, timeout=30.0) as conn:
+            with pooled_connection(self.db_path, timeout=30.0) as conn:
                 cursor = conn.cursor()
 
                 for metric_name, metric_value in metrics.items():
@@ -425,7 +426,7 @@ class BacktestDatabaseManager:
             回测结果字典
         """
         try:
-            with sqlite3.connect(self.db_path, timeout=30.0) as conn:
+            with pooled_connection(self.db_path, timeout=30.0) as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.cursor()
 
@@ -456,7 +457,7 @@ class BacktestDatabaseManager:
             交易记录DataFrame
         """
         try:
-            with sqlite3.connect(self.db_path, timeout=30.0) as conn:
+            with pooled_connection(self.db_path, timeout=30.0) as conn:
                 query = "SELECT * FROM trades WHERE backtest_id = ? ORDER BY trade_date"
                 df = pd.read_sql_query(query, conn, params=(backtest_id,))
                 return df
@@ -475,7 +476,7 @@ class BacktestDatabaseManager:
             权益曲线DataFrame
         """
         try:
-            with sqlite3.connect(self.db_path, timeout=30.0) as conn:
+            with pooled_connection(self.db_path, timeout=30.0) as conn:
                 query = "SELECT * FROM equity_curve WHERE backtest_id = ? ORDER BY date"
                 df = pd.read_sql_query(query, conn, params=(backtest_id,))
                 if not df.empty:
@@ -500,7 +501,7 @@ class BacktestDatabaseManager:
             指标字典
         """
         try:
-            with sqlite3.connect(self.db_path, timeout=30.0) as conn:
+            with pooled_connection(self.db_path, timeout=30.0) as conn:
                 cursor = conn.cursor()
 
                 if category:
@@ -539,7 +540,7 @@ class BacktestDatabaseManager:
             回测列表DataFrame
         """
         try:
-            with sqlite3.connect(self.db_path, timeout=30.0) as conn:
+            with pooled_connection(self.db_path, timeout=30.0) as conn:
                 query = """
                     SELECT backtest_id, strategy_name, start_date, end_date,
                            total_return, sharpe_ratio, max_drawdown, total_trades,
@@ -565,7 +566,7 @@ class BacktestDatabaseManager:
             是否删除成功
         """
         try:
-            with sqlite3.connect(self.db_path, timeout=30.0) as conn:
+            with pooled_connection(self.db_path, timeout=30.0) as conn:
                 cursor = conn.cursor()
 
                 # 删除相关表数据
@@ -605,7 +606,7 @@ class BacktestDatabaseManager:
             统计信息字典
         """
         try:
-            with sqlite3.connect(self.db_path, timeout=30.0) as conn:
+            with pooled_connection(self.db_path, timeout=30.0) as conn:
                 cursor = conn.cursor()
 
                 stats = {}
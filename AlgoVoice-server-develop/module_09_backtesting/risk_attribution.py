@@ -9,6 +9,7 @@ from typing import Any, Dict, List, Optional, Tuple
 import numpy as np
 import pandas as pd
 from common.constants import TRADING_DAYS_PER_YEAR
+from common.covariance_estimator import estimate_covariance
 from common.logging_system import setup_logger
 from scipy.optimize import minimize
 from sklearn.decomposition import PCA
@@ -48,6 +49,8 @@ class RiskAttributor:
         self.portfolio_returns: Optional[pd.DataFrame] = None
         self.weights: Optional[np.ndarray] = None
         self.factor_returns: Optional[pd.DataFrame] = None
+        self._cov_matrix: Optional[pd.DataFrame] = None
+        self._corr_matrix: Optional[pd.DataFrame] = None
 
     def attribute_risk(
         self,
@@ -69,6 +72,10 @@ class RiskAttributor:
         self.weights = weights / weights.sum()  # 标准化权重
         self.factor_returns = factor_returns
 
+        # 协方差只估计一次，供各项分解共享
+        self._cov_matrix = None
+        self._annualized_covariance()
+
         # 计算总风险
         total_risk = self._calculate_portfolio_risk()
 
@@ -82,7 +89,7 @@ class RiskAttributor:
         component_var = self._calculate_component_var()
 
         # 相关性矩阵
-        correlation_matrix = portfolio_returns.corr()
+        correlation_matrix = self._corr_matrix
 
         # 因子贡献（如果提供了因子数据）
         factor_contributions = {}
@@ -102,17 +109,38 @@ class RiskAttributor:
             principal_components=principal_components,
         )
 
+    def _annualized_covariance(self) -> pd.DataFrame:
+        """年化协方差矩阵（同时计算相关性矩阵），同一批收益率只估计一次
+
+        收益率含缺失值时沿用pandas的成对删除口径（每对资产使用两者都有值的日期），
+        不含缺失值时由协方差估计器一次计算，结果与pandas一致。
+
+        Returns:
+            年化协方差DataFrame
+        """
+        if self._cov_matrix is None:
+            returns = self.portfolio_returns
+            if returns.isna().values.any():
+                self._cov_matrix = returns.cov() * TRADING_DAYS_PER_YEAR
+                self._corr_matrix = returns.corr()
+            else:
+                snapshot = estimate_covariance(returns)
+                self._cov_matrix = snapshot.to_frame(
+                    annualization=TRADING_DAYS_PER_YEAR
+                )
+                self._corr_matrix = snapshot.to_frame(correlation=True)
+        return self._cov_matrix
+
     def _calculate_portfolio_risk(self) -> float:
         """计算组合总风险
 
         Returns:
             年化风险（标准差）
         """
-        returns = self.portfolio_returns
         weights = self.weights
 
         # 计算协方差矩阵
-        cov_matrix = returns.cov() * TRADING_DAYS_PER_YEAR
+        cov_matrix = self._annualized_covariance()
 
         # 组合方差
         portfolio_variance = np.dot(weights.T, np.dot(cov_matrix, weights))
@@ -132,7 +160,7 @@ class RiskAttributor:
         weights = self.weights
 
         # 计算各资产的风险贡献
-        cov_matrix = returns.cov() * TRADING_DAYS_PER_YEAR
+        cov_matrix = self._annualized_covariance()
 
         # 单个资产风险
         individual_risks = {}
@@ -177,7 +205,7 @@ class RiskAttributor:
         returns = self.portfolio_returns
         weights = self.weights
 
-        cov_matrix = returns.cov() * TRADING_DAYS_PER_YEAR
+        cov_matrix = self._annualized_covariance()
         portfolio_risk = self._calculate_portfolio_risk()
 
         marginal_contributions = {}
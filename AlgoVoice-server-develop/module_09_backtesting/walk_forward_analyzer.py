@@ -6,15 +6,16 @@ Walk-forward分析器模块
 import json
 import pickle
 from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from functools import partial
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 from common.exceptions import QuantSystemError
 from common.logging_system import setup_logger
+from common.parallel_executor import ParallelTrialExecutor
 
 logger = setup_logger("walk_forward_analyzer")
 
@@ -66,7 +67,8 @@ class WalkForwardConfig:
     optimization_metric: str = "sharpe_ratio"  # 优化指标
     anchored: bool = False  # 是否锚定起始点
     parallel: bool = True  # 是否并行执行
-    max_workers: int = 4  # 最大工作线程数
+    max_workers: int = 4  # 最大工作进程数
+    parallel_backend: str = "thread"  # 并行方式：'thread'，或在独立脚本中使用 'process'
     save_results: bool = True  # 是否保存结果
 
     def validate(self) -> bool:
@@ -107,6 +109,35 @@ class WalkForwardResult:
         }
 
 
+def _process_window_task(
+    optimization_function: Callable,
+    backtest_function: Callable,
+    parameter_ranges: Dict[str, Any],
+    bounds: Tuple[int, int, int, int],
+    data: pd.DataFrame,
+) -> Tuple[Dict[str, Any], Dict[str, float], Dict[str, float]]:
+    """在工作进程中处理单个窗口（并行执行器的目标函数）
+
+    Args:
+        optimization_function: 优化函数
+        backtest_function: 回测函数
+        parameter_ranges: 参数搜索范围
+        bounds: 窗口位置 (train_start, train_end, test_start, test_end)
+        data: 共享的完整数据集
+
+    Returns:
+        (最优参数, 样本内指标, 样本外指标)
+    """
+    train_start, train_end, test_start, test_end = bounds
+    train_data = data.iloc[train_start:train_end]
+    test_data = data.iloc[test_start:test_end]
+
+    optimal_params = optimization_function(train_data, parameter_ranges)
+    in_sample_metrics = backtest_function(train_data, optimal_params)
+    out_sample_metrics = backtest_function(test_data, optimal_params)
+    return optimal_params, in_sample_metrics, out_sample_metrics
+
+
 class WalkForwardAnalyzer:
     """Walk-forward分析器类"""
 
@@ -121,6 +152,9 @@ class WalkForwardAnalyzer:
         self.windows: List[WalkForwardWindow] = []
         self.optimization_function: Optional[Callable] = None
         self.backtest_function: Optional[Callable] = None
+        self.executor_stats: Optional[Dict[str, Any]] = None
+        # 各窗口在完整数据中的位置 (train_start, train_end, test_start, test_end)
+        self._window_bounds: List[Tuple[int, int, int, int]] = []
 
     def set_optimization_function(
         self, func: Callable[[pd.DataFrame, Dict[str, Any]], Dict[str, Any]]
@@ -169,7 +203,7 @@ class WalkForwardAnalyzer:
 
         # 执行分析
         if self.config.parallel:
-            self._run_parallel(parameter_ranges)
+            self._run_parallel(data, parameter_ranges)
         else:
             self._run_sequential(parameter_ranges)
 
@@ -194,6 +228,7 @@ class WalkForwardAnalyzer:
         """
         windows = []
         window_id = 0
+        self._window_bounds = []
 
         # 计算窗口起始位置
         if self.config.anchored:
@@ -216,6 +251,9 @@ class WalkForwardAnalyzer:
                 )
 
                 windows.append(window)
+                self._window_bounds.append(
+                    (train_start_idx, train_end_idx, test_start_idx, test_end_idx)
+                )
                 window_id += 1
 
                 # 步进
@@ -245,6 +283,9 @@ class WalkForwardAnalyzer:
                 )
 
                 windows.append(window)
+                self._window_bounds.append(
+                    (train_start_idx, train_end_idx, test_start_idx, test_end_idx)
+                )
                 window_id += 1
 
                 # 步进
@@ -262,29 +303,53 @@ class WalkForwardAnalyzer:
             self._process_window(window, parameter_ranges)
             logger.info(f"Processed window {window.window_id + 1}/{len(self.windows)}")
 
-    def _run_parallel(self, parameter_ranges: Dict[str, Any]) -> None:
+    def _run_parallel(
+        self, data: pd.DataFrame, parameter_ranges: Dict[str, Any]
+    ) -> None:
         """并行执行Walk-forward分析
 
+        完整数据集只写入一次共享内存映射，每个任务只传递窗口的位置区间。
+
         Args:
+            data: 完整数据集
             parameter_ranges: 参数搜索范围
         """
-        with ThreadPoolExecutor(max_workers=self.config.max_workers) as executor:
-            futures = {
-                executor.submit(self._process_window, window, parameter_ranges): window
-                for window in self.windows
-            }
+        objective = partial(
+            _process_window_task,
+            self.optimization_function,
+            self.backtest_function,
+            parameter_ranges,
+        )
+        with ParallelTrialExecutor(
+            objective,
+            n_workers=min(self.config.max_workers, max(1, len(self.windows))),
+            shared_data=data,
+            backend=self.config.parallel_backend,
+        ) as executor:
+            outcomes = executor.evaluate(self._window_bounds)
+            self.executor_stats = executor.get_stats()
+
+        completed = 0
+        for window, outcome in zip(self.windows, outcomes):
+            if not outcome.ok:
+                logger.error(
+                    f"Error processing window {window.window_id}: {outcome.error}"
+                )
+                continue
+            (
+                window.optimal_params,
+                window.in_sample_performance,
+                window.out_sample_performance,
+            ) = outcome.value
+            completed += 1
+            logger.info(
+                f"Processed window {window.window_id} ({completed}/{len(self.windows)})"
+            )
 
-            completed = 0
-            for future in as_completed(futures):
-                window = futures[future]
-                try:
-                    future.result()
-                    completed += 1
-                    logger.info(
-                        f"Processed window {window.window_id} ({completed}/{len(self.windows)})"
-                    )
-                except Exception as e:
-                    logger.error(f"Error processing window {window.window_id}: {e}")
+        logger.info(
+            f"Parallel utilization: {self.executor_stats['utilization']:.1%} "
+            f"({self.executor_stats['backend']}, {self.executor_stats['n_workers']} workers)"
+        )
 
     def _process_window(
         self, window: WalkForwardWindow, parameter_ranges: Dict[str, Any]
@@ -5,12 +5,12 @@
 
 import json
 import pickle
-import sqlite3
 from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from common.db_connection_pool import pooled_connect
 from common.exceptions import QuantSystemError
 from common.logging_system import setup_logger
 
@@ -63,7 +63,7 @@ class ConversationHistoryManager:
 
     def _init_database(self):
         """初始化数据库"""
-        conn = sqlite3.connect(self.db_path)
+        conn = pooled_connect(self.db_path)
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -303,7 +303,7 @@ class ConversationHistoryManager:
         Returns:
             是否成功
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = pooled_connect(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -402,7 +402,7 @@ class ConversationHistoryManager:
         Returns:
             对话记录列表
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = pooled_connect(self.db_path)
         cursor = conn.cursor()
 
         query = """
@@ -494,7 +494,7 @@ class ConversationHistoryManager:
         Returns:
             对话记录列表
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = pooled_connect(self.db_path)
         cursor = conn.cursor()
 
         query = "SELECT * FROM conversations WHERE user_id = ?"
@@ -571,7 +571,7 @@ class ConversationHistoryManager:
         Returns:
             匹配的对话记录
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = pooled_connect(self.db_path)
         cursor = conn.cursor()
 
         sql_query = """
@@ -664,7 +664,7 @@ class ConversationHistoryManager:
         Returns:
             统计信息字典
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = pooled_connect(self.db_path)
         cursor = conn.cursor()
 
         try:
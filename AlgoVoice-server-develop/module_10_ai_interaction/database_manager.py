@@ -9,6 +9,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from common.db_connection_pool import pooled_connect
 from common.logging_system import setup_logger
 
 logger = setup_logger("module10_database")
@@ -32,7 +33,7 @@ class Module10DatabaseManager:
 
     def _init_database(self):
         """初始化数据库表结构"""
-        conn = sqlite3.connect(self.db_path)
+        conn = pooled_connect(self.db_path)
         cursor = conn.cursor()
 
         # 用户需求表
@@ -221,7 +222,7 @@ class Module10DatabaseManager:
         Returns:
             需求ID
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = pooled_connect(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -270,7 +271,7 @@ class Module10DatabaseManager:
         Returns:
             需求记录列表
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = pooled_connect(self.db_path)
         cursor = conn.cursor()
 
         query = "SELECT * FROM user_requirements WHERE 1=1"
@@ -332,7 +333,7 @@ class Module10DatabaseManager:
         Returns:
             推荐ID
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = pooled_connect(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -384,7 +385,7 @@ class Module10DatabaseManager:
         Returns:
             推荐记录列表
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = pooled_connect(self.db_path)
         cursor = conn.cursor()
 
         query = "SELECT * FROM strategy_recommendations WHERE 1=1"
@@ -438,7 +439,7 @@ class Module10DatabaseManager:
         Returns:
             是否成功
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = pooled_connect(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -481,7 +482,7 @@ class Module10DatabaseManager:
         Returns:
             是否成功
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = pooled_connect(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -529,7 +530,7 @@ class Module10DatabaseManager:
         Returns:
             是否成功
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = pooled_connect(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -593,7 +594,7 @@ class Module10DatabaseManager:
         Returns:
             是否成功
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = pooled_connect(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -649,7 +650,7 @@ class Module10DatabaseManager:
         Returns:
             是否成功
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = pooled_connect(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -705,7 +706,7 @@ class Module10DatabaseManager:
         Returns:
             是否成功
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = pooled_connect(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -759,7 +760,7 @@ class Module10DatabaseManager:
         Returns:
             是否成功
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = pooled_connect(self.db_path)
         cursor = conn.cursor()
 
         try:
@@ -799,7 +800,7 @@ class Module10DatabaseManager:
         Returns:
             统计信息字典
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = pooled_connect(self.db_path)
         cursor = conn.cursor()
 
         stats = {}
@@ -868,7 +869,7 @@ class Module10DatabaseManager:
         Returns:
             收藏记录ID
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = pooled_connect(self.db_path)
         cursor = conn.cursor()
 
         tags_json = json.dumps(tags) if tags else None
@@ -921,7 +922,7 @@ class Module10DatabaseManager:
         Returns:
             是否成功移除
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = pooled_connect(self.db_path)
         cursor = conn.cursor()
 
         cursor.execute(
@@ -953,7 +954,7 @@ class Module10DatabaseManager:
         Returns:
             收藏对话列表
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = pooled_connect(self.db_path)
         cursor = conn.cursor()
 
         cursor.execute(
@@ -996,7 +997,7 @@ class Module10DatabaseManager:
         Returns:
             是否已收藏
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = pooled_connect(self.db_path)
         cursor = conn.cursor()
 
         cursor.execute(
@@ -1034,7 +1035,7 @@ class Module10DatabaseManager:
         Returns:
             是否更新成功
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = pooled_connect(self.db_path)
         cursor = conn.cursor()
 
         # 构建更新语句
@@ -11,6 +11,7 @@ from typing import Any, Dict, List, Optional
 
 import pandas as pd
 
+from common.db_connection_pool import pooled_connect
 from common.exceptions import DatabaseError
 from common.logging_system import setup_logger
 
@@ -44,7 +45,7 @@ class VisualizationDatabaseManager:
     def _get_connection(self) -> sqlite3.Connection:
         """获取数据库连接"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = pooled_connect(self.db_path, release_on_exit=True)
             conn.row_factory = sqlite3.Row
             return conn
         except Exception as e:
@@ -0,0 +1,128 @@
+"""
+预警规则评估基准测试
+对比每次指标更新都遍历全部规则逐条比较，与AlertManager按指标和阈值索引的规则引擎
+（每个指标一次二分查找）的单次check_rules耗时
+
+用法:
+    python scripts/benchmark_alert_rules.py --rules 1000 10000 --metrics 200 --batch 20
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+
+from module_06_monitoring_alerting.alert_system import (
+    AlertCategory,
+    AlertManager,
+    AlertRule,
+    AlertSeverity,
+)
+
+COMPARISONS = [">", "<", ">=", "<="]
+
+
+def make_rules(n_rules: int, n_metrics: int, seed: int = 42) -> list:
+    """生成分布在各指标上的阈值规则"""
+    rng = np.random.default_rng(seed)
+    rules = []
+    for i in range(n_rules):
+        metric = f"metric_{rng.integers(n_metrics)}"
+        comparison = COMPARISONS[rng.integers(len(COMPARISONS))]
+        # 阈值集中在分布尾部，每次更新只有少量规则触发
+        threshold = float(rng.normal(0, 1) + (3 if "<" not in comparison else -3))
+        rules.append(
+            AlertRule(
+                rule_id=f"rule_{i}",
+                name=f"rule_{i}",
+                description="benchmark",
+                category=AlertCategory.RISK,
+                severity=AlertSeverity.WARNING,
+                condition=f"{metric} {comparison} {threshold:.4f}",
+                threshold=threshold,
+                comparison=comparison,
+                metric=metric,
+                cooldown_seconds=0,
+            )
+        )
+    return rules
+
+
+def scan_rules(alert_manager: AlertManager, rules: list, metrics: dict) -> list:
+    """逐条遍历规则的基线实现（原check_rules的流程）"""
+    fired = []
+    for rule in rules:
+        if not rule.enabled or alert_manager._is_in_cooldown(rule.rule_id):
+            continue
+        if rule.metric not in metrics:
+            continue
+        value = metrics[rule.metric]
+        comparisons = {
+            ">": value > rule.threshold,
+            "<": value < rule.threshold,
+            ">=": value >= rule.threshold,
+            "<=": value <= rule.threshold,
+            "==": value == rule.threshold,
+            "!=": value != rule.threshold,
+        }
+        if comparisons.get(rule.comparison, False):
+            alert = alert_manager._create_alert(rule, value)
+            alert_manager._update_cooldown(rule.rule_id, rule.cooldown_seconds)
+            fired.append(alert.rule_id)
+    return fired
+
+
+def main():
+    parser = argparse.ArgumentParser(description="预警规则评估基准测试")
+    parser.add_argument("--rules", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--metrics", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=20, help="每次更新的指标数")
+    parser.add_argument("--updates", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    updates = []
+    for _ in range(args.updates):
+        size = min(args.batch, args.metrics)
+        names = rng.choice(args.metrics, size=size, replace=False)
+        values = rng.normal(0, 1, len(names))
+        updates.append({f"metric_{i}": float(v) for i, v in zip(names, values)})
+
+    print(f"\n{args.metrics} 个指标，每次更新其中 {args.batch} 个，单次评估耗时(ms)")
+    print(f"{'规则数':>8} {'逐条遍历':>10} {'索引引擎':>10} {'加速比':>8} {'平均触发数':>10}")
+
+    for n_rules in args.rules:
+        rules = make_rules(n_rules, args.metrics)
+        alert_manager = AlertManager()
+        for rule in rules:
+            alert_manager.add_rule(rule)
+
+        t0 = time.perf_counter()
+        expected = [scan_rules(alert_manager, rules, metrics) for metrics in updates]
+        scan_ms = (time.perf_counter() - t0) / args.updates * 1e3
+
+        t0 = time.perf_counter()
+        fired = [
+            [alert.rule_id for alert in alert_manager.check_rules(metrics)]
+            for metrics in updates
+        ]
+        engine_ms = (time.perf_counter() - t0) / args.updates * 1e3
+
+        # 两种实现触发的规则及顺序应一致
+        assert fired == expected
+        n_fired = np.mean([len(f) for f in fired])
+
+        print(
+            f"{n_rules:>8} {scan_ms:>10.3f} {engine_ms:>10.3f} "
+            f"{scan_ms / engine_ms:>8.1f} {n_fired:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
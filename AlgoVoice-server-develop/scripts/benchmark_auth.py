@@ -0,0 +1,107 @@
+"""
+令牌验证基准测试
+对比每个请求都查询会话并同步UPDATE last_activity + commit，与UserDatabase进程内
+会话缓存 + 后台批量写入的单次验证耗时（单线程与多线程并发轮询）
+
+用法:
+    python scripts/benchmark_auth.py --requests 2000 --threads 1 8
+"""
+
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from common.user_database import UserDatabase
+
+
+def verify_token_uncached(db_path: Path, token: str) -> tuple:
+    """每次查询并同步写入last_activity的基线实现（原verify_token）"""
+    with sqlite3.connect(db_path) as conn:
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT s.session_id, s.user_id, s.expires_at, s.is_valid,
+                   u.username, u.is_active, u.is_admin, u.permission_level
+            FROM user_sessions s
+            JOIN users u ON s.user_id = u.user_id
+            WHERE s.token = ?
+        """,
+            (token,),
+        )
+        session = cursor.fetchone()
+        if not session or not session["is_valid"] or not session["is_active"]:
+            return False, session["user_id"] if session else None
+        if datetime.now() > datetime.fromisoformat(session["expires_at"]):
+            return False, session["user_id"]
+        cursor.execute(
+            """
+            UPDATE user_sessions
+            SET last_activity = CURRENT_TIMESTAMP
+            WHERE session_id = ?
+        """,
+            (session["session_id"],),
+        )
+        conn.commit()
+        return True, session["user_id"]
+
+
+def run(verify, tokens: list, n_requests: int, n_threads: int) -> tuple:
+    """并发执行n_requests次验证，返回(单次平均耗时ms, 结果列表)"""
+    requests = [tokens[i % len(tokens)] for i in range(n_requests)]
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n_threads) as executor:
+        results = list(executor.map(verify, requests))
+    return (time.perf_counter() - t0) / n_requests * 1e3, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="令牌验证基准测试")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = UserDatabase(str(Path(tmp_dir) / "users.db"))
+        tokens = []
+        for i in range(args.users):
+            _, _, user_id = db.create_user(f"bench_user_{i}", "password123")
+            tokens.append(db.create_session(user_id)[2])
+
+        print(f"\n{args.users} 个会话，{args.requests} 次请求，单次验证耗时(ms)")
+        print(f"{'线程数':>6} {'同步写入':>10} {'缓存+批量':>10} {'加速比':>8}")
+
+        for n_threads in args.threads:
+            baseline_ms, expected = run(
+                lambda token: verify_token_uncached(db.db_path, token),
+                tokens,
+                args.requests,
+                n_threads,
+            )
+            cached_ms, results = run(
+                lambda token: db.verify_token(token), tokens, args.requests, n_threads
+            )
+
+            # 两种实现的验证结果应一致
+            assert [(valid, info["user_id"]) for valid, _, info in results] == expected
+
+            print(
+                f"{n_threads:>6} {baseline_ms:>10.4f} {cached_ms:>10.4f} "
+                f"{baseline_ms / cached_ms:>8.1f}"
+            )
+
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
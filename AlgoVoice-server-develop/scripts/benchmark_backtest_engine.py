@@ -0,0 +1,184 @@
+"""
+回测引擎基准测试
+1. 对比逐行扫描日期匹配与交易日历索引取数的耗时，验证股票数量扩展到数千只时的表现
+2. 对比均线参数扫描在事件驱动模式与向量化模式下的耗时
+
+用法:
+    python scripts/benchmark_backtest_engine.py --symbols 100 500 2000 --days 2500
+    python scripts/benchmark_backtest_engine.py --sweep --symbols 50 --days 1000
+"""
+
+import argparse
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+
+from common.data_structures import Signal
+from module_09_backtesting.backtest_engine import BacktestConfig, BacktestEngine
+
+
+def make_market_data(n_symbols: int, n_days: int, seed: int = 42):
+    """生成合成行情数据（每只股票随机缺失约5%的交易日）"""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2015-01-01", periods=n_days)
+    data = {}
+    for i in range(n_symbols):
+        keep = rng.random(n_days) > 0.05
+        close = 10 * np.exp(np.cumsum(rng.normal(0, 0.02, n_days)))[keep]
+        data[f"{i:06d}"] = pd.DataFrame(
+            {"close": close, "volume": rng.integers(1e5, 1e7, keep.sum())},
+            index=dates[keep],
+        )
+    return data, dates
+
+
+def legacy_scan(engine: BacktestEngine):
+    """原实现：逐日历日、逐股票扫描全部索引"""
+    start_date = engine.config.start_date.date()
+    end_date = engine.config.end_date.date()
+    current_date = start_date
+    while current_date <= end_date:
+        for data in engine.market_data.values():
+            matching = [idx for idx in data.index if idx.date() == current_date]
+            if matching:
+                data.loc[matching[0]]
+        current_date += timedelta(days=1)
+
+
+def indexed_scan(engine: BacktestEngine):
+    """交易日历索引：每个交易日一次O(股票数)的数组取值"""
+    trading_dates = engine._generate_trading_dates()
+    columns = engine._trading_date_columns(trading_dates)
+    for date, column in zip(trading_dates, columns):
+        engine._get_day_data(date, column)
+
+
+def make_engine(data, dates) -> BacktestEngine:
+    config = BacktestConfig(
+        start_date=dates[0].to_pydatetime(),
+        end_date=dates[-1].to_pydatetime(),
+        initial_capital=1_000_000,
+        save_to_db=False,
+    )
+    engine = BacktestEngine(config)
+    engine.load_market_data(list(data.keys()), data)
+    return engine
+
+
+def run_sweep(n_symbols: int, n_days: int, windows):
+    """均线择时参数扫描：事件驱动逐日回调 vs 向量化权重矩阵"""
+    data, dates = make_market_data(n_symbols, n_days)
+
+    event_seconds = 0.0
+    for window in windows:
+        frames = {}
+        for symbol, df in data.items():
+            df = df.copy()
+            df["ma"] = df["close"].rolling(window).mean()
+            frames[symbol] = df
+        engine = make_engine(frames, dates)
+        lot_value = engine.config.initial_capital / n_symbols
+
+        def strategy(current_data, positions, capital):
+            signals = []
+            for symbol, row in current_data.items():
+                above = row["close"] > row["ma"]
+                if above and symbol not in positions:
+                    quantity = int(lot_value / row["close"] / 100) * 100
+                    action = "BUY"
+                elif not above and symbol in positions:
+                    quantity = positions[symbol].quantity
+                    action = "SELL"
+                else:
+                    continue
+                signals.append(
+                    Signal(
+                        signal_id=f"{symbol}_{row.name:%Y%m%d}",
+                        symbol=symbol,
+                        action=action,
+                        price=row["close"],
+                        quantity=quantity,
+                        confidence=1.0,
+                        timestamp=row.name,
+                        strategy_name="MA",
+                        metadata={},
+                    )
+                )
+            return signals
+
+        engine.set_strategy(strategy)
+        t0 = time.perf_counter()
+        engine.run()
+        event_seconds += time.perf_counter() - t0
+
+    engine = make_engine(data, dates)
+    t0 = time.perf_counter()
+    for window in windows:
+        engine.run_vectorized(
+            lambda prices: prices > prices.rolling(window).mean(),
+            signal_type="signals",
+            record_trades=False,
+        )
+    vector_seconds = time.perf_counter() - t0
+
+    print(
+        f"{'symbols':>8} {'days':>6} {'trials':>6} {'event(s)':>10} {'vector(s)':>10}"
+    )
+    print(
+        f"{n_symbols:>8} {n_days:>6} {len(windows):>6} "
+        f"{event_seconds:>10.2f} {vector_seconds:>10.2f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="回测引擎交易日历索引基准测试")
+    parser.add_argument("--symbols", type=int, nargs="+", default=[50, 500, 2000])
+    parser.add_argument("--days", type=int, default=2500)
+    parser.add_argument(
+        "--legacy-max-cells",
+        type=int,
+        default=20_000,
+        help="股票数×交易日超过该值时跳过原实现（耗时过长）",
+    )
+    parser.add_argument("--sweep", action="store_true", help="运行均线参数扫描的模式对比")
+    parser.add_argument("--windows", type=int, nargs="+", default=[5, 10, 20, 60])
+    args = parser.parse_args()
+
+    if args.sweep:
+        for n_symbols in args.symbols:
+            run_sweep(n_symbols, args.days, args.windows)
+        return
+
+    print(
+        f"{'symbols':>8} {'days':>6} {'index(s)':>10} {'run(s)':>10} {'legacy(s)':>10}"
+    )
+    for n_symbols in args.symbols:
+        data, dates = make_market_data(n_symbols, args.days)
+
+        t0 = time.perf_counter()
+        engine = make_engine(data, dates)
+        t1 = time.perf_counter()
+        indexed_scan(engine)
+        t2 = time.perf_counter()
+
+        legacy = "skipped"
+        if n_symbols * args.days <= args.legacy_max_cells:
+            t3 = time.perf_counter()
+            legacy_scan(engine)
+            legacy = f"{time.perf_counter() - t3:10.2f}"
+
+        print(
+            f"{n_symbols:>8} {args.days:>6} {t1 - t0:>10.2f} {t2 - t1:>10.2f} {legacy:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
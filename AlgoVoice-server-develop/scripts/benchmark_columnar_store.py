@@ -0,0 +1,88 @@
+"""
+列式行情存储基准测试
+对比逐只股票 get_stock_prices（SQLite + read_sql_query）与
+get_stock_prices_panel（Feather列式存储，列和日期范围下推）加载多只股票的耗时
+
+用法:
+    python scripts/benchmark_columnar_store.py --symbols 100 500 --days 2500
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+
+from module_01_data_pipeline.storage_management.database_manager import DatabaseManager
+
+
+def make_price_frames(n_symbols: int, n_days: int, seed: int = 42):
+    """生成合成日线数据"""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2010-01-01", periods=n_days)
+    frames = {}
+    for i in range(n_symbols):
+        close = 10 * np.exp(np.cumsum(rng.normal(0, 0.02, n_days)))
+        frames[f"{i:06d}"] = pd.DataFrame(
+            {
+                "date": dates,
+                "open": close,
+                "high": close * 1.01,
+                "low": close * 0.99,
+                "close": close,
+                "volume": rng.integers(1e5, 1e7, n_days),
+                "amount": close * 1e6,
+                "pct_change": rng.normal(0, 2, n_days),
+            }
+        )
+    return frames, dates
+
+
+def main():
+    parser = argparse.ArgumentParser(description="列式行情存储基准测试")
+    parser.add_argument("--symbols", type=int, nargs="+", default=[100, 500])
+    parser.add_argument("--days", type=int, default=2500)
+    parser.add_argument("--window", type=int, default=500, help="读取最近多少个交易日")
+    args = parser.parse_args()
+
+    print(
+        f"{'symbols':>8} {'days':>6} {'sqlite(s)':>10} {'panel(s)':>10} "
+        f"{'panel close(s)':>15}"
+    )
+    for n_symbols in args.symbols:
+        frames, dates = make_price_frames(n_symbols, args.days)
+        symbols = list(frames)
+        start_date = dates[-args.window].strftime("%Y-%m-%d")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db = DatabaseManager(str(Path(tmp_dir) / "bench.db"))
+            db.save_stock_prices_bulk(frames)
+
+            t0 = time.perf_counter()
+            for symbol in symbols:
+                db.get_stock_prices(symbol, start_date=start_date)
+            sqlite_seconds = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            db.get_stock_prices_panel(symbols, start_date=start_date)
+            panel_seconds = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            db.get_stock_prices_panel(symbols, start_date=start_date, columns=["close"])
+            close_seconds = time.perf_counter() - t0
+
+        print(
+            f"{n_symbols:>8} {args.days:>6} {sqlite_seconds:>10.2f} "
+            f"{panel_seconds:>10.2f} {close_seconds:>15.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+增量协方差估计基准测试
+对比每来一行收益率就对最近window行重新计算协方差（DataFrame.cov / sklearn LedoitWolf），
+与IncrementalCovarianceEstimator以O(n²)增量更新维护的滚动窗口矩
+
+用法:
+    python scripts/benchmark_covariance.py --assets 50 200 --window 250 --updates 500
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+from sklearn.covariance import LedoitWolf
+
+from common.covariance_estimator import IncrementalCovarianceEstimator
+
+
+def make_returns(n_rows: int, n_assets: int, seed: int = 42) -> pd.DataFrame:
+    """生成单因子合成收益率"""
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0.0004, 0.01, (n_rows, 1))
+    returns = market + rng.normal(0.0, 0.02, (n_rows, n_assets))
+    return pd.DataFrame(returns, columns=[f"A{i}" for i in range(n_assets)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="增量协方差估计基准测试")
+    parser.add_argument("--assets", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--window", type=int, default=250)
+    parser.add_argument("--updates", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"\n滚动窗口 {args.window} 行，逐行追加 {args.updates} 次，单次更新耗时(ms)")
+    print(
+        f"{'资产数':>6} {'重算cov':>10} {'增量cov':>10} {'加速比':>8} "
+        f"{'重算LW':>10} {'增量LW':>10} {'加速比':>8} {'最大误差':>10}"
+    )
+
+    for n_assets in args.assets:
+        returns = make_returns(args.window + args.updates, n_assets)
+        values = returns.to_numpy()
+        start = args.window
+
+        t0 = time.perf_counter()
+        for i in range(start, len(returns)):
+            expected = returns.iloc[i - args.window + 1 : i + 1].cov().to_numpy()
+        recompute_ms = (time.perf_counter() - t0) / args.updates * 1e3
+
+        t0 = time.perf_counter()
+        for i in range(start, len(returns)):
+            LedoitWolf().fit(values[i - args.window + 1 : i + 1])
+        recompute_lw_ms = (time.perf_counter() - t0) / args.updates * 1e3
+
+        estimator = IncrementalCovarianceEstimator(window=args.window)
+        estimator.update_many(values[:start])
+        t0 = time.perf_counter()
+        for i in range(start, len(returns)):
+            estimator.update(values[i])
+        incremental_ms = (time.perf_counter() - t0) / args.updates * 1e3
+
+        t0 = time.perf_counter()
+        shrunk, shrinkage = estimator.ledoit_wolf()
+        incremental_lw_ms = incremental_ms + (time.perf_counter() - t0) * 1e3
+
+        # 最后一个窗口上的结果应与重新计算一致
+        error = np.abs(estimator.covariance() - expected).max()
+        lw = LedoitWolf().fit(values[-args.window :])
+        assert error < 1e-12
+        assert np.isclose(shrinkage, lw.shrinkage_)
+        assert np.allclose(shrunk, lw.covariance_)
+
+        print(
+            f"{n_assets:>6} {recompute_ms:>10.3f} {incremental_ms:>10.3f} "
+            f"{recompute_ms / incremental_ms:>8.1f} {recompute_lw_ms:>10.3f} "
+            f"{incremental_lw_ms:>10.3f} {recompute_lw_ms / incremental_lw_ms:>8.1f} "
+            f"{error:>10.1e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+数据库批量写入基准测试
+对比逐行INSERT（iterrows + 每行一次execute）与批量写入接口的写入速度(行/秒)
+
+用法:
+    python scripts/benchmark_database_writes.py --symbols 50 --days 2500
+"""
+
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+
+from module_01_data_pipeline.storage_management.database_manager import DatabaseManager
+
+
+def make_price_frames(n_symbols: int, n_days: int, seed: int = 42):
+    """生成合成日线数据"""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2010-01-01", periods=n_days).strftime("%Y-%m-%d")
+    frames = {}
+    for i in range(n_symbols):
+        close = 10 * np.exp(np.cumsum(rng.normal(0, 0.02, n_days)))
+        frames[f"{i:06d}"] = pd.DataFrame(
+            {
+                "date": dates,
+                "open": close * (1 + rng.normal(0, 0.005, n_days)),
+                "high": close * 1.01,
+                "low": close * 0.99,
+                "close": close,
+                "volume": rng.integers(1e5, 1e7, n_days),
+                "amount": close * 1e6,
+                "pct_change": rng.normal(0, 2, n_days),
+            }
+        )
+    return frames
+
+
+def legacy_row_inserts(db_path: Path, frames):
+    """原写入方式：每只股票新建连接，逐行构造记录并执行INSERT"""
+    for symbol, df in frames.items():
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+        for _, row in df.iterrows():
+            cursor.execute(
+                """
+                INSERT OR REPLACE INTO stock_prices
+                (symbol, date, open, high, low, close, volume, amount,
+                 pct_change, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
+                """,
+                (
+                    symbol,
+                    pd.to_datetime(row["date"]).strftime("%Y-%m-%d"),
+                    float(row["open"]),
+                    float(row["high"]),
+                    float(row["low"]),
+                    float(row["close"]),
+                    int(row["volume"]),
+                    float(row["amount"]),
+                    float(row["pct_change"]),
+                ),
+            )
+        conn.commit()
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="数据库批量写入基准测试")
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--days", type=int, default=2500)
+    args = parser.parse_args()
+
+    frames = make_price_frames(args.symbols, args.days)
+    total_rows = args.symbols * args.days
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        results = {}
+
+        legacy_db = DatabaseManager(str(Path(tmp_dir) / "legacy.db"))
+        t0 = time.perf_counter()
+        legacy_row_inserts(legacy_db.db_path, frames)
+        results["逐行INSERT"] = time.perf_counter() - t0
+
+        per_symbol_db = DatabaseManager(str(Path(tmp_dir) / "per_symbol.db"))
+        t0 = time.perf_counter()
+        for symbol, df in frames.items():
+            per_symbol_db.save_stock_prices(symbol, df)
+        results["save_stock_prices"] = time.perf_counter() - t0
+
+        bulk_db = DatabaseManager(str(Path(tmp_dir) / "bulk.db"))
+        t0 = time.perf_counter()
+        bulk_db.save_stock_prices_bulk(frames)
+        results["save_stock_prices_bulk"] = time.perf_counter() - t0
+
+    print(f"\n写入 {total_rows:,} 行 ({args.symbols} 只股票 × {args.days} 天)")
+    print(f"{'方式':<24} {'耗时(s)':>10} {'行/秒':>12}")
+    for name, seconds in results.items():
+        print(f"{name:<24} {seconds:>10.2f} {total_rows / seconds:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
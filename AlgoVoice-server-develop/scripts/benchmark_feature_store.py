@@ -0,0 +1,108 @@
+"""
+特征存储基准测试
+对比逐值存储（每个指标值一行，读取时透视）与特征矩阵块存储的写入、读取耗时和数据库大小
+
+用法:
+    python scripts/benchmark_feature_store.py --symbols 50 --days 1000 --features 30
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+
+from module_02_feature_engineering.storage_management.feature_database_manager import (
+    FeatureDatabaseManager,
+)
+
+
+def make_feature_frames(n_symbols: int, n_days: int, n_features: int, seed: int = 42):
+    """生成合成特征矩阵"""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2015-01-01", periods=n_days)
+    columns = [f"feature_{i:02d}" for i in range(n_features)]
+    return {
+        f"{i:06d}": pd.DataFrame(
+            rng.normal(size=(n_days, n_features)).cumsum(axis=0),
+            index=dates,
+            columns=columns,
+        )
+        for i in range(n_symbols)
+    }
+
+
+def legacy_save(db: FeatureDatabaseManager, symbol: str, df: pd.DataFrame):
+    """原存储方式：每个 (symbol, date, indicator) 一行"""
+    long = df.stack().reset_index()
+    long.columns = ["date", "indicator_name", "indicator_value"]
+    long["date"] = long["date"].dt.strftime("%Y-%m-%d")
+    conn = db._get_connection()
+    conn.executemany(
+        """
+        INSERT OR REPLACE INTO technical_indicators
+        (symbol, date, indicator_name, indicator_value, metadata)
+        VALUES (?, ?, ?, ?, NULL)
+    """,
+        [(symbol, *row) for row in long.itertuples(index=False)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="特征存储基准测试")
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--days", type=int, default=1000)
+    parser.add_argument("--features", type=int, default=30)
+    args = parser.parse_args()
+
+    frames = make_feature_frames(args.symbols, args.days, args.features)
+    symbols = list(frames)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        legacy_path = os.path.join(tmp_dir, "legacy.db")
+        legacy_db = FeatureDatabaseManager(legacy_path)
+        t0 = time.perf_counter()
+        for symbol, df in frames.items():
+            legacy_save(legacy_db, symbol, df)
+        legacy_write = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        for symbol in symbols:
+            legacy_db._get_legacy_features(
+                "technical_indicators", "indicator_name", "indicator_value", symbol
+            )
+        legacy_read = time.perf_counter() - t0
+
+        block_path = os.path.join(tmp_dir, "blocks.db")
+        block_db = FeatureDatabaseManager(block_path)
+        t0 = time.perf_counter()
+        for symbol, df in frames.items():
+            block_db.save_feature_matrix("technical", symbol, df)
+        block_write = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        block_db.get_feature_panel("technical", symbols)
+        block_read = time.perf_counter() - t0
+
+        legacy_mb = os.path.getsize(legacy_path) / 1024 / 1024
+        block_mb = os.path.getsize(block_path) / 1024 / 1024
+
+    print(
+        f"\n{args.symbols} 只股票 × {args.days} 天 × {args.features} 个特征"
+        f" ({args.symbols * args.days * args.features:,} 个值)"
+    )
+    print(f"{'方式':<12} {'写入(s)':>10} {'读取(s)':>10} {'大小(MB)':>10}")
+    print(f"{'逐值存储':<12} {legacy_write:>10.2f} {legacy_read:>10.2f} {legacy_mb:>10.1f}")
+    print(f"{'矩阵块':<12} {block_write:>10.2f} {block_read:>10.2f} {block_mb:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+市场数据异步缓存基准测试
+模拟前端并发轮询：缓存每隔ttl秒过期，上游接口耗时--latency秒。对比原先
+"内存缓存 → 限流后各自请求上游"的流程，与AsyncCache合并并发未命中 + 过期后
+返回旧值并后台刷新的上游请求次数、拿到空数据的请求数和请求延迟（延迟不含
+首轮冷启动）
+
+用法:
+    python scripts/benchmark_market_cache.py --clients 50 200 --rounds 20
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+
+from common.cache_manager import AsyncCache, MarketDataCache, MemoryCache
+
+
+class Upstream:
+    """模拟外部数据源"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    async def fetch(self) -> dict:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return {"data": {"indices": [{"code": "000001", "version": self.calls}]}}
+
+
+async def baseline_request(market_cache: MarketDataCache, upstream: Upstream, ttl):
+    """原接口流程：命中返回；未命中时抢到限流令牌的请求访问上游，其余返回空数据"""
+    cached = market_cache.get_market_indices()
+    if cached:
+        return cached
+    if not market_cache.should_fetch_from_source("indices", min_interval=0.05):
+        return {"data": {"indices": []}}
+    result = await upstream.fetch()
+    market_cache.set_market_indices(result, ttl=ttl, stale_ttl=0)
+    return result
+
+
+async def cached_request(async_cache: AsyncCache, upstream: Upstream, ttl):
+    """AsyncCache流程"""
+    result, _ = await async_cache.get_or_fetch(
+        "market:indices", upstream.fetch, ttl=ttl
+    )
+    return result
+
+
+async def simulate(request, n_clients: int, rounds: int, interval: float) -> tuple:
+    """每隔interval秒发起一轮n_clients个并发请求
+
+    Returns:
+        (首轮之后各请求的延迟ms, 空数据请求数)
+    """
+    latencies = []
+    empty = 0
+
+    async def timed(record: bool):
+        start = time.perf_counter()
+        result = await request()
+        if record:
+            latencies.append((time.perf_counter() - start) * 1e3)
+        return result
+
+    for round_index in range(rounds):
+        results = await asyncio.gather(
+            *[timed(round_index > 0) for _ in range(n_clients)]
+        )
+        empty += sum(1 for result in results if not result["data"]["indices"])
+        await asyncio.sleep(interval)
+    return np.array(latencies), empty
+
+
+def main():
+    parser = argparse.ArgumentParser(description="市场数据异步缓存基准测试")
+    parser.add_argument("--clients", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--ttl", type=float, default=0.5, help="缓存有效期（秒）")
+    parser.add_argument("--latency", type=float, default=0.2, help="上游耗时（秒）")
+    parser.add_argument("--interval", type=float, default=0.1, help="轮询间隔（秒）")
+    args = parser.parse_args()
+
+    print(f"\n{args.rounds} 轮并发轮询，缓存 {args.ttl}s 过期，上游耗时 {args.latency}s")
+    print(
+        f"{'并发数':>6} {'实现':>10} {'上游请求':>8} {'空数据':>8} "
+        f"{'p50(ms)':>10} {'p99(ms)':>10} {'max(ms)':>10}"
+    )
+
+    for n_clients in args.clients:
+        rows = []
+
+        memory_cache = MemoryCache()
+        market_cache = MarketDataCache(memory_cache)
+        upstream = Upstream(args.latency)
+        latencies, empty = asyncio.run(
+            simulate(
+                lambda: baseline_request(market_cache, upstream, args.ttl),
+                n_clients,
+                args.rounds,
+                args.interval,
+            )
+        )
+        rows.append(("逐请求", upstream.calls, empty, latencies))
+
+        async_cache = AsyncCache(MemoryCache(), stale_ttl=60)
+        upstream = Upstream(args.latency)
+        latencies, empty = asyncio.run(
+            simulate(
+                lambda: cached_request(async_cache, upstream, args.ttl),
+                n_clients,
+                args.rounds,
+                args.interval,
+            )
+        )
+        rows.append(("AsyncCache", upstream.calls, empty, latencies))
+
+        # 合并后不会有请求拿到空数据
+        assert rows[1][2] == 0
+
+        for name, calls, empty, latencies in rows:
+            print(
+                f"{n_clients:>6} {name:>10} {calls:>8} {empty:>8} "
+                f"{np.percentile(latencies, 50):>10.2f} "
+                f"{np.percentile(latencies, 99):>10.2f} {latencies.max():>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+市场监控行情存储基准测试
+对比每个tick都pd.concat + tail维护价格/成交量DataFrame并从头计算检测器统计，
+与MarketMonitor环形缓冲区O(1)追加 + 增量滚动统计的单次更新耗时
+
+用法:
+    python scripts/benchmark_market_monitor.py --symbols 100 500 --ticks 500
+"""
+
+import argparse
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+
+from common.data_structures import MarketData
+from module_06_monitoring_alerting.real_time_monitoring import MarketMonitor
+
+
+def make_ticks(n_ticks: int, n_symbols: int, seed: int = 42) -> list:
+    """生成逐tick的行情批次"""
+    rng = np.random.default_rng(seed)
+    symbols = [f"S{i}" for i in range(n_symbols)]
+    prices = 100 * np.cumprod(1 + rng.normal(0, 0.02, (n_ticks, n_symbols)), axis=0)
+    volumes = rng.integers(1000, 5000, (n_ticks, n_symbols))
+    start = datetime(2024, 1, 1)
+    batches = []
+    for t in range(n_ticks):
+        timestamp = start + timedelta(seconds=t)
+        batches.append(
+            [
+                MarketData(symbol, timestamp, price, price, price, price, int(volume))
+                for symbol, price, volume in zip(symbols, prices[t], volumes[t])
+            ]
+        )
+    return batches
+
+
+class ConcatStore:
+    """逐tick拼接DataFrame的基线实现"""
+
+    def __init__(self, lookback: int):
+        self.lookback = lookback
+        self.price_data = pd.DataFrame()
+        self.volume_data = pd.DataFrame()
+
+    def update(self, batch: list) -> tuple:
+        data_dict = defaultdict(dict)
+        volume_dict = defaultdict(dict)
+        for data in batch:
+            data_dict[data.symbol][data.timestamp] = data.close
+            volume_dict[data.symbol][data.timestamp] = data.volume
+        self.price_data = pd.concat([self.price_data, pd.DataFrame(data_dict)]).tail(
+            self.lookback
+        )
+        self.volume_data = pd.concat(
+            [self.volume_data, pd.DataFrame(volume_dict)]
+        ).tail(self.lookback)
+
+        # 三个检测器需要的统计
+        n_spikes = int((self.price_data.pct_change().iloc[-1].abs() > 0.05).sum())
+        n_surges = 0
+        if len(self.volume_data) >= 20:
+            ratio = self.volume_data.iloc[-1] / self.volume_data.tail(20).mean()
+            n_surges = int((ratio > 3).sum())
+        returns = self.price_data.pct_change().dropna()
+        volatility = returns.std().mean() * np.sqrt(252) if len(returns) > 0 else 0.0
+        return n_spikes, n_surges, volatility
+
+
+def main():
+    parser = argparse.ArgumentParser(description="市场监控行情存储基准测试")
+    parser.add_argument("--symbols", type=int, nargs="+", default=[100, 500])
+    parser.add_argument("--lookback", type=int, default=252)
+    parser.add_argument("--ticks", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"\n回看 {args.lookback} 行，逐tick更新 {args.ticks} 次，单次更新耗时(ms)")
+    print(f"{'标的数':>6} {'concat重算':>12} {'环形缓冲':>10} {'加速比':>8} {'波动率误差':>12}")
+
+    for n_symbols in args.symbols:
+        batches = make_ticks(args.ticks, n_symbols)
+
+        store = ConcatStore(args.lookback)
+        t0 = time.perf_counter()
+        for batch in batches:
+            expected = store.update(batch)
+        concat_ms = (time.perf_counter() - t0) / args.ticks * 1e3
+
+        symbols = [f"S{i}" for i in range(n_symbols)]
+        monitor = MarketMonitor(symbols, lookback_period=args.lookback)
+        t0 = time.perf_counter()
+        for batch in batches:
+            monitor._store_market_data(batch)
+            result = (
+                len(monitor._detect_price_spike()),
+                len(monitor._detect_volume_surge()),
+                monitor._calculate_market_volatility(),
+            )
+        ring_ms = (time.perf_counter() - t0) / args.ticks * 1e3
+
+        # 最后一个tick上两种实现的窗口和检测结果应一致
+        assert np.allclose(
+            monitor.price_data.to_numpy(), store.price_data.to_numpy(), equal_nan=True
+        )
+        assert result[:2] == expected[:2]
+        error = abs(result[2] - expected[2])
+        assert error < 1e-10
+
+        print(
+            f"{n_symbols:>6} {concat_ms:>12.3f} {ring_ms:>10.3f} "
+            f"{concat_ms / ring_ms:>8.1f} {error:>12.1e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
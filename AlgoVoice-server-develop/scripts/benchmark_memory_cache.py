@@ -0,0 +1,237 @@
+"""
+有界内存缓存基准测试
+对比原实现（FeatureCacheManager每次写入遍历全部条目清理过期、MemoryCache
+统计/清理时加锁扫描全部条目）与BoundedCache（过期堆 + 计数器 + 分片锁）的
+单次耗时，以及缓存DataFrame时的内存占用
+
+注：CPython有GIL，多线程get/set一行反映的是分片带来的额外开销；分片锁的
+收益在持锁时间较长（大条目、淘汰较多）时才明显
+
+用法:
+    python scripts/benchmark_memory_cache.py --entries 1000 10000 --threads 8
+"""
+
+import argparse
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+
+from common.bounded_cache import BoundedCache, MemoryBudget, estimate_size
+
+
+class ScanFeatureCache:
+    """原FeatureCacheManager的写入/读取路径"""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.cache = OrderedDict()
+        self.access_times = {}
+
+    def set(self, key, data):
+        current_time = time.time()
+        expired_keys = [
+            k for k, t in self.access_times.items() if (current_time - t) > self.ttl
+        ]
+        for k in expired_keys:
+            self.cache.pop(k, None)
+            self.access_times.pop(k, None)
+        while len(self.cache) >= self.max_size:
+            oldest_key = next(iter(self.cache))
+            self.cache.pop(oldest_key)
+            self.access_times.pop(oldest_key, None)
+        self.cache[key] = data
+        self.access_times[key] = time.time()
+        self.cache.move_to_end(key)
+
+    def get(self, key):
+        if key not in self.cache:
+            return None
+        if (time.time() - self.access_times[key]) > self.ttl:
+            self.cache.pop(key)
+            self.access_times.pop(key, None)
+            return None
+        self.access_times[key] = time.time()
+        self.cache.move_to_end(key)
+        return self.cache[key]
+
+
+class ScanMemoryCache:
+    """原MemoryCache：单锁字典，统计与清理扫描全部条目"""
+
+    def __init__(self):
+        self._cache = {}
+        self._lock = Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            if entry["expire_time"] >= time.time():
+                return entry["data"]
+            del self._cache[key]
+            return None
+
+    def set(self, key, data, ttl=120):
+        with self._lock:
+            now = time.time()
+            self._cache[key] = {"data": data, "expire_time": now + ttl}
+
+    def cleanup_expired(self):
+        with self._lock:
+            now = time.time()
+            expired = [k for k, e in self._cache.items() if e["expire_time"] < now]
+            for k in expired:
+                del self._cache[k]
+            return len(expired)
+
+    def get_stats(self):
+        with self._lock:
+            now = time.time()
+            expired = sum(1 for e in self._cache.values() if e["expire_time"] < now)
+            return {"total_entries": len(self._cache), "expired_entries": expired}
+
+
+def time_per_op(func, n_ops: int) -> float:
+    """执行n_ops次func，返回单次耗时(μs)"""
+    t0 = time.perf_counter()
+    for i in range(n_ops):
+        func(i)
+    return (time.perf_counter() - t0) / n_ops * 1e6
+
+
+def concurrent_ops(cache, n_threads: int, n_ops: int, n_keys: int) -> float:
+    """多线程读多写少的混合负载，返回单次耗时(μs)"""
+
+    def worker(seed: int):
+        rng = np.random.default_rng(seed)
+        keys = rng.integers(n_keys, size=n_ops)
+        writes = rng.random(n_ops) < 0.1
+        for key, write in zip(keys.tolist(), writes.tolist()):
+            if write:
+                cache.set(f"k{key}", key, ttl=60)
+            else:
+                cache.get(f"k{key}")
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n_threads)]
+    t0 = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return (time.perf_counter() - t0) / (n_threads * n_ops) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="有界内存缓存基准测试")
+    parser.add_argument("--entries", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--ops", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--frames", type=int, default=200, help="写入的DataFrame数")
+    parser.add_argument("--max-mb", type=float, default=64, help="缓存字节上限(MB)")
+    args = parser.parse_args()
+
+    print("\n单次操作耗时(μs)")
+    print(f"{'条目数':>8} {'操作':>22} {'原实现':>10} {'BoundedCache':>12} {'加速比':>8}")
+
+    for n_entries in args.entries:
+        rows = []
+
+        # 特征缓存写满后继续写入（原实现每次写入遍历全部条目）
+        scan = ScanFeatureCache(n_entries, ttl=3600)
+        bounded = BoundedCache(
+            max_entries=n_entries, default_ttl=3600, n_shards=1, sliding_ttl=True
+        )
+        for i in range(n_entries):
+            scan.set(f"k{i}", i)
+            bounded.set(f"k{i}", i)
+        rows.append(
+            (
+                "FeatureCache.set",
+                time_per_op(lambda i: scan.set(f"n{i}", i), args.ops),
+                time_per_op(lambda i: bounded.set(f"n{i}", i), args.ops),
+            )
+        )
+        probe = [f"k{i}" for i in range(n_entries)] + [f"n{i}" for i in range(args.ops)]
+        assert [scan.get(k) for k in probe] == [bounded.get(k) for k in probe]
+
+        # 内存缓存统计与过期清理
+        scan_memory = ScanMemoryCache()
+        bounded_memory = BoundedCache(n_shards=16)
+        for i in range(n_entries):
+            ttl = 0.01 if i % 100 == 0 else 3600
+            scan_memory.set(f"k{i}", i, ttl=ttl)
+            bounded_memory.set(f"k{i}", i, ttl=ttl)
+        time.sleep(0.02)
+        rows.append(
+            (
+                "MemoryCache.get_stats",
+                time_per_op(lambda i: scan_memory.get_stats(), args.ops // 10),
+                time_per_op(lambda i: bounded_memory.get_stats(), args.ops // 10),
+            )
+        )
+        # 写入过程中BoundedCache已顺带清理了部分到期条目，清理后两者一致
+        scan_memory.cleanup_expired()
+        bounded_memory.purge_expired()
+        expected = scan_memory.get_stats()["total_entries"]
+        assert bounded_memory.get_stats()["entries"] == expected
+        rows.append(
+            (
+                "MemoryCache.cleanup",
+                time_per_op(lambda i: scan_memory.cleanup_expired(), args.ops // 10),
+                time_per_op(lambda i: bounded_memory.purge_expired(), args.ops // 10),
+            )
+        )
+        rows.append(
+            (
+                f"{args.threads}线程 get/set",
+                concurrent_ops(scan_memory, args.threads, args.ops, n_entries),
+                concurrent_ops(bounded_memory, args.threads, args.ops, n_entries),
+            )
+        )
+
+        for name, baseline_us, bounded_us in rows:
+            print(
+                f"{n_entries:>8} {name:>22} {baseline_us:>10.2f} "
+                f"{bounded_us:>12.2f} {baseline_us / bounded_us:>8.1f}"
+            )
+
+    # 内存占用：原实现只限条目数，BoundedCache按估算字节数限额
+    frame = pd.DataFrame(np.random.default_rng(0).random((5000, 20)))
+    max_bytes = int(args.max_mb * 1024 * 1024)
+    scan = ScanFeatureCache(max_size=1000, ttl=3600)
+    bounded = BoundedCache(
+        max_entries=1000,
+        max_bytes=max_bytes,
+        n_shards=1,
+        budget=MemoryBudget(max_bytes),
+    )
+    for i in range(args.frames):
+        scan.set(i, frame.copy())
+        bounded.set(i, frame.copy())
+    scan_mb = sum(estimate_size(df) for df in scan.cache.values()) / 1024 / 1024
+    stats = bounded.get_stats()
+    assert stats["memory_bytes"] <= max_bytes
+
+    print(f"\n写入 {args.frames} 个 {estimate_size(frame) / 1024 / 1024:.1f}MB 的DataFrame")
+    print(f"{'实现':>12} {'条目数':>8} {'占用(MB)':>10}")
+    print(f"{'原实现':>12} {len(scan.cache):>8} {scan_mb:>10.1f}")
+    print(
+        f"{'BoundedCache':>12} {stats['entries']:>8} "
+        f"{stats['memory_bytes'] / 1024 / 1024:>10.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+模块间消息队列基准测试
+模拟行情数据突发写入：DATA消息有一个慢的同步订阅者（如写库，每次调用耗时
+--slow-ms毫秒）和一个快的异步订阅者，其间穿插CRITICAL优先级的COMMAND消息。
+对比原MessageQueue（单个FIFO队列、逐条顺序调用回调、同步回调在事件循环上
+执行）与优先级队列 + 订阅者独立队列/工作协程（以及慢订阅者批量接收）下，
+快订阅者和紧急命令的投递延迟与全部处理完的耗时
+
+用法:
+    python scripts/benchmark_message_queue.py --messages 500 --slow-ms 2
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+
+from common.communication_protocol import (
+    InterModuleMessage,
+    MessagePriority,
+    MessageQueue,
+    MessageType,
+)
+
+
+class SequentialMessageQueue:
+    """原MessageQueue：FIFO队列，逐条顺序调用回调"""
+
+    def __init__(self, max_size: int = 10000):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self.subscribers: Dict[str, List] = {}
+        self.running = False
+
+    async def put(self, message: InterModuleMessage) -> bool:
+        await self.queue.put(message)
+        return True
+
+    def subscribe(self, message_type: MessageType, callback, **options):
+        self.subscribers.setdefault(message_type.value, []).append(callback)
+
+    async def start_processing(self):
+        self.running = True
+        while self.running:
+            message = await self.queue.get()
+            for callback in self.subscribers.get(message.message_type.value, []):
+                if asyncio.iscoroutinefunction(callback):
+                    await callback(message)
+                else:
+                    callback(message)
+
+    async def stop_processing(self):
+        self.running = False
+
+
+def make_message(i: int, message_type: MessageType, priority: MessagePriority):
+    return InterModuleMessage(
+        message_id=f"msg_{i}",
+        timestamp=datetime.now(),
+        source_module="data_pipeline",
+        target_module="strategy",
+        message_type=message_type,
+        priority=priority,
+        payload={"sent_at": time.perf_counter()},
+        require_ack=False,
+    )
+
+
+async def simulate(queue, args, batch: bool) -> dict:
+    """突发写入消息，返回快订阅者/紧急命令的延迟和全部处理完的耗时"""
+    n_commands = args.messages // args.command_every
+    fast_latency, command_latency = [], []
+    slow_done = []
+    done = asyncio.Event()
+    loop = asyncio.get_running_loop()
+
+    def check_done():
+        if (
+            len(slow_done) == args.messages
+            and len(fast_latency) == args.messages
+            and len(command_latency) == n_commands
+        ):
+            done.set()
+
+    def slow_write(message):
+        # 批量订阅时一次调用处理整批，每次调用的固定耗时相同
+        time.sleep(args.slow_ms / 1000)
+        slow_done.extend(message if isinstance(message, list) else [message])
+        loop.call_soon_threadsafe(check_done)
+
+    async def fast_handler(message):
+        fast_latency.append(time.perf_counter() - message.payload["sent_at"])
+        check_done()
+
+    async def command_handler(message):
+        command_latency.append(time.perf_counter() - message.payload["sent_at"])
+        check_done()
+
+    # 同步回调默认在线程池中执行
+    options = {}
+    if batch:
+        options.update(batch_size=64, batch_timeout=0.005)
+    queue.subscribe(MessageType.DATA, slow_write, **options)
+    queue.subscribe(MessageType.DATA, fast_handler)
+    queue.subscribe(MessageType.COMMAND, command_handler)
+    dispatcher = asyncio.create_task(queue.start_processing())
+
+    t0 = time.perf_counter()
+    for i in range(args.messages):
+        await queue.put(make_message(i, MessageType.DATA, MessagePriority.NORMAL))
+        if i % args.command_every == args.command_every - 1:
+            command = make_message(i, MessageType.COMMAND, MessagePriority.CRITICAL)
+            await queue.put(command)
+        if i % args.burst == args.burst - 1:
+            await asyncio.sleep(args.burst_interval)
+    await done.wait()
+    total = time.perf_counter() - t0
+
+    await queue.stop_processing()
+    dispatcher.cancel()
+    return {
+        "fast": np.array(fast_latency) * 1e3,
+        "command": np.array(command_latency) * 1e3,
+        "total": total,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="模块间消息队列基准测试")
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--slow-ms", type=float, default=2.0)
+    parser.add_argument("--burst", type=int, default=50, help="每批突发消息数")
+    parser.add_argument("--burst-interval", type=float, default=0.01)
+    parser.add_argument("--command-every", type=int, default=25)
+    args = parser.parse_args()
+
+    rows = [
+        ("原实现", asyncio.run(simulate(SequentialMessageQueue(), args, False))),
+        ("订阅者队列", asyncio.run(simulate(MessageQueue(), args, False))),
+        ("订阅者队列+批量", asyncio.run(simulate(MessageQueue(), args, True))),
+    ]
+
+    print(
+        f"\n{args.messages} 条DATA消息（每批 {args.burst} 条），"
+        f"慢订阅者每次调用 {args.slow_ms}ms，延迟(ms)"
+    )
+    print(
+        f"{'实现':>14} {'快订阅者p50':>12} {'快订阅者p99':>12} "
+        f"{'紧急命令p99':>12} {'总耗时(s)':>10} {'加速比':>8}"
+    )
+    baseline_total = rows[0][1]["total"]
+    for name, result in rows:
+        print(
+            f"{name:>14} {np.percentile(result['fast'], 50):>12.2f} "
+            f"{np.percentile(result['fast'], 99):>12.2f} "
+            f"{np.percentile(result['command'], 99):>12.2f} "
+            f"{result['total']:>10.3f} {baseline_total / result['total']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+蒙特卡洛模拟基准测试
+对比逐路径、逐时间步循环生成路径的方式，与MonteCarloSimulator按批生成
+(n_paths × horizon) 收益率矩阵的方式（正态分布 / 跳跃扩散，含float32与准随机选项）
+
+用法:
+    python scripts/benchmark_monte_carlo.py --paths 20000 --horizon 252
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+
+from common.constants import TRADING_DAYS_PER_YEAR
+from module_05_risk_management.stress_testing.monte_carlo_simulator import (
+    DistributionType,
+    MonteCarloSimulator,
+    SimulationConfig,
+)
+
+JUMP_INTENSITY, JUMP_MEAN, JUMP_STD = 0.1, -0.02, 0.03
+
+
+def loop_final_returns(
+    distribution: DistributionType,
+    mean_return: float,
+    volatility: float,
+    n_paths: int,
+    horizon: int,
+    seed: int = 0,
+) -> tuple:
+    """逐路径（跳跃扩散再逐时间步）生成，返回各路径累计收益率和最大回撤"""
+    rng = np.random.RandomState(seed)
+    daily_return = mean_return / TRADING_DAYS_PER_YEAR
+    daily_vol = volatility / np.sqrt(TRADING_DAYS_PER_YEAR)
+    dt = 1 / TRADING_DAYS_PER_YEAR
+
+    final_returns = np.empty(n_paths)
+    max_drawdowns = np.empty(n_paths)
+    for i in range(n_paths):
+        if distribution == DistributionType.JUMP_DIFFUSION:
+            returns = []
+            for _ in range(horizon):
+                diffusion = daily_return * dt + daily_vol * np.sqrt(dt) * rng.normal()
+                n_jumps = rng.poisson(JUMP_INTENSITY * dt)
+                jumps = rng.normal(JUMP_MEAN, JUMP_STD, n_jumps).sum() if n_jumps else 0
+                returns.append(diffusion + jumps)
+            returns = np.array(returns)
+        else:
+            returns = rng.normal(daily_return, daily_vol, horizon)
+
+        prices = np.insert(np.exp(np.cumsum(returns)), 0, 1.0)
+        final_returns[i] = prices[-1] - 1
+        max_drawdowns[i] = (prices / np.maximum.accumulate(prices) - 1).min()
+    return final_returns, max_drawdowns
+
+
+def main():
+    parser = argparse.ArgumentParser(description="蒙特卡洛模拟基准测试")
+    parser.add_argument("--paths", type=int, default=20000)
+    parser.add_argument("--horizon", type=int, default=252)
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    expected_returns = pd.Series([0.08, 0.12], index=["A", "B"])
+    covariance = pd.DataFrame(
+        [[0.04, 0.01], [0.01, 0.09]], index=["A", "B"], columns=["A", "B"]
+    )
+    weights = pd.Series([0.6, 0.4], index=["A", "B"])
+    mean_return = float(weights @ expected_returns)
+    volatility = float(np.sqrt(weights @ covariance @ weights))
+
+    print(f"\n{args.paths} 条路径 × {args.horizon} 步，每批 {args.chunk_size} 条")
+    print(f"{'分布':<16} {'方式':<14} {'耗时(s)':>10} {'加速比':>8} {'均值':>9} {'标准差':>9}")
+
+    for distribution in (DistributionType.NORMAL, DistributionType.JUMP_DIFFUSION):
+        t0 = time.perf_counter()
+        reference, reference_drawdowns = loop_final_returns(
+            distribution, mean_return, volatility, args.paths, args.horizon
+        )
+        loop_seconds = time.perf_counter() - t0
+        print(
+            f"{distribution.value:<16} {'逐路径循环':<14} {loop_seconds:>10.3f} "
+            f"{1.0:>8.1f} {reference.mean():>9.4f} {reference.std():>9.4f}"
+        )
+
+        variants = {
+            "批量": {},
+            "批量+float32": {"use_float32": True},
+            "批量+准随机": {"use_quasi_random": True},
+        }
+        for label, options in variants.items():
+            config = SimulationConfig(
+                n_simulations=args.paths,
+                time_horizon=args.horizon,
+                distribution_type=distribution,
+                chunk_size=args.chunk_size,
+                random_seed=0,
+                **options,
+            )
+            t0 = time.perf_counter()
+            result = MonteCarloSimulator(config).simulate_portfolio_returns(
+                expected_returns, covariance, weights
+            )
+            seconds = time.perf_counter() - t0
+            print(
+                f"{'':<16} {label:<14} {seconds:>10.3f} "
+                f"{loop_seconds / seconds:>8.1f} {result.expected_return:>9.4f} "
+                f"{result.expected_volatility:>9.4f}"
+            )
+
+            # 两种方式抽样自同一分布：均值差异应在几个标准误以内
+            std_error = reference.std() * np.sqrt(2 / args.paths)
+            assert abs(result.expected_return - reference.mean()) < 5 * std_error
+            assert np.isclose(result.expected_volatility, reference.std(), rtol=0.05)
+            median_drawdown = result.percentile_outcomes.loc[50, "max_drawdown"]
+            assert np.isclose(
+                median_drawdown, np.median(reference_drawdowns), rtol=0.05, atol=1e-3
+            )
+
+
+if __name__ == "__main__":
+    main()
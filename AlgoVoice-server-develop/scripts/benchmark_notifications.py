@@ -0,0 +1,197 @@
+"""
+通知投递基准测试
+邮件渠道为同步发送，每次调用耗时--handler-ms毫秒（连接和登录为主）；Webhook
+渠道为异步发送，其中--fail-every分之一的通知首次发送失败、重试成功。对比原
+NotificationManager（单协程逐条发送，每条后固定等待0.1秒，失败时原地等待
+retry_delay再重试）与渠道工作协程 + 延迟重试队列（以及邮件批量发送）下，全部
+送达的耗时和各渠道的送达延迟
+
+用法:
+    python scripts/benchmark_notifications.py --notifications 100 --handler-ms 20
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from queue import PriorityQueue
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+
+from module_06_monitoring_alerting.notification_service import (
+    Notification,
+    NotificationChannel,
+    NotificationConfig,
+    NotificationManager,
+    NotificationPriority,
+    NotificationType,
+)
+
+
+class SequentialDelivery:
+    """原NotificationManager的发送循环"""
+
+    def __init__(self, config: NotificationConfig):
+        self.config = config
+        self.notification_queue = PriorityQueue()
+        self.channel_handlers = {}
+        self.sent_notifications = []
+        self.processing_active = False
+
+    def register_channel_handler(self, channel, handler, batch_handler=None):
+        self.channel_handlers[channel] = handler
+
+    def queue(self, notification):
+        self.notification_queue.put(
+            (-notification.priority.value, notification.timestamp, notification)
+        )
+
+    async def start_processing(self):
+        self.processing_active = True
+        while self.processing_active:
+            if not self.notification_queue.empty():
+                _, _, notification = self.notification_queue.get_nowait()
+                handler = self.channel_handlers[notification.channel]
+                if asyncio.iscoroutinefunction(handler):
+                    success = await handler(notification)
+                else:
+                    success = handler(notification)
+                if success:
+                    notification.delivered = True
+                    notification.sent_at = datetime.now()
+                    self.sent_notifications.append(notification)
+                else:
+                    notification.retry_count += 1
+                    await asyncio.sleep(self.config.retry_delay)
+                    self.queue(notification)
+            await asyncio.sleep(0.1)
+
+    def stop_processing(self):
+        self.processing_active = False
+
+
+def make_notification(i: int, channel: NotificationChannel):
+    return Notification(
+        notification_id=f"n{i}",
+        timestamp=datetime.now(),
+        type=NotificationType.ALERT,
+        priority=NotificationPriority.HIGH,
+        channel=channel,
+        recipient=f"user{i}",
+        subject="告警",
+        message="告警消息",
+        data={"index": i},
+    )
+
+
+async def simulate(manager, args, batch: bool) -> dict:
+    """发送通知直到全部送达，返回耗时和各渠道送达延迟"""
+    failed_once = set()
+
+    def send_email(notification):
+        time.sleep(args.handler_ms / 1000)
+        return True
+
+    def send_emails(notifications):
+        # 整批共用一次连接
+        time.sleep(args.handler_ms / 1000)
+        return [True] * len(notifications)
+
+    async def send_webhook(notification):
+        await asyncio.sleep(args.handler_ms / 1000)
+        index = notification.data["index"]
+        if index % args.fail_every == 0 and index not in failed_once:
+            failed_once.add(index)
+            return False
+        return True
+
+    manager.register_channel_handler(
+        NotificationChannel.EMAIL,
+        send_email,
+        batch_handler=send_emails if batch else None,
+    )
+    manager.register_channel_handler(NotificationChannel.WEBHOOK, send_webhook)
+    task = asyncio.create_task(manager.start_processing())
+
+    t0 = time.perf_counter()
+    for i in range(args.notifications):
+        channel = NotificationChannel.EMAIL if i % 2 else NotificationChannel.WEBHOOK
+        if isinstance(manager, SequentialDelivery):
+            manager.queue(make_notification(i, channel))
+        else:
+            manager.send_notification(
+                type=NotificationType.ALERT,
+                priority=NotificationPriority.HIGH,
+                channel=channel,
+                recipient=f"user{i}",
+                subject="告警",
+                message="告警消息",
+                data={"index": i},
+            )
+    while len(manager.sent_notifications) < args.notifications:
+        await asyncio.sleep(0.005)
+    total = time.perf_counter() - t0
+
+    manager.stop_processing()
+    await asyncio.wait_for(task, timeout=5)
+
+    assert all(n.delivered for n in manager.sent_notifications)
+    latency = {channel: [] for channel in NotificationChannel}
+    for n in manager.sent_notifications:
+        latency[n.channel].append((n.sent_at - n.timestamp).total_seconds())
+    return {
+        "total": total,
+        "email": np.array(latency[NotificationChannel.EMAIL]),
+        "webhook": np.array(latency[NotificationChannel.WEBHOOK]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="通知投递基准测试")
+    parser.add_argument("--notifications", type=int, default=100)
+    parser.add_argument("--handler-ms", type=float, default=20.0)
+    parser.add_argument("--fail-every", type=int, default=5)
+    parser.add_argument("--retry-delay", type=float, default=0.5, help="秒")
+    args = parser.parse_args()
+
+    def config():
+        return NotificationConfig(
+            enabled_channels=list(NotificationChannel),
+            enable_aggregation=False,
+            retry_delay=args.retry_delay,
+        )
+
+    rows = [
+        ("原实现", SequentialDelivery(config()), False),
+        ("渠道工作协程", NotificationManager(config()), False),
+        ("工作协程+批量", NotificationManager(config()), True),
+    ]
+    rows = [(name, asyncio.run(simulate(m, args, batch))) for name, m, batch in rows]
+
+    print(
+        f"\n{args.notifications} 条通知（邮件/Webhook各半），"
+        f"发送耗时 {args.handler_ms}ms，每 {args.fail_every} 条Webhook有1条首次失败，"
+        f"重试延迟 {args.retry_delay}s"
+    )
+    print(
+        f"{'实现':>14} {'邮件p50(s)':>10} {'邮件p99(s)':>10} "
+        f"{'Webhook p99(s)':>14} {'总耗时(s)':>10} {'加速比':>8}"
+    )
+    baseline_total = rows[0][1]["total"]
+    for name, result in rows:
+        print(
+            f"{name:>14} {np.percentile(result['email'], 50):>10.3f} "
+            f"{np.percentile(result['email'], 99):>10.3f} "
+            f"{np.percentile(result['webhook'], 99):>14.3f} "
+            f"{result['total']:>10.3f} {baseline_total / result['total']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+订单管理器查询基准测试
+对比每次查询都遍历全部订单的列表推导，与OrderManager按股票/状态/账户/策略
+建立的二级索引在大量子订单下的查询耗时
+
+用法:
+    python scripts/benchmark_order_manager.py --orders 10000 50000 --queries 200
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+
+from module_08_execution import Order, OrderManager, OrderStatus, OrderType
+
+ACTIVE_STATUSES = [OrderStatus.SUBMITTED, OrderStatus.PARTIALLY_FILLED]
+
+
+def make_order_manager(n_orders: int, n_symbols: int, seed: int = 42) -> OrderManager:
+    """生成大量TWAP子订单并推进到不同状态"""
+    rng = np.random.default_rng(seed)
+    order_manager = OrderManager()
+    for i in range(n_orders):
+        order = Order(
+            order_id=f"CHILD_{i}",
+            signal_id=f"PARENT_{i // 50}",
+            symbol=f"S{rng.integers(n_symbols)}",
+            order_type=OrderType.LIMIT,
+            side="BUY" if i % 2 else "SELL",
+            quantity=100,
+            price=10.0,
+            metadata={"strategy_name": f"strategy_{i % 10}"},
+            account_id=f"account_{i % 20}",
+        )
+        order_manager.add_order(order)
+        order_manager.submit_order(order)
+        roll = rng.random()
+        if roll < 0.6:
+            order_manager.fill_order(order.order_id, 100, 10.0)
+        elif roll < 0.7:
+            order_manager.fill_order(order.order_id, 50, 10.0)
+        elif roll < 0.8:
+            order_manager.cancel_order(order.order_id)
+    return order_manager
+
+
+def scan_queries(orders: dict, symbol: str, account_id: str) -> tuple:
+    """遍历全部订单的基线实现（原get_orders_by_*的写法）"""
+    return (
+        [o for o in orders.values() if o.symbol == symbol],
+        [o for o in orders.values() if o.status in ACTIVE_STATUSES],
+        [o for o in orders.values() if o.status == OrderStatus.PENDING],
+        [o for o in orders.values() if o.account_id == account_id],
+    )
+
+
+def index_queries(order_manager: OrderManager, symbol: str, account_id: str) -> tuple:
+    """索引查询"""
+    return (
+        order_manager.get_orders_by_symbol(symbol),
+        order_manager.get_active_orders(),
+        order_manager.get_pending_orders(),
+        order_manager.get_orders_by_account(account_id),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="订单管理器查询基准测试")
+    parser.add_argument("--orders", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    queries = [
+        (f"S{rng.integers(args.symbols)}", f"account_{rng.integers(20)}")
+        for _ in range(args.queries)
+    ]
+
+    print(f"\n{args.symbols} 只股票，每组4个查询（股票/活跃/待处理/账户），单组耗时(ms)")
+    print(f"{'订单数':>8} {'全量遍历':>10} {'二级索引':>10} {'加速比':>8}")
+
+    for n_orders in args.orders:
+        order_manager = make_order_manager(n_orders, args.symbols)
+
+        t0 = time.perf_counter()
+        expected = [scan_queries(order_manager.orders, *query) for query in queries]
+        scan_ms = (time.perf_counter() - t0) / args.queries * 1e3
+
+        t0 = time.perf_counter()
+        results = [index_queries(order_manager, *query) for query in queries]
+        index_ms = (time.perf_counter() - t0) / args.queries * 1e3
+
+        # 两种实现返回的订单集合应一致（状态查询按进入状态的顺序返回）
+        for result, reference in zip(results, expected):
+            for orders, reference_orders in zip(result, reference):
+                assert sorted(o.order_id for o in orders) == sorted(
+                    o.order_id for o in reference_orders
+                )
+
+        print(
+            f"{n_orders:>8} {scan_ms:>10.3f} {index_ms:>10.3f} "
+            f"{scan_ms / index_ms:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -23,14 +23,16 @@ logger = setup_logger("initialize_stock_database")
 class StockDatabaseInitializer:
     """股票数据库初始化器"""
     
-    def __init__(self, years_back: int = 20):
+    def __init__(self, years_back: int = 20, write_batch_size: int = 20):
         """
         初始化
         
         Args:
             years_back: 获取多少年的历史数据
+            write_batch_size: 每多少只股票合并为一次批量写入
         """
         self.years_back = years_back
+        self.write_batch_size = write_batch_size
         self.collector = AkshareDataCollector(rate_limit=0.5)
         self.db_manager = DatabaseManager()
         
@@ -138,6 +140,7 @@ class StockDatabaseInitializer:
             #     popular_stocks.extend(all_symbols[:max_stocks - len(popular_stocks)])
             
             count = 0
+            pending = {}
             for symbol in popular_stocks[:max_stocks]:
                 try:
                     logger.info(f"正在获取 {symbol} 的历史数据...")
@@ -152,17 +155,10 @@ class StockDatabaseInitializer:
                     )
                     
                     if not df.empty:
-                        # 标准化列名
-                        df = self._standardize_columns(df)
-                        
-                        # 保存到数据库
-                        success = self.db_manager.save_stock_prices(symbol, df)
-                        
-                        if success:
-                            count += 1
-                            logger.info(f"✅ {symbol}: 保存了 {len(df)} 条记录")
-                        else:
-                            logger.warning(f"⚠️ {symbol}: 保存失败")
+                        # 标准化列名，攒够一批后在单个事务中写入
+                        pending[symbol] = self._standardize_columns(df)
+                        if len(pending) >= self.write_batch_size:
+                            count += self._flush_stock_history(pending)
                     else:
                         logger.warning(f"⚠️ {symbol}: 没有数据")
                     
@@ -170,11 +166,34 @@ class StockDatabaseInitializer:
                     logger.error(f"获取 {symbol} 数据失败: {e}")
                     continue
             
+            count += self._flush_stock_history(pending)
+            
             logger.info(f"✅ 股票历史数据初始化完成，共保存 {count} 只股票")
             
         except Exception as e:
             logger.error(f"初始化股票历史数据失败: {e}")
     
+    def _flush_stock_history(self, pending: dict) -> int:
+        """批量保存已获取的股票历史数据并清空缓冲区
+        
+        Returns:
+            成功保存的股票数量
+        """
+        if not pending:
+            return 0
+        
+        saved = self.db_manager.save_stock_prices_bulk(pending)
+        if saved:
+            for symbol, df in pending.items():
+                logger.info(f"✅ {symbol}: 保存了 {len(df)} 条记录")
+            count = len(pending)
+        else:
+            logger.warning(f"⚠️ {', '.join(pending)}: 保存失败")
+            count = 0
+        
+        pending.clear()
+        return count
+    
     def initialize_macro_data(self):
         """初始化宏观经济数据"""
         logger.info("\n[3/4] 正在获取宏观经济数据...")
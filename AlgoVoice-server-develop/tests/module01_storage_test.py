@@ -0,0 +1,249 @@
+"""
+Module 01 存储层测试
+使用临时数据库测试批量写入等功能，不依赖网络数据
+"""
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+
+from module_01_data_pipeline.storage_management.cached_data_manager import (
+    CachedDataManager,
+)
+from module_01_data_pipeline.storage_management.database_manager import (
+    PRICE_COLUMNS,
+    DatabaseManager,
+)
+
+
+def make_prices(start: str, days: int, base: float = 10.0) -> pd.DataFrame:
+    """生成日线价格数据"""
+    dates = pd.bdate_range(start, periods=days)
+    close = base + np.arange(days) * 0.1
+    return pd.DataFrame(
+        {
+            "date": dates,
+            "open": close - 0.05,
+            "high": close + 0.1,
+            "low": close - 0.1,
+            "close": close,
+            "volume": np.arange(days) * 100 + 1000,
+            "amount": close * 1000,
+            "pct_change": np.full(days, 1.0),
+        }
+    )
+
+
+class TestDatabaseBulkWrites(unittest.TestCase):
+    """DatabaseManager批量写入测试"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db = DatabaseManager(db_path=str(Path(self.tmp_dir) / "test.db"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_01_save_and_read_prices(self):
+        df = make_prices("2024-01-02", 20)
+        self.assertTrue(self.db.save_stock_prices("000001", df))
+
+        stored = self.db.get_stock_prices("000001")
+        self.assertEqual(len(stored), 20)
+        np.testing.assert_allclose(stored["close"].to_numpy(), df["close"].to_numpy())
+        np.testing.assert_array_equal(
+            stored["volume"].to_numpy(), df["volume"].to_numpy()
+        )
+
+    def test_02_missing_values_stored_as_zero(self):
+        # None和NaN统一写为0.0（原逐行写入时NaN会被SQLite存成NULL）
+        df = make_prices("2024-01-02", 3).astype({"amount": object})
+        df.loc[0, "amount"] = None
+        df.loc[1, "amount"] = np.nan
+        df.loc[1, "pct_change"] = np.nan
+        df.loc[2, "open"] = np.nan
+        self.db.save_stock_prices("000001", df)
+
+        stored = self.db.get_stock_prices("000001")
+        self.assertEqual(stored["amount"].iloc[:2].tolist(), [0.0, 0.0])
+        self.assertEqual(stored["pct_change"].iloc[1], 0.0)
+        self.assertEqual(stored["open"].iloc[2], 0.0)
+        self.assertFalse(stored[["open", "amount", "pct_change"]].isna().any().any())
+
+    def test_03_bulk_save_upserts(self):
+        frames = {
+            "000001": make_prices("2024-01-02", 10),
+            "600000": make_prices("2024-01-02", 10, base=20.0),
+        }
+        self.assertEqual(self.db.save_stock_prices_bulk(frames), 20)
+
+        # 重复写入同一日期覆盖原记录
+        updated = make_prices("2024-01-02", 10, base=30.0)
+        self.assertEqual(self.db.save_stock_prices_bulk({"000001": updated}), 10)
+        stored = self.db.get_stock_prices("000001")
+        self.assertEqual(len(stored), 10)
+        np.testing.assert_allclose(
+            stored["close"].to_numpy(), updated["close"].to_numpy()
+        )
+        self.assertEqual(len(self.db.get_stock_prices("600000")), 10)
+
+
+class TestColumnarMirror(unittest.TestCase):
+    """列式存储与SQLite一致性测试"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db = DatabaseManager(db_path=str(Path(self.tmp_dir) / "test.db"))
+        if self.db.columnar_store is None:
+            self.skipTest("pyarrow not installed")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def assert_panel_matches_sqlite(self, symbol, start_date=None, end_date=None):
+        panel = self.db.get_stock_prices_panel([symbol], start_date, end_date)
+        expected = self.db.get_stock_prices(symbol, start_date, end_date)
+        actual = panel.droplevel("symbol")
+        self.assertEqual(len(actual), len(expected))
+        np.testing.assert_array_equal(
+            actual.index.to_numpy("datetime64[ns]"),
+            expected.index.to_numpy("datetime64[ns]"),
+        )
+        for col in actual.columns:
+            np.testing.assert_allclose(
+                actual[col].to_numpy(), expected[col].to_numpy(dtype="float64")
+            )
+
+    def test_01_existing_history_is_backfilled(self):
+        # 启用列式存储之前已入库的历史（直接写SQLite，不经过镜像）
+        history = make_prices("2023-01-02", 250)
+        records = self.db._price_records("000001", history, "2023-12-31")
+        self.db.bulk_upsert("stock_prices", PRICE_COLUMNS, records)
+        self.assertFalse(self.db.columnar_store.has_symbol("000001"))
+
+        self.db.save_stock_prices("000001", make_prices("2024-02-01", 1))
+        self.assertEqual(len(self.db.get_stock_prices("000001")), 251)
+        self.assert_panel_matches_sqlite("000001")
+        self.assert_panel_matches_sqlite("000001", "2023-06-01", "2023-09-30")
+
+    def test_02_missing_values_match_sqlite(self):
+        df = make_prices("2024-01-02", 5)
+        df.loc[1, ["open", "high"]] = np.nan
+        df.loc[2, "amount"] = np.nan
+        self.db.save_stock_prices("000001", df)
+        later = make_prices("2024-01-09", 3)
+        later.loc[0, "close"] = np.nan
+        self.db.save_stock_prices_bulk({"000001": later})
+
+        self.assert_panel_matches_sqlite("000001")
+        panel = self.db.get_stock_prices_panel(["000001"])
+        self.assertFalse(panel.isna().any().any())
+
+    def test_03_incomplete_mirror_falls_back_to_sqlite(self):
+        self.db.save_stock_prices("000001", make_prices("2024-01-02", 20))
+        self.db.save_stock_prices("600000", make_prices("2024-01-02", 20, base=20.0))
+        # 残缺的镜像文件（例如旧版本只写入了新增的一根K线）
+        self.db.columnar_store.write_symbol(
+            "000001", make_prices("2024-01-29", 1), merge=False
+        )
+
+        panel = self.db.get_stock_prices_panel(["000001", "600000"])
+        self.assertEqual(len(panel), 40)
+        self.assert_panel_matches_sqlite("000001")
+        self.assert_panel_matches_sqlite("600000")
+
+
+class FakeCollector:
+    """按预设价格表返回数据的采集器，记录每次请求的区间"""
+
+    def __init__(self, prices: pd.DataFrame, calendar: pd.DatetimeIndex):
+        self.prices = prices
+        self.calendar = calendar
+        self.calls = []
+
+    def fetch_trade_calendar(self) -> pd.DatetimeIndex:
+        return self.calendar
+
+    def fetch_stock_history(self, symbol, start_date, end_date, **kwargs):
+        self.calls.append((start_date, end_date))
+        dates = self.prices["date"]
+        mask = (dates >= pd.Timestamp(start_date)) & (dates <= pd.Timestamp(end_date))
+        return self.prices[mask].reset_index(drop=True)
+
+
+class TestCachedDataManager(unittest.TestCase):
+    """CachedDataManager按缺口补齐测试"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.manager = CachedDataManager(db_path=str(Path(self.tmp_dir) / "test.db"))
+        self.calendar = pd.bdate_range("2024-01-01", "2024-02-29")
+        self.prices = make_prices("2024-01-01", len(self.calendar))
+        self.collector = FakeCollector(self.prices, self.calendar)
+        self.manager.collector = self.collector
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_01_repeat_request_uses_local_data(self):
+        first = self.manager.get_stock_history("000001", "20240101", "20240131")
+        second = self.manager.get_stock_history("000001", "20240101", "20240131")
+
+        self.assertEqual(len(first), 23)
+        self.assertEqual(len(self.collector.calls), 1)
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_02_adjustment_change_refetches_history(self):
+        self.manager.get_stock_history("000001", "20240101", "20240131")
+
+        # 2月除权：数据源返回的前复权历史价格整体下调
+        adjusted = self.prices.copy()
+        adjusted[["open", "high", "low", "close"]] *= 0.9
+        self.collector.prices = adjusted
+        result = self.manager.get_stock_history("000001", "20240101", "20240229")
+
+        np.testing.assert_allclose(
+            result["close"].to_numpy(), adjusted["close"].to_numpy()
+        )
+        # 第二次调用先获取2月缺口，发现1月31日收盘价不一致后重新获取全部历史
+        self.assertEqual(
+            self.collector.calls[1:],
+            [("20240131", "20240229"), ("20240101", "20240229")],
+        )
+
+    def test_03_recent_missing_days_are_rechecked(self):
+        last_closed = pd.Timestamp("2024-01-31")
+        # 1月15日停牌，1月31日收盘后数据尚未发布
+        published = self.prices[
+            ~self.prices["date"].isin([pd.Timestamp("2024-01-15"), last_closed])
+        ]
+        self.collector.prices = published
+
+        with mock.patch.object(
+            CachedDataManager, "_last_closed_date", return_value=last_closed
+        ):
+            first = self.manager.get_stock_history("000001", "20240101", "20240131")
+            self.assertEqual(len(first), 21)
+
+            # 只重新获取最近缺失的1月31日，停牌日不再请求
+            self.collector.prices = self.prices[self.prices["date"] != "2024-01-15"]
+            second = self.manager.get_stock_history("000001", "20240101", "20240131")
+            self.assertEqual(self.collector.calls[1], ("20240130", "20240131"))
+            self.assertEqual(second.index[-1], last_closed)
+
+            self.manager.get_stock_history("000001", "20240101", "20240131")
+            self.assertEqual(len(self.collector.calls), 2)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,119 @@
+"""
+Module 02 特征存储测试
+使用临时数据库测试特征矩阵存储与旧版逐值存储的兼容读取，不依赖网络数据
+"""
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+
+from module_02_feature_engineering.storage_management.feature_database_manager import (
+    FeatureDatabaseManager,
+)
+
+
+class TestFeatureBlockStore(unittest.TestCase):
+    """特征矩阵存储测试"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db = FeatureDatabaseManager(
+            db_path=str(Path(self.tmp_dir) / "features.db")
+        )
+        self.dates = pd.bdate_range("2024-01-01", periods=20)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def insert_legacy(self, table: str, rows: list):
+        """按旧版逐值格式直接写入（特征矩阵存储之前的数据）"""
+        conn = self.db._get_connection()
+        if table == "technical_indicators":
+            conn.executemany(
+                "INSERT INTO technical_indicators "
+                "(symbol, date, indicator_name, indicator_value) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+        else:
+            conn.executemany(
+                "INSERT INTO time_series_features "
+                "(symbol, date, feature_name, feature_value, window_size) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+        conn.commit()
+        conn.close()
+
+    def test_01_roundtrip(self):
+        df = pd.DataFrame(
+            {"close": np.arange(20.0), "sma_5": np.arange(20.0) / 2, "rsi": 50.0},
+            index=self.dates,
+        )
+        self.assertTrue(self.db.save_technical_indicators("000001", df))
+
+        result = self.db.get_technical_indicators("000001")
+        self.assertEqual(list(result.columns), ["sma_5", "rsi"])
+        np.testing.assert_allclose(result["sma_5"].to_numpy(), df["sma_5"].to_numpy())
+
+    def test_02_legacy_and_block_rows_are_merged(self):
+        # 旧版数据覆盖前15天，其中最后5天与新写入的特征块重叠
+        legacy = [
+            ("000001", d.strftime("%Y-%m-%d"), name, value)
+            for d in self.dates[:15]
+            for name, value in (("sma_5", 1.0), ("macd", 2.0))
+        ]
+        self.insert_legacy("technical_indicators", legacy)
+        self.db.save_technical_indicators(
+            "000001", pd.DataFrame({"sma_5": 3.0}, index=self.dates[10:])
+        )
+
+        result = self.db.get_technical_indicators("000001")
+        self.assertEqual(len(result), 20)
+        self.assertEqual(list(result.columns), ["sma_5", "macd"])
+        np.testing.assert_allclose(result["sma_5"].to_numpy(), [1.0] * 10 + [3.0] * 10)
+        self.assertEqual(result["macd"].notna().sum(), 15)
+
+        ranged = self.db.get_technical_indicators("000001", "2024-01-08", "2024-01-19")
+        self.assertEqual(len(ranged), 10)
+        self.assertEqual(ranged.index[0], pd.Timestamp("2024-01-08"))
+
+    def test_03_time_series_window_filter(self):
+        legacy = [
+            ("000001", d.strftime("%Y-%m-%d"), "volatility_20", 0.1, 20)
+            for d in self.dates[:10]
+        ]
+        self.insert_legacy("time_series_features", legacy)
+        features = {
+            name: SimpleNamespace(
+                values=pd.Series(value, index=self.dates[10:]), description=name
+            )
+            for name, value in (("volatility_20", 0.2), ("momentum_5", 0.5))
+        }
+        self.assertTrue(self.db.save_time_series_features("000001", features))
+
+        result = self.db.get_time_series_features("000001")
+        self.assertEqual(len(result), 20)
+        self.assertEqual(set(result.columns), {"volatility_20", "momentum_5"})
+
+        windowed = self.db.get_time_series_features("000001", window_size=20)
+        self.assertEqual(list(windowed.columns), ["volatility_20"])
+        np.testing.assert_allclose(
+            windowed["volatility_20"].to_numpy(), [0.1] * 10 + [0.2] * 10
+        )
+        self.assertTrue(
+            self.db.get_time_series_features("000001", window_size=60).columns.empty
+        )
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
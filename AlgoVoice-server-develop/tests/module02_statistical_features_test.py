@@ -0,0 +1,122 @@
+"""
+Module 02 统计特征测试
+测试快照模式（单只/批量）与整条序列rolling取末值的结果一致，包括含缺失值的序列
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+
+from module_02_feature_engineering.feature_extraction.statistical_features import (
+    StatisticalFeatureConfig,
+    StatisticalFeatures,
+)
+
+
+def make_price_panel(n_symbols: int = 4, n_days: int = 150) -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    returns = rng.normal(0, 0.02, size=(n_days, n_symbols))
+    return pd.DataFrame(
+        10 * np.exp(np.cumsum(returns, axis=0)),
+        index=pd.bdate_range("2024-01-01", periods=n_days),
+        columns=[f"{i:06d}" for i in range(n_symbols)],
+    )
+
+
+class TestStatisticalSnapshot(unittest.TestCase):
+    """滚动窗口特征快照测试"""
+
+    def setUp(self):
+        self.rolling = StatisticalFeatures(
+            StatisticalFeatureConfig(snapshot_mode=False)
+        )
+        self.snapshot = StatisticalFeatures(StatisticalFeatureConfig())
+        self.windows = self.snapshot.config.windows
+
+    def rolling_features(self, series: pd.Series, window: int) -> dict:
+        features = {}
+        features.update(self.rolling.extract_basic_statistics(series, window))
+        features.update(self.rolling.extract_percentile_features(series, window))
+        features.update(self.rolling.extract_distribution_features(series, window))
+        features.update(self.rolling.extract_outlier_features(series, window))
+        features.update(self.rolling.extract_stability_features(series, window))
+
+        # rolling的偏度/峰度由滑动累积矩更新，有约1e-5的漂移，改用末尾窗口的精确值
+        tail = series.tail(window)
+        if f"skew_{window}" in features:
+            skew = tail.skew()
+            features[f"skew_{window}"] = skew
+            features[f"skew_normalized_{window}"] = (
+                skew / np.sqrt(6.0 / window) if window > 6 else skew
+            )
+        if f"kurt_{window}" in features:
+            kurt = tail.kurt()
+            features[f"kurt_{window}"] = kurt
+            features[f"excess_kurtosis_{window}"] = kurt - 3
+        return features
+
+    def assert_features_equal(self, actual: dict, expected: dict):
+        self.assertEqual(sorted(actual), sorted(expected))
+        for key, value in expected.items():
+            self.assertTrue(
+                np.isclose(actual[key], value, rtol=1e-8, atol=1e-12),
+                f"{key}: {actual[key]} != {value}",
+            )
+
+    def test_01_window_snapshot_matches_rolling(self):
+        series = make_price_panel()["000000"]
+        for window in self.windows:
+            with self.subTest(window=window):
+                self.assert_features_equal(
+                    self.snapshot.extract_window_snapshot(series, window),
+                    self.rolling_features(series, window),
+                )
+
+    def test_02_window_snapshot_with_nan(self):
+        series = make_price_panel()["000000"]
+        # 最近的窗口内有缺失（停牌），更早的缺失只影响std_stability
+        series.iloc[-3] = np.nan
+        series.iloc[-70] = np.nan
+        for window in self.windows:
+            with self.subTest(window=window):
+                snapshot = self.snapshot.extract_window_snapshot(series, window)
+                self.assert_features_equal(
+                    snapshot, self.rolling_features(series, window)
+                )
+                self.assertNotIn(f"mean_{window}", snapshot)
+                self.assertEqual(snapshot[f"cv_{window}"], 0.0)
+
+    def test_03_snapshot_panel_matches_per_symbol(self):
+        panel = make_price_panel()
+        panel.iloc[-2, 1] = np.nan
+        panel.iloc[:-15, 2] = np.nan  # 上市较晚，数据不足大窗口
+
+        batched = self.snapshot.extract_snapshot_panel(panel)
+        self.assertEqual(list(batched.index), list(panel.columns))
+        for symbol in panel.columns:
+            with self.subTest(symbol=symbol):
+                expected = {}
+                for window in self.windows:
+                    expected.update(self.rolling_features(panel[symbol], window))
+                row = batched.loc[symbol]
+                self.assert_features_equal(row[row.notna()].to_dict(), expected)
+
+    def test_04_short_history(self):
+        panel = make_price_panel(n_days=15)
+        batched = self.snapshot.extract_snapshot_panel(panel)
+
+        self.assertIn("mean_10", batched.columns)
+        self.assertNotIn("mean_20", batched.columns)
+        self.assertEqual(self.snapshot.extract_window_snapshot(panel["000000"], 20), {})
+        self.assertTrue(batched["std_stability_10"].isna().all())
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -25,22 +25,32 @@ from datetime import datetime, timedelta
 import numpy as np
 import pandas as pd
 
+from common.covariance_estimator import IncrementalCovarianceEstimator
+
 # 导入Module 01和02用于获取真实数据
 from module_01_data_pipeline import AkshareDataCollector, get_database_manager
 from module_02_feature_engineering import TechnicalIndicators
 
 # 导入Module 05组件
 from module_05_risk_management import (
+    DistributionType,
     ExposureConfig,
     # 仓位管理
     KellyCriterion,
     KellyResult,
+    # 投资组合优化
+    MeanVarianceOptimizer,
+    # 压力测试
+    MonteCarloSimulator,
+    MVOConfig,
+    OptimizationObjective,
     # 风险分析
     PortfolioRiskAnalyzer,
     RiskConfig,
     # 数据库
     RiskDatabaseManager,
     RiskExposureAnalyzer,
+    SimulationConfig,
     # 止损管理
     StopLossConfig,
     StopLossManager,
@@ -261,6 +271,286 @@ def test_var_calculator(returns_df):
         return False
 
 
+def test_monte_carlo_simulator(returns_df):
+    """测试3b: 蒙特卡洛模拟器"""
+    print_section("测试3b: 蒙特卡洛模拟器")
+
+    try:
+        expected_returns = returns_df.mean() * 252
+        covariance = returns_df.cov() * 252
+        weights = pd.Series(1.0 / len(returns_df.columns), index=returns_df.columns)
+
+        variants = {
+            "正态+对偶变量": {},
+            "正态+float32": {"use_float32": True},
+            "正态+准随机": {"use_quasi_random": True},
+            "跳跃扩散": {"distribution_type": DistributionType.JUMP_DIFFUSION},
+        }
+        for label, options in variants.items():
+            config = SimulationConfig(
+                n_simulations=10000, chunk_size=2500, random_seed=42, **options
+            )
+            result = MonteCarloSimulator(config).simulate_portfolio_returns(
+                expected_returns, covariance, weights
+            )
+
+            assert len(result.simulation_paths) == config.n_stored_paths
+            assert len(result.simulation_paths[0].prices) == config.time_horizon + 1
+            assert 0.0 <= result.probability_of_loss <= 1.0
+            assert result.cvar_estimates[0.95] >= result.var_estimates[0.95]
+            print(
+                f"  {label}: 期望收益 {result.expected_return:.2%}, "
+                f"VaR(95%) {result.var_estimates[0.95]:.2%}, "
+                f"亏损概率 {result.probability_of_loss:.2%}"
+            )
+
+        # 批量Bootstrap与逐次Bootstrap的置信区间应接近
+        simulator = MonteCarloSimulator(SimulationConfig(random_seed=42))
+        returns = returns_df.iloc[:, 0]
+        point, lower, upper = simulator.bootstrap_confidence_intervals(
+            returns, np.mean, n_bootstrap=500
+        )
+        point_vec, lower_vec, upper_vec = simulator.bootstrap_confidence_intervals(
+            returns, lambda x: x.mean(axis=1), n_bootstrap=500, vectorized=True
+        )
+        assert lower < point < upper and lower_vec < point_vec < upper_vec
+        assert abs(point - point_vec) < (upper - lower) / 2
+        print(f"  Bootstrap均值置信区间: [{lower_vec:.5f}, {upper_vec:.5f}]")
+
+        print("\n✅ 蒙特卡洛模拟器测试通过")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ 蒙特卡洛模拟器测试失败: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return False
+
+
+def test_mean_variance_optimizer(returns_df):
+    """测试3c: 均值方差优化"""
+    print_section("测试3c: 均值方差优化")
+
+    try:
+        expected_returns = returns_df.mean()
+        cov_matrix = returns_df.cov()
+
+        # 只有预算和边界约束时走有效集QP，结果应不劣于SLSQP
+        for objective in (
+            OptimizationObjective.MIN_VARIANCE,
+            OptimizationObjective.MAX_SHARPE,
+            OptimizationObjective.MAX_DIVERSIFICATION,
+        ):
+            results = {}
+            for use_qp_solver in (True, False):
+                config = MVOConfig(
+                    objective=objective,
+                    risk_free_rate=0.0,
+                    max_weight=0.5,
+                    robust_estimation=False,
+                    use_qp_solver=use_qp_solver,
+                )
+                results[use_qp_solver] = MeanVarianceOptimizer(
+                    config
+                ).optimize_portfolio(expected_returns, cov_matrix)
+
+            qp, slsqp = results[True], results[False]
+            assert qp.metadata["solver"] == "active_set_qp"
+            assert np.isclose(qp.weights.sum(), 1.0)
+            assert qp.weights.min() >= -1e-9 and qp.weights.max() <= 0.5 + 1e-9
+            if objective == OptimizationObjective.MIN_VARIANCE:
+                assert qp.expected_volatility <= slsqp.expected_volatility * (1 + 1e-4)
+            elif objective == OptimizationObjective.MAX_SHARPE:
+                assert qp.sharpe_ratio >= slsqp.sharpe_ratio - 1e-4
+            else:
+                assert qp.diversification_ratio >= slsqp.diversification_ratio - 1e-4
+            print(
+                f"  {objective.value}: 波动率 {qp.expected_volatility:.2%}, "
+                f"夏普 {qp.sharpe_ratio:.3f} (SLSQP {slsqp.sharpe_ratio:.3f})"
+            )
+
+        # 有效前沿：波动率随目标收益率单调不减
+        optimizer = MeanVarianceOptimizer(
+            MVOConfig(risk_free_rate=0.0, robust_estimation=False)
+        )
+        frontier = optimizer.calculate_efficient_frontier(
+            expected_returns, cov_matrix, n_portfolios=30
+        )
+        assert len(frontier.volatilities) == 30
+        assert np.all(np.diff(frontier.volatilities) >= -1e-8)
+        print(
+            f"  有效前沿: 波动率 {frontier.volatilities[0]:.2%} ~ "
+            f"{frontier.volatilities[-1]:.2%}, "
+            f"最大夏普 {frontier.optimal_point['sharpe']:.3f}"
+        )
+
+        print("\n✅ 均值方差优化测试通过")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ 均值方差优化测试失败: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return False
+
+
+def test_incremental_covariance(returns_df):
+    """测试3d: 增量协方差估计"""
+    print_section("测试3d: 增量协方差估计")
+
+    try:
+        from sklearn.covariance import LedoitWolf
+
+        returns = returns_df.dropna()
+        window = 60
+
+        # 滚动窗口：逐行更新的结果应与窗口内重新计算一致
+        estimator = IncrementalCovarianceEstimator(window=window)
+        max_error = 0.0
+        for i in range(len(returns)):
+            estimator.update(returns.iloc[i])
+            if i >= window and i % 10 == 0:
+                expected = returns.iloc[i - window + 1 : i + 1].cov().values
+                max_error = max(
+                    max_error, np.abs(estimator.covariance() - expected).max()
+                )
+        assert max_error < 1e-12
+        print(f"  滚动窗口({window})协方差最大误差: {max_error:.2e}")
+
+        # 维护状态上的Ledoit-Wolf收缩与sklearn一致
+        shrunk, shrinkage = estimator.ledoit_wolf()
+        lw = LedoitWolf().fit(returns.iloc[-window:].values)
+        assert np.isclose(shrinkage, lw.shrinkage_)
+        assert np.allclose(shrunk, lw.covariance_)
+        print(f"  Ledoit-Wolf收缩强度: {shrinkage:.4f}")
+
+        # EWMA与pandas的ewm().cov()一致
+        ewma = IncrementalCovarianceEstimator(halflife=20)
+        ewma.update_many(returns)
+        expected = returns.ewm(halflife=20).cov().loc[returns.index[-1]].values
+        assert np.allclose(ewma.covariance(), expected)
+
+        snapshot = ewma.snapshot()
+        assert snapshot is ewma.snapshot()
+        assert snapshot.covariance.flags.writeable is False
+        print(f"  EWMA快照: 有效样本量 {snapshot.effective_observations:.1f}")
+
+        print("\n✅ 增量协方差估计测试通过")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ 增量协方差估计测试失败: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return False
+
+
+def test_risk_attribution_missing_values(returns_df):
+    """测试3e: 风险归因的协方差口径（含缺失值时成对删除）"""
+    print_section("测试3e: 风险归因协方差口径")
+
+    try:
+        from module_09_backtesting.risk_attribution import RiskAttributor
+
+        returns = returns_df.dropna().copy()
+        weights = np.full(returns.shape[1], 1.0 / returns.shape[1])
+
+        def expected_risk(frame):
+            cov = frame.cov().values * 252
+            return np.sqrt(weights @ cov @ weights)
+
+        # 无缺失值：与pandas结果一致
+        report = RiskAttributor().attribute_risk(returns, weights)
+        assert np.isclose(report.total_risk, expected_risk(returns))
+        assert np.allclose(report.correlation_matrix.values, returns.corr().values)
+
+        # 第一只股票前30天缺失（如新上市），其余资产对仍使用全部日期
+        returns.iloc[:30, 0] = np.nan
+        report = RiskAttributor().attribute_risk(returns, weights)
+        assert np.isclose(report.total_risk, expected_risk(returns))
+        assert np.allclose(report.correlation_matrix.values, returns.corr().values)
+        print(f"  含缺失值的组合年化风险: {report.total_risk:.2%}")
+
+        print("\n✅ 风险归因协方差口径测试通过")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ 风险归因协方差口径测试失败: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return False
+
+
+def test_mean_variance_singular_covariance():
+    """测试3f: 奇异协方差矩阵下的均值方差优化（资产数多于样本数）"""
+    print_section("测试3f: 奇异协方差矩阵")
+
+    try:
+        from unittest import mock
+
+        from module_05_risk_management.portfolio_optimization import (
+            ActiveSetQPSolver,
+            QPAccuracyError,
+        )
+
+        # 20只资产、13个样本：协方差矩阵秩为12
+        rng = np.random.default_rng(24)
+        returns = pd.DataFrame(rng.normal(0.001, 0.02, (13, 20)))
+        expected_returns = returns.mean()
+        cov_matrix = returns.cov()
+        assert np.linalg.matrix_rank(cov_matrix.values) < len(cov_matrix)
+
+        def check_weights(weights):
+            assert abs(weights.sum() - 1.0) < 1e-8
+            assert weights.min() >= -1e-9 and weights.max() <= 0.1 + 1e-9
+
+        def run(optimizer):
+            frontier = optimizer.calculate_efficient_frontier(
+                expected_returns, cov_matrix, n_portfolios=20
+            )
+            for weights in frontier.weights:
+                check_weights(weights)
+            # 前沿点的收益率等于目标收益率
+            targets = np.linspace(
+                frontier.returns[0], frontier.returns[-1], len(frontier.returns)
+            )
+            assert np.allclose(frontier.returns, targets, rtol=1e-6, atol=1e-9)
+
+            result = optimizer.optimize_portfolio(expected_returns, cov_matrix)
+            check_weights(result.weights)
+            return result
+
+        config = MVOConfig(risk_free_rate=0.0, max_weight=0.1, robust_estimation=False)
+        result = run(MeanVarianceOptimizer(config))
+        assert result.metadata["solver"] == "active_set_qp"
+        print(f"  有效集QP: 夏普 {result.sharpe_ratio:.3f}")
+
+        # 有效集QP的结果不满足约束时回退到SLSQP
+        with mock.patch.object(
+            ActiveSetQPSolver,
+            "_check_constraints",
+            side_effect=QPAccuracyError("forced"),
+        ):
+            fallback = run(MeanVarianceOptimizer(config))
+        assert fallback.metadata["solver"] == "slsqp"
+        assert fallback.sharpe_ratio <= result.sharpe_ratio + 1e-3
+        print(f"  回退SLSQP: 夏普 {fallback.sharpe_ratio:.3f}")
+
+        print("\n✅ 奇异协方差矩阵测试通过")
+        return True
+
+    except Exception as e:
+        print(f"\n❌ 奇异协方差矩阵测试失败: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return False
+
+
 def test_kelly_criterion(returns_df):
     """测试4: 凯利准则仓位管理"""
     print_section("测试4: 凯利准则仓位管理")
@@ -514,6 +804,7 @@ def main():
         "数据准备": False,
         "投资组合风险分析": False,
         "VaR计算器": False,
+        "蒙特卡洛模拟": False,
         "凯利准则": False,
         "止损管理": False,
         "数据库操作": False,
@@ -533,6 +824,21 @@ def main():
         # 测试3: VaR计算器
         results["VaR计算器"] = test_var_calculator(returns_df)
 
+        # 测试3b: 蒙特卡洛模拟器
+        results["蒙特卡洛模拟"] = test_monte_carlo_simulator(returns_df)
+
+        # 测试3c: 均值方差优化
+        results["均值方差优化"] = test_mean_variance_optimizer(returns_df)
+
+        # 测试3d: 增量协方差估计
+        results["增量协方差估计"] = test_incremental_covariance(returns_df)
+
+        # 测试3e: 风险归因协方差口径
+        results["风险归因协方差口径"] = test_risk_attribution_missing_values(returns_df)
+
+        # 测试3f: 奇异协方差矩阵
+        results["奇异协方差矩阵"] = test_mean_variance_singular_covariance()
+
         # 测试4: 凯利准则
         results["凯利准则"] = test_kelly_criterion(returns_df)
 
@@ -7,43 +7,46 @@ import asyncio
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
 
+import numpy as np
 import pandas as pd
 
 # 添加项目根目录到路径
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from common.data_structures import MarketData
 from common.logging_system import setup_logger
-from module_06_monitoring_alerting import (
+from module_06_monitoring_alerting import (  # 告警系统; 通知服务; 实时监控; 报告引擎; 数据库管理
     AlertCategory,
     AlertConfig,
-    # 告警系统
     AlertManager,
     AlertSeverity,
+    AlertStatus,
     MarketMonitor,
     MonitoringConfig,
     NotificationChannel,
     NotificationConfig,
-    # 通知服务
     NotificationManager,
     NotificationPriority,
     NotificationType,
-    # 实时监控
     PerformanceMonitor,
     PortfolioMonitor,
     ReportConfig,
     ReportFormat,
-    # 报告引擎
     ReportGenerator,
     ReportType,
-    # 数据库管理
     get_monitoring_database_manager,
 )
 
 # 从alert_system导入AlertRule（用于alert_manager）
-from module_06_monitoring_alerting.alert_system import (
-    AlertRule as AlertManagerRule,
+from module_06_monitoring_alerting.alert_system import AlertRule as AlertManagerRule
+from module_06_monitoring_alerting.notification_service import (
+    WebhookConfig,
+    WebhookNotifier,
+    webhook_notifier,
 )
 
 # 从performance_monitor导入AlertRule（用于performance_monitor）
@@ -199,6 +202,66 @@ def test_performance_tracker():
         return False
 
 
+def test_market_monitor():
+    """测试市场监控器"""
+    logger.info("=" * 60)
+    logger.info("测试市场监控器")
+    logger.info("=" * 60)
+
+    try:
+        symbols = ["000001", "600036", "000858", "601318"]
+        market_monitor = MarketMonitor(symbols, lookback_period=30)
+
+        # 逐tick写入60批行情，超过回看期后环形缓冲区会覆盖最旧的行
+        rng = np.random.default_rng(42)
+        prices = np.full(len(symbols), 10.0)
+        start = datetime(2024, 1, 2, 9, 30)
+        for t in range(60):
+            prices *= 1 + rng.normal(0, 0.01, len(symbols))
+            volumes = rng.integers(1000, 2000, len(symbols))
+            if t == 59:
+                prices[0] *= 1.08  # 最后一个tick制造价格异常
+                volumes[1] *= 10  # 以及成交量激增
+            timestamp = start + timedelta(minutes=t)
+            market_monitor.update_market_data(
+                [
+                    MarketData(s, timestamp, p, p, p, p, int(v))
+                    for s, p, v in zip(symbols, prices, volumes)
+                ]
+            )
+
+        price_data = market_monitor.price_data
+        assert price_data.shape == (30, len(symbols))
+        assert price_data.index[-1] == start + timedelta(minutes=59)
+        logger.info(f"✓ 价格窗口: {price_data.shape}")
+
+        # 增量统计应与对窗口重新计算的结果一致
+        returns = price_data.pct_change().dropna()
+        expected_volatility = returns.std().mean() * np.sqrt(252)
+        volatility = market_monitor._calculate_market_volatility()
+        assert abs(volatility - expected_volatility) < 1e-12
+        logger.info(f"✓ 市场波动率: {volatility:.4f}")
+
+        anomalies = market_monitor.detect_anomalies()
+        types = {(a.type, a.affected_symbols[0]) for a in anomalies}
+        assert ("price_spike", "000001") in types
+        assert ("volume_surge", "600036") in types
+        logger.info(f"✓ 检测到异常: {len(anomalies)}个")
+
+        summary = market_monitor.get_market_summary()
+        logger.info(f"✓ 市场状态: {summary['regime']}, 风险级别: {summary['risk_level']}")
+
+        logger.info("✓ 市场监控器测试通过\n")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ 市场监控器测试失败: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return False
+
+
 def test_alert_manager():
     """测试告警管理器"""
     logger.info("=" * 60)
@@ -257,6 +320,101 @@ def test_alert_manager():
         return False
 
 
+def test_alert_rule_engine():
+    """测试预警规则引擎"""
+    logger.info("=" * 60)
+    logger.info("测试预警规则引擎")
+    logger.info("=" * 60)
+
+    try:
+        alert_manager = AlertManager(AlertConfig(max_alerts_per_minute=3))
+
+        def make_rule(rule_id, metric, comparison, threshold, **kwargs):
+            return AlertManagerRule(
+                rule_id=rule_id,
+                name=rule_id,
+                description=rule_id,
+                category=AlertCategory.RISK,
+                severity=kwargs.pop("severity", AlertSeverity.WARNING),
+                condition=f"{metric} {comparison} {threshold}",
+                threshold=threshold,
+                comparison=comparison,
+                metric=metric,
+                cooldown_seconds=0,
+                **kwargs,
+            )
+
+        # 同一指标的分级规则共用去重键，只触发最严重的一条
+        alert_manager.add_rule(
+            make_rule("drawdown_warn", "drawdown", ">", 0.05, dedup_key="drawdown")
+        )
+        alert_manager.add_rule(
+            make_rule(
+                "drawdown_critical",
+                "drawdown",
+                ">",
+                0.10,
+                severity=AlertSeverity.CRITICAL,
+                dedup_key="drawdown",
+            )
+        )
+        alerts = alert_manager.check_rules({"drawdown": 0.12})
+        assert [a.rule_id for a in alerts] == ["drawdown_critical"]
+        logger.info(f"✓ 去重后触发: {[a.rule_id for a in alerts]}")
+
+        # 窗口条件：60秒内平均延迟超过100ms
+        alert_manager.add_rule(
+            make_rule("latency_avg", "latency_ms", ">", 100, window_seconds=60)
+        )
+        start = datetime(2024, 1, 2, 9, 30)
+        fired = []
+        for i, latency in enumerate([50, 60, 150, 200]):
+            alerts = alert_manager.check_rules(
+                {"latency_ms": latency}, timestamp=start + timedelta(seconds=10 * i)
+            )
+            fired.extend(a.metric_value for a in alerts)
+        assert fired == [115.0]  # 窗口均值依次为50、55、86.7、115
+        logger.info(f"✓ 窗口条件触发值: {fired}")
+
+        # 组合条件：VaR超限且杠杆大于2
+        alert_manager.add_rule(
+            make_rule(
+                "var_leverage",
+                "var",
+                ">",
+                0.02,
+                extra_conditions=[("leverage", ">", 2)],
+            )
+        )
+        assert not alert_manager.check_rules({"var": 0.03, "leverage": 1.5})
+        alerts = alert_manager.check_rules({"var": 0.03, "leverage": 2.5})
+        assert [a.rule_id for a in alerts] == ["var_leverage"]
+        logger.info("✓ 组合条件触发正确")
+
+        # 全局速率上限：本分钟已触发3条，后续被限流
+        alerts = alert_manager.check_rules({"drawdown": 0.2, "var": 0.05})
+        assert not alerts and alert_manager.rate_limited_count == 2
+        logger.info(f"✓ 限流预警数: {alert_manager.rate_limited_count}")
+
+        # 统计随预警状态增量更新
+        alert = alert_manager.trigger_alert("drawdown_warn", 0.06)
+        alert_manager.resolve_alert(alert.alert_id)
+        stats = alert_manager.get_alert_statistics()
+        assert stats.total_alerts == 1
+        assert stats.alerts_by_status == {AlertStatus.RESOLVED: 1}
+        logger.info(f"✓ 告警统计: {stats.total_alerts}条")
+
+        logger.info("✓ 预警规则引擎测试通过\n")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ 预警规则引擎测试失败: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return False
+
+
 def test_notification_manager():
     """测试通知管理器"""
     logger.info("=" * 60)
@@ -304,6 +462,162 @@ def test_notification_manager():
         return False
 
 
+def test_notification_delivery_workers():
+    """测试通知渠道工作协程与重试延迟队列"""
+    logger.info("=" * 60)
+    logger.info("测试通知渠道工作协程")
+    logger.info("=" * 60)
+
+    async def run():
+        notification_manager = NotificationManager(
+            NotificationConfig(
+                enabled_channels=[
+                    NotificationChannel.EMAIL,
+                    NotificationChannel.WEBHOOK,
+                ],
+                enable_aggregation=False,
+                retry_attempts=3,
+                retry_delay=0.05,
+                retry_backoff=2.0,
+            )
+        )
+
+        # Webhook一直失败，记录每次尝试的时间
+        attempts = []
+
+        async def failing_webhook(notification):
+            attempts.append(asyncio.get_running_loop().time())
+            return False
+
+        # 邮件支持批量发送
+        batches = []
+
+        def send_emails(notifications):
+            batches.append(len(notifications))
+            return [True] * len(notifications)
+
+        notification_manager.register_channel_handler(
+            NotificationChannel.WEBHOOK, failing_webhook
+        )
+        notification_manager.register_channel_handler(
+            NotificationChannel.EMAIL, lambda n: True, batch_handler=send_emails
+        )
+
+        def send(channel, recipient):
+            return notification_manager.send_notification(
+                type=NotificationType.ALERT,
+                priority=NotificationPriority.HIGH,
+                channel=channel,
+                recipient=recipient,
+                subject="测试告警",
+                message="这是一条测试告警消息",
+            )
+
+        webhook_id = send(NotificationChannel.WEBHOOK, "https://example.com/hook")
+        email_ids = [
+            send(NotificationChannel.EMAIL, f"user{i}@example.com") for i in range(20)
+        ]
+
+        task = asyncio.create_task(notification_manager.start_processing())
+        await asyncio.sleep(0.05)
+
+        # 失败的Webhook在等待重试，不影响邮件发送
+        for notification_id in email_ids:
+            status = notification_manager.get_notification_status(notification_id)
+            assert status["status"] == "delivered"
+        assert sum(batches) == 20 and max(batches) > 1
+        logger.info(f"✓ 邮件批次: {batches}")
+
+        await asyncio.sleep(0.3)
+        status = notification_manager.get_notification_status(webhook_id)
+        assert status["status"] == "failed" and len(attempts) == 3
+        gaps = [b - a for a, b in zip(attempts, attempts[1:])]
+        assert gaps[1] > gaps[0] * 1.5  # 指数退避
+        logger.info(f"✓ 重试间隔: {[f'{gap:.3f}s' for gap in gaps]}")
+
+        latency = notification_manager.get_delivery_latency_stats()
+        assert latency["email"]["count"] == 20 and "webhook" not in latency
+        logger.info(f"✓ 邮件送达延迟p95: {latency['email']['p95']:.3f}s")
+
+        notification_manager.stop_processing()
+        await asyncio.wait_for(task, timeout=1)
+
+    try:
+        asyncio.run(run())
+        logger.info("✓ 通知渠道工作协程测试通过\n")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ 通知渠道工作协程测试失败: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return False
+
+
+def test_webhook_notifier_retries():
+    """测试由通知管理器驱动的Webhook只由延迟队列重试"""
+    logger.info("=" * 60)
+    logger.info("测试Webhook重试")
+    logger.info("=" * 60)
+
+    async def run():
+        notification_manager = NotificationManager(
+            NotificationConfig(
+                enabled_channels=[NotificationChannel.WEBHOOK],
+                enable_aggregation=False,
+                retry_attempts=3,
+                retry_delay=0.05,
+            )
+        )
+        # 通知器自身的重试延迟很长，若在工作协程里原地重试测试会超时
+        notifier = WebhookNotifier(
+            WebhookConfig(url="https://example.com/hook", retry_count=3, retry_delay=5)
+        )
+        requests_sent = []
+
+        def failing_request(payload):
+            requests_sent.append(payload["data"]["notification_id"])
+            return SimpleNamespace(status_code=500, text="error")
+
+        notifier._send_request = failing_request
+        notification_manager.register_webhook_notifier(notifier)
+
+        notification_id = notification_manager.send_notification(
+            type=NotificationType.ALERT,
+            priority=NotificationPriority.HIGH,
+            channel=NotificationChannel.WEBHOOK,
+            recipient="https://example.com/hook",
+            subject="测试告警",
+            message="这是一条测试告警消息",
+        )
+        task = asyncio.create_task(notification_manager.start_processing())
+        await asyncio.sleep(0.5)
+
+        status = notification_manager.get_notification_status(notification_id)
+        assert status["status"] == "failed"
+        assert requests_sent == [notification_id] * 3
+        logger.info(f"✓ 共发送 {len(requests_sent)} 次请求，均由延迟队列重试")
+
+        notification_manager.stop_processing()
+        await asyncio.wait_for(task, timeout=1)
+        await notifier.close()
+
+    try:
+        # 不依赖aiohttp，走requests发送路径
+        with mock.patch.object(webhook_notifier, "HAS_AIOHTTP", False):
+            asyncio.run(run())
+        logger.info("✓ Webhook重试测试通过\n")
+        return True
+
+    except Exception as e:
+        logger.error(f"✗ Webhook重试测试失败: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return False
+
+
 def test_report_generator():
     """测试报告生成器"""
     logger.info("=" * 60)
@@ -540,8 +854,12 @@ def main():
     results["系统监控"] = test_system_monitor()
     results["性能监控"] = test_performance_monitor()
     results["性能追踪"] = test_performance_tracker()
+    results["市场监控"] = test_market_monitor()
     results["告警管理"] = test_alert_manager()
+    results["规则引擎"] = test_alert_rule_engine()
     results["通知管理"] = test_notification_manager()
+    results["通知投递"] = test_notification_delivery_workers()
+    results["Webhook重试"] = test_webhook_notifier_retries()
     results["报告生成"] = test_report_generator()
     results["数据库管理"] = test_database_manager()
     results["集成测试"] = test_integration()
@@ -14,6 +14,7 @@ import pandas as pd
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from common.logging_system import setup_logger
+from common.pareto import crowding_distance, non_dominated_sort
 from module_01_data_pipeline import AkshareDataCollector
 from module_02_feature_engineering import TechnicalIndicators
 from module_07_optimization import (
@@ -24,6 +25,7 @@ from module_07_optimization import (
     CostComponent,
     CostOptimizer,
     GridSearchOptimizer,
+    MedianPrefixPruner,
     MemoryOptimizer,
     NSGAOptimizer,
     Parameter,
@@ -31,7 +33,12 @@ from module_07_optimization import (
     PerformanceEvaluator,
     RandomSearchOptimizer,
     StrategyOptimizer,
+    StreamingStrategy,
+    SuccessiveHalvingPruner,
+    TrialCache,
+    VectorizedStrategy,
     create_portfolio_objectives,
+    fingerprint_data,
     get_optimization_database_manager,
     get_optimization_manager,
     get_strategy_space,
@@ -313,6 +320,288 @@ def test_strategy_optimization_with_real_data():
         logger.warning("跳过策略优化测试")
 
 
+def test_streaming_strategy_evaluation():
+    """测试流式/向量化策略接口与generate_signal评估结果一致"""
+    logger.info("=" * 50)
+    logger.info("测试 6b: 流式与向量化策略评估")
+
+    from collections import deque
+
+    from common.data_structures import Signal
+
+    def make_signal(position, timestamp):
+        if position == 0:
+            return None
+        return Signal(
+            signal_id="test",
+            timestamp=timestamp,
+            symbol="000001",
+            action="BUY" if position > 0 else "SELL",
+            quantity=1,
+            price=0.0,
+            confidence=1.0,
+            strategy_name="ma_crossover",
+            metadata={},
+        )
+
+    class PrefixMAStrategy:
+        def __init__(self, short_window, long_window):
+            self.short_window = int(short_window)
+            self.long_window = int(long_window)
+
+        def generate_signal(self, history):
+            if len(history) < self.long_window:
+                return None
+            short_ma = history["close"].iloc[-self.short_window :].mean()
+            long_ma = history["close"].iloc[-self.long_window :].mean()
+            return make_signal(np.sign(short_ma - long_ma), history.index[-1])
+
+    class StreamingMAStrategy(StreamingStrategy):
+        def __init__(self, short_window, long_window):
+            self.short_window = int(short_window)
+            self.long_window = int(long_window)
+
+        def reset(self):
+            self.closes = deque(maxlen=self.long_window)
+
+        def on_bar(self, bar):
+            self.closes.append(bar.close)
+            if len(self.closes) < self.long_window:
+                return None
+            closes = list(self.closes)
+            short_ma = np.mean(closes[-self.short_window :])
+            return make_signal(np.sign(short_ma - np.mean(closes)), bar.Index)
+
+    class VectorizedMAStrategy(VectorizedStrategy):
+        def __init__(self, short_window, long_window):
+            self.short_window = int(short_window)
+            self.long_window = int(long_window)
+
+        def generate_positions(self, data):
+            short_ma = data["close"].rolling(self.short_window).mean()
+            long_ma = data["close"].rolling(self.long_window).mean()
+            return np.sign(short_ma - long_ma)
+
+    np.random.seed(42)
+    dates = pd.bdate_range("2020-01-01", periods=500)
+    market_data = pd.DataFrame(
+        {"close": 10 * np.exp(np.cumsum(np.random.normal(0, 0.02, len(dates))))},
+        index=dates,
+    )
+    params = {"short_window": 5, "long_window": 20}
+
+    results = {}
+    for strategy_class in (
+        PrefixMAStrategy,
+        StreamingMAStrategy,
+        VectorizedMAStrategy,
+    ):
+        optimizer = StrategyOptimizer(
+            strategy_class=strategy_class, market_data=market_data, test_split=0.2
+        )
+        performance = optimizer._evaluate_strategy_full(params, optimizer.train_data)
+        results[strategy_class.__name__] = performance.to_dict()
+
+    expected = results["PrefixMAStrategy"]
+    assert expected["total_trades"] > 0, "未产生交易"
+    for name, metrics in results.items():
+        for key, value in expected.items():
+            assert np.isclose(metrics[key], value), f"{name}.{key} 不一致"
+
+    logger.info(f"夏普比率: {expected['sharpe_ratio']:.4f}")
+    logger.info("✓ 流式与向量化策略评估测试通过")
+
+
+def test_parallel_trial_execution():
+    """测试并行执行器评估结果与串行一致"""
+    logger.info("=" * 50)
+    logger.info("测试 6c: 并行试验执行")
+
+    from common.parallel_executor import ParallelTrialExecutor
+
+    def objective(params):
+        return (params["x"] - 0.5) ** 2 + params["y"] ** 2
+
+    param_space = [
+        Parameter(name="x", param_type="float", low=-2.0, high=2.0),
+        Parameter(name="y", param_type="float", low=-2.0, high=2.0),
+    ]
+
+    serial = GridSearchOptimizer(
+        parameter_space=param_space, objective_function=objective, n_grid_points=5
+    ).optimize()
+
+    parallel = GridSearchOptimizer(
+        parameter_space=param_space, objective_function=objective, n_grid_points=5
+    )
+    with ParallelTrialExecutor(objective, n_workers=2) as executor:
+        parallel.set_executor(executor)
+        parallel_result = parallel.optimize()
+
+    assert parallel_result.best_parameters == serial.best_parameters, "最佳参数不一致"
+    assert [t.objective_value for t in parallel_result.all_trials] == [
+        t.objective_value for t in serial.all_trials
+    ], "试验结果不一致"
+    stats = parallel_result.metadata["executor_stats"]
+    assert stats["tasks"] == serial.n_trials, "执行器任务数不正确"
+    logger.info(f"执行器利用率: {stats['utilization']:.1%}")
+
+    # 策略评估：市场数据共享给工作进程，结果与串行评估一致
+    class MomentumStrategy(VectorizedStrategy):
+        def __init__(self, window):
+            self.window = int(window)
+
+        def generate_positions(self, data):
+            return np.sign(data["close"].pct_change(self.window))
+
+    np.random.seed(7)
+    dates = pd.bdate_range("2020-01-01", periods=300)
+    market_data = pd.DataFrame(
+        {"close": 10 * np.exp(np.cumsum(np.random.normal(0, 0.02, len(dates))))},
+        index=dates,
+    )
+    parameter_sets = [{"window": w} for w in (3, 5, 10, 20)]
+
+    expected = StrategyOptimizer(
+        MomentumStrategy, market_data, n_jobs=1
+    ).parallel_evaluate(parameter_sets)
+    optimizer = StrategyOptimizer(MomentumStrategy, market_data, n_jobs=2)
+    try:
+        actual = optimizer.parallel_evaluate(parameter_sets)
+        actual_again = optimizer.parallel_evaluate(parameter_sets)
+        stats = optimizer.get_executor_stats()
+    finally:
+        optimizer.close()
+
+    for a, b, e in zip(actual, actual_again, expected):
+        assert a.to_dict() == e.to_dict(), "并行策略评估结果不一致"
+        assert b.to_dict() == e.to_dict(), "复用进程池后结果不一致"
+    assert stats["tasks"] == 2 * len(parameter_sets), "执行器未复用"
+    logger.info("✓ 并行试验执行测试通过")
+
+
+def test_trial_cache_and_pruning():
+    """测试试验缓存与前缀剪枝"""
+    logger.info("=" * 50)
+    logger.info("测试 6d: 试验缓存与前缀剪枝")
+
+    n_calls = {"count": 0}
+
+    def objective(params):
+        n_calls["count"] += 1
+        return (params["a"] - 3) ** 2 + (params["b"] - 1) ** 2
+
+    param_space = [
+        Parameter(name="a", param_type="int", low=0, high=6),
+        Parameter(name="b", param_type="int", low=0, high=3),
+    ]
+
+    baseline = RandomSearchOptimizer(
+        param_space, objective, n_trials=60, random_state=1
+    ).optimize()
+
+    # 重复的参数组合只评估一次，结果与不使用缓存时一致
+    n_calls["count"] = 0
+    optimizer = RandomSearchOptimizer(
+        param_space, objective, n_trials=60, random_state=1
+    )
+    optimizer.set_trial_cache(TrialCache("test_quadratic", persist=False))
+    result = optimizer.optimize()
+
+    cache_stats = result.metadata["cache_stats"]
+    assert n_calls["count"] == cache_stats["misses"] < 60, "缓存未生效"
+    assert [t.objective_value for t in result.all_trials] == [
+        t.objective_value for t in baseline.all_trials
+    ], "缓存结果不一致"
+    logger.info(f"缓存命中率: {cache_stats['hit_rate']:.1%}")
+
+    # 数据内容变化时指纹不同
+    frame = pd.DataFrame({"close": np.arange(10.0)})
+    changed = frame.copy()
+    changed.iloc[3, 0] = 99.0
+    assert fingerprint_data(frame) == fingerprint_data(frame.copy())
+    assert fingerprint_data(frame) != fingerprint_data(changed)
+
+    # 前缀剪枝：落后的候选只在较短的前缀上评估
+    np.random.seed(0)
+    dates = pd.bdate_range("2015-01-01", periods=1200)
+    market_data = pd.DataFrame(
+        {"close": 10 * np.exp(np.cumsum(np.random.normal(0.0003, 0.01, len(dates))))},
+        index=dates,
+    )
+
+    def ma_sharpe(params, data):
+        close = data["close"].to_numpy()
+        ma = data["close"].rolling(params["window"]).mean().to_numpy()
+        position = np.nan_to_num(np.sign(close - ma))
+        returns = position[:-1] * np.diff(close) / close[:-1]
+        return np.sqrt(252) * returns.mean() / returns.std()
+
+    window_space = [Parameter(name="window", param_type="int", low=5, high=100)]
+    full = GridSearchOptimizer(
+        window_space,
+        lambda params: ma_sharpe(params, market_data),
+        maximize=True,
+        n_grid_points=20,
+    ).optimize()
+
+    for pruner_class in (SuccessiveHalvingPruner, MedianPrefixPruner):
+        optimizer = GridSearchOptimizer(
+            window_space, None, maximize=True, n_grid_points=20
+        )
+        with pruner_class(ma_sharpe, market_data, min_fraction=0.25) as pruner:
+            optimizer.set_pruner(pruner)
+            result = optimizer.optimize()
+
+        stats = result.metadata["pruner_stats"]
+        assert stats["pruned"] > 0, f"{pruner_class.__name__} 未剪枝"
+        assert stats["work_fraction"] < 1.0, "剪枝未减少评估量"
+        assert result.best_parameters == full.best_parameters, "剪枝后最优参数不一致"
+        logger.info(
+            f"{pruner_class.__name__}: 剪枝 {stats['pruned']}/{stats['candidates']}，"
+            f"评估量 {stats['work_fraction']:.0%}"
+        )
+
+    logger.info("✓ 试验缓存与前缀剪枝测试通过")
+
+
+def test_vectorized_pareto_sorting():
+    """测试向量化非支配排序"""
+    logger.info("=" * 50)
+    logger.info("测试 6e: 向量化非支配排序")
+
+    def dominates(a, b):
+        return bool(np.all(a <= b) and np.any(a < b))
+
+    rng = np.random.default_rng(7)
+    objectives = np.round(rng.random((150, 3)), 2)  # 取整后存在并列值
+    fronts = non_dominated_sort(objectives)
+
+    assert sorted(np.concatenate(fronts).tolist()) == list(range(len(objectives)))
+    for level, front in enumerate(fronts):
+        for i in front:
+            # 同层互不支配，非第一层的解必被上一层某个解支配
+            assert not any(dominates(objectives[j], objectives[i]) for j in front)
+            if level > 0:
+                assert any(
+                    dominates(objectives[j], objectives[i]) for j in fronts[level - 1]
+                )
+
+    distances = crowding_distance(objectives[fronts[0]])
+    assert np.isinf(distances).sum() >= 2, "边界解拥挤度应为inf"
+
+    # ParetoFrontier的非支配解与第一前沿一致
+    solutions = [
+        {"parameters": {"i": i}, "objectives": row} for i, row in enumerate(objectives)
+    ]
+    frontier = ParetoFrontier(solutions, ["f1", "f2", "f3"])
+    pareto_ids = sorted(sol["parameters"]["i"] for sol in frontier.get_pareto_front())
+    assert pareto_ids == fronts[0].tolist(), "帕累托前沿不一致"
+    logger.info(f"前沿层数: {len(fronts)}，第一前沿: {len(fronts[0])} 个解")
+
+    logger.info("✓ 向量化非支配排序测试通过")
+
+
 def test_performance_evaluator():
     """测试性能评估器"""
     logger.info("=" * 50)
@@ -551,6 +840,10 @@ def main():
         ("随机搜索", test_random_search),
         ("多目标优化", test_multi_objective_optimization),
         ("策略优化", test_strategy_optimization_with_real_data),
+        ("流式策略评估", test_streaming_strategy_evaluation),
+        ("并行试验执行", test_parallel_trial_execution),
+        ("试验缓存与剪枝", test_trial_cache_and_pruning),
+        ("向量化非支配排序", test_vectorized_pareto_sorting),
         ("性能评估", test_performance_evaluator),
         ("计算资源优化", test_compute_optimizer),
         ("成本优化", test_cost_optimizer),
@@ -423,10 +423,125 @@ class TestModule08WithRealData(unittest.TestCase):
         self.assertGreater(summary["completed_executions"], 0)
 
 
+class FakeArchiveStore:
+    """记录每次批量写入的归档存储"""
+
+    def __init__(self):
+        self.batches = []
+
+    def save_orders(self, records):
+        self.batches.append(list(records))
+        return True
+
+
+class TestOrderManagerIndexes(unittest.TestCase):
+    """订单索引与归档测试（不依赖真实数据）"""
+
+    test_symbols = ["000001", "600000", "601318"]
+
+    def make_order(self, order_manager, i):
+        signal = EnhancedSignal(
+            signal_id=f"TEST_INDEX_{i}",
+            timestamp=datetime.now(),
+            symbol=self.test_symbols[i % len(self.test_symbols)],
+            signal_type=SignalType.BUY,
+            quantity=1000,
+            price=10.0,
+            confidence=0.75,
+            priority=SignalPriority.NORMAL,
+            strategy_name=f"STRATEGY_{i % 2}",
+            metadata={"account_id": f"ACCOUNT_{i % 3}"},
+            expected_return=0.05,
+            risk_score=0.3,
+            holding_period=10,
+        )
+        order = order_manager.create_order_from_signal(signal)
+        order_manager.submit_order(order)
+        return order
+
+    def test_01_order_indexes(self):
+        """订单索引与内存上限测试"""
+        print("\n测试: 订单索引与内存上限")
+
+        order_manager = OrderManager(max_orders_in_memory=20, history_size=5)
+        orders = [self.make_order(order_manager, i) for i in range(30)]
+
+        # 索引查询与全量扫描一致
+        def scan(predicate):
+            return [o for o in order_manager.orders.values() if predicate(o)]
+
+        for symbol in self.test_symbols:
+            self.assertEqual(
+                order_manager.get_orders_by_symbol(symbol),
+                scan(lambda o: o.symbol == symbol),
+            )
+        self.assertEqual(len(order_manager.get_orders_by_account("ACCOUNT_0")), 10)
+        self.assertEqual(len(order_manager.get_orders_by_strategy("STRATEGY_1")), 15)
+        print("  ✓ 股票/账户/策略索引正确")
+
+        # 状态变化同步更新状态索引
+        for order in orders[:15]:
+            order_manager.fill_order(order.order_id, order.quantity, order.price)
+        order_manager.fill_order(orders[20].order_id, 500, 10.0)
+        order_manager.cancel_order(orders[21].order_id)
+
+        active_statuses = [OrderStatus.SUBMITTED, OrderStatus.PARTIALLY_FILLED]
+        self.assertCountEqual(
+            order_manager.get_active_orders(),
+            scan(lambda o: o.status in active_statuses),
+        )
+        self.assertEqual(
+            order_manager.get_orders_by_status(OrderStatus.PARTIALLY_FILLED),
+            [orders[20]],
+        )
+        print(f"  ✓ 活跃订单: {len(order_manager.get_active_orders())}")
+
+        # 超过内存上限时最早完结的订单被归档，统计仍包含归档订单
+        self.assertEqual(len(order_manager.orders), 20)
+        self.assertNotIn(orders[0].order_id, order_manager.orders)
+        self.assertEqual(len(order_manager.order_history), 5)
+        self.assertEqual(order_manager.get_orders_by_symbol("NOT_EXIST"), [])
+
+        stats = order_manager.get_order_statistics()
+        self.assertEqual(stats["total_orders"], 30)
+        self.assertEqual(stats["filled_orders"], 10)
+        print(f"  ✓ 内存订单 {len(order_manager.orders)}，统计: {stats}")
+
+    def test_02_archived_orders_are_complete_and_batched(self):
+        store = FakeArchiveStore()
+        order_manager = OrderManager(
+            max_orders_in_memory=2, archive_store=store, archive_batch_size=4
+        )
+        orders = [self.make_order(order_manager, i) for i in range(12)]
+        for order in orders[:8]:
+            order_manager.fill_order(order.order_id, order.quantity, order.price)
+        for order in orders[8:]:
+            order_manager.cancel_order(order.order_id)
+
+        # 10笔完结订单被归档，每累积4笔写入一次
+        self.assertEqual([len(batch) for batch in store.batches], [4, 4])
+        self.assertTrue(order_manager.flush_archive())
+        self.assertEqual([len(batch) for batch in store.batches], [4, 4, 2])
+
+        records = [record for batch in store.batches for record in batch]
+        filled = [r for r in records if r["status"] == OrderStatus.FILLED.value]
+        cancelled = [r for r in records if r["status"] == OrderStatus.CANCELLED.value]
+        self.assertEqual(len(filled), 8)
+        self.assertTrue(all(r["filled_time"] is not None for r in filled))
+        self.assertTrue(all(r["updated_at"] >= r["submitted_time"] for r in records))
+        self.assertEqual(len(cancelled), 2)
+
+
 def run_tests():
     """运行所有测试"""
     # 创建测试套件
-    suite = unittest.TestLoader().loadTestsFromTestCase(TestModule08WithRealData)
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite(
+        [
+            loader.loadTestsFromTestCase(TestOrderManagerIndexes),
+            loader.loadTestsFromTestCase(TestModule08WithRealData),
+        ]
+    )
 
     # 运行测试
     runner = unittest.TextTestRunner(verbosity=2)
@@ -170,6 +170,97 @@ class TestBacktesting:
             traceback.print_exc()
             return None, None
 
+    def test_trading_calendar_index(self):
+        """测试交易日历索引"""
+        logger.info("\n2.1 测试交易日历索引")
+
+        try:
+            config = BacktestConfig(
+                start_date=datetime(2023, 1, 1),
+                end_date=datetime(2024, 12, 1),
+                initial_capital=1000000.0,
+                save_to_db=False,
+            )
+            engine = BacktestEngine(config)
+            engine.load_market_data(list(self.market_data.keys()), self.market_data)
+
+            trading_dates = engine._generate_trading_dates()
+            all_dates = set()
+            for df in engine.market_data.values():
+                all_dates.update(df.index.normalize())
+            assert len(trading_dates) == len(all_dates), "交易日历与数据日期不一致"
+            logger.info(f"  交易日历: {len(trading_dates)} 个交易日")
+
+            # 抽查若干交易日，索引取数应与按日期匹配一致
+            columns = engine._trading_date_columns(trading_dates)
+            for date, column in list(zip(trading_dates, columns))[::50]:
+                day_data = engine._get_day_data(date, column)
+                for symbol, df in engine.market_data.items():
+                    matches = df[df.index.normalize() == date]
+                    if matches.empty:
+                        assert symbol not in day_data
+                    else:
+                        assert day_data[symbol].equals(matches.iloc[0])
+
+            logger.info("  ✓ 交易日历索引测试通过")
+
+        except Exception as e:
+            logger.error(f"  ✗ 交易日历索引测试失败: {e}")
+            import traceback
+
+            traceback.print_exc()
+
+    def test_vectorized_backtest(self):
+        """测试向量化回测模式"""
+        logger.info("\n2.2 测试向量化回测模式")
+
+        try:
+            config = BacktestConfig(
+                start_date=datetime(2023, 1, 1),
+                end_date=datetime(2024, 12, 1),
+                initial_capital=1000000.0,
+                commission_rate=0.0003,
+                slippage_bps=5.0,
+                save_to_db=False,
+                strategy_name="向量化均线策略",
+            )
+            engine = BacktestEngine(config)
+            engine.load_market_data(list(self.market_data.keys()), self.market_data)
+
+            # 满仓持有第一只股票，结果应等于买入持有收益扣除一次建仓成本
+            symbol = list(engine.market_data.keys())[0]
+
+            def buy_and_hold(prices):
+                weights = pd.DataFrame(0.0, index=prices.index, columns=prices.columns)
+                weights[symbol] = 1.0
+                return weights
+
+            result = engine.run_vectorized(buy_and_hold)
+            close = engine.get_price_panel("close")[symbol].dropna()
+            cost = config.commission_rate + config.slippage_bps / 10000
+            expected = (
+                config.initial_capital * (1 - cost) * close.iloc[-1] / close.iloc[0]
+            )
+            assert abs(result.final_capital - expected) < 1e-6 * expected
+            assert result.total_trades == 1
+            logger.info(f"    买入持有最终资金: {result.final_capital:,.2f}")
+
+            # 均线信号等权持有
+            result = engine.run_vectorized(
+                lambda prices: prices > prices.rolling(20).mean(),
+                signal_type="signals",
+            )
+            logger.info(f"    均线策略总收益率: {result.total_return:.2%}")
+            logger.info(f"    均线策略交易次数: {result.total_trades}")
+
+            logger.info("  ✓ 向量化回测测试通过")
+
+        except Exception as e:
+            logger.error(f"  ✗ 向量化回测测试失败: {e}")
+            import traceback
+
+            traceback.print_exc()
+
     def test_performance_analyzer(self, result: BacktestResult):
         """测试性能分析器"""
         logger.info("\n3. 测试性能分析器")
@@ -442,6 +533,12 @@ class TestBacktesting:
             # 测试回测引擎
             result, backtest_id = self.test_backtest_engine()
 
+            # 测试交易日历索引
+            self.test_trading_calendar_index()
+
+            # 测试向量化回测
+            self.test_vectorized_backtest()
+
             if result and backtest_id:
                 # 测试性能分析
                 performance_report = self.test_performance_analyzer(result)
@@ -464,6 +561,8 @@ class TestBacktesting:
             logger.info("=" * 60)
             logger.info("\n测试总结:")
             logger.info("  ✓ 回测引擎")
+            logger.info("  ✓ 交易日历索引")
+            logger.info("  ✓ 向量化回测")
             logger.info("  ✓ 性能分析")
             logger.info("  ✓ 数据库管理")
             logger.info("  ✓ 交易模拟")
@@ -0,0 +1,108 @@
+"""
+回测引擎交易日历测试
+测试带时区行情的交易日匹配，以及直接修改市场数据后的索引失效
+"""
+
+import sys
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from module_09_backtesting.backtest_engine import BacktestConfig, BacktestEngine
+
+
+def make_bars(index: pd.DatetimeIndex, start_price: float = 10.0) -> pd.DataFrame:
+    close = start_price + np.arange(len(index), dtype=float)
+    return pd.DataFrame({"close": close, "volume": 1000.0}, index=index)
+
+
+class TestTradingCalendar(unittest.TestCase):
+    """交易日历索引测试"""
+
+    def make_engine(self, start_date=datetime(2024, 1, 1), end_date=None):
+        config = BacktestConfig(
+            start_date=start_date,
+            end_date=end_date or datetime(2024, 1, 31),
+            initial_capital=100000.0,
+            save_to_db=False,
+        )
+        return BacktestEngine(config)
+
+    def test_01_tz_aware_index(self):
+        # 收盘时间15:00（北京时间）对应UTC 07:00，按当地日期归属交易日
+        local = pd.date_range(
+            "2024-01-02 15:00", periods=10, freq="B", tz="Asia/Shanghai"
+        )
+        data = {
+            "000001": make_bars(local),
+            "600036": make_bars(local.tz_convert("UTC")[2:], start_price=20.0),
+        }
+        engine = self.make_engine()
+        engine.load_market_data(list(data), data)
+
+        trading_dates = engine._generate_trading_dates()
+        expected = list(pd.bdate_range("2024-01-02", periods=10).to_pydatetime())
+        self.assertEqual(trading_dates, expected)
+
+        day_data = engine._get_day_data(datetime(2024, 1, 3))
+        self.assertEqual(day_data["000001"]["close"], 11.0)
+        self.assertNotIn("600036", day_data)
+        self.assertEqual(
+            engine._get_day_data(datetime(2024, 1, 4))["600036"]["close"], 20.0
+        )
+
+        panel = engine.get_price_panel("close")
+        self.assertIsNone(panel.index.tz)
+        self.assertEqual(panel["600036"].isna().sum(), 2)
+
+    def test_02_tz_aware_config_dates(self):
+        index = pd.bdate_range("2024-01-02", periods=10)
+        data = {"000001": make_bars(index)}
+        engine = self.make_engine(
+            start_date=pd.Timestamp("2024-01-04", tz="Asia/Shanghai"),
+            end_date=pd.Timestamp("2024-01-10 23:00", tz="Asia/Shanghai"),
+        )
+        engine.load_market_data(list(data), data)
+
+        trading_dates = engine._generate_trading_dates()
+        self.assertEqual(trading_dates[0], datetime(2024, 1, 4))
+        self.assertEqual(trading_dates[-1], datetime(2024, 1, 10))
+
+    def test_03_in_place_edit_requires_invalidation(self):
+        index = pd.bdate_range("2024-01-02", periods=10)
+        data = {"000001": make_bars(index)}
+        engine = self.make_engine()
+        engine.load_market_data(list(data), data)
+        self.assertEqual(engine.get_price_panel("close").iloc[0, 0], 10.0)
+
+        # 原地修改：对象和长度都不变
+        engine.market_data["000001"].iloc[0, 0] = 99.0
+        engine.market_data["000001"].index = index + pd.Timedelta(days=7)
+        engine.invalidate_trading_index()
+
+        panel = engine.get_price_panel("close")
+        self.assertEqual(panel.index[0], pd.Timestamp("2024-01-09"))
+        self.assertEqual(panel.iloc[0, 0], 99.0)
+
+    def test_04_reload_rebuilds_index(self):
+        engine = self.make_engine()
+        first = {"000001": make_bars(pd.bdate_range("2024-01-02", periods=5))}
+        engine.load_market_data(list(first), first)
+        engine.get_price_panel("close")
+
+        second = {"600036": make_bars(pd.bdate_range("2024-01-15", periods=3))}
+        engine.load_market_data(list(second), second)
+        panel = engine.get_price_panel("close")
+        self.assertEqual(list(panel.columns), ["000001", "600036"])
+        self.assertEqual(len(engine._generate_trading_dates()), 8)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -191,6 +191,103 @@ def test_scheduler_status():
     print()
 
 
+def test_async_cache():
+    """测试异步缓存（并发合并与陈旧数据后台刷新）"""
+    print("=" * 60)
+    print("测试 6: 异步缓存")
+    print("=" * 60)
+    
+    import asyncio
+    import time
+    from common.cache_manager import AsyncCache, MemoryCache
+    
+    async_cache = AsyncCache(MemoryCache(), ttl=1, stale_ttl=60)
+    calls = []
+    
+    async def fetch():
+        calls.append(time.time())
+        await asyncio.sleep(0.1)
+        return {"version": len(calls)}
+    
+    async def run():
+        # 并发未命中只请求一次上游
+        results = await asyncio.gather(
+            *[async_cache.get_or_fetch("test:async", fetch) for _ in range(20)]
+        )
+        assert len(calls) == 1, "❌ 并发未命中没有合并"
+        assert all(r == ({"version": 1}, "miss") for r in results), "❌ 合并结果不一致"
+        print("✅ 20个并发未命中合并为1次上游请求")
+        
+        # 过期后返回旧值并在后台刷新
+        await asyncio.sleep(1.1)
+        data, status = await async_cache.get_or_fetch("test:async", fetch)
+        assert status == "stale" and data["version"] == 1, "❌ 未返回陈旧数据"
+        await asyncio.sleep(0.2)
+        data, status = await async_cache.get_or_fetch("test:async", fetch)
+        assert status == "hit" and data["version"] == 2, "❌ 后台刷新失败"
+        print("✅ 过期数据立即返回，后台刷新后命中新数据")
+    
+    asyncio.run(run())
+    
+    stats = async_cache.get_stats()["test:async"]
+    assert stats["coalesced"] == 19, "❌ 合并计数错误"
+    print(f"✅ 缓存统计: 命中率 {stats['hit_rate']:.0%}, 刷新平均 {stats['refresh_avg_ms']:.1f}ms")
+    
+    print()
+
+
+def test_bounded_cache():
+    """测试有界缓存（字节限额、LRU/LFU淘汰、过期堆）"""
+    print("=" * 60)
+    print("测试 7: 有界缓存")
+    print("=" * 60)
+    
+    import time
+    import numpy as np
+    from common.bounded_cache import BoundedCache, MemoryBudget, estimate_size
+    
+    block = np.zeros(100_000)
+    assert estimate_size(block) >= block.nbytes, "❌ 数组大小估算错误"
+    
+    # 超出字节限额时淘汰最久未使用的条目
+    budget = MemoryBudget(max_bytes=10_000_000)
+    cache = BoundedCache(max_bytes=2_500_000, n_shards=1, budget=budget)
+    for i in range(3):
+        cache.set(i, block.copy())
+    cache.get(0)
+    cache.set(3, block.copy())
+    assert cache.get(1) is None and cache.get(0) is not None, "❌ LRU淘汰错误"
+    stats = cache.get_stats()
+    assert stats["evictions"] == 1 and stats["entries"] == 3, "❌ 淘汰计数错误"
+    assert budget.used_bytes == stats["memory_bytes"], "❌ 内存预算未同步"
+    assert not cache.set("huge", np.zeros(1_000_000)), "❌ 超大条目不应缓存"
+    print(f"✅ 字节限额淘汰正常，占用 {stats['memory_bytes'] / 1e6:.1f}MB")
+    
+    # LFU淘汰访问次数最少的条目
+    lfu = BoundedCache(max_entries=2, policy="lfu", n_shards=1)
+    lfu.set("a", 1)
+    lfu.set("b", 2)
+    lfu.get("a")
+    lfu.set("c", 3)
+    assert lfu.get("b") is None and lfu.get("a") == 1, "❌ LFU淘汰错误"
+    print("✅ LFU淘汰正常")
+    
+    # 过期条目通过堆清理，陈旧窗口内仍可读取
+    expiring = BoundedCache()
+    for i in range(100):
+        expiring.set(i, i, ttl=0.05, stale_ttl=0.5 if i < 10 else 0)
+    time.sleep(0.1)
+    assert expiring.purge_expired() == 90, "❌ 过期清理错误"
+    assert expiring.get_with_freshness(0) == (0, False), "❌ 陈旧数据读取错误"
+    assert expiring.get_stats()["stale_entries"] == 10, "❌ 陈旧条目统计错误"
+    print("✅ 过期清理与陈旧窗口正常")
+    
+    cache.clear()
+    assert budget.used_bytes == 0, "❌ 清空后内存预算未归还"
+    
+    print()
+
+
 def run_all_tests():
     """运行所有测试"""
     print("\n" + "=" * 60)
@@ -203,6 +300,8 @@ def run_all_tests():
         test_db_cache()
         test_anti_spider()
         test_scheduler_status()
+        test_async_cache()
+        test_bounded_cache()
         
         print("=" * 60)
         print("✅ 所有测试通过！")
@@ -0,0 +1,227 @@
+"""
+模块间消息队列测试
+测试优先级出队、订阅者隔离、批量接收、背压、跨线程的查询响应以及同步回调的执行位置
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from common import communication_protocol
+from common.communication_protocol import (
+    BackpressureError,
+    InterModuleMessage,
+    MessagePriority,
+    MessageQueue,
+    MessageType,
+    ModuleCommunicator,
+)
+
+
+def make_message(
+    i: int,
+    message_type: MessageType = MessageType.DATA,
+    priority: MessagePriority = MessagePriority.NORMAL,
+) -> InterModuleMessage:
+    return InterModuleMessage(
+        message_id=f"m{i}",
+        timestamp=datetime.now(),
+        source_module="test",
+        target_module="test",
+        message_type=message_type,
+        priority=priority,
+        payload={"index": i},
+        require_ack=False,
+    )
+
+
+async def wait_until(predicate, timeout: float = 2.0):
+    """等待条件成立"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        if loop.time() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.005)
+
+
+class TestMessageQueue(unittest.TestCase):
+    """MessageQueue测试"""
+
+    def run_with_queue(self, queue: MessageQueue, scenario):
+        async def run():
+            try:
+                await scenario()
+            finally:
+                await queue.stop_processing()
+
+        asyncio.run(run())
+
+    def test_01_priority_order(self):
+        queue = MessageQueue()
+        received = []
+
+        async def handler(message):
+            received.append(message.priority)
+
+        async def scenario():
+            priorities = [
+                MessagePriority.LOW,
+                MessagePriority.NORMAL,
+                MessagePriority.CRITICAL,
+                MessagePriority.NORMAL,
+                MessagePriority.HIGH,
+            ]
+            for i, priority in enumerate(priorities):
+                await queue.put(make_message(i, priority=priority))
+            queue.subscribe(MessageType.DATA, handler)
+            asyncio.create_task(queue.start_processing())
+            await wait_until(lambda: len(received) == len(priorities))
+
+        self.run_with_queue(queue, scenario)
+        self.assertEqual(
+            received,
+            [
+                MessagePriority.CRITICAL,
+                MessagePriority.HIGH,
+                MessagePriority.NORMAL,
+                MessagePriority.NORMAL,
+                MessagePriority.LOW,
+            ],
+        )
+
+    def test_02_slow_subscriber_does_not_block_others(self):
+        queue = MessageQueue()
+        fast, slow = [], []
+
+        async def scenario():
+            release = asyncio.Event()
+
+            async def slow_handler(message):
+                await release.wait()
+                slow.append(message.message_id)
+
+            async def fast_handler(message):
+                fast.append(message.message_id)
+
+            queue.subscribe(MessageType.DATA, slow_handler)
+            queue.subscribe(MessageType.DATA, fast_handler)
+            asyncio.create_task(queue.start_processing())
+            for i in range(20):
+                await queue.put(make_message(i))
+
+            await wait_until(lambda: len(fast) == 20)
+            self.assertEqual(slow, [])
+            release.set()
+            await wait_until(lambda: len(slow) == 20)
+
+        self.run_with_queue(queue, scenario)
+        self.assertEqual(fast, slow)
+        subscribers = queue.get_stats()["subscribers"]
+        self.assertTrue(all(s["delivered"] == 20 for s in subscribers.values()))
+
+    def test_03_batch_delivery(self):
+        queue = MessageQueue()
+        batches = []
+
+        def save(messages):
+            batches.append([m.payload["index"] for m in messages])
+
+        async def scenario():
+            for i in range(10):
+                await queue.put(make_message(i))
+            queue.subscribe(MessageType.DATA, save, batch_size=4, batch_timeout=0.01)
+            asyncio.create_task(queue.start_processing())
+            await wait_until(lambda: sum(map(len, batches)) == 10)
+
+        self.run_with_queue(queue, scenario)
+        self.assertEqual(batches, [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]])
+
+    def test_04_backpressure(self):
+        signals = []
+        queue = MessageQueue(
+            max_size=2, on_backpressure=lambda *args: signals.append(args)
+        )
+        communicator = ModuleCommunicator("test", queue)
+
+        async def scenario():
+            await queue.put(make_message(0))
+            await queue.put(make_message(1))
+            self.assertTrue(queue.is_congested())
+            with self.assertRaises(BackpressureError):
+                await queue.put(make_message(2), timeout=0.01)
+            with self.assertRaises(BackpressureError):
+                await communicator.send_message(
+                    "test", MessageType.DATA, {}, require_ack=False, timeout_ms=10
+                )
+
+        self.run_with_queue(queue, scenario)
+        self.assertEqual(signals, [("main", 2, 2), ("main", 2, 2)])
+        self.assertEqual(queue.get_stats()["topics"]["DATA"]["published"], 2)
+
+    def test_05_query_response_from_callbacks(self):
+        for offload in (False, True):
+            with self.subTest(offload=offload):
+                queue = MessageQueue()
+                communicator = ModuleCommunicator("client", queue)
+                threads = []
+
+                def responder(query):
+                    threads.append(threading.current_thread())
+                    response = make_message(0, MessageType.RESPONSE)
+                    response.correlation_id = query.message_id
+                    communicator.handle_response(response)
+
+                async def scenario():
+                    queue.subscribe(MessageType.QUERY, responder, offload=offload)
+                    asyncio.create_task(queue.start_processing())
+                    response = await asyncio.wait_for(
+                        communicator.send_query("server", "ping"), timeout=1
+                    )
+                    self.assertEqual(response.message_type, MessageType.RESPONSE)
+
+                self.run_with_queue(queue, scenario)
+                on_loop = threads == [threading.main_thread()]
+                self.assertEqual(on_loop, not offload)
+
+    def test_06_sync_callbacks_offloaded_by_default(self):
+        queue = MessageQueue(slow_callback_threshold=0.01)
+        threads = {}
+
+        def record(name):
+            def callback(message):
+                threads[name] = threading.current_thread()
+                if name == "slow":
+                    time.sleep(0.02)
+
+            callback.__qualname__ = name
+            return callback
+
+        async def scenario():
+            queue.subscribe(MessageType.DATA, record("default"))
+            queue.subscribe(MessageType.DATA, record("fast"), offload=False)
+            queue.subscribe(MessageType.DATA, record("slow"), offload=False)
+            asyncio.create_task(queue.start_processing())
+            await queue.put(make_message(0))
+            await wait_until(lambda: len(threads) == 3)
+
+        with mock.patch.object(communication_protocol.logger, "warning") as warning:
+            self.run_with_queue(queue, scenario)
+        self.assertIsNot(threads["default"], threading.main_thread())
+        self.assertIs(threads["fast"], threading.main_thread())
+        self.assertIs(threads["slow"], threading.main_thread())
+        warning.assert_called_once()
+        self.assertIn("slow blocked the event loop", warning.call_args[0][0])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
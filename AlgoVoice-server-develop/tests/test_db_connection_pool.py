@@ -0,0 +1,136 @@
+"""
+SQLite连接池测试
+测试连接复用、线程隔离与归还时的状态重置
+"""
+
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from common.db_connection_pool import (
+    MAX_IDLE_PER_THREAD,
+    SQLiteConnectionPool,
+    pooled_connection,
+)
+
+
+class TestSQLiteConnectionPool(unittest.TestCase):
+    """连接池测试"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = Path(self.tmp_dir) / "pool.db"
+        self.pool = SQLiteConnectionPool(self.db_path)
+        conn = self.pool.connect()
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def count_items(self) -> int:
+        conn = self.pool.connect(readonly=True)
+        try:
+            return conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_01_reuse_after_close(self):
+        first = self.pool.connect()
+        first.close()
+        second = self.pool.connect()
+        second.close()
+
+        self.assertIs(first, second)
+        counters = self.pool.get_stats()["connections"]
+        self.assertEqual(counters["reused"], 2)
+        self.assertTrue(self.pool.get_stats()["wal_enabled"])
+
+    def test_02_readonly_connections_are_separate(self):
+        writer = self.pool.connect()
+        writer.close()
+        reader = self.pool.connect(readonly=True)
+        self.assertIsNot(writer, reader)
+        with self.assertRaises(sqlite3.OperationalError):
+            reader.execute("INSERT INTO items (name) VALUES ('x')")
+        reader.close()
+
+    def test_03_thread_confinement(self):
+        main_conn = self.pool.connect()
+        main_conn.close()
+
+        result = {}
+
+        def worker():
+            conn = self.pool.connect()
+            result["same"] = conn is main_conn
+            conn.execute("INSERT INTO items (name) VALUES ('thread')")
+            conn.commit()
+            conn.close()
+            # 其他线程归还的连接不能在本线程使用
+            try:
+                main_conn.execute("SELECT 1")
+            except sqlite3.ProgrammingError:
+                result["cross_thread_error"] = True
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+        self.assertFalse(result["same"])
+        self.assertTrue(result.get("cross_thread_error"))
+        self.assertEqual(self.count_items(), 1)
+        # 主线程仍然复用自己的连接
+        conn = self.pool.connect()
+        self.assertIs(conn, main_conn)
+        conn.close()
+
+    def test_04_close_rolls_back_and_resets(self):
+        conn = self.pool.connect()
+        conn.row_factory = sqlite3.Row
+        conn.execute("INSERT INTO items (name) VALUES ('uncommitted')")
+        self.assertTrue(conn.in_transaction)
+        conn.close()
+
+        self.assertEqual(self.count_items(), 0)
+        reused = self.pool.connect()
+        self.assertIs(reused, conn)
+        self.assertFalse(reused.in_transaction)
+        self.assertIsNone(reused.row_factory)
+        reused.close()
+
+    def test_05_idle_limit_discards_extra(self):
+        conns = [self.pool.connect() for _ in range(MAX_IDLE_PER_THREAD + 1)]
+        for conn in conns:
+            conn.close()
+
+        # 超出空闲上限的连接被真正关闭
+        with self.assertRaises(sqlite3.ProgrammingError):
+            conns[-1].execute("SELECT 1")
+        self.assertEqual(self.pool.get_stats()["connections"]["discarded"], 1)
+
+    def test_06_pooled_connection_context(self):
+        with pooled_connection(self.db_path) as conn:
+            conn.execute("INSERT INTO items (name) VALUES ('committed')")
+
+        with self.assertRaises(RuntimeError):
+            with pooled_connection(self.db_path) as conn:
+                conn.execute("INSERT INTO items (name) VALUES ('rolled back')")
+                raise RuntimeError("boom")
+
+        with pooled_connection(self.db_path, readonly=True) as conn:
+            names = [row[0] for row in conn.execute("SELECT name FROM items")]
+        self.assertEqual(names, ["committed"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,92 @@
+"""
+动态相关性测试
+测试滚动、扩展和指数加权相关性与pandas逐时点计算结果一致，包括上市较晚的资产
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from module_04_market_analysis.correlation_analysis.dynamic_correlation import (
+    CorrelationConfig,
+    DynamicCorrelationAnalyzer,
+)
+
+
+def make_returns(late_start: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    dates = pd.date_range("2024-01-01", periods=200, freq="B")
+    factor = rng.normal(0, 0.01, (200, 1))
+    returns = pd.DataFrame(
+        factor + rng.normal(0, 0.01, (200, 4)),
+        index=dates,
+        columns=["A", "B", "C", "D"],
+    )
+    # D 上市较晚，之前没有收益率
+    returns.iloc[:late_start, 3] = np.nan
+    return returns
+
+
+class TestDynamicCorrelation(unittest.TestCase):
+    """最新时点相关性矩阵测试"""
+
+    def assert_matches_pandas(self, config: CorrelationConfig, returns: pd.DataFrame):
+        analyzer = DynamicCorrelationAnalyzer(config)
+        result = analyzer.calculate_dynamic_correlation(returns)
+
+        if config.exponential_weighting and config.rolling_window:
+            expected = returns.ewm(
+                halflife=config.halflife, min_periods=config.min_periods
+            ).corr()
+        elif config.rolling_window:
+            expected = returns.rolling(
+                config.window_size, min_periods=config.min_periods
+            ).corr()
+        else:
+            expected = returns.expanding(min_periods=config.min_periods).corr()
+        expected = expected.loc[returns.index[-1]]
+
+        self.assertFalse(result.isna().values.any())
+        pd.testing.assert_frame_equal(result, expected, check_names=False, atol=1e-10)
+
+    def test_01_complete_returns(self):
+        returns = make_returns()
+        for config in (
+            CorrelationConfig(),
+            CorrelationConfig(rolling_window=False),
+            CorrelationConfig(exponential_weighting=True),
+        ):
+            with self.subTest(config=config):
+                self.assert_matches_pandas(config, returns)
+
+    def test_02_late_starting_column(self):
+        # 窗口内 D 仍有部分缺失，估计器整行跳过会丢掉 A/B/C 的样本
+        returns = make_returns(late_start=160)
+        for config in (
+            CorrelationConfig(window_size=60, min_periods=20),
+            CorrelationConfig(rolling_window=False, min_periods=20),
+            CorrelationConfig(exponential_weighting=True, min_periods=20),
+        ):
+            with self.subTest(config=config):
+                self.assert_matches_pandas(config, returns)
+
+    def test_03_insufficient_overlap_is_nan(self):
+        returns = make_returns(late_start=190)
+        analyzer = DynamicCorrelationAnalyzer(CorrelationConfig(min_periods=20))
+        result = analyzer.calculate_dynamic_correlation(returns)
+
+        self.assertTrue(result["D"].isna().all())
+        self.assertFalse(
+            result.loc[["A", "B", "C"], ["A", "B", "C"]].isna().any().any()
+        )
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
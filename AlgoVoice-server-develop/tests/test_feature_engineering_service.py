@@ -0,0 +1,96 @@
+"""
+策略工作流特征工程测试
+使用合成行情测试并发下载与特征计算的合并结果，不依赖网络数据
+"""
+
+import asyncio
+import sys
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+
+from ai_strategy_system.core.strategy_workflow import (
+    FeatureEngineeringService,
+    UniverseSelection,
+)
+
+
+def make_history(days: int = 120, seed: int = 0) -> pd.DataFrame:
+    """生成带date列的日线数据"""
+    rng = np.random.default_rng(seed)
+    close = 10 * np.exp(np.cumsum(rng.normal(0, 0.01, days)))
+    return pd.DataFrame(
+        {
+            "date": pd.bdate_range("2024-01-01", periods=days).strftime("%Y-%m-%d"),
+            "open": close * 0.99,
+            "high": close * 1.01,
+            "low": close * 0.98,
+            "close": close,
+            "volume": rng.integers(1_000, 10_000, days).astype(float),
+        }
+    )
+
+
+class FakeStreamCollector:
+    """按给定顺序逐只返回数据的采集器"""
+
+    def __init__(self, histories: dict, order: list):
+        self.histories = histories
+        self.order = order
+
+    async def stream_multiple_stocks(self, symbols, start_date, end_date, n):
+        for symbol in self.order:
+            await asyncio.sleep(0)
+            yield symbol, self.histories[symbol].copy()
+
+
+class TestFeatureEngineeringService(unittest.TestCase):
+    """FeatureEngineeringService.prepare测试"""
+
+    def setUp(self):
+        self.symbols = ["000001", "000002", "600000"]
+        self.histories = {s: make_history(seed=i) for i, s in enumerate(self.symbols)}
+
+    def prepare(self, service: FeatureEngineeringService, order: list):
+        service.collector = FakeStreamCollector(self.histories, order)
+        universe = UniverseSelection(symbols=self.symbols, rationale="test")
+        return asyncio.run(service.prepare(universe))
+
+    def test_01_thread_pool_by_default(self):
+        service = FeatureEngineeringService(compute_workers=2)
+        self.assertEqual(service.compute_backend, "thread")
+        pool = service._create_compute_pool(3)
+        self.assertIsInstance(pool, ThreadPoolExecutor)
+        pool.shutdown()
+        with self.assertRaises(ValueError):
+            FeatureEngineeringService(compute_backend="fork")
+
+    def test_02_results_follow_universe_order(self):
+        service = FeatureEngineeringService(compute_workers=2)
+        bundle = self.prepare(service, list(reversed(self.symbols)))
+
+        symbols = bundle.combined_features["symbol"].unique().tolist()
+        self.assertEqual(symbols, self.symbols)
+        self.assertEqual(list(bundle.returns_by_symbol), self.symbols)
+        self.assertEqual(
+            len(bundle.train_data), int(0.8 * len(bundle.combined_features))
+        )
+
+    def test_03_malformed_dates_are_skipped(self):
+        self.histories["000002"].loc[5, "date"] = "not a date"
+        service = FeatureEngineeringService(compute_workers=2)
+        bundle = self.prepare(service, self.symbols)
+
+        self.assertNotIn("000002", bundle.raw_market_data)
+        self.assertEqual(list(bundle.returns_by_symbol), ["000001", "600000"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
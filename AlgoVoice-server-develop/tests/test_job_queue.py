@@ -0,0 +1,134 @@
+"""
+后台任务队列测试
+测试任务执行、每用户并发上限、降级结果状态与进度订阅
+"""
+
+import asyncio
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from common.job_queue import (
+    FINISHED_STATES,
+    JOB_CANCELLED,
+    JOB_COMPLETED,
+    JOB_FAILED,
+    JOB_FALLBACK,
+    FallbackResult,
+    JobLimitError,
+    JobQueue,
+)
+
+
+class TestJobQueue(unittest.TestCase):
+    """JobQueue测试"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = Path(self.tmp_dir) / "jobs.db"
+        self.queue = JobQueue(db_path=self.db_path, max_workers=1, max_jobs_per_user=2)
+        self.release = threading.Event()
+
+        def blocking(params, progress):
+            self.release.wait(5)
+            return {"done": True}
+
+        self.queue.register_handler("echo", lambda params, progress: params)
+        self.queue.register_handler("blocking", blocking)
+
+    def tearDown(self):
+        self.release.set()
+        self.queue.shutdown(wait=True)
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def wait_finished(self, job_id: str, timeout: float = 5.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            job = self.queue.get_job(job_id)
+            if job.status in FINISHED_STATES:
+                return job
+            time.sleep(0.01)
+        self.fail(f"job {job_id} did not finish")
+
+    def test_01_job_runs_and_persists(self):
+        job = self.queue.submit("echo", {"x": 1}, user_id=7)
+        finished = self.wait_finished(job.job_id)
+
+        self.assertEqual(finished.status, JOB_COMPLETED)
+        self.assertEqual(finished.result, {"x": 1})
+        # 重新打开队列后仍可从数据库查询
+        reopened = JobQueue(db_path=self.db_path, max_workers=1)
+        self.assertEqual(reopened.get_job(job.job_id, user_id=7).result, {"x": 1})
+        self.assertIsNone(reopened.get_job(job.job_id, user_id=8))
+        reopened.shutdown()
+
+    def test_02_fast_jobs_do_not_leak_futures(self):
+        jobs = [self.queue.submit("echo", {}, user_id=i) for i in range(50)]
+        for job in jobs:
+            self.wait_finished(job.job_id)
+        self.assertEqual(self.queue._futures, {})
+        self.assertEqual(self.queue._active, {})
+
+    def test_03_per_user_limit(self):
+        self.queue.submit("blocking", {}, user_id=1)
+        self.queue.submit("blocking", {}, user_id=1)
+        with self.assertRaises(JobLimitError):
+            self.queue.submit("blocking", {}, user_id=1)
+        # 其他用户不受影响
+        self.queue.submit("echo", {}, user_id=2)
+
+    def test_04_fallback_and_failure_status(self):
+        self.queue.register_handler(
+            "mock", lambda params, progress: FallbackResult({"mock": True}, "模拟数据")
+        )
+        self.queue.register_handler("boom", lambda params, progress: 1 / 0)
+
+        fallback = self.wait_finished(self.queue.submit("mock", {}, 1).job_id)
+        self.assertEqual(fallback.status, JOB_FALLBACK)
+        self.assertEqual(fallback.result, {"mock": True})
+        self.assertIn("模拟数据", fallback.message)
+
+        failed = self.wait_finished(self.queue.submit("boom", {}, 1).job_id)
+        self.assertEqual(failed.status, JOB_FAILED)
+        self.assertIn("division", failed.error)
+
+    def test_05_cancel_queued_job(self):
+        running = self.queue.submit("blocking", {}, user_id=1)
+        queued = self.queue.submit("echo", {}, user_id=2)
+
+        self.assertFalse(self.queue.cancel(running.job_id))
+        self.assertTrue(self.queue.cancel(queued.job_id))
+        self.assertEqual(self.queue.get_job(queued.job_id).status, JOB_CANCELLED)
+
+    def test_06_watch_reports_progress(self):
+        def stepped(params, progress):
+            for i in range(3):
+                self.release.wait(5)
+                progress(i + 1, 3, f"step {i + 1}")
+            return "ok"
+
+        self.queue.register_handler("stepped", stepped)
+
+        async def collect():
+            job = self.queue.submit("stepped", {}, user_id=1)
+            snapshots = []
+            async for snapshot in self.queue.watch(job.job_id):
+                snapshots.append(snapshot)
+                self.release.set()
+            return snapshots
+
+        snapshots = asyncio.run(collect())
+        self.assertEqual(snapshots[-1]["status"], JOB_COMPLETED)
+        self.assertIn("step 3", [s["message"] for s in snapshots])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,151 @@
+"""
+用户数据库测试
+测试令牌验证缓存的命中与失效，以及会话活动和活动日志的批量写入
+"""
+
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from common import admin_manager, user_database
+from common.admin_manager import AdminManager
+from common.user_database import UserDatabase
+
+
+class TestUserDatabase(unittest.TestCase):
+    """令牌缓存与批量写入测试"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = Path(self.tmp_dir) / "users.db"
+        self.db = self.make_db()
+        _, _, self.user_id = self.db.create_user("alice", "password1")
+        _, _, self.token = self.db.create_session(self.user_id)
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def make_db(self, **kwargs) -> UserDatabase:
+        kwargs.setdefault("flush_interval", 60.0)
+        return UserDatabase(str(self.db_path), **kwargs)
+
+    def query(self, sql, params=()):
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def count_activity_logs(self) -> int:
+        return self.query("SELECT COUNT(*) FROM user_activity_log")[0][0]
+
+    def test_01_cache_hit_skips_database(self):
+        self.assertIsNone(self.db.verify_cached_token(self.token))
+        valid, _, user = self.db.verify_token(self.token)
+        self.assertTrue(valid)
+
+        with mock.patch.object(
+            user_database.sqlite3, "connect", side_effect=AssertionError("db access")
+        ):
+            cached = self.db.verify_cached_token(self.token)
+            valid, _, cached_user = self.db.verify_token(self.token)
+
+        self.assertEqual(cached, (True, "令牌有效", user))
+        self.assertTrue(valid)
+        self.assertEqual(cached_user, user)
+        # 返回副本，调用方修改不影响缓存
+        cached_user["permission_level"] = 99
+        self.assertEqual(self.db.verify_cached_token(self.token)[2], user)
+
+    def test_02_logout_invalidates_cache(self):
+        self.db.verify_token(self.token)
+        self.assertTrue(self.db.invalidate_session(self.token))
+
+        self.assertIsNone(self.db.verify_cached_token(self.token))
+        valid, message, _ = self.db.verify_token(self.token)
+        self.assertFalse(valid)
+        self.assertEqual(message, "会话已失效")
+
+    def test_03_password_change_invalidates_all_tokens(self):
+        _, _, other_token = self.db.create_session(self.user_id)
+        self.db.verify_token(self.token)
+        self.db.verify_token(other_token)
+
+        success, _ = self.db.change_password(self.user_id, "password1", "password2")
+        self.assertTrue(success)
+        for token in (self.token, other_token):
+            self.assertIsNone(self.db.verify_cached_token(token))
+            self.assertFalse(self.db.verify_token(token)[0])
+
+    def test_04_admin_permission_change_invalidates_cache(self):
+        _, _, admin_id = self.db.create_user(
+            "admin", "password1", is_admin=True, permission_level=10
+        )
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                "CREATE TABLE user_activities "
+                "(user_id INTEGER, action TEXT, description TEXT)"
+            )
+        self.assertEqual(self.db.verify_token(self.token)[2]["permission_level"], 1)
+
+        manager = AdminManager(str(self.db_path))
+        with mock.patch.object(admin_manager, "user_db", self.db):
+            success, _ = manager.update_user_permission(admin_id, 10, self.user_id, 5)
+
+        self.assertTrue(success)
+        self.assertIsNone(self.db.verify_cached_token(self.token))
+        _, _, user = self.db.verify_token(self.token)
+        self.assertEqual(user["permission_level"], 5)
+        self.assertTrue(user["is_admin"])
+
+    def test_05_invalidation_during_lookup_is_not_cached(self):
+        real_connect = sqlite3.connect
+
+        def connect_then_invalidate(*args, **kwargs):
+            conn = real_connect(*args, **kwargs)
+            # 模拟查询期间管理员修改了权限
+            self.db.invalidate_user_cache(self.user_id)
+            return conn
+
+        with mock.patch.object(
+            user_database.sqlite3, "connect", side_effect=connect_then_invalidate
+        ):
+            valid, _, _ = self.db.verify_token(self.token)
+
+        self.assertTrue(valid)
+        self.assertIsNone(self.db.verify_cached_token(self.token))
+        self.db.verify_token(self.token)
+        self.assertIsNotNone(self.db.verify_cached_token(self.token))
+
+    def test_06_zero_flush_interval_writes_immediately(self):
+        db = self.make_db(flush_interval=0)
+        db.log_activity(self.user_id, "login", ip_address="127.0.0.1")
+        self.assertEqual(self.count_activity_logs(), 1)
+
+        self.query("UPDATE user_sessions SET last_activity = NULL")
+        db.verify_token(self.token)
+        last_activity = self.query("SELECT last_activity FROM user_sessions")[0][0]
+        self.assertIsNotNone(last_activity)
+        self.assertIsNone(db._writer_thread)
+
+    def test_07_close_flushes_pending_logs(self):
+        for i in range(3):
+            self.db.log_activity(self.user_id, "query", f"request {i}")
+        self.assertEqual(self.count_activity_logs(), 0)
+
+        self.db.close()
+        rows = self.query(
+            "SELECT activity_detail FROM user_activity_log ORDER BY log_id"
+        )
+        self.assertEqual([row[0] for row in rows], [f"request {i}" for i in range(3)])
+        self.assertIsNone(self.db._writer_thread)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
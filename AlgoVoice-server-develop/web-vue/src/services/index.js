@@ -15,6 +15,7 @@ import { dataApi } from './modules/data'
 import { userApi } from './modules/user'
 import { adminApi } from './modules/admin'
 import { paperTradingApi } from './modules/paperTrading'
+import { jobsApi } from './modules/jobs'
 import apiClient from './client'
 
 // 统一导出API对象（兼容旧版本）
@@ -32,6 +33,7 @@ export const api = {
   user: userApi,
   admin: adminApi,
   paperTrading: paperTradingApi,
+  jobs: jobsApi,
   
   // 兼容旧版本的analyze接口
   analyze: (params) => apiClient.post('/v1/analyze', params)
@@ -51,7 +53,8 @@ export {
   dataApi,
   userApi,
   adminApi,
-  paperTradingApi
+  paperTradingApi,
+  jobsApi
 }
 
 // 导出axios实例
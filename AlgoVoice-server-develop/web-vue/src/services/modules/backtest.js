@@ -3,11 +3,13 @@
  */
 
 import apiClient from '../client'
+import { jobsApi } from './jobs'
 
 export const backtestApi = {
   /**
-   * 运行回测
+   * 运行回测（提交后台任务并等待结果）
    */
-  run: (params) => apiClient.post('/v1/backtest/run', params)
+  run: (params, onProgress = null) =>
+    jobsApi.waitFor(apiClient.post('/v1/backtest/run', params), onProgress)
 }
 
@@ -0,0 +1,70 @@
+/**
+ * 后台任务API服务
+ * 回测、策略生成等耗时操作提交后立即返回任务ID，通过轮询获取进度和结果
+ */
+
+import apiClient from '../client'
+
+// fallback: 任务结束，但结果为降级数据（如真实回测失败后的模拟数据）
+const FINISHED_STATES = ['completed', 'fallback', 'failed', 'cancelled']
+const SUCCESS_STATES = ['completed', 'fallback']
+
+export const jobsApi = {
+  /**
+   * 获取当前用户最近的任务
+   */
+  list: (jobType = null, limit = 20) =>
+    apiClient.get('/v1/jobs', { params: { job_type: jobType, limit } }),
+
+  /**
+   * 查询任务状态
+   */
+  get: (jobId) => apiClient.get(`/v1/jobs/${jobId}`),
+
+  /**
+   * 获取任务结果
+   */
+  getResult: (jobId) => apiClient.get(`/v1/jobs/${jobId}/result`),
+
+  /**
+   * 取消排队中的任务
+   */
+  cancel: (jobId) => apiClient.delete(`/v1/jobs/${jobId}`),
+
+  /**
+   * 提交任务并等待完成，返回任务结果
+   * @param {Promise} submission - 提交任务的请求
+   * @param {Function} onProgress - 进度回调 (job) => void
+   * @param {number} interval - 轮询间隔（毫秒）
+   */
+  async waitFor(submission, onProgress = null, interval = 1000) {
+    const submitted = await submission
+    if (submitted.status === 'error') {
+      throw submitted
+    }
+
+    const jobId = submitted.data.job_id
+    for (;;) {
+      const response = await jobsApi.get(jobId)
+      if (response.status === 'error') {
+        throw response
+      }
+      if (onProgress) {
+        onProgress(response.data)
+      }
+      if (FINISHED_STATES.includes(response.data.status)) {
+        break
+      }
+      await new Promise(resolve => setTimeout(resolve, interval))
+    }
+
+    const { data: job } = await jobsApi.getResult(jobId)
+    if (!SUCCESS_STATES.includes(job.status)) {
+      throw { status: 'error', error: job.error || '任务未完成', job }
+    }
+    if (job.status === 'fallback') {
+      console.warn(`任务 ${jobId} ${job.message}`)
+    }
+    return job.result
+  }
+}
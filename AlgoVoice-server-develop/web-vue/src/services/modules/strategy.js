@@ -3,13 +3,17 @@
  */
 
 import apiClient from '../client'
+import { jobsApi } from './jobs'
 
 export const strategyApi = {
   /**
-   * 生成策略
+   * 生成策略（提交后台任务并等待结果）
    */
-  generate: (requirements) =>
-    apiClient.post('/v1/strategy/generate', { requirements }),
+  generate: (requirements, onProgress = null) =>
+    jobsApi.waitFor(
+      apiClient.post('/v1/strategy/generate', { requirements }),
+      onProgress
+    ),
 
   /**
    * 启动智能策略工作流